@@ -3,33 +3,41 @@
 A lightweight MCP server implementing hierarchical project management:
 Projects → Epics → Features → Tasks stored as Markdown files with
 YAML front-matter.
+
+Public names are loaded lazily on first access (PEP 562), so importing a
+submodule such as ``trellis_mcp.cli`` does not load the parser, dumper and
+validation stack up front.
 """
 
-from .object_dumper import dump_object, write_object
-from .object_parser import parse_object
-from .utils.id_utils import clean_prerequisite_id
-from .validation import (
-    CircularDependencyError,
-    PerformanceBenchmark,
-    TrellisValidationError,
-    benchmark_cycle_detection,
-    build_prerequisites_graph,
-    clear_dependency_cache,
-    detect_cycle_dfs,
-    get_all_objects,
-    get_cache_stats,
-    is_hierarchy_task,
-    is_hierarchy_task_guard,
-    is_standalone_task,
-    is_standalone_task_guard,
-    validate_acyclic_prerequisites,
-    validate_enum_membership,
-    validate_object_data,
-    validate_parent_exists,
-    validate_parent_exists_for_object,
-    validate_required_fields_per_kind,
-    validate_status_for_kind,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .object_dumper import dump_object, write_object
+    from .object_parser import parse_object
+    from .utils.id_utils import clean_prerequisite_id
+    from .validation import (
+        CircularDependencyError,
+        PerformanceBenchmark,
+        TrellisValidationError,
+        benchmark_cycle_detection,
+        build_prerequisites_graph,
+        clear_dependency_cache,
+        detect_cycle_dfs,
+        get_all_objects,
+        get_cache_stats,
+        is_hierarchy_task,
+        is_hierarchy_task_guard,
+        is_standalone_task,
+        is_standalone_task_guard,
+        validate_acyclic_prerequisites,
+        validate_enum_membership,
+        validate_object_data,
+        validate_parent_exists,
+        validate_parent_exists_for_object,
+        validate_required_fields_per_kind,
+        validate_status_for_kind,
+    )
 
 __author__ = "LangAdventure LLC"
 __description__ = "File-backed MCP server for project management"
@@ -60,3 +68,45 @@ __all__ = [
     "clear_dependency_cache",
     "PerformanceBenchmark",
 ]
+
+_LAZY_IMPORTS: dict[str, str] = {
+    "parse_object": ".object_parser",
+    "dump_object": ".object_dumper",
+    "write_object": ".object_dumper",
+    "clean_prerequisite_id": ".utils.id_utils",
+    "validate_parent_exists": ".validation",
+    "validate_parent_exists_for_object": ".validation",
+    "is_hierarchy_task": ".validation",
+    "is_standalone_task": ".validation",
+    "is_hierarchy_task_guard": ".validation",
+    "is_standalone_task_guard": ".validation",
+    "validate_required_fields_per_kind": ".validation",
+    "validate_enum_membership": ".validation",
+    "validate_status_for_kind": ".validation",
+    "validate_object_data": ".validation",
+    "CircularDependencyError": ".validation",
+    "TrellisValidationError": ".validation",
+    "validate_acyclic_prerequisites": ".validation",
+    "get_all_objects": ".validation",
+    "build_prerequisites_graph": ".validation",
+    "detect_cycle_dfs": ".validation",
+    "benchmark_cycle_detection": ".validation",
+    "get_cache_stats": ".validation",
+    "clear_dependency_cache": ".validation",
+    "PerformanceBenchmark": ".validation",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names from their submodule on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Include lazily loaded names in dir()."""
+    return sorted(set(globals()) | set(__all__))
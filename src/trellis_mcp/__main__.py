@@ -0,0 +1,6 @@
+"""Allow running the CLI with ``python -m trellis_mcp``."""
+
+from .cli import cli
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,325 @@
+"""Packed archive of old completed tasks.
+
+Done tasks are rarely read again, yet each one is a file every scan of the
+planning tree lists and parses. ``archive_done_tasks`` moves done tasks
+completed before a cutoff out of ``tasks-done`` into two files under
+``planning/.trellis/archive/``:
+
+- ``done-tasks.jsonl.gz``: append-only data file. Every task is one gzip
+  member holding one JSON line with its original path and file content, so
+  ``gzip -dc`` prints the whole archive as JSON lines and a single task can
+  be decompressed on its own.
+- ``done-tasks.idx.json``: offset index mapping each task ID to its member's
+  offset and length plus the task's validated front-matter.
+
+Prerequisite resolution and validation see archived tasks through the index
+alone (``archived_objects``), so an archived prerequisite still counts as
+done without any file being opened. ``read_archived_task`` decompresses one
+member for ``getObject``.
+
+The data is appended and flushed before the index is replaced, and task
+files are removed only after that. A run interrupted at any point leaves
+each task readable from its file, the archive, or both; archiving it again
+appends a fresh copy and the index points at the newest one.
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, TypedDict
+
+from .change_feed import CHANGE_JOURNAL_DIR, record_change
+from .done_tasks import find_tasks_done_dirs, is_done_task_name, is_shard_name, iter_task_files
+from .durability import sync_directory, sync_file
+from .markdown_loader import parse_markdown
+from .object_parser import parse_object
+from .schema.task import TaskModel
+from .utils.io_utils import atomic_write_text
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR_NAME = "archive"
+ARCHIVE_DATA_FILE = "done-tasks.jsonl.gz"
+ARCHIVE_INDEX_FILE = "done-tasks.idx.json"
+ARCHIVE_INDEX_VERSION = 1
+
+_AGE_PATTERN = re.compile(r"^\s*(\d+)\s*([hdw])\s*$")
+_AGE_UNITS = {"h": "hours", "d": "days", "w": "weeks"}
+_COMPLETED_PATTERN = re.compile(r"^(\d{8}_\d{6})-T-")
+
+
+class ArchiveEntry(TypedDict):
+    """Type definition for the index entry of one archived task."""
+
+    offset: int
+    length: int
+    path: str  # original path relative to the planning root
+    task: dict[str, Any]  # validated front-matter in JSON form
+
+
+class ArchiveIndex(TypedDict):
+    """Type definition for the archive index file."""
+
+    version: int
+    tasks: dict[str, ArchiveEntry]  # keyed by task ID without the T- prefix
+
+
+def parse_age(value: str) -> timedelta:
+    """Parse an age such as ``90d``, ``12w`` or ``36h``.
+
+    Args:
+        value: Number followed by h (hours), d (days) or w (weeks)
+
+    Returns:
+        The age as a timedelta
+
+    Raises:
+        ValueError: If the value is not a positive age
+    """
+    match = _AGE_PATTERN.match(value)
+    if match is None or int(match.group(1)) <= 0:
+        raise ValueError(f"Invalid age '{value}'; expected e.g. 90d, 12w or 36h")
+    return timedelta(**{_AGE_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def archive_dir(planning_root: str | Path) -> Path:
+    """Get the archive directory of a planning root.
+
+    Args:
+        planning_root: Planning directory
+
+    Returns:
+        Path of ``.trellis/archive`` under the planning directory
+    """
+    return Path(os.path.abspath(planning_root)) / CHANGE_JOURNAL_DIR / ARCHIVE_DIR_NAME
+
+
+def completed_at(path: Path) -> datetime:
+    """Get when a done task was completed.
+
+    Args:
+        path: Done task file named ``<YYYYMMDD_HHMMSS>-T-<id>.md``
+
+    Returns:
+        The timestamp from the file name, or the file's modification time if
+        the name has none
+    """
+    match = _COMPLETED_PATTERN.match(path.name)
+    if match is not None:
+        try:
+            return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(path.stat().st_mtime)
+
+
+def archive_done_tasks(
+    planning_root: str | Path,
+    older_than: timedelta,
+    dry_run: bool = False,
+    now: datetime | None = None,
+) -> list[Path]:
+    """Pack done tasks completed before a cutoff into the archive.
+
+    Args:
+        planning_root: Planning directory
+        older_than: Minimum time since completion
+        dry_run: If True, only report which tasks would be archived
+        now: Reference time (default: the current local time)
+
+    Returns:
+        Task files archived (or to be archived), in the order they were packed
+
+    Raises:
+        OSError: If the archive cannot be written
+    """
+    root = Path(os.path.abspath(planning_root))
+    cutoff = (now or datetime.now()) - older_than
+    candidates = [
+        path
+        for tasks_done_dir in find_tasks_done_dirs(root)
+        for path in sorted(iter_task_files(tasks_done_dir))
+        if is_done_task_name(path.name) and completed_at(path) < cutoff
+    ]
+    if dry_run or not candidates:
+        return candidates
+
+    directory = archive_dir(root)
+    directory.mkdir(parents=True, exist_ok=True)
+    archived: list[Path] = []
+    with open(directory / ARCHIVE_DATA_FILE, "ab") as data:
+        # One archiver at a time; readers never take the lock
+        if fcntl is not None:
+            fcntl.flock(data.fileno(), fcntl.LOCK_EX)
+        index = _read_index(directory / ARCHIVE_INDEX_FILE)
+        offset = data.seek(0, os.SEEK_END)
+
+        for path in candidates:
+            try:
+                content = path.read_text(encoding="utf-8")
+                task = parse_object(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Not archiving {path}: {e}")
+                continue
+            if not isinstance(task, TaskModel):
+                continue
+
+            relative = os.path.relpath(path, root)
+            line = json.dumps({"id": task.id, "path": relative, "content": content}) + "\n"
+            member = gzip.compress(line.encode("utf-8"), mtime=0)
+            data.write(member)
+            index["tasks"][_clean_id(task.id)] = {
+                "offset": offset,
+                "length": len(member),
+                "path": relative,
+                "task": task.model_dump(mode="json"),
+            }
+            offset += len(member)
+            archived.append(path)
+
+        data.flush()
+        sync_file(data.fileno(), directory / ARCHIVE_DATA_FILE)
+        atomic_write_text(directory / ARCHIVE_INDEX_FILE, json.dumps(index, separators=(",", ":")))
+
+    # Every archived task is now readable from the archive
+    for path in archived:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            continue
+        sync_directory(path.parent)
+        record_change(path, "deleted")
+        if is_shard_name(path.parent.name):
+            try:
+                path.parent.rmdir()
+            except OSError:
+                pass  # Shard still has tasks
+    if archived:
+        logger.info(f"Archived {len(archived)} done tasks from {root}")
+    return archived
+
+
+def archived_objects(planning_root: str | Path) -> dict[str, dict[str, Any]]:
+    """Get archived tasks in the form ``get_all_objects`` returns objects.
+
+    Built from the archive index only; no task content is decompressed.
+
+    Args:
+        planning_root: Planning directory
+
+    Returns:
+        Mapping of task ID (without prefix) to ``TaskModel.model_dump()`` data;
+        callers must not mutate the returned dictionaries
+    """
+    return _index_cache.load(planning_root)[1]
+
+
+def is_archived(planning_root: str | Path, clean_id: str) -> bool:
+    """Check whether a task ID is in the archive.
+
+    Args:
+        planning_root: Planning directory
+        clean_id: Task ID without the T- prefix
+
+    Returns:
+        True if the task was archived
+    """
+    return clean_id in _index_cache.load(planning_root)[0]["tasks"]
+
+
+def read_archived_task(
+    planning_root: str | Path, clean_id: str
+) -> tuple[dict[str, Any], str] | None:
+    """Read an archived task's front-matter and body.
+
+    Args:
+        planning_root: Planning directory
+        clean_id: Task ID without the T- prefix
+
+    Returns:
+        Tuple of (front-matter, body), or None if the task is not archived
+
+    Raises:
+        OSError: If the archive data file cannot be read
+        ValueError: If the archived record is corrupt
+    """
+    entry = _index_cache.load(planning_root)[0]["tasks"].get(clean_id)
+    if entry is None:
+        return None
+    with open(archive_dir(planning_root) / ARCHIVE_DATA_FILE, "rb") as data:
+        data.seek(entry["offset"])
+        member = data.read(entry["length"])
+    try:
+        record = json.loads(gzip.decompress(member))
+    except (OSError, EOFError) as e:
+        raise ValueError(f"Corrupt archive record for T-{clean_id}: {e}") from e
+    return parse_markdown(record["content"], record["path"])
+
+
+def _clean_id(task_id: str) -> str:
+    """Strip the T- prefix from a task ID."""
+    return task_id[2:] if task_id.startswith("T-") else task_id
+
+
+def _read_index(index_path: Path) -> ArchiveIndex:
+    """Read the archive index, or an empty one if there is none."""
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        return {"version": ARCHIVE_INDEX_VERSION, "tasks": {}}
+    if index.get("version") != ARCHIVE_INDEX_VERSION:
+        raise ValueError(f"Unsupported archive index version in {index_path}")
+    return index
+
+
+class _IndexCache:
+    """Archive indexes and their derived objects, reloaded when the index file changes."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._entries: dict[str, tuple[Any, ArchiveIndex, dict[str, dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, planning_root: str | Path) -> tuple[ArchiveIndex, dict[str, dict[str, Any]]]:
+        """Get the index of a planning root and its tasks as object dictionaries."""
+        index_path = str(archive_dir(planning_root) / ARCHIVE_INDEX_FILE)
+        try:
+            stat = os.stat(index_path)
+            signature: Any = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+
+        with self._lock:
+            cached = self._entries.get(index_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1], cached[2]
+
+        if signature is None:
+            index: ArchiveIndex = {"version": ARCHIVE_INDEX_VERSION, "tasks": {}}
+        else:
+            index = _read_index(Path(index_path))
+        objects: dict[str, dict[str, Any]] = {}
+        for clean_id, entry in index["tasks"].items():
+            try:
+                objects[clean_id] = TaskModel(**entry["task"]).model_dump()
+            except Exception as e:
+                logger.warning(f"Skipping invalid archived task T-{clean_id}: {e}")
+
+        with self._lock:
+            self._entries[index_path] = (signature, index, objects)
+        return index, objects
+
+
+_index_cache = _IndexCache()
@@ -0,0 +1,630 @@
+"""In-memory columnar index of the tasks in a planning tree.
+
+listBacklog answers its queries from this index instead of parsing task
+files. The index keeps one entry per object file with the fields queries
+filter and group on, and lays the task entries out as columns: parallel
+tuples with one row per task, plus row lists per status, priority and
+scope ID. A query starts from the smallest of the row lists it can use and
+checks its remaining conditions against the columns. For large trees with
+NumPy installed, the columns are also laid out as arrays (see
+``trellis_mcp.task_table``) and queries run as vectorized operations.
+
+The index also keeps the tasks in review in update order (see
+``trellis_mcp.review_queue``), maintained as entries change status, and
+builds the object map getObjects and getTree resolve IDs and children with
+(see ``trellis_mcp.object_tree``).
+
+Entries are validated like the other planning caches: object files are
+listed and stat-ed on each query and only changed files are parsed again
+(through the parse cache). While a filesystem watcher covers the planning
+tree, the index trusts its entries and only re-reads the paths published on
+the invalidation bus.
+"""
+
+import fnmatch
+import logging
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, cast
+
+from .archive import archived_objects
+from .invalidation import get_invalidation_bus, is_under, is_watched
+from .object_parser import parse_object
+from .object_tree import ObjectMap
+from .parse_cache import FileSignature, file_signature
+from .review_queue import ReviewKey, ReviewQueue
+from .schema.task import TaskModel
+from .task_table import VECTORIZE_MIN_ROWS, TaskTable, vectorization_available
+from .utils.id_utils import clean_prerequisite_id
+from .validation.object_loader import OBJECT_FILE_PATTERNS
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Columns of the task table, in row tuple order
+TASK_COLUMNS = (
+    "id",
+    "title",
+    "status",
+    "priority",
+    "parent",
+    "project",
+    "epic",
+    "feature",
+    "worktree",
+    "created",
+    "updated",
+    "prerequisites",
+    "file_path",  # relative to the planning directory
+)
+
+_STATUS = TASK_COLUMNS.index("status")
+_PRIORITY = TASK_COLUMNS.index("priority")
+_UPDATED = TASK_COLUMNS.index("updated")
+_FILE_PATH = TASK_COLUMNS.index("file_path")
+
+# Fields tasks can be counted by
+GROUP_FIELDS = ("status", "priority", "parent", "feature", "epic", "project", "worktree")
+
+
+@dataclass(frozen=True)
+class BacklogQuery:
+    """Conditions a task must meet to be selected; unset conditions match every task.
+
+    Attributes:
+        statuses: Status values, any of which matches
+        priorities: Priority values, any of which matches
+        scope: Project, epic or feature ID the task must belong to
+        worktree: Worktree the task must be claimed in
+        title_contains: Case-insensitive title substring
+        created_after: Earliest creation time (inclusive)
+        created_before: Latest creation time (exclusive)
+        updated_after: Earliest update time (inclusive)
+        updated_before: Latest update time (exclusive)
+        has_unfinished_prerequisites: Whether some prerequisite is missing or not done
+    """
+
+    statuses: frozenset[str] = frozenset()
+    priorities: frozenset[str] = frozenset()
+    scope: str = ""
+    worktree: str = ""
+    title_contains: str = ""
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+    updated_after: datetime | None = None
+    updated_before: datetime | None = None
+    has_unfinished_prerequisites: bool | None = None
+
+
+class TaskColumns:
+    """Immutable column store of the tasks of one planning tree.
+
+    Example:
+        >>> columns = get_backlog_index().columns(Path("planning"))
+        >>> rows = columns.select(BacklogQuery(statuses=frozenset({"open"})))
+        >>> columns.count_by(rows, ["epic"])
+        [{'epic': 'E-auth', 'count': 3}, {'epic': None, 'count': 1}]
+    """
+
+    def __init__(self, rows: list[tuple], statuses: dict[str, str], planning_root: str):
+        """Lay out task rows as columns.
+
+        Args:
+            rows: Task rows in ``TASK_COLUMNS`` order
+            statuses: Status of every indexed object by ID without prefix
+            planning_root: Absolute planning directory, for archived prerequisites
+        """
+        self.size = len(rows)
+        self.columns: dict[str, tuple] = {
+            name: column for name, column in zip(TASK_COLUMNS, zip(*rows) if rows else [])
+        }
+        for name in TASK_COLUMNS:
+            self.columns.setdefault(name, ())
+        self._statuses = statuses
+        self._planning_root = planning_root
+        self._archived: dict[str, dict[str, Any]] | None = None
+        self._table: TaskTable | None = None
+
+        self._titles = tuple(title.lower() for title in self.columns["title"])
+        self._created = tuple(_as_utc(created) for created in self.columns["created"])
+        self._updated = tuple(_as_utc(updated) for updated in self.columns["updated"])
+
+        self._by_status: dict[str, list[int]] = {}
+        self._by_priority: dict[str, list[int]] = {}
+        self._by_scope: dict[str, list[int]] = {}
+        self._standalone: list[int] = []
+        for row, (status, priority) in enumerate(
+            zip(self.columns["status"], self.columns["priority"])
+        ):
+            self._by_status.setdefault(status, []).append(row)
+            self._by_priority.setdefault(str(priority), []).append(row)
+        for row, chain in enumerate(
+            zip(
+                self.columns["project"],
+                self.columns["epic"],
+                self.columns["feature"],
+                self.columns["parent"],
+            )
+        ):
+            if chain[0] is None:
+                self._standalone.append(row)
+                continue
+            for scope_id in set(chain):
+                if scope_id:
+                    self._by_scope.setdefault(scope_id, []).append(row)
+
+    def select(self, query: BacklogQuery) -> list[int]:
+        """Find the rows of the tasks matching a query.
+
+        Args:
+            query: Conditions to match
+
+        Returns:
+            Matching row numbers in ascending order
+        """
+        table = self._vectorized()
+        if table is not None:
+            return table.select(query)
+
+        candidates: list[list[int]] = []
+        if query.statuses:
+            candidates.append(self._union(self._by_status, query.statuses))
+        if query.priorities:
+            candidates.append(self._union(self._by_priority, query.priorities))
+        if query.scope:
+            # Like filter_by_scope, a project scope also covers standalone tasks
+            scoped = self._by_scope.get(query.scope, [])
+            if query.scope.startswith("P-"):
+                scoped = sorted(scoped + self._standalone)
+            candidates.append(scoped)
+        if not candidates:
+            candidates.append(list(range(self.size)))
+
+        # Scan the smallest candidate list, probing the others as sets
+        candidates.sort(key=len)
+        rows = list(candidates[0])  # Row lists are shared; callers may sort the result
+        for other in candidates[1:]:
+            members = set(other)
+            rows = [row for row in rows if row in members]
+
+        if query.worktree:
+            worktrees = self.columns["worktree"]
+            rows = [row for row in rows if worktrees[row] == query.worktree]
+        if query.title_contains:
+            needle = query.title_contains.lower()
+            rows = [row for row in rows if needle in self._titles[row]]
+        rows = _in_range(rows, self._created, query.created_after, query.created_before)
+        rows = _in_range(rows, self._updated, query.updated_after, query.updated_before)
+        if query.has_unfinished_prerequisites is not None:
+            prerequisites = self.columns["prerequisites"]
+            rows = [
+                row
+                for row in rows
+                if self._has_unfinished(prerequisites[row]) == query.has_unfinished_prerequisites
+            ]
+        return rows
+
+    def count_by(self, rows: list[int], fields: list[str]) -> list[dict[str, Any]]:
+        """Count rows per combination of field values.
+
+        Args:
+            rows: Row numbers from ``select``
+            fields: Names from ``GROUP_FIELDS``
+
+        Returns:
+            One dictionary per combination with the field values and a
+            ``count``, largest count first
+
+        Raises:
+            ValueError: If a field cannot be grouped by
+        """
+        for name in fields:
+            if name not in GROUP_FIELDS:
+                raise ValueError(
+                    f"Cannot group by '{name}'; expected one of: {', '.join(GROUP_FIELDS)}"
+                )
+        table = self._vectorized()
+        if table is not None:
+            counts = table.count_by(rows, fields)
+        else:
+            columns = [self.columns[name] for name in fields]
+            counted = Counter(
+                tuple(_group_value(column[row]) for column in columns) for row in rows
+            )
+            counts = list(counted.items())
+        ordered = sorted(counts, key=lambda item: (-item[1], [str(value) for value in item[0]]))
+        return [{**dict(zip(fields, values)), "count": count} for values, count in ordered]
+
+    def order(self, rows: list[int]) -> list[int]:
+        """Sort rows by priority rank, then creation date, keeping ties in row order.
+
+        Args:
+            rows: Row numbers from ``select``
+
+        Returns:
+            The rows in listing order
+        """
+        table = self._vectorized()
+        if table is not None:
+            return table.order(rows)
+        priorities, created = self.columns["priority"], self._created
+        return sorted(rows, key=lambda row: (int(priorities[row]), created[row]))
+
+    def record(self, row: int, planning_root: Path) -> dict[str, Any]:
+        """Build the listBacklog entry of a row.
+
+        Args:
+            row: Row number
+            planning_root: Planning directory the file path is reported under
+
+        Returns:
+            Dictionary with id, title, status, priority, parent, file_path,
+            created and updated
+        """
+        return task_record(tuple(column[row] for column in self.columns.values()), planning_root)
+
+    def _union(self, postings: dict[str, list[int]], values: frozenset[str]) -> list[int]:
+        """Merge the row lists of several values."""
+        if len(values) == 1:
+            return postings.get(next(iter(values)), [])
+        return sorted(row for value in values for row in postings.get(value, []))
+
+    def _vectorized(self) -> TaskTable | None:
+        """Get the array form of the columns for large trees when NumPy is installed."""
+        if self._table is None and self.size >= VECTORIZE_MIN_ROWS and vectorization_available():
+            self._table = TaskTable(
+                self.columns, self._titles, self._created, self._updated, self._is_done
+            )
+        return self._table
+
+    def _has_unfinished(self, prerequisites: tuple[str, ...]) -> bool:
+        """Check whether any prerequisite is missing or not done."""
+        return not all(self._is_done(prereq) for prereq in prerequisites)
+
+    def _is_done(self, prereq: str) -> bool:
+        """Check whether a prerequisite ID names a done object, archived ones included."""
+        status = self._statuses.get(prereq)
+        if status is None:
+            if self._archived is None:
+                self._archived = archived_objects(self._planning_root)
+            status = self._archived.get(prereq, {}).get("status")
+        return status == "done"
+
+
+@dataclass
+class _Entry:
+    """Indexed fields of one object file."""
+
+    signature: FileSignature
+    clean_id: str | None = None  # None if the file could not be parsed
+    status: str = ""
+    task_row: tuple | None = None
+
+
+@dataclass
+class _RootState:
+    """Index entries of one planning directory."""
+
+    entries: dict[str, _Entry] = field(default_factory=dict)
+    columns: TaskColumns | None = None
+    objects: ObjectMap | None = None
+    review: ReviewQueue = field(default_factory=ReviewQueue)
+    # Paths published since the last query, and whether a directory was published
+    dirty: set[str] = field(default_factory=set)
+    stale: bool = True
+    # Whether the last full scan ran while a watcher covered the directory
+    trusted: bool = False
+
+
+class BacklogIndex:
+    """Columnar task index per planning directory.
+
+    Example:
+        >>> index = get_backlog_index()
+        >>> columns = index.columns(Path("planning"))
+        >>> len(columns.select(BacklogQuery(priorities=frozenset({"high"}))))
+        2
+    """
+
+    def __init__(self):
+        """Initialize an empty index subscribed to the invalidation bus."""
+        self._roots: dict[str, _RootState] = {}
+        # Serializes refreshes; published paths are recorded under the lighter lock
+        self._lock = threading.Lock()
+        self._dirty_lock = threading.Lock()
+        self.parses = 0
+        get_invalidation_bus().subscribe(self.invalidate_path)
+
+    def columns(self, planning_root: str | Path) -> TaskColumns:
+        """Get the up-to-date task columns of a planning directory.
+
+        Args:
+            planning_root: Planning directory (containing projects/ and tasks-*/)
+
+        Returns:
+            Column store of every parseable task
+        """
+        key = os.path.abspath(planning_root)
+        with self._lock:
+            state = self._current(key)
+            if state.columns is None:
+                state.columns = _build_columns(key, state.entries)
+            return state.columns
+
+    def object_map(self, planning_root: str | Path) -> ObjectMap:
+        """Get the up-to-date object map of a planning directory.
+
+        Args:
+            planning_root: Planning directory (containing projects/ and tasks-*/)
+
+        Returns:
+            File path and children of every parseable object
+        """
+        key = os.path.abspath(planning_root)
+        with self._lock:
+            state = self._current(key)
+            if state.objects is None:
+                paths = [path for path, entry in state.entries.items() if entry.clean_id]
+                state.objects = ObjectMap(key, paths)
+            return state.objects
+
+    def review_queue(
+        self, planning_root: str | Path, after: ReviewKey | None = None, limit: int | None = None
+    ) -> tuple[list[tuple], list[ReviewKey], int]:
+        """Get a page of the tasks in review, oldest update first.
+
+        Ties on the update time are ordered by priority (high first), then by
+        file path. Unlike ``columns``, this does not lay out the task columns.
+
+        Args:
+            planning_root: Planning directory (containing projects/ and tasks-*/)
+            after: Queue key to continue after (default: start of the queue)
+            limit: Maximum number of tasks (default: all)
+
+        Returns:
+            Task rows in ``TASK_COLUMNS`` order, their queue keys, and the
+            number of tasks in review
+        """
+        key = os.path.abspath(planning_root)
+        with self._lock:
+            state = self._current(key)
+            keys = state.review.page(after, limit)
+            rows = [state.entries[os.path.join(key, path)].task_row for _, _, path in keys]
+            return cast(list[tuple], rows), keys, len(state.review)
+
+    def invalidate_path(self, path: str) -> None:
+        """Record a changed path for the next query (invalidation bus listener).
+
+        Args:
+            path: Changed file, or directory whose contents may have changed
+        """
+        with self._dirty_lock:
+            for key, state in self._roots.items():
+                if is_under(path, key) and path.endswith(".md"):
+                    state.dirty.add(path)
+                elif is_under(path, key) or is_under(key, path):
+                    state.stale = True
+
+    def clear(self) -> None:
+        """Drop every index entry."""
+        with self._lock, self._dirty_lock:
+            self._roots.clear()
+
+    def _current(self, key: str) -> _RootState:
+        """Bring the entries of a planning directory up to date.
+
+        Drops the laid-out columns and object map if any entry changed.
+        """
+        with self._dirty_lock:
+            state = self._roots.setdefault(key, _RootState())
+            dirty, state.dirty = state.dirty, set()
+            stale, state.stale = state.stale, False
+
+        # Changes made before a watcher started were never published
+        watched = is_watched(key)
+        if stale or not watched or not state.trusted:
+            changed = self._scan(key, state)
+            state.trusted = watched
+        else:
+            changed = self._refresh(key, state, dirty)
+        if changed:
+            state.columns = None
+            state.objects = None
+        return state
+
+    def _scan(self, key: str, state: _RootState) -> bool:
+        """List and stat every object file, parsing new and changed ones."""
+        root = Path(key)
+        paths = [str(path) for pattern in OBJECT_FILE_PATTERNS for path in root.glob(pattern)]
+        changed = False
+        for path in set(state.entries) - set(paths):
+            _store(state, path, None)
+            changed = True
+        for path in paths:
+            changed = self._update(key, state, path) or changed
+        return changed
+
+    def _refresh(self, key: str, state: _RootState, dirty: set[str]) -> bool:
+        """Re-read the published object files of a watched planning directory."""
+        changed = False
+        for path in dirty:
+            relative = os.path.relpath(path, key).replace(os.sep, "/")
+            if path in state.entries or _is_object_file(relative):
+                changed = self._update(key, state, path) or changed
+        return changed
+
+    def _update(self, key: str, state: _RootState, path: str) -> bool:
+        """Bring one file's entry up to date.
+
+        Returns:
+            True if the entry was added, replaced or removed
+        """
+        try:
+            signature = file_signature(os.stat(path))
+        except OSError:
+            return _store(state, path, None)
+        entry = state.entries.get(path)
+        if entry is not None and entry.signature == signature:
+            return False
+        _store(state, path, self._parse(key, path, signature))
+        return True
+
+    def _parse(self, key: str, path: str, signature: FileSignature) -> _Entry:
+        """Parse an object file into an index entry."""
+        self.parses += 1
+        try:
+            obj = parse_object(path)
+        except Exception as e:
+            logger.warning(f"Skipping invalid file {path}: {e}")
+            return _Entry(signature)
+
+        entry = _Entry(signature, clean_prerequisite_id(obj.id), obj.status.value)
+        if isinstance(obj, TaskModel):
+            # Security check, as in scan_tasks: skip task files linked in from outside
+            if not Path(path).resolve().is_relative_to(Path(key).parent.resolve()):
+                return _Entry(signature)
+            entry.task_row = _task_row(key, path, obj)
+        return entry
+
+
+def _store(state: _RootState, path: str, entry: _Entry | None) -> bool:
+    """Set or remove the entry of a file, keeping the review queue in step.
+
+    Returns:
+        True if an entry was set or removed
+    """
+    if entry is None:
+        state.review.put(path, None)
+        return state.entries.pop(path, None) is not None
+
+    state.entries[path] = entry
+    row = entry.task_row
+    if row is not None and row[_STATUS] == "review":
+        state.review.put(path, (_as_utc(row[_UPDATED]), int(row[_PRIORITY]), row[_FILE_PATH]))
+    else:
+        state.review.put(path, None)
+    return True
+
+
+def task_record(row: tuple, planning_root: Path) -> dict[str, Any]:
+    """Build the listBacklog entry of a task row.
+
+    Args:
+        row: Task row in ``TASK_COLUMNS`` order
+        planning_root: Planning directory the file path is reported under
+
+    Returns:
+        Dictionary with id, title, status, priority, parent, file_path,
+        created and updated
+    """
+    return {
+        "id": row[0],
+        "title": row[1],
+        "status": row[_STATUS],
+        "priority": str(row[_PRIORITY]),
+        "parent": row[4] or "",
+        "file_path": str(planning_root / row[_FILE_PATH]),
+        "created": row[9].isoformat(),
+        "updated": row[_UPDATED].isoformat(),
+    }
+
+
+def _task_row(key: str, path: str, task: TaskModel) -> tuple:
+    """Build a task's row in ``TASK_COLUMNS`` order."""
+    relative = os.path.relpath(path, key)
+    return (
+        task.id if task.id.startswith("T-") else f"T-{task.id}",
+        task.title,
+        task.status.value,
+        task.priority,
+        task.parent,
+        *parent_chain(relative),
+        task.worktree,
+        task.created,
+        task.updated,
+        tuple(clean_prerequisite_id(prereq) for prereq in task.prerequisites),
+        relative,
+    )
+
+
+def parent_chain(relative: str) -> tuple[str | None, str | None, str | None]:
+    """Get the project, epic and feature directories a task file lies under.
+
+    Args:
+        relative: Task file path relative to the planning directory
+
+    Returns:
+        Prefixed (project, epic, feature) IDs, all None for a standalone task
+    """
+    parts = relative.replace(os.sep, "/").split("/")
+    # projects/P-*/epics/E-*/features/F-*/tasks-*/...
+    if parts[0] != "projects" or len(parts) <= 6:
+        return None, None, None
+    return parts[1], parts[3], parts[5]
+
+
+def _build_columns(key: str, entries: dict[str, _Entry]) -> TaskColumns:
+    """Lay out the task entries of a planning directory as columns."""
+    statuses: dict[str, str] = {}
+    rows: list[tuple] = []
+    for path in sorted(entries):
+        entry = entries[path]
+        if entry.clean_id is not None:
+            statuses[entry.clean_id] = entry.status
+        if entry.task_row is not None:
+            rows.append(entry.task_row)
+    return TaskColumns(rows, statuses, key)
+
+
+def _is_object_file(relative: str) -> bool:
+    """Check whether a path relative to the planning directory names an object file."""
+    return any(fnmatch.fnmatchcase(relative, pattern) for pattern in OBJECT_FILE_PATTERNS)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Make a timestamp comparable, reading naive timestamps as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _in_range(
+    rows: list[int], values: tuple[datetime, ...], after: datetime | None, before: datetime | None
+) -> list[int]:
+    """Keep the rows whose timestamp lies in [after, before)."""
+    if after is not None:
+        start = _as_utc(after)
+        rows = [row for row in rows if values[row] >= start]
+    if before is not None:
+        end = _as_utc(before)
+        rows = [row for row in rows if values[row] < end]
+    return rows
+
+
+def _group_value(value: Any) -> Any:
+    """Get the JSON value a grouped field is reported as."""
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+_backlog_index: BacklogIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_backlog_index() -> BacklogIndex:
+    """Get the process-wide backlog index.
+
+    Returns:
+        The shared BacklogIndex instance
+    """
+    global _backlog_index
+    if _backlog_index is None:
+        with _index_lock:
+            if _backlog_index is None:
+                _backlog_index = BacklogIndex()
+    return _backlog_index
@@ -0,0 +1,94 @@
+"""Synthetic planning trees, macro benchmarks and load tests for Trellis MCP.
+
+Provides a deterministic tree generator, a benchmark suite that measures
+cold/warm latency and file-open counts for the main tools with baseline
+comparison for regression checks, and a multi-agent load test that drives
+the real server over STDIO or HTTP.
+
+Public names are loaded lazily on first access, like the top-level package.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .load_test import (
+        LOAD_TEST_TRANSPORTS,
+        LoadTestReport,
+        check_tree_integrity,
+        format_load_test_reports,
+        load_test_shape,
+        run_load_test,
+    )
+    from .suite import (
+        BENCH_OPERATIONS,
+        DEFAULT_BENCH_SIZES,
+        BenchReport,
+        FileOpenCounter,
+        OperationResult,
+        Regression,
+        SizeResult,
+        compare_to_baseline,
+        format_bench_report,
+        run_benchmark_suite,
+    )
+    from .tree_generator import GeneratedTree, TreeShape, generate_tree
+
+__all__ = [
+    "BENCH_OPERATIONS",
+    "DEFAULT_BENCH_SIZES",
+    "BenchReport",
+    "FileOpenCounter",
+    "GeneratedTree",
+    "LOAD_TEST_TRANSPORTS",
+    "LoadTestReport",
+    "OperationResult",
+    "Regression",
+    "SizeResult",
+    "TreeShape",
+    "check_tree_integrity",
+    "compare_to_baseline",
+    "format_bench_report",
+    "format_load_test_reports",
+    "generate_tree",
+    "load_test_shape",
+    "run_benchmark_suite",
+    "run_load_test",
+]
+
+_LAZY_IMPORTS: dict[str, str] = {
+    "LOAD_TEST_TRANSPORTS": ".load_test",
+    "LoadTestReport": ".load_test",
+    "check_tree_integrity": ".load_test",
+    "format_load_test_reports": ".load_test",
+    "load_test_shape": ".load_test",
+    "run_load_test": ".load_test",
+    "BENCH_OPERATIONS": ".suite",
+    "DEFAULT_BENCH_SIZES": ".suite",
+    "BenchReport": ".suite",
+    "FileOpenCounter": ".suite",
+    "OperationResult": ".suite",
+    "Regression": ".suite",
+    "SizeResult": ".suite",
+    "compare_to_baseline": ".suite",
+    "format_bench_report": ".suite",
+    "run_benchmark_suite": ".suite",
+    "GeneratedTree": ".tree_generator",
+    "TreeShape": ".tree_generator",
+    "generate_tree": ".tree_generator",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names from their submodule on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Include lazily loaded names in dir()."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,478 @@
+"""Protocol-level multi-agent load test for Trellis MCP.
+
+Starts the real server (one STDIO server process per agent, or one shared
+``serve --http`` process) and runs K agent processes concurrently against a
+generated planning tree. Each agent loops claim -> update -> complete through
+an MCP client. The report covers throughput, per-tool latency percentiles,
+duplicate claims and file-integrity violations found in the tree afterwards.
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, TypedDict
+
+from ..choices import LOAD_TEST_TRANSPORTS, LoadTestTransport
+from ..done_tasks import tasks_dir_of
+from .tree_generator import TreeShape, generate_tree
+
+AGENT_OPERATIONS: tuple[str, ...] = ("claimNextTask", "updateObject", "completeTask")
+
+
+class LatencyPercentiles(TypedDict):
+    """Type definition for per-tool latency statistics."""
+
+    count: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class AgentResult(TypedDict):
+    """Type definition for one agent process's raw results."""
+
+    agent: int
+    latencies_ms: dict[str, list[float]]
+    errors: dict[str, int]
+    error_samples: list[str]
+    claimed: list[str]
+    completed: list[str]
+    exhausted: bool
+
+
+class LoadTestReport(TypedDict):
+    """Type definition for a load test run."""
+
+    transport: str
+    agents: int
+    iterations: int
+    cpu_count: int
+    objects: int
+    open_tasks: int
+    duration_seconds: float
+    completed_tasks: int
+    throughput_tasks_per_second: float
+    throughput_calls_per_second: float
+    operations: dict[str, LatencyPercentiles]
+    duplicate_claims: int
+    duplicate_claim_ids: list[str]
+    integrity_violations: list[str]
+    error_samples: list[str]
+
+
+def load_test_shape(objects: int = 100, seed: int = 0) -> TreeShape:
+    """Build a small tree shape suitable for contention testing.
+
+    Every claim scans the whole tree, so load tests use trees of a few hundred
+    objects at most with mostly open, lightly connected tasks.
+
+    Args:
+        objects: Approximate number of objects
+        seed: Random seed
+
+    Returns:
+        TreeShape with one project, two epics and ~10% standalone tasks
+    """
+    if objects <= 0:
+        raise ValueError("Object count must be positive")
+    standalone = objects // 10
+    features_per_epic = max(1, round((objects - standalone - 3) / 2 / 11))
+    return TreeShape(
+        projects=1,
+        epics_per_project=2,
+        features_per_epic=features_per_epic,
+        tasks_per_feature=10,
+        standalone_tasks=standalone,
+        prereq_density=0.2,
+        body_bytes=200,
+        done_ratio=0.2,
+        in_progress_ratio=0.0,
+        seed=seed,
+    )
+
+
+def _percentiles(values: list[float], errors: int) -> LatencyPercentiles:
+    """Compute nearest-rank percentiles of raw latencies."""
+    ordered = sorted(values)
+
+    def rank(quantile: float) -> float:
+        if not ordered:
+            return 0.0
+        index = max(0, math.ceil(quantile * len(ordered)) - 1)
+        return round(ordered[index], 2)
+
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "p50_ms": rank(0.50),
+        "p95_ms": rank(0.95),
+        "p99_ms": rank(0.99),
+        "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+    }
+
+
+def _server_command(*args: str) -> list[str]:
+    """Command line that runs the Trellis MCP CLI with the current interpreter."""
+    return [sys.executable, "-m", "trellis_mcp", *args]
+
+
+def _server_env(log_dir: Path) -> dict[str, str]:
+    """Environment for spawned servers.
+
+    Keeps their logs out of the caller's log directory and silences FastMCP's
+    console logging, which STDIO servers would otherwise send to our stderr.
+    """
+    env = dict(os.environ)
+    env["MCP_LOG_DIR"] = str(log_dir)
+    env["FASTMCP_LOG_LEVEL"] = "CRITICAL"
+    return env
+
+
+def _free_port() -> int:
+    """Pick an unused local TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    """Block until the HTTP server accepts connections.
+
+    Raises:
+        RuntimeError: If the server exits or does not come up in time
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"HTTP server exited with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"HTTP server did not start listening on port {port} within {timeout}s")
+
+
+def _run_agent(config: dict[str, Any]) -> AgentResult:
+    """Process entry point for one simulated agent."""
+    return asyncio.run(_agent_main(config))
+
+
+async def _agent_main(config: dict[str, Any]) -> AgentResult:
+    """Connect to the server, wait for the common start time and run the agent loop."""
+    from fastmcp import Client
+    from fastmcp.client.transports import StdioTransport
+    from fastmcp.exceptions import ToolError
+
+    agent = config["agent"]
+    planning_root = config["planning_root"]
+    result: AgentResult = {
+        "agent": agent,
+        "latencies_ms": {operation: [] for operation in AGENT_OPERATIONS},
+        "errors": {operation: 0 for operation in AGENT_OPERATIONS},
+        "error_samples": [],
+        "claimed": [],
+        "completed": [],
+        "exhausted": False,
+    }
+
+    if config["transport"] == "http":
+        target: Any = config["url"]
+    else:
+        target = StdioTransport(
+            command=sys.executable,
+            args=["-m", "trellis_mcp", "serve"],
+            env=config["env"],
+            cwd=config["cwd"],
+        )
+
+    async def call(operation: str, arguments: dict[str, Any]) -> dict[str, Any] | None:
+        start = time.perf_counter()
+        try:
+            response = await client.call_tool(operation, arguments)
+            return response.structured_content or {}
+        except ToolError as e:
+            message = str(e)
+            if operation == "claimNextTask" and "No " in message and "task" in message:
+                result["exhausted"] = True
+                return None
+            result["errors"][operation] += 1
+            if len(result["error_samples"]) < 5:
+                result["error_samples"].append(f"agent {agent} {operation}: {message}")
+            return None
+        finally:
+            result["latencies_ms"][operation].append((time.perf_counter() - start) * 1000)
+
+    async with Client(target, timeout=config["call_timeout"]) as client:
+        await asyncio.sleep(max(0.0, config["start_at"] - time.time()))
+
+        for _ in range(config["iterations"]):
+            claimed = await call(
+                "claimNextTask", {"projectRoot": planning_root, "worktree": f"agent-{agent}"}
+            )
+            if claimed is None:
+                if result["exhausted"]:
+                    break
+                continue
+            task = claimed.get("task", {})
+            task_id = task.get("id") if isinstance(task, dict) else None
+            if not task_id:
+                continue
+            result["claimed"].append(task_id)
+
+            await call(
+                "updateObject",
+                {"id": task_id, "projectRoot": planning_root, "yamlPatch": {"status": "review"}},
+            )
+            completed = await call(
+                "completeTask",
+                {
+                    "projectRoot": planning_root,
+                    "taskId": task_id,
+                    "summary": f"Completed by load-test agent {agent}",
+                },
+            )
+            if completed is not None:
+                result["completed"].append(task_id)
+
+    return result
+
+
+def check_tree_integrity(planning_root: str | Path) -> list[str]:
+    """Check a planning tree for corruption left by concurrent writers.
+
+    Looks for files that fail to parse, leftover atomic-write temp files, task
+    IDs stored in more than one file, and tasks whose status does not match
+    the tasks-open/tasks-done directory they live in.
+
+    Args:
+        planning_root: Planning directory to check
+
+    Returns:
+        List of human-readable violations, empty if the tree is intact
+    """
+    from ..object_parser import parse_object
+
+    root = Path(planning_root)
+    violations: list[str] = []
+    task_locations: dict[str, list[Path]] = {}
+
+    for path in sorted(root.rglob("*")):
+        if not path.is_file():
+            continue
+        relative = path.relative_to(root)
+        if path.name.endswith(".tmp"):
+            violations.append(f"Leftover temp file: {relative}")
+            continue
+        if path.suffix != ".md":
+            continue
+        try:
+            obj = parse_object(path)
+        except Exception as e:
+            violations.append(f"Unparseable file {relative}: {e}")
+            continue
+        if obj.kind != "task":
+            continue
+
+        task_locations.setdefault(obj.id, []).append(relative)
+        directory = tasks_dir_of(path).name
+        status = obj.status.value
+        if directory == "tasks-done" and status != "done":
+            violations.append(f"Task {obj.id} in tasks-done has status '{status}': {relative}")
+        elif directory == "tasks-open" and status == "done":
+            violations.append(f"Task {obj.id} in tasks-open has status 'done': {relative}")
+
+    for task_id, locations in sorted(task_locations.items()):
+        if len(locations) > 1:
+            violations.append(
+                f"Task {task_id} stored in {len(locations)} files: "
+                + ", ".join(str(location) for location in locations)
+            )
+
+    return violations
+
+
+def run_load_test(
+    agents: int = 4,
+    transport: LoadTestTransport = "stdio",
+    iterations: int = 5,
+    shape: TreeShape | None = None,
+    work_dir: str | Path | None = None,
+    call_timeout: float = 300.0,
+    connect_seconds: float = 15.0,
+) -> LoadTestReport:
+    """Run K concurrent agents against a real server and a fresh generated tree.
+
+    With the STDIO transport every agent spawns its own server process, as
+    separate MCP clients would; with HTTP all agents share one server started
+    with ``serve --http``. Agents run in separate processes and start their
+    loops at the same moment once all of them are connected.
+
+    Args:
+        agents: Number of concurrent agent processes
+        transport: 'stdio' or 'http'
+        iterations: Claim/update/complete cycles per agent (fewer if tasks run out)
+        shape: Tree shape (default: load_test_shape())
+        work_dir: Directory for the tree and server logs (temporary if omitted)
+        call_timeout: Per-call timeout in seconds
+        connect_seconds: Time allowed for all agents to start and connect before
+            the synchronized start; excluded from the measured duration
+
+    Returns:
+        Report with throughput, latency percentiles, duplicate claims and
+        integrity violations
+
+    Raises:
+        ValueError: If agents/iterations are not positive or the transport is unknown
+        RuntimeError: If the HTTP server cannot be started
+    """
+    if agents <= 0 or iterations <= 0:
+        raise ValueError("agents and iterations must be positive")
+    if transport not in LOAD_TEST_TRANSPORTS:
+        raise ValueError(
+            f"Invalid transport '{transport}'. Must be one of: {list(LOAD_TEST_TRANSPORTS)}"
+        )
+    shape = shape or load_test_shape()
+
+    temp_dir = None
+    if work_dir is None:
+        temp_dir = tempfile.TemporaryDirectory(prefix="trellis-loadtest-")
+        base_dir = Path(temp_dir.name)
+    else:
+        base_dir = Path(work_dir)
+
+    server: subprocess.Popen | None = None
+    try:
+        planning_root = base_dir / f"{transport}-{agents}" / "planning"
+        tree = generate_tree(planning_root, shape)
+        env = _server_env(base_dir / "logs")
+
+        url = None
+        if transport == "http":
+            port = _free_port()
+            server = subprocess.Popen(
+                _server_command("serve", "--http", f"127.0.0.1:{port}"),
+                env=env,
+                cwd=str(base_dir),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            _wait_for_port(port, server)
+            url = f"http://127.0.0.1:{port}/mcp/"
+
+        start_at = time.time() + connect_seconds
+        configs = [
+            {
+                "agent": agent,
+                "transport": transport,
+                "url": url,
+                "env": env,
+                "cwd": str(base_dir),
+                "planning_root": str(planning_root),
+                "iterations": iterations,
+                "start_at": start_at,
+                "call_timeout": call_timeout,
+            }
+            for agent in range(agents)
+        ]
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=agents, mp_context=context) as executor:
+            results = list(executor.map(_run_agent, configs))
+        duration = max(time.time() - start_at, 1e-9)
+
+        violations = check_tree_integrity(planning_root)
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    claims = Counter(task_id for result in results for task_id in result["claimed"])
+    duplicates = sorted(task_id for task_id, count in claims.items() if count > 1)
+    completed = sum(len(result["completed"]) for result in results)
+
+    operations: dict[str, LatencyPercentiles] = {}
+    total_calls = 0
+    for operation in AGENT_OPERATIONS:
+        latencies = [value for result in results for value in result["latencies_ms"][operation]]
+        errors = sum(result["errors"][operation] for result in results)
+        operations[operation] = _percentiles(latencies, errors)
+        total_calls += len(latencies)
+
+    return {
+        "transport": transport,
+        "agents": agents,
+        "iterations": iterations,
+        "cpu_count": os.cpu_count() or 1,
+        "objects": tree["total_objects"],
+        "open_tasks": len(tree["open_task_ids"]),
+        "duration_seconds": round(duration, 3),
+        "completed_tasks": completed,
+        "throughput_tasks_per_second": round(completed / duration, 3),
+        "throughput_calls_per_second": round(total_calls / duration, 3),
+        "operations": operations,
+        "duplicate_claims": sum(claims[task_id] - 1 for task_id in duplicates),
+        "duplicate_claim_ids": duplicates[:20],
+        "integrity_violations": violations,
+        "error_samples": [sample for result in results for sample in result["error_samples"]][:10],
+    }
+
+
+def format_load_test_reports(reports: list[LoadTestReport]) -> str:
+    """Render one or more load test runs as text, one block per run.
+
+    Args:
+        reports: Reports returned by run_load_test()
+
+    Returns:
+        Multi-line text summary
+    """
+    lines: list[str] = []
+    for report in reports:
+        lines.append(
+            f"{report['transport']} x {report['agents']} agents "
+            f"({report['objects']} objects, {report['open_tasks']} open tasks, "
+            f"{report['cpu_count']} CPUs)"
+        )
+        lines.append(
+            f"  {report['completed_tasks']} tasks completed in {report['duration_seconds']}s: "
+            f"{report['throughput_tasks_per_second']} tasks/s, "
+            f"{report['throughput_calls_per_second']} calls/s"
+        )
+        for operation, stats in report["operations"].items():
+            lines.append(
+                f"  {operation:<14} n={stats['count']:<5} errors={stats['errors']:<4} "
+                f"p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms "
+                f"p99={stats['p99_ms']}ms max={stats['max_ms']}ms"
+            )
+        lines.append(
+            f"  duplicate claims: {report['duplicate_claims']}"
+            + (
+                f" ({', '.join(report['duplicate_claim_ids'])})"
+                if report["duplicate_claims"]
+                else ""
+            )
+        )
+        lines.append(f"  integrity violations: {len(report['integrity_violations'])}")
+        for violation in report["integrity_violations"][:10]:
+            lines.append(f"    {violation}")
+        for sample in report["error_samples"]:
+            lines.append(f"  error: {sample}")
+        lines.append("")
+    return "\n".join(lines).rstrip("\n")
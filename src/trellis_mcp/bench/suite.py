@@ -0,0 +1,420 @@
+"""Macro benchmark suite for Trellis MCP tools.
+
+Generates synthetic planning trees of increasing size and measures cold and
+warm latency plus file-open counts for the main tools, calling them in-process
+exactly as the server would. Results can be saved as a baseline JSON file and
+later runs compared against it to catch regressions.
+"""
+
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, TypedDict
+
+from ..choices import BENCH_OPERATIONS, DEFAULT_BENCH_SIZES
+from ..settings import Settings
+from .tree_generator import GeneratedTree, TreeShape, generate_tree
+
+BENCH_REPORT_VERSION = 1
+
+
+class OperationResult(TypedDict):
+    """Type definition for one tool's measurements at one tree size."""
+
+    runs: int
+    errors: int
+    truncated: bool
+    cold_ms: float
+    warm_p50_ms: float
+    warm_mean_ms: float
+    warm_max_ms: float
+    cold_file_opens: int
+    warm_file_opens: float
+
+
+class SizeResult(TypedDict):
+    """Type definition for all measurements at one tree size."""
+
+    objects: int
+    generate_seconds: float
+    operations: dict[str, OperationResult]
+
+
+class BenchReport(TypedDict):
+    """Type definition for a benchmark suite run."""
+
+    version: int
+    created: str
+    python: str
+    platform: str
+    repeat: int
+    seed: int
+    sizes: dict[str, SizeResult]
+
+
+class Regression(TypedDict):
+    """Type definition for a metric that got worse than the baseline."""
+
+    size: str
+    operation: str
+    metric: str
+    baseline: float
+    current: float
+    change_percent: float
+
+
+class FileOpenCounter:
+    """Count file opens in this process while active.
+
+    Uses a process-wide audit hook (``sys.addaudithook``) on the ``open`` event,
+    which covers ``open()``, ``io.open`` and ``os.open``. Audit hooks cannot be
+    removed, so a single hook is installed on first use and only counts while
+    a counter is active.
+
+    Example:
+        >>> with FileOpenCounter() as counter:
+        ...     Path("planning/projects/P-p0001/project.md").read_text()
+        >>> counter.count
+        1
+    """
+
+    _active: list["FileOpenCounter"] = []
+    _hook_installed = False
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self) -> "FileOpenCounter":
+        if not FileOpenCounter._hook_installed:
+            sys.addaudithook(_count_open_event)
+            FileOpenCounter._hook_installed = True
+        FileOpenCounter._active.append(self)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        FileOpenCounter._active.remove(self)
+
+
+def _count_open_event(event: str, args: tuple[Any, ...]) -> None:
+    """Audit hook that feeds active FileOpenCounter instances."""
+    if event == "open" and FileOpenCounter._active:
+        for counter in FileOpenCounter._active:
+            counter.count += 1
+
+
+def _clear_caches() -> None:
+    """Drop all in-process caches so the next call runs cold."""
+    from ..children.cache import clear_children_cache
+    from ..inference.cache import clear_inference_cache
+    from ..parse_cache import clear_parse_cache
+    from ..validation.cache import clear_dependency_cache
+
+    clear_parse_cache()
+    clear_inference_cache()
+    clear_children_cache()
+    clear_dependency_cache()
+
+
+ArgumentFactory = Callable[[GeneratedTree, int], dict[str, Any] | None]
+
+
+def _operation_arguments(operation: str) -> ArgumentFactory:
+    """Get the factory that builds arguments for the Nth call of an operation.
+
+    Mutating operations target a different object on every call so each call
+    does real work. Factories return None when the tree has run out of targets.
+    """
+
+    def pick(ids: list[str], index: int) -> str | None:
+        return ids[index] if index < len(ids) else None
+
+    def get_object(tree: GeneratedTree, index: int) -> dict[str, Any] | None:
+        ids = tree["open_task_ids"] + tree["done_task_ids"]
+        return {"id": ids[(index * 7919) % len(ids)]} if ids else None
+
+    def update_object(tree: GeneratedTree, index: int) -> dict[str, Any] | None:
+        task_id = pick(tree["open_task_ids"][::-1], index)
+        return {"id": task_id, "yamlPatch": {"priority": "high"}} if task_id else None
+
+    def create_object(tree: GeneratedTree, index: int) -> dict[str, Any] | None:
+        features = tree["feature_ids"]
+        return {
+            "kind": "task",
+            "title": f"Benchmark created task {index}",
+            "parent": features[index % len(features)] if features else "",
+        }
+
+    def complete_task(tree: GeneratedTree, index: int) -> dict[str, Any] | None:
+        task_id = pick(tree["in_progress_task_ids"], index)
+        return {"taskId": task_id, "summary": "Completed by benchmark"} if task_id else None
+
+    factories: dict[str, ArgumentFactory] = {
+        "getObject": get_object,
+        "listBacklog": lambda tree, index: {"status": "open"},
+        "updateObject": update_object,
+        "createObject": create_object,
+        "claimNextTask": lambda tree, index: {},
+        "completeTask": complete_task,
+    }
+    return factories[operation]
+
+
+async def _measure_operation(
+    tool: Any, operation: str, tree: GeneratedTree, repeat: int, max_seconds: float | None
+) -> OperationResult:
+    """Run one cold call followed by up to `repeat` warm calls of a tool."""
+    factory = _operation_arguments(operation)
+    durations: list[float] = []
+    opens: list[int] = []
+    errors = 0
+    truncated = False
+
+    for index in range(repeat + 1):
+        if max_seconds is not None and sum(durations) / 1000 >= max_seconds:
+            truncated = True
+            break
+        arguments = factory(tree, index)
+        if arguments is None:
+            truncated = True
+            break
+        arguments["projectRoot"] = tree["planning_root"]
+
+        if index == 0:
+            _clear_caches()
+        with FileOpenCounter() as counter:
+            start = time.perf_counter()
+            try:
+                await tool.run(arguments)
+            except Exception:
+                errors += 1
+            durations.append((time.perf_counter() - start) * 1000)
+        opens.append(counter.count)
+
+    warm = durations[1:] or durations
+    warm_opens = opens[1:] or opens
+    return {
+        "runs": len(durations),
+        "errors": errors,
+        "truncated": truncated,
+        "cold_ms": round(durations[0], 3) if durations else 0.0,
+        "warm_p50_ms": round(statistics.median(warm), 3) if warm else 0.0,
+        "warm_mean_ms": round(statistics.fmean(warm), 3) if warm else 0.0,
+        "warm_max_ms": round(max(warm), 3) if warm else 0.0,
+        "cold_file_opens": opens[0] if opens else 0,
+        "warm_file_opens": round(statistics.fmean(warm_opens), 2) if warm_opens else 0.0,
+    }
+
+
+async def run_benchmark_suite(
+    settings: Settings,
+    sizes: tuple[int, ...] | list[int] = DEFAULT_BENCH_SIZES,
+    operations: tuple[str, ...] | list[str] = BENCH_OPERATIONS,
+    repeat: int = 5,
+    seed: int = 0,
+    work_dir: str | Path | None = None,
+    max_seconds: float | None = 60.0,
+    progress: Callable[[str], None] | None = None,
+) -> BenchReport:
+    """Benchmark tools against synthetic trees of each size.
+
+    For every size a fresh tree is generated, then each operation is called
+    once right after clearing the in-process caches (cold) and `repeat` more
+    times (warm). Operations run in the given order against the same tree, so
+    mutating operations see the changes made by earlier ones. The OS page
+    cache is not dropped, so "cold" means cold application caches only.
+
+    Args:
+        settings: Settings used to configure the tools
+        sizes: Approximate object counts of the trees to generate
+        operations: Tool names to benchmark (subset of BENCH_OPERATIONS)
+        repeat: Number of warm calls per operation
+        seed: Seed for tree generation
+        work_dir: Directory to keep generated trees in (a temporary directory
+            is used and removed when omitted)
+        max_seconds: Per-operation time budget; once exceeded, the remaining
+            warm calls are skipped and the result is marked truncated. A single
+            call is never interrupted. None disables the budget.
+        progress: Optional callback receiving progress messages
+
+    Returns:
+        Report with per-size, per-operation measurements
+
+    Raises:
+        ValueError: If an operation is unknown or repeat/sizes are not positive
+    """
+    from ..profiling import get_profileable_tools
+
+    unknown = [operation for operation in operations if operation not in BENCH_OPERATIONS]
+    if unknown:
+        raise ValueError(f"Unknown operations {unknown}. Must be among: {list(BENCH_OPERATIONS)}")
+    if repeat <= 0:
+        raise ValueError("repeat must be positive")
+    if not sizes or any(size <= 0 for size in sizes):
+        raise ValueError("sizes must be positive object counts")
+
+    tools = get_profileable_tools(settings)
+    report: BenchReport = {
+        "version": BENCH_REPORT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "seed": seed,
+        "sizes": {},
+    }
+
+    temp_dir = None
+    if work_dir is None:
+        temp_dir = tempfile.TemporaryDirectory(prefix="trellis-bench-")
+        base_dir = Path(temp_dir.name)
+    else:
+        base_dir = Path(work_dir)
+
+    try:
+        for size in sizes:
+            shape = TreeShape.for_object_count(size, seed=seed)
+            planning_root = base_dir / f"size-{size}" / "planning"
+            if progress:
+                progress(f"Generating {shape.total_objects} objects in {planning_root}")
+            start = time.perf_counter()
+            tree = generate_tree(planning_root, shape)
+            generate_seconds = round(time.perf_counter() - start, 3)
+
+            results: dict[str, OperationResult] = {}
+            for operation in operations:
+                if progress:
+                    progress(f"  {operation} @ {size}")
+                results[operation] = await _measure_operation(
+                    tools[operation], operation, tree, repeat, max_seconds
+                )
+
+            report["sizes"][str(size)] = {
+                "objects": tree["total_objects"],
+                "generate_seconds": generate_seconds,
+                "operations": results,
+            }
+    finally:
+        _clear_caches()
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    return report
+
+
+# Metrics compared against a baseline; file-open counts are deterministic so
+# they use an absolute threshold instead of the latency tolerance
+_LATENCY_METRICS = ("cold_ms", "warm_p50_ms")
+_OPEN_METRICS = ("cold_file_opens", "warm_file_opens")
+
+
+def compare_to_baseline(
+    report: BenchReport,
+    baseline: dict[str, Any],
+    tolerance: float = 0.25,
+    min_delta_ms: float = 1.0,
+) -> list[Regression]:
+    """Find metrics that regressed relative to a saved baseline.
+
+    Latency regresses when it exceeds the baseline by more than `tolerance`
+    (relative) and `min_delta_ms` (absolute). File opens regress on any
+    increase of at least one open. Sizes and operations missing from either
+    report are skipped.
+
+    Args:
+        report: Current benchmark report
+        baseline: Previously saved report (parsed JSON)
+        tolerance: Allowed relative latency increase (0.25 = 25%)
+        min_delta_ms: Latency increases smaller than this are ignored as noise
+
+    Returns:
+        List of regressions, empty if the run is within tolerance
+    """
+    regressions: list[Regression] = []
+    baseline_sizes: dict[str, Any] = baseline.get("sizes", {})
+
+    for size, size_result in report["sizes"].items():
+        baseline_ops: dict[str, Any] = baseline_sizes.get(size, {}).get("operations", {})
+        for operation, current in size_result["operations"].items():
+            previous = baseline_ops.get(operation)
+            if previous is None:
+                continue
+            for metric in _LATENCY_METRICS + _OPEN_METRICS:
+                if metric not in previous:
+                    continue
+                old = float(previous[metric])
+                new = float(current[metric])
+                if metric in _LATENCY_METRICS:
+                    regressed = new > old * (1 + tolerance) and new - old >= min_delta_ms
+                else:
+                    regressed = new - old >= 1
+                if regressed:
+                    change = ((new - old) / old * 100) if old else float("inf")
+                    regressions.append(
+                        {
+                            "size": size,
+                            "operation": operation,
+                            "metric": metric,
+                            "baseline": old,
+                            "current": new,
+                            "change_percent": round(change, 1),
+                        }
+                    )
+    return regressions
+
+
+def format_bench_report(report: BenchReport, regressions: list[Regression] | None = None) -> str:
+    """Render a benchmark report as a human-readable table.
+
+    Args:
+        report: Report returned by run_benchmark_suite()
+        regressions: Optional regressions returned by compare_to_baseline()
+
+    Returns:
+        Multi-line text with one table per tree size
+    """
+    lines: list[str] = []
+    header = (
+        f"{'operation':<14} {'cold ms':>10} {'warm p50':>10} {'warm max':>10} "
+        f"{'opens cold':>10} {'opens warm':>10} {'runs':>5} {'errors':>6}"
+    )
+    for size, size_result in report["sizes"].items():
+        lines.append(
+            f"Size {size} ({size_result['objects']} objects, "
+            f"generated in {size_result['generate_seconds']}s)"
+        )
+        lines.append(header)
+        for operation, result in size_result["operations"].items():
+            lines.append(
+                f"{operation:<14} {result['cold_ms']:>10.2f} {result['warm_p50_ms']:>10.2f} "
+                f"{result['warm_max_ms']:>10.2f} {result['cold_file_opens']:>10d} "
+                f"{result['warm_file_opens']:>10.1f} "
+                f"{str(result['runs']) + ('*' if result['truncated'] else ''):>5} "
+                f"{result['errors']:>6d}"
+            )
+        lines.append("")
+
+    if any(
+        result["truncated"]
+        for size_result in report["sizes"].values()
+        for result in size_result["operations"].values()
+    ):
+        lines.append("* fewer runs than requested (time budget or targets exhausted)")
+        lines.append("")
+
+    if regressions is not None:
+        if regressions:
+            lines.append(f"{len(regressions)} regression(s) against baseline:")
+            for regression in regressions:
+                lines.append(
+                    f"  size {regression['size']} {regression['operation']} "
+                    f"{regression['metric']}: {regression['baseline']:g} -> "
+                    f"{regression['current']:g} ({regression['change_percent']:+.1f}%)"
+                )
+        else:
+            lines.append("No regressions against baseline.")
+
+    return "\n".join(lines).rstrip("\n")
@@ -0,0 +1,297 @@
+"""Deterministic synthetic planning-tree generator.
+
+Builds planning trees of a chosen shape (projects, epics, features, tasks,
+standalone tasks, prerequisite density, body size and done ratio) directly on
+disk in the same format the server writes. The same shape and seed always
+produce byte-identical trees, so benchmark runs are comparable across machines
+and commits.
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TypedDict
+
+import yaml
+
+# Fixed origin for generated timestamps so output does not depend on the clock
+_BASE_TIMESTAMP = datetime(2025, 1, 1, 9, 0, 0)
+
+_PRIORITIES = ("high", "normal", "low")
+_PRIORITY_WEIGHTS = (2, 5, 3)
+
+_BODY_WORDS = (
+    "implement validate refactor endpoint schema migration cache index request "
+    "response handler parser config token session queue worker retry timeout "
+    "latency storage backend client server module feature review deploy test"
+).split()
+
+# Objects per project with the default fan-out (1 + 4 + 4*5 + 4*5*10)
+_OBJECTS_PER_PROJECT = 225
+
+
+@dataclass(frozen=True)
+class TreeShape:
+    """Shape parameters for a synthetic planning tree.
+
+    Attributes:
+        projects: Number of projects
+        epics_per_project: Epics under each project
+        features_per_epic: Features under each epic
+        tasks_per_feature: Tasks under each feature
+        standalone_tasks: Tasks without a parent feature
+        prereq_density: Probability (0.0-1.0) that a task has prerequisites
+        body_bytes: Approximate size of each object's markdown body
+        done_ratio: Fraction of tasks that are completed (in tasks-done)
+        in_progress_ratio: Fraction of tasks that are in progress
+        seed: Random seed; the same shape and seed yield the same tree
+    """
+
+    projects: int = 4
+    epics_per_project: int = 4
+    features_per_epic: int = 5
+    tasks_per_feature: int = 10
+    standalone_tasks: int = 50
+    prereq_density: float = 0.3
+    body_bytes: int = 400
+    done_ratio: float = 0.5
+    in_progress_ratio: float = 0.05
+    seed: int = 0
+
+    def __post_init__(self):
+        """Validate shape parameters."""
+        counts = (
+            self.projects,
+            self.epics_per_project,
+            self.features_per_epic,
+            self.tasks_per_feature,
+            self.standalone_tasks,
+            self.body_bytes,
+        )
+        if any(count < 0 for count in counts):
+            raise ValueError("Tree shape counts must not be negative")
+        for name in ("prereq_density", "done_ratio", "in_progress_ratio"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0.0 and 1.0")
+        if self.done_ratio + self.in_progress_ratio > 1.0:
+            raise ValueError("done_ratio + in_progress_ratio must not exceed 1.0")
+
+    @property
+    def total_objects(self) -> int:
+        """Total number of objects the shape produces."""
+        epics = self.projects * self.epics_per_project
+        features = epics * self.features_per_epic
+        tasks = features * self.tasks_per_feature
+        return self.projects + epics + features + tasks + self.standalone_tasks
+
+    @classmethod
+    def for_object_count(cls, objects: int, seed: int = 0) -> "TreeShape":
+        """Build a default-shaped tree with roughly the given number of objects.
+
+        Keeps the default fan-out (4 epics, 5 features, 10 tasks) and puts about
+        5% of objects in standalone tasks, scaling the number of projects.
+
+        Args:
+            objects: Target number of objects (e.g. 1000, 10000, 100000)
+            seed: Random seed
+
+        Returns:
+            TreeShape whose total_objects is close to the target
+        """
+        if objects <= 0:
+            raise ValueError("Object count must be positive")
+        standalone = objects // 20
+        projects = max(1, round((objects - standalone) / _OBJECTS_PER_PROJECT))
+        return cls(projects=projects, standalone_tasks=standalone, seed=seed)
+
+
+class GeneratedTree(TypedDict):
+    """Type definition for a generated tree summary."""
+
+    planning_root: str
+    total_objects: int
+    counts: dict[str, int]
+    feature_ids: list[str]
+    open_task_ids: list[str]
+    in_progress_task_ids: list[str]
+    done_task_ids: list[str]
+
+
+def generate_tree(planning_root: str | Path, shape: TreeShape) -> GeneratedTree:
+    """Write a synthetic planning tree to disk.
+
+    Prerequisites only point at earlier tasks in the same feature (or earlier
+    standalone tasks), so the graph is acyclic. Done tasks only depend on done
+    tasks and in-progress tasks only on done tasks, so the tree is consistent
+    and every in-progress task can be completed.
+
+    Args:
+        planning_root: Planning directory to populate (created if missing)
+        shape: Shape of the tree
+
+    Returns:
+        Summary with object counts and the IDs benchmarks need as targets
+
+    Example:
+        >>> tree = generate_tree("/tmp/bench/planning", TreeShape.for_object_count(1000))
+        >>> tree["counts"]["project"]
+        4
+    """
+    root = Path(planning_root)
+    rng = random.Random(shape.seed)
+    filler = _filler_text(rng, shape.body_bytes)
+    writer = _TreeWriter(root, rng, shape, filler)
+
+    tree: GeneratedTree = {
+        "planning_root": str(root),
+        "total_objects": shape.total_objects,
+        "counts": {"project": 0, "epic": 0, "feature": 0, "task": 0},
+        "feature_ids": [],
+        "open_task_ids": [],
+        "in_progress_task_ids": [],
+        "done_task_ids": [],
+    }
+
+    task_number = 0
+    feature_number = 0
+    epic_number = 0
+    for p in range(1, shape.projects + 1):
+        project_id = f"p{p:04d}"
+        project_dir = root / "projects" / f"P-{project_id}"
+        writer.write(project_dir / "project.md", "project", project_id, None, "in-progress")
+        tree["counts"]["project"] += 1
+
+        for _ in range(shape.epics_per_project):
+            epic_number += 1
+            epic_id = f"e{epic_number:05d}"
+            epic_dir = project_dir / "epics" / f"E-{epic_id}"
+            writer.write(epic_dir / "epic.md", "epic", epic_id, f"P-{project_id}", "in-progress")
+            tree["counts"]["epic"] += 1
+
+            for _ in range(shape.features_per_epic):
+                feature_number += 1
+                feature_id = f"f{feature_number:06d}"
+                feature_dir = epic_dir / "features" / f"F-{feature_id}"
+                writer.write(
+                    feature_dir / "feature.md", "feature", feature_id, f"E-{epic_id}", "in-progress"
+                )
+                tree["counts"]["feature"] += 1
+                tree["feature_ids"].append(f"F-{feature_id}")
+
+                task_ids = [
+                    f"t{number:07d}"
+                    for number in range(task_number + 1, task_number + shape.tasks_per_feature + 1)
+                ]
+                task_number += shape.tasks_per_feature
+                writer.write_tasks(feature_dir, task_ids, f"F-{feature_id}", tree)
+
+    standalone_ids = [f"s{number:06d}" for number in range(1, shape.standalone_tasks + 1)]
+    writer.write_tasks(root, standalone_ids, None, tree)
+
+    return tree
+
+
+class _TreeWriter:
+    """Writes objects for generate_tree() using a shared random stream."""
+
+    def __init__(self, root: Path, rng: random.Random, shape: TreeShape, filler: str):
+        self.root = root
+        self.rng = rng
+        self.shape = shape
+        self.filler = filler
+        self.sequence = 0
+
+    def write(
+        self,
+        path: Path,
+        kind: str,
+        obj_id: str,
+        parent: str | None,
+        status: str,
+        prerequisites: list[str] | None = None,
+    ) -> datetime:
+        """Write one object file and return its creation timestamp."""
+        self.sequence += 1
+        created = _BASE_TIMESTAMP + timedelta(seconds=self.sequence)
+        prefix = {"project": "P", "epic": "E", "feature": "F", "task": "T"}[kind]
+
+        front_matter: dict[str, object] = {"kind": kind, "id": f"{prefix}-{obj_id}"}
+        if parent is not None or kind != "task":
+            front_matter["parent"] = parent
+        front_matter.update(
+            {
+                "status": status,
+                "title": f"Synthetic {kind} {obj_id}",
+                "priority": self.rng.choices(_PRIORITIES, _PRIORITY_WEIGHTS)[0],
+                "prerequisites": prerequisites or [],
+                "created": created.isoformat(),
+                "updated": created.isoformat(),
+                "schema_version": "1.1",
+            }
+        )
+
+        body = ""
+        if self.filler:
+            start = self.rng.randrange(len(self.filler) // 2)
+            body = self.filler[start : start + self.shape.body_bytes].strip() + "\n"
+
+        yaml_content = yaml.safe_dump(
+            front_matter, default_flow_style=False, sort_keys=False, allow_unicode=True
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"---\n{yaml_content}---\n{body}", encoding="utf-8")
+        return created
+
+    def write_tasks(
+        self, task_root: Path, task_ids: list[str], parent: str | None, tree: GeneratedTree
+    ) -> None:
+        """Write a group of sibling tasks with acyclic, status-consistent prerequisites."""
+        shape = self.shape
+        done: list[str] = []
+        earlier: list[str] = []
+        for obj_id in task_ids:
+            full_id = f"T-{obj_id}"
+            roll = self.rng.random()
+            if roll < shape.done_ratio:
+                status = "done"
+                candidates = done
+            elif roll < shape.done_ratio + shape.in_progress_ratio:
+                status = "in-progress"
+                candidates = done
+            else:
+                status = "open"
+                candidates = earlier
+
+            prerequisites: list[str] = []
+            if candidates and self.rng.random() < shape.prereq_density:
+                count = min(len(candidates), self.rng.randint(1, 2))
+                prerequisites = sorted(self.rng.sample(candidates, count))
+
+            if status == "done":
+                created = _BASE_TIMESTAMP + timedelta(seconds=self.sequence + 1)
+                filename = f"{created.strftime('%Y%m%d_%H%M%S')}-{full_id}.md"
+                path = task_root / "tasks-done" / filename
+                done.append(full_id)
+                tree["done_task_ids"].append(full_id)
+            else:
+                path = task_root / "tasks-open" / f"{full_id}.md"
+                key = "in_progress_task_ids" if status == "in-progress" else "open_task_ids"
+                tree[key].append(full_id)
+
+            self.write(path, "task", obj_id, parent, status, prerequisites)
+            earlier.append(full_id)
+            tree["counts"]["task"] += 1
+
+
+def _filler_text(rng: random.Random, body_bytes: int) -> str:
+    """Build a pool of filler text that bodies are sliced from."""
+    if body_bytes <= 0:
+        return ""
+    words: list[str] = []
+    length = 0
+    while length < body_bytes * 4:
+        word = rng.choice(_BODY_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
@@ -0,0 +1,242 @@
+"""Background cache warm-up for the Trellis MCP server.
+
+Pre-walks the configured planning root on a daemon thread so the first
+requests after startup do not pay for parsing the whole tree. The walk fills
+the parse cache (every object file), the children cache (one entry per
+project, epic and feature), the dependency graph cache, the backlog index and
+the ID index.
+
+Warm-up never blocks request handling: every cache validates entries against
+the filesystem, so calls that arrive before warm-up finishes are served from
+disk and simply see fewer cache hits.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Literal, TypedDict, cast
+
+from .logging.logger import write_event
+from .settings import Settings
+
+WarmupState = Literal["pending", "running", "ready", "failed", "cancelled"]
+
+
+class CacheWarmupStatus(TypedDict):
+    """Type definition for cache warm-up status reported by health checks."""
+
+    state: WarmupState
+    ready: bool
+    planning_root: str
+    objects: int
+    children_indexed: int
+    duration_ms: float | None
+    error: str | None
+
+
+class _WarmupCancelled(Exception):
+    """Raised inside the warm-up thread when cancellation was requested."""
+
+
+def warmup_planning_dir(planning_root: str | Path) -> Path:
+    """Resolve the planning directory the tools use for a configured root.
+
+    Mirrors ``resolve_project_roots(..., ensure_planning_subdir=True)`` without
+    creating directories, and returns an absolute path so cache keys match
+    the ones produced by request handling.
+
+    Args:
+        planning_root: Configured planning root (the planning dir or its parent)
+
+    Returns:
+        Absolute path of the planning directory
+    """
+    root = Path(os.path.abspath(planning_root))
+    return root if root.name == "planning" else root / "planning"
+
+
+class CacheWarmup:
+    """Fill the in-process caches for one planning root on a background thread.
+
+    Example:
+        >>> warmup = CacheWarmup(settings)
+        >>> warmup.start()
+        >>> warmup.wait(timeout=30)
+        True
+        >>> warmup.status()["state"]
+        'ready'
+    """
+
+    def __init__(self, settings: Settings):
+        """Initialize warm-up for the settings' planning root.
+
+        Args:
+            settings: Server configuration; ``planning_root`` is walked
+        """
+        self.settings = settings
+        self.planning_dir = warmup_planning_dir(settings.planning_root)
+
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._cancel = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self._state: WarmupState = "pending"
+        self._objects = 0
+        self._children_indexed = 0
+        self._started_at: float | None = None
+        self._duration_ms: float | None = None
+        self._error: str | None = None
+
+    def start(self) -> "CacheWarmup":
+        """Start the warm-up thread (no-op if already started).
+
+        Returns:
+            This instance, for chaining
+        """
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._state = "running"
+            self._started_at = time.perf_counter()
+            self._thread = threading.Thread(
+                target=self._run, name="trellis-cache-warmup", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        """Ask the warm-up thread to stop before its next step."""
+        self._cancel.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until warm-up finishes, fails or is cancelled.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if warm-up has finished, False on timeout
+        """
+        return self._done.wait(timeout)
+
+    @property
+    def ready(self) -> bool:
+        """Whether all caches have been filled."""
+        return self._state == "ready"
+
+    def status(self) -> CacheWarmupStatus:
+        """Get a snapshot of warm-up progress.
+
+        Returns:
+            Dictionary with state, readiness, counts, duration and error
+        """
+        with self._lock:
+            duration_ms = self._duration_ms
+            if duration_ms is None and self._started_at is not None:
+                duration_ms = (time.perf_counter() - self._started_at) * 1000
+            return {
+                "state": self._state,
+                "ready": self._state == "ready",
+                "planning_root": str(self.planning_dir),
+                "objects": self._objects,
+                "children_indexed": self._children_indexed,
+                "duration_ms": round(duration_ms, 3) if duration_ms is not None else None,
+                "error": self._error,
+            }
+
+    def _run(self) -> None:
+        """Thread body: warm every cache and record the outcome."""
+        state: WarmupState = "ready"
+        error: str | None = None
+        try:
+            self._warm()
+        except _WarmupCancelled:
+            state = "cancelled"
+        except Exception as e:
+            state = "failed"
+            error = str(e)
+
+        with self._lock:
+            self._state = state
+            self._error = error
+            if self._started_at is not None:
+                self._duration_ms = (time.perf_counter() - self._started_at) * 1000
+
+        try:
+            status = self.status()
+            level = "ERROR" if state == "failed" else "INFO"
+            fields: dict[str, Any] = {k: v for k, v in status.items() if k != "ready"}
+            write_event(level, f"Cache warm-up {state}", settings=self.settings, **fields)
+        except Exception:
+            # Logging failures must not hide the warm-up outcome
+            pass
+        finally:
+            self._done.set()
+
+    def _check_cancelled(self) -> None:
+        """Stop the walk if cancellation was requested."""
+        if self._cancel.is_set():
+            raise _WarmupCancelled()
+
+    def _warm(self) -> None:
+        """Walk the planning tree and fill the parse, children and graph caches."""
+        from .backlog_index import get_backlog_index
+        from .id_index import get_id_index
+        from .parse_cache import FileFingerprint
+        from .path_resolver import discover_immediate_children
+        from .validation.cache import _graph_cache
+        from .validation.graph_operations import build_prerequisites_graph
+        from .validation.object_loader import get_all_objects
+
+        if not self.planning_dir.is_dir():
+            # Nothing to warm yet; the first write creates the tree
+            return
+
+        # Parsing every object fills the parse cache; the result feeds the graph cache
+        generation = _graph_cache.generation
+        objects, file_fingerprints = cast(
+            tuple[dict[str, dict[str, Any]], dict[str, FileFingerprint]],
+            get_all_objects(self.planning_dir, include_mtimes=True),
+        )
+        with self._lock:
+            self._objects = len(objects)
+        self._check_cancelled()
+
+        graph = build_prerequisites_graph(objects)
+        _graph_cache.cache_graph(
+            self.planning_dir, graph, file_fingerprints, trusted_generation=generation
+        )
+
+        # Children lookups for every container object fill the children cache
+        for obj_id, obj in objects.items():
+            self._check_cancelled()
+            kind = obj.get("kind")
+            kind = getattr(kind, "value", kind)
+            if kind not in ("project", "epic", "feature"):
+                continue
+            try:
+                discover_immediate_children(kind, obj_id, self.planning_dir)
+            except Exception:
+                # A broken parent only loses its cache entry
+                continue
+            with self._lock:
+                self._children_indexed += 1
+
+        # Task columns built from the parse cache serve the first listBacklog query
+        self._check_cancelled()
+        get_backlog_index().columns(self.planning_dir)
+        get_id_index().tries(self.planning_dir)
+
+
+def start_cache_warmup(settings: Settings) -> CacheWarmup:
+    """Start warming the caches for the configured planning root.
+
+    Args:
+        settings: Server configuration settings
+
+    Returns:
+        The running CacheWarmup instance
+    """
+    return CacheWarmup(settings).start()
@@ -0,0 +1,544 @@
+"""Change feed with generation numbers for delta sync.
+
+Every mutation of a planning object (create, update, complete, cascade
+delete) is recorded as a change entry carrying a monotonically increasing
+generation number. Entries are appended to a persisted journal under the
+planning directory (``.trellis/changes.jsonl``) and kept in an in-memory
+ring, so clients can ask for "everything since generation N" instead of
+re-listing the whole backlog.
+
+The journal is shared by every process that writes to the planning root
+(servers and the CLI). Appends happen under an exclusive lock on a separate
+lock file (the journal itself is replaced when it is trimmed), and each
+process picks up entries written by others by reading the journal tail
+whenever its size changes. Asking "has anything changed?" when nothing has
+costs a single ``stat`` call.
+
+The journal doubles as the generation stamp: every append grows it and
+every trim replaces it, so other processes compare its inode and size with
+a single ``stat`` to learn whether anything was written since they last
+looked, without reading it and without a separate file to rewrite on each
+change.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Literal, TypedDict
+
+from .done_tasks import tasks_dir_of
+from .invalidation import invalidate_path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+ChangeOp = Literal["created", "updated", "deleted"]
+
+CHANGE_JOURNAL_DIR = ".trellis"
+CHANGE_JOURNAL_NAME = "changes.jsonl"
+CHANGE_LOCK_NAME = "changes.lock"
+
+# In-memory entries per planning root; older entries are read from the journal
+DEFAULT_RING_SIZE = 1024
+
+# The journal is trimmed to half this many entries once it grows past it
+DEFAULT_JOURNAL_MAX_ENTRIES = 10000
+
+_KIND_PREFIXES = {"project": "P-", "epic": "E-", "feature": "F-", "task": "T-"}
+_TASK_DIRS = ("tasks-open", "tasks-done")
+
+
+class ChangeEntry(TypedDict):
+    """Type definition for one recorded change."""
+
+    generation: int
+    op: ChangeOp
+    id: str
+    kind: str
+    status: str | None
+    title: str | None
+    parent: str | None
+    path: str
+    old_path: str | None
+    ts: str
+
+
+class ChangesResult(TypedDict):
+    """Type definition for a getChanges response."""
+
+    generation: int
+    since_generation: int
+    changed: bool
+    resync_required: bool
+    changes: list[ChangeEntry]
+
+
+class ChangeFeed:
+    """Generation-numbered change log for one planning root.
+
+    Example:
+        >>> feed = ChangeFeed(Path("./planning"))
+        >>> feed.record("created", "task", "T-login", "tasks-open/T-login.md", status="open")
+        1
+        >>> feed.changes_since(0)["changes"][0]["id"]
+        'T-login'
+        >>> feed.changes_since(1)["changed"]
+        False
+    """
+
+    def __init__(
+        self,
+        planning_root: Path,
+        ring_size: int = DEFAULT_RING_SIZE,
+        journal_max_entries: int = DEFAULT_JOURNAL_MAX_ENTRIES,
+    ):
+        """Initialize the feed and load existing journal entries.
+
+        Args:
+            planning_root: Planning directory whose changes are tracked
+            ring_size: Number of recent entries kept in memory
+            journal_max_entries: Journal size that triggers trimming
+
+        Raises:
+            ValueError: If ring_size or journal_max_entries is not positive
+        """
+        if ring_size <= 0 or journal_max_entries <= 0:
+            raise ValueError("Change feed sizes must be positive")
+
+        self.planning_root = Path(os.path.abspath(planning_root))
+        self.journal_path = self.planning_root / CHANGE_JOURNAL_DIR / CHANGE_JOURNAL_NAME
+        self.lock_path = self.journal_path.with_name(CHANGE_LOCK_NAME)
+        self.journal_max_entries = journal_max_entries
+
+        self._ring: deque[ChangeEntry] = deque(maxlen=ring_size)
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._first_generation = 1
+        self._journal_entries = 0
+        self._journal_identity: tuple[int, int] | None = None  # (inode, bytes consumed)
+
+        with self._lock:
+            self._sync()
+
+    @property
+    def generation(self) -> int:
+        """Latest generation known to this process."""
+        return self._generation
+
+    def current_generation(self) -> int:
+        """Get the latest generation, including writes made by other processes.
+
+        Returns:
+            Latest generation number (0 if nothing was ever recorded)
+        """
+        with self._lock:
+            if self._journal_changed():
+                self._sync()
+            return self._generation
+
+    def record(
+        self,
+        op: ChangeOp,
+        kind: str,
+        obj_id: str,
+        path: str,
+        status: str | None = None,
+        title: str | None = None,
+        parent: str | None = None,
+        old_path: str | None = None,
+    ) -> int:
+        """Append a change entry and return its generation.
+
+        Args:
+            op: Type of change
+            kind: Object kind
+            obj_id: Prefixed object ID (e.g. 'T-login')
+            path: File path relative to the planning root
+            status: Object status after the change, if known
+            title: Object title after the change, if known
+            parent: Parent object ID, if any
+            old_path: Previous path relative to the planning root, for moves
+
+        Returns:
+            Generation number assigned to the change
+        """
+        with self._lock:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, "a+b") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    # Open after locking so a concurrent trim cannot swap the file under us
+                    with open(self.journal_path, "a+b") as journal:
+                        # Pick up entries appended by other processes before numbering ours
+                        self._sync(journal)
+                        entry: ChangeEntry = {
+                            "generation": self._generation + 1,
+                            "op": op,
+                            "id": obj_id,
+                            "kind": kind,
+                            "status": status,
+                            "title": title,
+                            "parent": parent,
+                            "path": path,
+                            "old_path": old_path,
+                            "ts": datetime.now(timezone.utc).isoformat(),
+                        }
+                        journal.seek(0, os.SEEK_END)
+                        journal.write(_encode(entry))
+                        journal.flush()
+                        self._apply(entry)
+                        self._journal_identity = (os.fstat(journal.fileno()).st_ino, journal.tell())
+
+                    if self._journal_entries > self.journal_max_entries:
+                        self._trim_journal()
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            return entry["generation"]
+
+    def changes_since(
+        self, since_generation: int, limit: int | None = None, collapse: bool = True
+    ) -> ChangesResult:
+        """Get the objects created, updated or deleted after a generation.
+
+        Entries are collapsed to one per object (the latest), keeping 'created'
+        when the object was created within the window and the path the object
+        had before the window when it moved. When nothing changed this costs
+        one ``stat`` of the journal.
+
+        Args:
+            since_generation: Last generation the client has seen (0 for all)
+            limit: Maximum number of changed objects to return
+            collapse: False to return every entry, including intermediate paths
+
+        Returns:
+            Dictionary with the current generation, whether anything changed,
+            whether the client must fall back to a full listing, and the changes
+        """
+        with self._lock:
+            if self._journal_changed():
+                self._sync()
+            generation = self._generation
+
+            if since_generation == generation:
+                return _result(generation, since_generation, [], resync_required=False)
+            if since_generation > generation:
+                # Journal was reset or the client talks about another tree
+                return _result(generation, since_generation, [], resync_required=True)
+
+            first_available = self._first_generation
+            if self._ring and self._ring[0]["generation"] <= since_generation + 1:
+                entries = [e for e in self._ring if e["generation"] > since_generation]
+            else:
+                entries = [e for e in self._read_journal() if e["generation"] > since_generation]
+            resync_required = since_generation + 1 < first_available
+
+        changes = _collapse(entries) if collapse else entries
+        if limit is not None and limit >= 0:
+            changes = changes[:limit]
+        return _result(generation, since_generation, changes, resync_required)
+
+    def _journal_changed(self) -> bool:
+        """Check with a single stat whether the journal differs from what was read."""
+        try:
+            stat_result = os.stat(self.journal_path)
+        except FileNotFoundError:
+            return self._journal_identity is not None
+        return self._journal_identity != (stat_result.st_ino, stat_result.st_size)
+
+    def _sync(self, journal: Any = None) -> None:
+        """Read journal entries this process has not seen yet. Lock must be held."""
+        try:
+            if journal is None:
+                with open(self.journal_path, "rb") as handle:
+                    self._read_new(handle)
+            else:
+                self._read_new(journal)
+        except FileNotFoundError:
+            if self._journal_identity is not None:
+                # Journal was removed: start over
+                self._reset()
+
+    def _read_new(self, handle: Any) -> None:
+        """Consume unread lines from an open journal handle. Lock must be held."""
+        stat_result = os.fstat(handle.fileno())
+        inode, offset = self._journal_identity or (stat_result.st_ino, 0)
+        if inode != stat_result.st_ino or stat_result.st_size < offset:
+            # Journal was trimmed or replaced: reload it from the start
+            self._reset()
+            offset = 0
+
+        handle.seek(offset)
+        data = handle.read()
+        consumed = data.rfind(b"\n") + 1
+        for line in data[:consumed].splitlines():
+            entry = _parse_line(line)
+            if entry is not None:
+                self._apply(entry)
+        self._journal_identity = (stat_result.st_ino, offset + consumed)
+
+    def _apply(self, entry: ChangeEntry) -> None:
+        """Add an entry read from or written to the journal. Lock must be held."""
+        if entry["generation"] <= self._generation:
+            return
+        if self._journal_entries == 0:
+            self._first_generation = entry["generation"]
+        self._journal_entries += 1
+        self._generation = entry["generation"]
+        self._ring.append(entry)
+
+    def _reset(self) -> None:
+        """Forget everything read so far. Lock must be held."""
+        self._ring.clear()
+        self._generation = 0
+        self._first_generation = 1
+        self._journal_entries = 0
+        self._journal_identity = None
+
+    def _read_journal(self) -> Iterator[ChangeEntry]:
+        """Yield every entry currently in the journal."""
+        try:
+            with open(self.journal_path, "rb") as handle:
+                for line in handle:
+                    entry = _parse_line(line)
+                    if entry is not None:
+                        yield entry
+        except FileNotFoundError:
+            return
+
+    def _trim_journal(self) -> None:
+        """Keep the newest half of the journal. Caller must hold the journal lock."""
+        keep = list(self._read_journal())[-(self.journal_max_entries // 2) :]
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.journal_path.parent, prefix=f".{CHANGE_JOURNAL_NAME}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                for entry in keep:
+                    handle.write(_encode(entry))
+            os.replace(temp_path, self.journal_path)
+        except Exception:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+        stat_result = os.stat(self.journal_path)
+        self._journal_entries = len(keep)
+        self._first_generation = keep[0]["generation"] if keep else self._generation + 1
+        self._journal_identity = (stat_result.st_ino, stat_result.st_size)
+
+
+def _encode(entry: ChangeEntry) -> bytes:
+    """Serialize an entry as one journal line."""
+    return (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _parse_line(line: bytes) -> ChangeEntry | None:
+    """Parse one journal line, skipping torn or foreign lines."""
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or not isinstance(entry.get("generation"), int):
+        return None
+    return entry  # type: ignore[return-value]
+
+
+def _collapse(entries: list[ChangeEntry]) -> list[ChangeEntry]:
+    """Reduce entries to the latest change per object, in generation order."""
+    latest: dict[str, ChangeEntry] = {}
+    created: set[str] = set()
+    first_paths: dict[str, str] = {}
+    for entry in entries:
+        key = entry["id"]
+        if entry["op"] == "created":
+            created.add(key)
+        # Entries written before moves were recorded carry no old_path
+        first_paths.setdefault(key, entry.get("old_path") or entry["path"])
+        latest.pop(key, None)
+        latest[key] = entry
+
+    changes: list[ChangeEntry] = []
+    for key, entry in latest.items():
+        op: ChangeOp = "created" if key in created and entry["op"] == "updated" else entry["op"]
+        old_path = None if key in created else first_paths[key]
+        if old_path == entry["path"]:
+            old_path = None
+        if op != entry["op"] or old_path != entry.get("old_path"):
+            entry = entry.copy()
+            entry["op"] = op
+            entry["old_path"] = old_path
+        changes.append(entry)
+    return changes
+
+
+def _result(
+    generation: int, since_generation: int, changes: list[ChangeEntry], resync_required: bool
+) -> ChangesResult:
+    """Build a ChangesResult dictionary."""
+    return {
+        "generation": generation,
+        "since_generation": since_generation,
+        "changed": bool(changes) or resync_required,
+        "resync_required": resync_required,
+        "changes": changes,
+    }
+
+
+# Feeds per planning root for singleton access
+_feeds: dict[str, ChangeFeed] = {}
+_feeds_lock = threading.Lock()
+
+
+def get_change_feed(planning_root: str | Path) -> ChangeFeed:
+    """Get the change feed for a planning root.
+
+    Args:
+        planning_root: Planning directory
+
+    Returns:
+        The process-wide ChangeFeed for that directory
+    """
+    key = os.path.abspath(planning_root)
+    with _feeds_lock:
+        feed = _feeds.get(key)
+        if feed is None:
+            feed = ChangeFeed(Path(key))
+            _feeds[key] = feed
+        return feed
+
+
+def generation_stamp_path(planning_root: str | Path) -> Path:
+    """Get the path whose inode and size identify a planning root's latest generation.
+
+    Args:
+        planning_root: Planning directory
+
+    Returns:
+        Absolute path of the change journal (it may not exist yet)
+    """
+    return Path(os.path.abspath(planning_root)) / CHANGE_JOURNAL_DIR / CHANGE_JOURNAL_NAME
+
+
+def clear_change_feeds() -> None:
+    """Drop all in-memory change feeds (journals on disk are kept)."""
+    with _feeds_lock:
+        _feeds.clear()
+
+
+def find_planning_root(path: str | Path) -> Path | None:
+    """Find the planning directory that contains an object file.
+
+    Args:
+        path: Path of a project, epic, feature or task file
+
+    Returns:
+        The planning directory, or None if the path is not inside a planning tree
+    """
+    file_path = Path(os.path.abspath(path))
+    for ancestor in file_path.parents:
+        if ancestor.name == "projects":
+            return ancestor.parent
+    tasks_dir = tasks_dir_of(file_path)
+    if tasks_dir.name in _TASK_DIRS:
+        # Standalone task: planning/tasks-open/T-*.md or planning/tasks-done/YYYY-MM/*.md
+        return tasks_dir.parent
+    return None
+
+
+def object_id_from_path(path: str | Path) -> tuple[str, str] | None:
+    """Derive (kind, prefixed ID) from an object file path without reading it.
+
+    Args:
+        path: Path of a project, epic, feature or task file
+
+    Returns:
+        Tuple of (kind, prefixed ID), or None if the name is not an object file
+    """
+    file_path = Path(path)
+    name = file_path.name
+    if name in ("project.md", "epic.md", "feature.md"):
+        return name[:-3], file_path.parent.name
+    if name.endswith(".md") and "T-" in name:
+        # Done tasks carry a timestamp prefix: 20250101_000000-T-id.md
+        return "task", name[name.index("T-") : -3]
+    return None
+
+
+def _prefixed(kind: str, value: Any) -> str | None:
+    """Return an ID with its kind prefix, or None for empty values."""
+    if not value:
+        return None
+    text = str(value)
+    for prefix in _KIND_PREFIXES.values():
+        if text.startswith(prefix):
+            return text
+    prefix = _KIND_PREFIXES.get(kind)
+    return f"{prefix}{text}" if prefix else text
+
+
+def record_change(
+    path: str | Path,
+    op: ChangeOp,
+    front_matter: dict[str, Any] | None = None,
+    old_path: str | Path | None = None,
+) -> int | None:
+    """Record a change to an object file in its planning root's change feed.
+
+    Also publishes the path (and the previous path of a move) on the
+    invalidation bus so in-process caches drop their entries before the write
+    returns. Never raises: a failure to record is logged and the mutation
+    proceeds.
+
+    Args:
+        path: Object file that was written or removed
+        op: Type of change
+        front_matter: Front-matter written to the file, if available
+        old_path: Path the file had before it was moved, if it was
+
+    Returns:
+        The generation assigned, or None if the path is not in a planning tree
+    """
+    try:
+        invalidate_path(path)
+        if old_path is not None:
+            invalidate_path(old_path)
+        planning_root = find_planning_root(path)
+        identity = object_id_from_path(path)
+        if planning_root is None or identity is None:
+            return None
+        kind, obj_id = identity
+        fields = front_matter or {}
+        status = fields.get("status")
+        status = getattr(status, "value", status)
+        parent_kind = {"epic": "project", "feature": "epic", "task": "feature"}.get(kind, "")
+        return get_change_feed(planning_root).record(
+            op,
+            kind,
+            obj_id,
+            os.path.relpath(os.path.abspath(path), planning_root),
+            status="deleted" if op == "deleted" else (str(status) if status else None),
+            title=fields.get("title"),
+            parent=_prefixed(parent_kind, fields.get("parent")),
+            old_path=(
+                os.path.relpath(os.path.abspath(old_path), planning_root)
+                if old_path is not None
+                else None
+            ),
+        )
+    except Exception as e:
+        logger.warning(f"Failed to record change for {path}: {e}")
+        return None
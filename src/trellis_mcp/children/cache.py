@@ -3,16 +3,28 @@
 This module provides high-performance caching for children discovery operations
 to optimize repeated children lookup operations. Follows existing cache patterns
 from the validation and inference systems and integrates with file system validation.
+
+Entries are dropped when a path below the parent's directory is published on the
+invalidation bus; while a filesystem watcher covers the parent, entries are
+served without re-checking modification times.
+
+Entries also keep a fingerprint (mtime in nanoseconds, size and front-matter
+hash) of every file they were built from. A file whose mtime changed but whose
+front-matter hashes the same, as after ``git checkout``, keeps the entry valid.
 """
 
 import logging
 import os
 import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TypedDict
 
+from ..invalidation import get_invalidation_bus, is_under, is_watched
+from ..markdown_loader import revalidate_fingerprint
+from ..parse_cache import FileFingerprint, get_parse_cache
+
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
@@ -41,6 +53,9 @@ class ChildrenCacheEntry:
     parent_mtime: float
     children_mtimes: dict[str, float]
     cached_at: float
+    parent_dir: str = ""
+    trusted: bool = False
+    fingerprints: dict[str, FileFingerprint] = field(default_factory=dict)
 
     @classmethod
     def create(
@@ -48,6 +63,9 @@ class ChildrenCacheEntry:
         children: list[dict[str, str]],
         parent_mtime: float,
         children_mtimes: dict[str, float],
+        parent_dir: str = "",
+        trusted: bool = False,
+        fingerprints: dict[str, FileFingerprint] | None = None,
     ) -> "ChildrenCacheEntry":
         """Create a new cache entry with current timestamp."""
         return cls(
@@ -55,6 +73,9 @@ class ChildrenCacheEntry:
             parent_mtime=parent_mtime,
             children_mtimes=children_mtimes,
             cached_at=time.time(),
+            parent_dir=parent_dir,
+            trusted=trusted,
+            fingerprints=fingerprints or {},
         )
 
 
@@ -104,6 +125,15 @@ class ChildrenCache:
         self._misses = 0
         self._evictions = 0
 
+        # Bumped on every invalidation; lets callers detect changes during discovery
+        self._generation = 0
+        get_invalidation_bus().subscribe(self.invalidate_path)
+
+    @property
+    def generation(self) -> int:
+        """Invalidation counter, read before discovery and passed to ``set_children``."""
+        return self._generation
+
     def get_children(self, parent_path: Path | None) -> list[dict[str, str]] | None:
         """Retrieve cached children metadata if still valid.
 
@@ -129,8 +159,9 @@ class ChildrenCache:
 
             entry = self._cache[cache_key]
 
-            # Validate cache entry is still current
-            if self._is_cache_valid(parent_path, entry):
+            # Validate cache entry is still current; watched entries need no check
+            trusted = entry.trusted and is_watched(entry.parent_dir)
+            if trusted or self._is_cache_valid(parent_path, entry):
                 # Update LRU order
                 self._access_order.remove(cache_key)
                 self._access_order.append(cache_key)
@@ -142,7 +173,12 @@ class ChildrenCache:
                 self._misses += 1
                 return None
 
-    def set_children(self, parent_path: Path | None, children: list[dict[str, str]] | None) -> None:
+    def set_children(
+        self,
+        parent_path: Path | None,
+        children: list[dict[str, str]] | None,
+        trusted_generation: int | None = None,
+    ) -> None:
         """Cache children metadata with current modification times.
 
         Stores the children metadata in cache with current file modification
@@ -151,6 +187,9 @@ class ChildrenCache:
         Args:
             parent_path: Path to parent object file
             children: List of children metadata dictionaries
+            trusted_generation: The ``generation`` read before discovery started;
+                if nothing was invalidated since and the parent is watched, the
+                entry is served without modification time checks
 
         Raises:
             ValueError: If parent_path is None or children is None
@@ -175,8 +214,20 @@ class ChildrenCache:
                         if child_path.exists():
                             children_mtimes[child_path_str] = os.path.getmtime(child_path)
 
+                # Fingerprints of the parsed versions, when the parse cache has them
+                parse_cache = get_parse_cache()
+                fingerprints = {}
+                for path_str in [str(parent_path), *children_mtimes]:
+                    fingerprint = parse_cache.fingerprint(os.path.abspath(path_str))
+                    if fingerprint is not None:
+                        fingerprints[path_str] = fingerprint
+
                 # Create cache entry
-                entry = ChildrenCacheEntry.create(children, parent_mtime, children_mtimes)
+                parent_dir = os.path.dirname(os.path.abspath(parent_path))
+                trusted = trusted_generation == self._generation and is_watched(parent_dir)
+                entry = ChildrenCacheEntry.create(
+                    children, parent_mtime, children_mtimes, parent_dir, trusted, fingerprints
+                )
 
                 # Remove existing entry if present
                 if cache_key in self._cache:
@@ -206,9 +257,28 @@ class ChildrenCache:
         with self._lock:
             self._invalidate_unsafe(str(parent_path))
 
+    def invalidate_path(self, path: str) -> None:
+        """Drop entries whose parent directory contains or lies below a changed path.
+
+        Args:
+            path: Absolute path published on the invalidation bus
+        """
+        with self._lock:
+            self._generation += 1
+            stale = [
+                key
+                for key, entry in self._cache.items()
+                if not entry.parent_dir
+                or is_under(path, entry.parent_dir)
+                or is_under(entry.parent_dir, path)
+            ]
+            for key in stale:
+                self._invalidate_unsafe(key)
+
     def clear(self) -> None:
         """Clear all cached entries and reset statistics."""
         with self._lock:
+            self._generation += 1
             self._cache.clear()
             self._access_order.clear()
             self._hits = 0
@@ -238,9 +308,10 @@ class ChildrenCache:
     def _is_cache_valid(self, parent_path: Path, entry: ChildrenCacheEntry) -> bool:
         """Check if cache entry is still valid by comparing file modification times.
 
-        Uses tolerance-based comparison (1ms) following existing patterns from
-        DependencyGraphCache to avoid floating point precision issues and
-        filesystem timestamp resolution differences.
+        Files with a fingerprint are compared by nanosecond mtime and size, then
+        by front-matter hash when those differ. Other files use tolerance-based
+        comparison (1ms) to avoid floating point precision issues and filesystem
+        timestamp resolution differences.
 
         Args:
             parent_path: Path to parent object file
@@ -251,7 +322,10 @@ class ChildrenCache:
         """
         try:
             # Check parent file modification time
-            if parent_path.exists():
+            if str(parent_path) in entry.fingerprints:
+                if not self._revalidate_unsafe(entry, str(parent_path)):
+                    return False
+            elif parent_path.exists():
                 current_parent_mtime = os.path.getmtime(parent_path)
                 if abs(current_parent_mtime - entry.parent_mtime) > 0.001:
                     return False
@@ -261,6 +335,10 @@ class ChildrenCache:
 
             # Check all children file modification times
             for child_path_str, cached_mtime in entry.children_mtimes.items():
+                if child_path_str in entry.fingerprints:
+                    if not self._revalidate_unsafe(entry, child_path_str):
+                        return False
+                    continue
                 child_path = Path(child_path_str)
                 if child_path.exists():
                     current_mtime = os.path.getmtime(child_path)
@@ -277,6 +355,14 @@ class ChildrenCache:
             logger.debug(f"Cache validation failed for {parent_path}: {e}")
             return False
 
+    def _revalidate_unsafe(self, entry: ChildrenCacheEntry, path_str: str) -> bool:
+        """Check one fingerprinted file and refresh its fingerprint. Lock must be held."""
+        current = revalidate_fingerprint(path_str, entry.fingerprints[path_str])
+        if current is None:
+            return False
+        entry.fingerprints[path_str] = current
+        return True
+
     def _evict_lru_unsafe(self) -> None:
         """Evict least recently used entry. Must be called with lock held."""
         if self._access_order:
@@ -0,0 +1,27 @@
+"""Fixed value sets for profiling, benchmark and load test options.
+
+Kept free of other imports so the CLI can declare its ``click.Choice`` options
+without loading the profiling, benchmark and load test modules, which pull in
+asyncio, multiprocessing and subprocess.
+"""
+
+from typing import Literal
+
+ProfileSortKey = Literal["cumulative", "tottime", "calls"]
+
+PROFILE_SORT_KEYS: tuple[ProfileSortKey, ...] = ("cumulative", "tottime", "calls")
+
+BENCH_OPERATIONS: tuple[str, ...] = (
+    "getObject",
+    "listBacklog",
+    "updateObject",
+    "createObject",
+    "claimNextTask",
+    "completeTask",
+)
+
+DEFAULT_BENCH_SIZES: tuple[int, ...] = (1000, 10000, 100000)
+
+LoadTestTransport = Literal["stdio", "http"]
+
+LOAD_TEST_TRANSPORTS: tuple[LoadTestTransport, ...] = ("stdio", "http")
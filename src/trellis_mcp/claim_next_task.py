@@ -13,6 +13,7 @@ from .dependency_resolver import is_unblocked
 from .exceptions.no_available_task import NoAvailableTask
 from .exceptions.validation_error import ValidationError, ValidationErrorCode
 from .filters import filter_by_scope, validate_scope_exists
+from .id_index import did_you_mean
 from .object_dumper import write_object
 from .path_resolver import resolve_project_roots
 from .scanner import scan_tasks
@@ -101,7 +102,9 @@ def claim_specific_task(
     # Find the specific task by ID
     target_task = _find_task_by_id(scanning_root, task_id)
     if not target_task:
-        raise NoAvailableTask(f"Task not found: {task_id}")
+        raise NoAvailableTask(
+            f"Task not found: {task_id}{did_you_mean(planning_root, task_id, 'task')}"
+        )
 
     # Validate task is in open status unless force_claim=True
     if not force_claim and target_task.status != StatusEnum.OPEN:
@@ -239,7 +242,10 @@ def claim_next_task(
         except ValidationError:
             # Re-raise with more specific context for claiming
             raise ValidationError(
-                errors=[f"Scope object not found: {scope.strip()}"],
+                errors=[
+                    f"Scope object not found: {scope.strip()}"
+                    f"{did_you_mean(planning_root, scope.strip())}"
+                ],
                 error_codes=[ValidationErrorCode.INVALID_FIELD],
                 context={"scope": scope.strip(), "operation": "claim_next_task"},
             )
@@ -9,15 +9,19 @@ from pathlib import Path
 
 import click
 
-from .complete_task import complete_task
-from .filters import apply_filters, filter_by_scope
+# Only what the command group and option declarations need is imported here.
+# Everything else (notably fastmcp via create_server) is imported inside the
+# subcommand that uses it, so short-lived commands such as `backlog` and
+# `complete` start quickly.
+from .choices import (
+    BENCH_OPERATIONS,
+    DEFAULT_BENCH_SIZES,
+    LOAD_TEST_TRANSPORTS,
+    PROFILE_SORT_KEYS,
+)
+from .done_tasks import DoneLayout, set_done_layout
+from .durability import set_durability_mode
 from .loader import ConfigLoader
-from .logging.prune_logs import prune_logs
-from .models.filter_params import FilterParams
-from .models.task_sort_key import task_sort_key
-from .path_resolver import children_of, id_to_path, resolve_project_roots
-from .scanner import scan_tasks
-from .server import create_server
 from .types import VALID_KINDS
 
 
@@ -76,6 +80,8 @@ def cli(ctx: click.Context, config: str | None, debug: bool | None, log_level: s
 
     # Store settings in context for subcommands
     ctx.obj["settings"] = settings
+    set_durability_mode(settings.durability)
+    set_done_layout(settings.done_layout)
 
     # Enable debug mode if requested
     if settings.debug_mode:
@@ -88,8 +94,18 @@ def cli(ctx: click.Context, config: str | None, debug: bool | None, log_level: s
     metavar="HOST:PORT",
     help="Enable HTTP transport with specified host and port (e.g., --http 127.0.0.1:8080)",
 )
+@click.option(
+    "--warm-cache",
+    is_flag=True,
+    help="Pre-walk the planning root in the background to fill caches at startup",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Watch the planning root for external edits (inotify, or polling as a fallback)",
+)
 @click.pass_context
-def serve(ctx: click.Context, http: str | None) -> None:
+def serve(ctx: click.Context, http: str | None, warm_cache: bool, watch: bool) -> None:
     """Start the Trellis MCP server.
 
     Starts the FastMCP server using STDIO transport by default, or HTTP transport
@@ -99,7 +115,13 @@ def serve(ctx: click.Context, http: str | None) -> None:
     Configuration is loaded from the main command's settings, including server name,
     transport options, and planning directory structure.
     """
+    from .server import create_server
+
     settings = ctx.obj["settings"]
+    if warm_cache:
+        settings = settings.model_copy(update={"warm_cache_on_start": True})
+    if watch:
+        settings = settings.model_copy(update={"watch_planning_root": True})
 
     # Parse HTTP transport option if provided
     host, port = None, None
@@ -232,6 +254,8 @@ def complete(ctx: click.Context, task_id: str, summary: str | None, files: tuple
       trellis-mcp complete 001 --summary "Added feature" --files src/auth.py \\
                                                           --files tests/test_auth.py
     """
+    from .complete_task import complete_task
+
     settings = ctx.obj["settings"]
 
     # Convert tuple to list for files_changed parameter
@@ -260,6 +284,156 @@ def complete(ctx: click.Context, task_id: str, summary: str | None, files: tuple
         raise click.ClickException(f"Failed to complete task: {e}")
 
 
+@cli.command()
+@click.option(
+    "--older-than",
+    required=True,
+    help="Archive done tasks completed longer ago than this (e.g. 90d, 12w, 36h)",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Show which tasks would be archived without moving them",
+)
+@click.pass_context
+def archive(ctx: click.Context, older_than: str, dry_run: bool) -> None:
+    """Pack old completed tasks into the compressed archive.
+
+    Archived tasks no longer appear in listings or scans. They still satisfy
+    prerequisites and can be read with getObject.
+
+    Examples:
+      trellis-mcp archive --older-than 90d              # Archive tasks done over 90 days ago
+      trellis-mcp archive --older-than 12w --dry-run    # Preview
+    """
+    from .archive import archive_done_tasks, parse_age
+    from .cache_warmup import warmup_planning_dir
+
+    settings = ctx.obj["settings"]
+    try:
+        age = parse_age(older_than)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--older-than")
+    planning_dir = warmup_planning_dir(settings.planning_root)
+
+    try:
+        paths = archive_done_tasks(planning_dir, age, dry_run=dry_run)
+    except (OSError, ValueError) as e:
+        if settings.debug_mode:
+            raise
+        raise click.ClickException(f"Failed to archive tasks: {e}")
+
+    if dry_run:
+        for path in paths:
+            click.echo(f"  {path.relative_to(planning_dir)}")
+        click.echo(f"Would archive {len(paths)} done task(s)")
+    else:
+        click.echo(f"✓ Archived {len(paths)} done task(s)")
+
+
+@cli.command()
+@click.argument("target")
+@click.pass_context
+def export(ctx: click.Context, target: str) -> None:
+    """Copy every object of the planning tree into another storage backend.
+
+    TARGET: sqlite:PATH for a SQLite database, or markdown:PATH (or a bare
+    path) for another markdown planning directory
+
+    Examples:
+      trellis-mcp export sqlite:trellis.db
+      trellis-mcp export markdown:/tmp/planning-copy
+    """
+    count = _copy_objects_between(ctx.obj["settings"], source=None, target=target)
+    click.echo(f"✓ Exported {count} object(s) to {target}")
+
+
+@cli.command("import")
+@click.argument("source")
+@click.pass_context
+def import_command(ctx: click.Context, source: str) -> None:
+    """Copy every object of another storage backend into the planning tree.
+
+    Objects already in the tree with the same ID are replaced.
+
+    SOURCE: sqlite:PATH for a SQLite database, or markdown:PATH (or a bare
+    path) for another markdown planning directory
+
+    Examples:
+      trellis-mcp import sqlite:trellis.db
+    """
+    count = _copy_objects_between(ctx.obj["settings"], source=source, target=None)
+    click.echo(f"✓ Imported {count} object(s) from {source}")
+
+
+def _copy_objects_between(settings, source: str | None, target: str | None) -> int:
+    """Copy objects between backend specs, where None stands for the planning tree."""
+    import sqlite3
+
+    from .cache_warmup import warmup_planning_dir
+    from .storage import MarkdownBackend, copy_objects, open_backend
+
+    planning_dir = warmup_planning_dir(settings.planning_root)
+    try:
+        source_backend = open_backend(source) if source else MarkdownBackend(planning_dir)
+        target_backend = open_backend(target) if target else MarkdownBackend(planning_dir)
+    except (ValueError, OSError, sqlite3.Error) as e:
+        raise click.BadParameter(f"Cannot open backend: {e}")
+
+    try:
+        return copy_objects(source_backend, target_backend)
+    except Exception as e:
+        if settings.debug_mode:
+            raise
+        raise click.ClickException(f"Failed to copy objects: {e}")
+    finally:
+        source_backend.close()
+        target_backend.close()
+
+
+@cli.command("migrate-done")
+@click.option(
+    "--layout",
+    type=click.Choice(["flat", "monthly"]),
+    help="Target tasks-done layout (default: the configured done_layout)",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Show which files would be moved without moving them",
+)
+@click.pass_context
+def migrate_done(ctx: click.Context, layout: DoneLayout | None, dry_run: bool) -> None:
+    """Move completed task files into the flat or monthly tasks-done layout.
+
+    Files are moved one rename at a time and both layouts are readable, so
+    the migration can run while servers are using the planning tree.
+
+    Examples:
+      trellis-mcp migrate-done --layout monthly     # Shard into tasks-done/YYYY-MM/
+      trellis-mcp migrate-done --layout flat        # Move everything back
+      trellis-mcp migrate-done --dry-run            # Preview moves for the configured layout
+    """
+    from .cache_warmup import warmup_planning_dir
+    from .done_tasks import migrate_done_layout
+
+    settings = ctx.obj["settings"]
+    target: DoneLayout = layout or settings.done_layout
+    planning_dir = warmup_planning_dir(settings.planning_root)
+
+    try:
+        moves = migrate_done_layout(planning_dir, target, dry_run=dry_run)
+    except OSError as e:
+        raise click.ClickException(f"File system error: {e}")
+
+    verb = "Would move" if dry_run else "Moved"
+    for source, destination in moves:
+        click.echo(
+            f"  {source.relative_to(planning_dir)} -> {destination.relative_to(planning_dir)}"
+        )
+    click.echo(f"{verb} {len(moves)} done task file(s) to the {target} layout")
+
+
 @cli.command()
 @click.option("--scope", type=str, help="Filter by scope ID (project/epic/feature)")
 @click.option(
@@ -288,6 +462,12 @@ def backlog(
       trellis-mcp backlog --priority high        # Only high priority tasks
       trellis-mcp backlog --status review --priority high  # Combined filters
     """
+    from .filters import apply_filters, filter_by_scope
+    from .models.filter_params import FilterParams
+    from .models.task_sort_key import task_sort_key
+    from .path_resolver import id_to_path, resolve_project_roots
+    from .scanner import scan_tasks
+
     settings = ctx.obj["settings"]
 
     try:
@@ -377,6 +557,9 @@ def delete(ctx: click.Context, kind: str, object_id: str, force: bool) -> None:
       trellis-mcp delete feature F-001
       trellis-mcp delete task T-001
     """
+    from .path_resolver import children_of
+    from .server import create_server
+
     settings = ctx.obj["settings"]
 
     try:
@@ -459,6 +642,330 @@ def delete(ctx: click.Context, kind: str, object_id: str, force: bool) -> None:
         raise click.ClickException(f"Failed to delete {kind} {object_id}: {e}")
 
 
+@cli.command()
+@click.argument("tool_name", metavar="TOOL", type=str)
+@click.option(
+    "--args",
+    "tool_args",
+    type=str,
+    default="{}",
+    help='Tool arguments as a JSON object (e.g. \'{"id": "T-001"}\')',
+)
+@click.option(
+    "--project-root",
+    type=click.Path(exists=True, file_okay=False),
+    help="Planning root passed as projectRoot unless --args already sets it",
+)
+@click.option(
+    "--sort",
+    type=click.Choice(PROFILE_SORT_KEYS),
+    default="cumulative",
+    show_default=True,
+    help="Sort key for the profile stats",
+)
+@click.option("--limit", type=int, default=25, show_default=True, help="Number of rows to show")
+@click.option("--memory", is_flag=True, help="Also trace allocations with tracemalloc")
+@click.option(
+    "--output", "-o", type=click.Path(dir_okay=False), help="Save raw pstats data to FILE"
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the full report as JSON")
+@click.pass_context
+def profile(
+    ctx: click.Context,
+    tool_name: str,
+    tool_args: str,
+    project_root: str | None,
+    sort: str,
+    limit: int,
+    memory: bool,
+    output: str | None,
+    as_json: bool,
+) -> None:
+    """Profile a real tool invocation with cProfile (and optionally tracemalloc).
+
+    TOOL: Name of the MCP tool to run (e.g. listBacklog, updateObject)
+
+    The tool runs in-process against the given planning tree, exactly as it
+    would inside the server, and the hottest functions are printed. Use
+    --output to save stats for tools such as snakeviz or pstats.
+
+    Examples:
+      trellis-mcp profile listBacklog --project-root ./planning
+      trellis-mcp profile getObject --args '{"id": "T-001"}' --project-root ./planning
+      trellis-mcp profile claimNextTask --project-root ./planning --memory --sort tottime
+      trellis-mcp profile listBacklog --project-root ./planning -o backlog.prof
+    """
+    import asyncio
+
+    from .profiling import format_profile_report, profile_tool_call
+
+    settings = ctx.obj["settings"]
+
+    try:
+        arguments = json.loads(tool_args)
+    except json.JSONDecodeError as e:
+        raise click.ClickException(f"--args must be valid JSON: {e}")
+    if not isinstance(arguments, dict):
+        raise click.ClickException("--args must be a JSON object")
+    if project_root and "projectRoot" not in arguments:
+        arguments["projectRoot"] = project_root
+
+    try:
+        report = asyncio.run(
+            profile_tool_call(
+                settings,
+                tool_name,
+                arguments,
+                sort=sort,  # type: ignore[arg-type]
+                limit=limit,
+                trace_memory=memory,
+                output_path=output,
+            )
+        )
+    except Exception as e:
+        if settings.debug_mode:
+            raise
+        raise click.ClickException(f"Failed to profile {tool_name}: {e}")
+
+    if as_json:
+        click.echo(json.dumps(report, indent=2, default=str))
+    else:
+        click.echo(format_profile_report(report))
+
+
+@cli.command()
+@click.option(
+    "--sizes",
+    type=str,
+    default=",".join(str(size) for size in DEFAULT_BENCH_SIZES),
+    show_default=True,
+    help="Comma-separated approximate object counts of the generated trees",
+)
+@click.option(
+    "--operation",
+    "operations",
+    type=click.Choice(BENCH_OPERATIONS),
+    multiple=True,
+    help="Tool to benchmark (repeatable; default: all)",
+)
+@click.option("--repeat", type=int, default=5, show_default=True, help="Warm calls per tool")
+@click.option("--seed", type=int, default=0, show_default=True, help="Tree generation seed")
+@click.option(
+    "--max-seconds",
+    type=float,
+    default=60.0,
+    show_default=True,
+    help="Per-tool time budget before remaining warm calls are skipped (0 disables)",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Baseline JSON to compare against; regressions make the command fail",
+)
+@click.option(
+    "--tolerance",
+    type=float,
+    default=0.25,
+    show_default=True,
+    help="Allowed relative latency increase over the baseline",
+)
+@click.option(
+    "--save", "-o", type=click.Path(dir_okay=False), help="Save results as a baseline JSON file"
+)
+@click.option(
+    "--work-dir",
+    type=click.Path(file_okay=False),
+    help="Keep generated trees in this directory instead of a temporary one",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the full report as JSON")
+@click.pass_context
+def bench(
+    ctx: click.Context,
+    sizes: str,
+    operations: tuple[str, ...],
+    repeat: int,
+    seed: int,
+    max_seconds: float,
+    baseline: str | None,
+    tolerance: float,
+    save: str | None,
+    work_dir: str | None,
+    as_json: bool,
+) -> None:
+    """Benchmark the main tools against generated planning trees.
+
+    Generates a deterministic synthetic tree for each size and measures cold
+    (caches cleared) and warm latency plus file opens for getObject,
+    listBacklog, updateObject, createObject, claimNextTask and completeTask.
+
+    Examples:
+      trellis-mcp bench --sizes 1000 --save bench-baseline.json
+      trellis-mcp bench --sizes 1000,10000 --baseline bench-baseline.json
+      trellis-mcp bench --sizes 10000 --operation listBacklog --operation getObject
+      trellis-mcp bench --sizes 1000 --work-dir ./bench-trees   # keep trees for profiling
+    """
+    import asyncio
+
+    from .bench.suite import compare_to_baseline, format_bench_report, run_benchmark_suite
+
+    settings = ctx.obj["settings"]
+
+    try:
+        size_list = [int(size) for size in sizes.split(",") if size.strip()]
+    except ValueError:
+        raise click.ClickException(f"--sizes must be comma-separated integers, got '{sizes}'")
+
+    baseline_data = None
+    if baseline:
+        try:
+            baseline_data = json.loads(Path(baseline).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            raise click.ClickException(f"Failed to read baseline {baseline}: {e}")
+
+    progress = None if as_json else (lambda message: click.echo(message, err=True))
+    try:
+        report = asyncio.run(
+            run_benchmark_suite(
+                settings,
+                sizes=size_list,
+                operations=operations or BENCH_OPERATIONS,
+                repeat=repeat,
+                seed=seed,
+                work_dir=work_dir,
+                max_seconds=max_seconds or None,
+                progress=progress,
+            )
+        )
+    except Exception as e:
+        if settings.debug_mode:
+            raise
+        raise click.ClickException(f"Benchmark failed: {e}")
+
+    regressions = None
+    if baseline_data is not None:
+        regressions = compare_to_baseline(report, baseline_data, tolerance=tolerance)
+
+    if save:
+        save_path = Path(save)
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        save_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if as_json:
+        output = dict(report)
+        if regressions is not None:
+            output["regressions"] = regressions
+        click.echo(json.dumps(output, indent=2))
+    else:
+        click.echo(format_bench_report(report, regressions))
+        if save:
+            click.echo(f"Saved results to {save}")
+
+    if regressions:
+        raise click.ClickException(f"{len(regressions)} regression(s) against {baseline}")
+
+
+@cli.command()
+@click.option(
+    "--agents",
+    type=str,
+    default="4",
+    show_default=True,
+    help="Concurrent agent processes; a comma-separated list runs a scaling sweep",
+)
+@click.option(
+    "--transport",
+    type=click.Choice(LOAD_TEST_TRANSPORTS),
+    default="stdio",
+    show_default=True,
+    help="stdio spawns one server per agent; http shares one 'serve --http' server",
+)
+@click.option(
+    "--iterations",
+    type=int,
+    default=5,
+    show_default=True,
+    help="Claim/update/complete cycles per agent",
+)
+@click.option(
+    "--size", type=int, default=100, show_default=True, help="Approximate objects in the tree"
+)
+@click.option("--seed", type=int, default=0, show_default=True, help="Tree generation seed")
+@click.option(
+    "--work-dir",
+    type=click.Path(file_okay=False),
+    help="Keep generated trees and server logs in this directory",
+)
+@click.option(
+    "--check", is_flag=True, help="Fail if any duplicate claims or integrity violations occur"
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the full reports as JSON")
+@click.pass_context
+def loadtest(
+    ctx: click.Context,
+    agents: str,
+    transport: str,
+    iterations: int,
+    size: int,
+    seed: int,
+    work_dir: str | None,
+    check: bool,
+    as_json: bool,
+) -> None:
+    """Run concurrent agents against a real server to measure contention.
+
+    Each agent is a separate process with its own MCP client, looping
+    claimNextTask -> updateObject -> completeTask over a freshly generated
+    tree. Reports throughput, latency percentiles, duplicate claims and
+    file-integrity violations for each agent count.
+
+    Examples:
+      trellis-mcp loadtest --agents 4
+      trellis-mcp loadtest --agents 1,2,4,8 --transport http --iterations 10
+      trellis-mcp loadtest --agents 8 --check   # non-zero exit on duplicates/corruption
+    """
+    from .bench.load_test import format_load_test_reports, load_test_shape, run_load_test
+
+    settings = ctx.obj["settings"]
+
+    try:
+        agent_counts = [int(count) for count in agents.split(",") if count.strip()]
+    except ValueError:
+        raise click.ClickException(f"--agents must be comma-separated integers, got '{agents}'")
+
+    reports = []
+    try:
+        for agent_count in agent_counts:
+            if not as_json:
+                click.echo(f"Running {agent_count} agent(s) over {transport}...", err=True)
+            reports.append(
+                run_load_test(
+                    agents=agent_count,
+                    transport=transport,  # type: ignore[arg-type]
+                    iterations=iterations,
+                    shape=load_test_shape(size, seed=seed),
+                    work_dir=work_dir,
+                )
+            )
+    except Exception as e:
+        if settings.debug_mode:
+            raise
+        raise click.ClickException(f"Load test failed: {e}")
+
+    if as_json:
+        click.echo(json.dumps(reports, indent=2))
+    else:
+        click.echo(format_load_test_reports(reports))
+
+    if check:
+        problems = sum(
+            report["duplicate_claims"] + len(report["integrity_violations"]) for report in reports
+        )
+        if problems:
+            raise click.ClickException(
+                f"{problems} duplicate claim(s) or integrity violation(s) detected"
+            )
+
+
 @cli.command("prune-logs")
 @click.option(
     "--dry-run",
@@ -487,6 +994,8 @@ def prune_logs_command(ctx: click.Context, dry_run: bool, retention_days: int |
       trellis-mcp prune-logs --retention-days 7     # Use 7-day retention instead of configured
       trellis-mcp prune-logs --dry-run --retention-days 14  # Preview with 14-day retention
     """
+    from .logging.prune_logs import prune_logs
+
     settings = ctx.obj["settings"]
 
     # Override retention_days if provided
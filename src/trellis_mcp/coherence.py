@@ -0,0 +1,174 @@
+"""Cross-process cache coherence through the change feed's generation stamp.
+
+Several processes may write to the same planning root (a server per agent,
+the CLI). Every mutation made through Trellis appends to the shared change
+journal, which serves as the generation stamp: its inode and size move with
+every change. ``StampCoherence`` lets a process trust its caches without
+per-file stat validation: before handling a request it compares the stamp
+with one ``stat``, and only when the stamp moved does it read the new
+journal entries and publish their paths on the invalidation bus.
+
+This covers writes made through Trellis only. Edits made by other tools
+(editors, ``git checkout``) do not touch the stamp; enable the planning root
+watcher alongside it, or leave it off, when such edits are expected.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+from .change_feed import generation_stamp_path, get_change_feed
+from .invalidation import InvalidationBus, get_invalidation_bus
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+StampIdentity = tuple[int, int] | None  # (inode, size) of the change journal
+
+
+class StampCoherence:
+    """Replay other processes' changes onto the invalidation bus.
+
+    While started, the planning root is marked watched so caches trust their
+    entries; ``sync`` must run before each read for those entries to stay
+    correct. Start and stop are reference counted like ``PlanningWatcher``.
+
+    Example:
+        >>> coherence = StampCoherence(Path("./planning"))
+        >>> coherence.acquire()
+        >>> coherence.sync()  # one stat when nothing changed
+        0
+    """
+
+    def __init__(self, root: str | Path, bus: InvalidationBus | None = None):
+        """Initialize the coherence tracker.
+
+        Args:
+            root: Planning directory whose stamp is followed
+            bus: Invalidation bus to publish on (default: the global bus)
+        """
+        self.root = os.path.abspath(root)
+        self.bus = bus or get_invalidation_bus()
+        self.stamp_path = str(generation_stamp_path(self.root))
+        self.syncs = 0
+        self._identity: StampIdentity = None
+        self._generation = 0
+        self._started = False
+        self._users = 0
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """True while the root is marked watched."""
+        return self._started
+
+    def acquire(self) -> None:
+        """Start trusting caches if this is the first user."""
+        with self._lock:
+            self._users += 1
+            if self._users == 1:
+                self.start()
+
+    def release(self) -> None:
+        """Stop trusting caches when the last user releases the tracker."""
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users == 0:
+                self.stop()
+
+    def start(self) -> None:
+        """Record the current stamp and mark the root watched."""
+        if self._started:
+            return
+        self._identity = self._stamp_identity()
+        self._generation = get_change_feed(self.root).current_generation()
+        # Entries cached before this point stay untrusted until re-validated
+        self.bus.add_watched_root(self.root)
+        self._started = True
+
+    def stop(self) -> None:
+        """Stop trusting cached entries for the root."""
+        if not self._started:
+            return
+        self._started = False
+        self.bus.remove_watched_root(self.root)
+        # Entries trusted while watched would otherwise outlive the trust
+        self.bus.publish(self.root)
+
+    def sync(self) -> int:
+        """Publish paths changed by any process since the last sync.
+
+        A tracker stopped by a failed sync while still acquired is restarted
+        here, so trust returns once the stamp and journal can be read again.
+
+        Returns:
+            Number of paths published (0 when the stamp did not move)
+        """
+        if not self._started:
+            if not self._users:
+                return 0
+            with self._lock:
+                if self._users and not self._started:
+                    self.start()
+                    logger.info(f"Generation stamp tracking for {self.root} resumed")
+            return 0
+        identity = self._stamp_identity()
+        if identity == self._identity:
+            return 0
+
+        with self._lock:
+            if identity == self._identity:
+                return 0
+            self.syncs += 1
+            # Remember the stamp before reading, so a later write moves it again
+            self._identity = identity
+            feed = get_change_feed(self.root)
+            result = feed.changes_since(self._generation, collapse=False)
+            self._generation = result["generation"]
+            if result["resync_required"]:
+                self.bus.publish(self.root)
+                return 1
+            # Every path an entry touched, including both ends of each move
+            paths = set()
+            for change in result["changes"]:
+                paths.add(change["path"])
+                if change.get("old_path"):
+                    paths.add(change["old_path"])
+            for path in sorted(paths):
+                self.bus.publish(os.path.join(self.root, path))
+            return len(paths)
+
+    def _stamp_identity(self) -> StampIdentity:
+        """Stat the change journal."""
+        try:
+            stat_result = os.stat(self.stamp_path)
+        except FileNotFoundError:
+            return None
+        return (stat_result.st_ino, stat_result.st_size)
+
+
+class StampCoherenceMiddleware(Middleware):
+    """Run ``StampCoherence.sync`` before every request reaches a handler."""
+
+    def __init__(self, coherence: StampCoherence):
+        """Initialize the middleware.
+
+        Args:
+            coherence: Tracker to sync before each request
+        """
+        self.coherence = coherence
+
+    async def on_request(self, context: MiddlewareContext, call_next) -> Any:
+        """Sync the caches with other processes, then handle the request."""
+        try:
+            self.coherence.sync()
+        except Exception as e:
+            # Stop trusting rather than serve entries that may be stale; the
+            # next request's sync restarts tracking once the stamp reads again
+            logger.warning(f"Generation stamp sync for {self.coherence.root} failed: {e}")
+            self.coherence.stop()
+        return await call_next(context)
@@ -4,18 +4,19 @@ Provides the core function for validating and completing tasks that are
 in-progress or in review status.
 """
 
-import os
 from datetime import datetime, timezone
 from pathlib import Path
 
 from .dependency_resolver import is_unblocked
+from .done_tasks import iter_task_files
 from .exceptions.invalid_status_for_completion import InvalidStatusForCompletion
 from .exceptions.prerequisites_not_complete import PrerequisitesNotComplete
 from .object_parser import parse_object
 from .path_resolver import id_to_path, resolve_path_for_new_object, resolve_project_roots
 from .schema.status_enum import StatusEnum
 from .schema.task import TaskModel
-from .utils.io_utils import read_markdown, write_markdown
+from .utils.io_utils import MarkdownDocument
+from .wal import delete_action, journal_operation, write_action
 
 
 def complete_task(
@@ -30,7 +31,8 @@ def complete_task(
     for completion (in-progress or review) and that all its prerequisites
     are completed (status=done). Then moves the task file to tasks-done
     directory with timestamp prefix, updates status to 'done', and clears
-    the worktree field. If summary is provided, appends a log entry first.
+    the worktree field. If summary is provided, a log entry is appended in
+    the same write.
 
     Args:
         project_root: Root directory of the planning structure
@@ -105,13 +107,14 @@ def complete_task(
             f"prerequisites are not yet done"
         )
 
-    # Append log entry if summary is provided
-    if summary:
-        _append_log_entry(task_file_path, summary, files_changed or [])
-
     # Now actually complete the task by moving to tasks-done and updating status
     completed_task = _move_task_to_done(
-        original_project_root_path, task, task_file_path, clean_task_id
+        original_project_root_path,
+        task,
+        task_file_path,
+        clean_task_id,
+        summary=summary,
+        files_changed=files_changed or [],
     )
 
     # Check if parent feature should be updated to done status
@@ -121,24 +124,18 @@ def complete_task(
     return completed_task
 
 
-def _append_log_entry(task_file_path: Path, summary: str, files_changed: list[str]) -> None:
-    """Append a log entry to the task file.
+def _append_log_entry(document: MarkdownDocument, summary: str, files_changed: list[str]) -> None:
+    """Append a log entry to a loaded task document.
 
-    Reads the existing task file, finds the ### Log section, and appends
-    a new entry with timestamp, summary, and list of changed files.
+    Finds the ### Log section of the document body and appends a new entry
+    with timestamp, summary, and list of changed files. The document is not
+    written; the caller saves it together with its other changes.
 
     Args:
-        task_file_path: Path to the task markdown file
+        document: Loaded task document to modify
         summary: Summary text for the log entry
         files_changed: List of relative file paths that were changed
-
-    Raises:
-        OSError: If file operations fail
-        ValueError: If the file format is invalid
     """
-    # Read the current file content
-    yaml_dict, body = read_markdown(task_file_path)
-
     # Generate timestamp in ISO format with Z suffix
     timestamp = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
@@ -149,31 +146,35 @@ def _append_log_entry(task_file_path: Path, summary: str, files_changed: list[st
         log_entry += f"\n- filesChanged: [{files_list}]"
 
     # Find the ### Log section and append the entry
-    if "### Log" in body:
+    if "### Log" in document.body:
         # Append to existing log section
-        body += log_entry
+        document.body += log_entry
     else:
         # Add log section if it doesn't exist
-        body += f"\n\n### Log{log_entry}"
-
-    # Write the updated content back to the file
-    write_markdown(task_file_path, yaml_dict, body)
+        document.body += f"\n\n### Log{log_entry}"
 
 
 def _move_task_to_done(
-    project_root: Path, task: TaskModel, current_path: Path, clean_task_id: str
+    project_root: Path,
+    task: TaskModel,
+    current_path: Path,
+    clean_task_id: str,
+    summary: str = "",
+    files_changed: list[str] | None = None,
 ) -> TaskModel:
     """Move a task file to tasks-done directory and update status to done.
 
-    Reads the current task file, updates the YAML front-matter to set status=done
-    and clear worktree field, generates the destination path with timestamp prefix,
-    writes to new location, and removes the old file.
+    Loads the current task file once, appends the log entry when a summary is
+    given, sets status=done and clears the worktree field, then writes the file
+    in place and renames it to its timestamp-prefixed tasks-done path.
 
     Args:
         project_root: Root directory of the planning structure
         task: The current TaskModel object
         current_path: Current file path in tasks-open
         clean_task_id: Task ID without T- prefix
+        summary: Optional log entry summary
+        files_changed: Relative file paths listed in the log entry
 
     Returns:
         TaskModel: Updated task model with status=done
@@ -182,12 +183,15 @@ def _move_task_to_done(
         OSError: If file operations fail
         ValueError: If path resolution fails
     """
-    # Read current file content
-    yaml_dict, body = read_markdown(current_path)
+    # Read current file content (a parse cache hit after parse_object)
+    document = MarkdownDocument.load(current_path)
+
+    if summary:
+        _append_log_entry(document, summary, files_changed or [])
 
     # Update the YAML front-matter for completion
-    yaml_dict["status"] = "done"
-    yaml_dict["worktree"] = None
+    document.frontmatter["status"] = "done"
+    document.frontmatter["worktree"] = None
 
     # Get planning root for path resolution
     _, planning_root = resolve_project_roots(project_root)
@@ -213,14 +217,14 @@ def _move_task_to_done(
             status="done",
         )
 
-    # Ensure the destination directory exists
-    destination_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Write to new location with updated status
-    write_markdown(destination_path, yaml_dict, body)
-
-    # Remove the old file from tasks-open
-    os.remove(current_path)
+    # Write once and rename into tasks-done; the task moves, it is not new.
+    # The journal entry lets recovery finish the move if the process dies.
+    actions = [
+        write_action(planning_root, destination_path, document.render()),
+        delete_action(planning_root, current_path),
+    ]
+    with journal_operation(planning_root, "complete_task", actions):
+        document.move_to(destination_path, change="updated")
 
     # Create and return updated TaskModel
     updated_task = TaskModel(
@@ -288,8 +292,8 @@ def _get_all_feature_tasks(project_root: Path, feature_id: str) -> list[TaskMode
     # Scan tasks-done directory
     tasks_done_dir = feature_dir / "tasks-done"
     if tasks_done_dir.exists() and tasks_done_dir.is_dir():
-        for task_file in tasks_done_dir.iterdir():
-            if task_file.is_file() and task_file.name.endswith(".md"):
+        for task_file in iter_task_files(tasks_done_dir):
+            if task_file.name.endswith(".md"):
                 try:
                     task_obj = parse_object(task_file)
                     if isinstance(task_obj, TaskModel):
@@ -324,14 +328,14 @@ def _update_feature_status(project_root: Path, feature_id: str, new_status: str)
     # Find and load the feature
     _, planning_root = resolve_project_roots(project_root)
     feature_path = id_to_path(planning_root, "feature", clean_feature_id)
-    yaml_dict, body = read_markdown(feature_path)
+    document = MarkdownDocument.load(feature_path)
 
     # Update status and timestamp
-    yaml_dict["status"] = new_status
-    yaml_dict["updated"] = datetime.now(timezone.utc).isoformat()
+    document.frontmatter["status"] = new_status
+    document.frontmatter["updated"] = datetime.now(timezone.utc).isoformat()
 
     # Write back to file
-    write_markdown(feature_path, yaml_dict, body)
+    document.save()
 
 
 def _check_and_update_parent_feature_status(project_root: Path, parent_feature_id: str) -> None:
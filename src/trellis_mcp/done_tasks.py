@@ -0,0 +1,477 @@
+"""Layout of tasks-done directories and the done-task lookup index.
+
+Completed tasks are named ``<YYYYMMDD_HHMMSS>-T-<id>.md``. In the ``flat``
+layout they sit directly in ``tasks-done``; in the ``monthly`` layout they
+are sharded into ``tasks-done/YYYY-MM/`` by the timestamp in their name.
+Readers understand both layouts at once, so a tree can be migrated while in
+use and a half-migrated tree is still valid. The layout setting only decides
+where newly completed tasks are written.
+
+Finding a done task by ID used to list its whole ``tasks-done`` directory.
+``DoneTaskIndex`` keeps an ID-to-file map per ``tasks-done`` directory,
+validated by the modification times of the directory and its shards, so a
+lookup costs a dictionary access plus one ``stat`` per shard directory
+(none while a watcher covers the tree). While a watcher covers a planning
+root the index also keeps one ID-to-file map for the whole tree, so a done
+task is found without visiting the features at all.
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Iterator, Literal
+
+from .invalidation import get_invalidation_bus, is_watched
+
+DoneLayout = Literal["flat", "monthly"]
+
+DONE_LAYOUTS: tuple[DoneLayout, ...] = ("flat", "monthly")
+
+TASKS_DONE_DIR = "tasks-done"
+
+# Glob patterns, relative to a feature or planning directory, matching done tasks
+DONE_TASK_GLOBS = (f"{TASKS_DONE_DIR}/*-T-*.md", f"{TASKS_DONE_DIR}/*/*-T-*.md")
+
+_SHARD_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+_TIMESTAMP_PATTERN = re.compile(r"^(\d{4})(\d{2})\d{2}_\d{6}-T-")
+
+_layout: DoneLayout = "flat"
+
+
+def set_done_layout(layout: DoneLayout) -> None:
+    """Set the layout newly completed tasks are written in.
+
+    Args:
+        layout: 'flat' or 'monthly'
+
+    Raises:
+        ValueError: If the layout is unknown
+    """
+    global _layout
+    if layout not in DONE_LAYOUTS:
+        raise ValueError(
+            f"Unknown tasks-done layout '{layout}'; expected one of {', '.join(DONE_LAYOUTS)}"
+        )
+    _layout = layout
+
+
+def get_done_layout() -> DoneLayout:
+    """Get the layout newly completed tasks are written in.
+
+    Returns:
+        Current tasks-done layout
+    """
+    return _layout
+
+
+def is_done_task_name(name: str) -> bool:
+    """Check whether a file name is a completed task file."""
+    return name.endswith(".md") and "-T-" in name
+
+
+def is_shard_name(name: str) -> bool:
+    """Check whether a directory name is a monthly tasks-done shard."""
+    return bool(_SHARD_PATTERN.match(name))
+
+
+def shard_for(filename: str) -> str | None:
+    """Get the monthly shard a done task file belongs in.
+
+    Args:
+        filename: Done task file name with a timestamp prefix
+
+    Returns:
+        Shard directory name (YYYY-MM), or None if the name has no timestamp
+    """
+    match = _TIMESTAMP_PATTERN.match(filename)
+    if match is None:
+        return None
+    return f"{match.group(1)}-{match.group(2)}"
+
+
+def done_task_path(tasks_done_dir: Path, filename: str, layout: DoneLayout | None = None) -> Path:
+    """Build the path of a done task file in a tasks-done directory.
+
+    Args:
+        tasks_done_dir: The feature's or planning root's tasks-done directory
+        filename: Done task file name
+        layout: Layout to use (default: the configured layout)
+
+    Returns:
+        Path of the file, inside its shard for the monthly layout
+    """
+    if (layout or _layout) == "monthly":
+        shard = shard_for(filename)
+        if shard is not None:
+            return tasks_done_dir / shard / filename
+    return tasks_done_dir / filename
+
+
+def tasks_dir_of(path: str | Path) -> Path:
+    """Get the tasks-open or tasks-done directory a task file belongs to.
+
+    Args:
+        path: Task file path, possibly inside a monthly shard
+
+    Returns:
+        The tasks directory (the shard's parent for sharded files)
+    """
+    parent = Path(path).parent
+    if is_shard_name(parent.name) and parent.parent.name == TASKS_DONE_DIR:
+        return parent.parent
+    return parent
+
+
+def iter_task_files(task_dir: Path) -> Iterator[Path]:
+    """Yield the files of a tasks-open or tasks-done directory, including shards.
+
+    Args:
+        task_dir: Directory to list
+
+    Yields:
+        Paths of regular files directly in the directory or in its monthly shards
+    """
+    try:
+        entries = list(os.scandir(task_dir))
+    except (FileNotFoundError, NotADirectoryError):
+        return
+    for entry in entries:
+        if entry.is_file():
+            yield Path(entry.path)
+        elif entry.is_dir() and is_shard_name(entry.name):
+            try:
+                shard_entries = list(os.scandir(entry.path))
+            except FileNotFoundError:
+                continue
+            for shard_entry in shard_entries:
+                if shard_entry.is_file():
+                    yield Path(shard_entry.path)
+
+
+DirSignature = tuple[tuple[str, int], ...]  # (absolute directory, mtime in nanoseconds)
+
+
+class DoneTaskIndex:
+    """ID-to-file map for tasks-done directories.
+
+    Example:
+        >>> index = get_done_task_index()
+        >>> index.lookup(Path("planning/tasks-done"), "login")
+        PosixPath('planning/tasks-done/2025-07/20250715_103045-T-login.md')
+    """
+
+    def __init__(self):
+        """Initialize an empty index subscribed to the invalidation bus."""
+        # Maps are keyed by absolute directory and hold paths relative to it
+        self._entries: dict[str, tuple[DirSignature, dict[str, str]]] = {}
+        # Tree-wide maps are keyed by absolute planning root and hold absolute paths;
+        # they are only kept while a watcher reports every change below the root
+        self._trees: dict[str, dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+        get_invalidation_bus().subscribe(self.invalidate_path)
+
+    def lookup(self, tasks_done_dir: Path, clean_id: str) -> Path | None:
+        """Find the done file of a task in one tasks-done directory.
+
+        Args:
+            tasks_done_dir: Directory to look in
+            clean_id: Task ID without the T- prefix
+
+        Returns:
+            Path of the task's done file under ``tasks_done_dir``, or None if
+            the task has none there
+        """
+        key = os.path.abspath(tasks_done_dir)
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is None or not (is_watched(key) or _signature_matches(cached[0])):
+            cached = self._build(key)
+            with self._lock:
+                self._entries[key] = cached
+
+        relative = cached[1].get(clean_id)
+        return tasks_done_dir / relative if relative is not None else None
+
+    def lookup_tree(self, planning_root: Path, clean_id: str) -> Path | None:
+        """Find the done file of a task in any tasks-done directory of a planning tree.
+
+        While the root is watched this is a dictionary access on a map kept
+        current from the invalidation bus. Otherwise every tasks-done
+        directory is looked up in turn.
+
+        Args:
+            planning_root: Planning directory
+            clean_id: Task ID without the T- prefix
+
+        Returns:
+            Path of the task's done file, or None if the task is not done
+        """
+        key = os.path.abspath(planning_root)
+        if not is_watched(key):
+            for tasks_done_dir in find_tasks_done_dirs(Path(key)):
+                done_task = self.lookup(tasks_done_dir, clean_id)
+                if done_task is not None:
+                    return done_task
+            return None
+
+        with self._lock:
+            ids = self._trees.get(key)
+        if ids is None:
+            ids = {}
+            for tasks_done_dir in find_tasks_done_dirs(Path(key)):
+                directory = str(tasks_done_dir)
+                with self._lock:
+                    cached = self._entries.get(directory)
+                if cached is None or not _signature_matches(cached[0]):
+                    # Maps cached before the watch started may be stale
+                    cached = self._build(directory)
+                    with self._lock:
+                        self._entries[directory] = cached
+                for task_id, relative in cached[1].items():
+                    _keep_latest(ids, task_id, os.path.join(directory, relative))
+            with self._lock:
+                self._trees[key] = ids
+
+        path = ids.get(clean_id)
+        return Path(path) if path is not None else None
+
+    def invalidate_path(self, path: str) -> None:
+        """Update index entries for a changed path (invalidation bus listener).
+
+        A done task file written or removed by Trellis is applied to its
+        directory's map in place, so completing a task does not force the
+        next lookup to list the directory again. Any other change below an
+        indexed directory drops its map.
+
+        Args:
+            path: Changed file, or directory whose contents may have changed
+        """
+        with self._lock:
+            for key in list(self._trees):
+                if path == key or key.startswith(path + os.sep):
+                    del self._trees[key]
+                elif path.startswith(key + os.sep) and not self._apply_tree_change(key, path):
+                    del self._trees[key]
+            for key in list(self._entries):
+                if path == key or key.startswith(path + os.sep):
+                    del self._entries[key]
+                elif path.startswith(key + os.sep):
+                    if not self._apply_file_change(key, path):
+                        del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every index entry."""
+        with self._lock:
+            self._entries.clear()
+            self._trees.clear()
+
+    def _apply_tree_change(self, key: str, path: str) -> bool:
+        """Apply a change below a planning root to its tree map. Lock must be held.
+
+        Returns:
+            False if the change cannot be applied in place
+        """
+        name = os.path.basename(path)
+        if not is_done_task_name(name) or tasks_dir_of(path).name != TASKS_DONE_DIR:
+            # Other object files never hold a done task; directories may hold many
+            return name.endswith(".md")
+        ids = self._trees[key]
+        task_id = _task_id(name)
+        if os.path.isfile(path):
+            _keep_latest(ids, task_id, path)
+            return True
+        # An older completion of the same task may still exist
+        return ids.get(task_id) != path
+
+    def _apply_file_change(self, key: str, path: str) -> bool:
+        """Apply a done task file change to one map. Lock must be held.
+
+        Returns:
+            False if the change cannot be applied in place
+        """
+        name = os.path.basename(path)
+        if not is_done_task_name(name) or str(tasks_dir_of(path)) != key:
+            return False
+        signature, ids = self._entries[key]
+        task_id = _task_id(name)
+        relative = os.path.relpath(path, key)
+
+        directories = {directory for directory, _ in signature}
+        if os.path.isfile(path):
+            _keep_latest(ids, task_id, relative)
+            directories.add(os.path.dirname(path))  # May be a new shard
+        elif ids.get(task_id) == relative:
+            del ids[task_id]
+
+        # The write changed the directory mtimes; record the new ones
+        try:
+            refreshed = tuple(
+                (directory, os.stat(directory).st_mtime_ns) for directory in sorted(directories)
+            )
+        except FileNotFoundError:
+            return False
+        self._entries[key] = (refreshed, ids)
+        return True
+
+    def _build(self, key: str) -> tuple[DirSignature, dict[str, str]]:
+        """List a tasks-done directory and its shards into an ID map."""
+        self.builds += 1
+        ids: dict[str, str] = {}
+        try:
+            signature = [(key, os.stat(key).st_mtime_ns)]
+            entries = list(os.scandir(key))
+        except (FileNotFoundError, NotADirectoryError):
+            return ((key, -1),), ids
+
+        for entry in entries:
+            if entry.is_dir() and is_shard_name(entry.name):
+                signature.append((entry.path, entry.stat().st_mtime_ns))
+                for shard_entry in os.scandir(entry.path):
+                    if is_done_task_name(shard_entry.name) and shard_entry.is_file():
+                        relative = os.path.join(entry.name, shard_entry.name)
+                        _keep_latest(ids, _task_id(shard_entry.name), relative)
+            elif is_done_task_name(entry.name) and entry.is_file():
+                _keep_latest(ids, _task_id(entry.name), entry.name)
+        return tuple(signature), ids
+
+
+def _task_id(name: str) -> str:
+    """Extract the task ID from a done task file name."""
+    return name[name.rfind("-T-") + 3 : -3]
+
+
+def _keep_latest(ids: dict[str, str], task_id: str, relative: str) -> None:
+    """Map a task to a file, keeping the latest completion if it has several."""
+    current = ids.get(task_id)
+    if current is None or os.path.basename(current) <= os.path.basename(relative):
+        ids[task_id] = relative
+
+
+def _signature_matches(signature: DirSignature) -> bool:
+    """Check that none of the indexed directories changed."""
+    for directory, mtime_ns in signature:
+        try:
+            if os.stat(directory).st_mtime_ns != mtime_ns:
+                return False
+        except FileNotFoundError:
+            if mtime_ns != -1:
+                return False
+    return True
+
+
+_done_task_index: DoneTaskIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_done_task_index() -> DoneTaskIndex:
+    """Get the process-wide done-task index.
+
+    Returns:
+        The shared DoneTaskIndex instance
+    """
+    global _done_task_index
+    if _done_task_index is None:
+        with _index_lock:
+            if _done_task_index is None:
+                _done_task_index = DoneTaskIndex()
+    return _done_task_index
+
+
+def find_done_task(tasks_done_dir: Path, clean_id: str) -> Path | None:
+    """Find a task's done file in a tasks-done directory through the index.
+
+    Args:
+        tasks_done_dir: Directory to look in
+        clean_id: Task ID without the T- prefix
+
+    Returns:
+        Path of the done file, or None
+    """
+    return get_done_task_index().lookup(tasks_done_dir, clean_id)
+
+
+def find_done_task_in_tree(planning_root: Path, clean_id: str) -> Path | None:
+    """Find a task's done file anywhere in a planning tree through the index.
+
+    Args:
+        planning_root: Planning directory
+        clean_id: Task ID without the T- prefix
+
+    Returns:
+        Path of the done file, or None
+    """
+    return get_done_task_index().lookup_tree(planning_root, clean_id)
+
+
+def find_tasks_done_dirs(planning_root: Path) -> list[Path]:
+    """List every tasks-done directory of a planning tree.
+
+    Args:
+        planning_root: Planning directory
+
+    Returns:
+        The root tasks-done directory and each feature's, where they exist
+    """
+    candidates = [planning_root / TASKS_DONE_DIR]
+    candidates.extend(
+        sorted(planning_root.glob(f"projects/P-*/epics/E-*/features/F-*/{TASKS_DONE_DIR}"))
+    )
+    return [path for path in candidates if path.is_dir()]
+
+
+def migrate_done_layout(
+    planning_root: Path, layout: DoneLayout, dry_run: bool = False
+) -> list[tuple[Path, Path]]:
+    """Move every done task file into the given layout.
+
+    Each file is moved with a single rename, and readers accept both
+    layouts, so the tree stays valid if the migration is interrupted or runs
+    while servers are using it.
+
+    Args:
+        planning_root: Planning directory
+        layout: Target layout
+        dry_run: If True, only report the moves
+
+    Returns:
+        List of (source, destination) pairs moved (or to be moved)
+
+    Raises:
+        ValueError: If the layout is unknown
+    """
+    from .change_feed import record_change
+    from .durability import sync_directory
+
+    if layout not in DONE_LAYOUTS:
+        raise ValueError(
+            f"Unknown tasks-done layout '{layout}'; expected one of {', '.join(DONE_LAYOUTS)}"
+        )
+
+    moves: list[tuple[Path, Path]] = []
+    for tasks_done_dir in find_tasks_done_dirs(planning_root):
+        for source in sorted(iter_task_files(tasks_done_dir)):
+            if not is_done_task_name(source.name):
+                continue
+            destination = done_task_path(tasks_done_dir, source.name, layout)
+            if destination == source or destination.exists():
+                continue
+            moves.append((source, destination))
+            if dry_run:
+                continue
+            destination.parent.mkdir(exist_ok=True)
+            os.replace(source, destination)
+            sync_directory(destination.parent)
+            sync_directory(source.parent)
+            record_change(destination, "updated", old_path=source)
+
+        if not dry_run and layout == "flat":
+            # Drop shards the migration emptied
+            for entry in os.scandir(tasks_done_dir):
+                if entry.is_dir() and is_shard_name(entry.name):
+                    try:
+                        os.rmdir(entry.path)
+                    except OSError:
+                        pass  # Not empty
+    return moves
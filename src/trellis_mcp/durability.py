@@ -0,0 +1,270 @@
+"""Durability modes for writes to planning files.
+
+Every object file is written to a temporary file and renamed over its target,
+so readers never see a partially written file. How much is flushed to stable
+storage around that rename depends on the durability mode:
+
+- ``strict`` (default): the temporary file is fsynced before the rename and
+  the directory is fsynced after it, so a write is durable, including its
+  directory entry, when the call returns.
+- ``group``: writes made during one operation (one MCP tool call) skip the
+  per-file fsync. When the operation ends, everything it wrote is committed
+  with a single ``syncfs`` of the planning filesystem, or a set of file and
+  directory fsyncs where ``syncfs`` is unavailable. Writes made outside an
+  operation behave as in ``strict``.
+- ``relaxed``: nothing is fsynced; the operating system flushes in its own
+  time.
+
+In every mode each rename is atomic, so a crash of the process leaves each
+file at either its old or its new content. ``group`` only widens the window
+in which a power loss can drop writes of an operation that has not returned
+yet; once a tool call returns its writes are as durable as in ``strict``.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Iterator, Literal
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+DurabilityMode = Literal["strict", "group", "relaxed"]
+
+DURABILITY_MODES: tuple[DurabilityMode, ...] = ("strict", "group", "relaxed")
+
+_mode: DurabilityMode = "strict"
+
+
+class CommitGroup:
+    """Files and directories written by one operation, flushed together.
+
+    Example:
+        >>> with commit_group() as group:
+        ...     write_markdown(first_path, first_yaml, first_body)
+        ...     write_markdown(second_path, second_yaml, second_body)
+        >>> group.committed
+        True
+    """
+
+    def __init__(self):
+        """Initialize an empty group."""
+        self.files: set[str] = set()
+        self.directories: set[str] = set()
+        self.committed = False
+        self._after_commit: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def add(self, file_path: str | Path | None = None, directory: str | Path | None = None) -> None:
+        """Record a written file or a changed directory.
+
+        Args:
+            file_path: File whose data must reach storage at commit
+            directory: Directory whose entries changed
+        """
+        with self._lock:
+            if file_path is not None:
+                self.files.add(os.path.abspath(file_path))
+            if directory is not None:
+                self.directories.add(os.path.abspath(directory))
+
+    def call_after_commit(self, callback: Callable[[], None]) -> None:
+        """Run a callback once the group's writes are on stable storage.
+
+        Args:
+            callback: Called after a successful commit (e.g. to drop a journal entry)
+        """
+        with self._lock:
+            self._after_commit.append(callback)
+
+    def commit(self) -> None:
+        """Flush everything recorded in the group to stable storage.
+
+        Raises:
+            OSError: If a file or directory cannot be synced
+        """
+        with self._lock:
+            files, self.files = self.files, set()
+            directories, self.directories = self.directories, set()
+            callbacks, self._after_commit = self._after_commit, []
+            self.committed = True
+        self._flush(files, directories)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Post-commit callback failed: {e}")
+
+    def _flush(self, files: set[str], directories: set[str]) -> None:
+        """Sync the given files and directories, preferring one syncfs per filesystem."""
+        if not files and not directories:
+            return
+
+        # syncfs flushes data and metadata of the whole filesystem in one call
+        synced_devices: set[int] = set()
+        for directory in sorted(directories):
+            try:
+                device = os.stat(directory).st_dev
+            except FileNotFoundError:
+                continue
+            if device not in synced_devices and _syncfs(directory):
+                synced_devices.add(device)
+        if synced_devices:
+            files = {path for path in files if not _on_devices(path, synced_devices)}
+            directories = {path for path in directories if not _on_devices(path, synced_devices)}
+
+        for file_path in sorted(files):
+            _fsync_path(file_path)
+        for directory in sorted(directories):
+            _fsync_path(directory)
+
+
+_active_group: ContextVar[CommitGroup | None] = ContextVar("trellis_commit_group", default=None)
+
+
+def active_commit_group() -> CommitGroup | None:
+    """Get the commit group writes are currently deferred to, if any.
+
+    Returns:
+        The active group in group mode, otherwise None
+    """
+    return _active_group.get() if _mode == "group" else None
+
+
+def set_durability_mode(mode: DurabilityMode) -> None:
+    """Set the durability mode for this process.
+
+    Args:
+        mode: One of 'strict', 'group' or 'relaxed'
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    global _mode
+    if mode not in DURABILITY_MODES:
+        raise ValueError(
+            f"Unknown durability mode '{mode}'; expected one of {', '.join(DURABILITY_MODES)}"
+        )
+    _mode = mode
+
+
+def get_durability_mode() -> DurabilityMode:
+    """Get the durability mode for this process.
+
+    Returns:
+        Current durability mode
+    """
+    return _mode
+
+
+@contextmanager
+def commit_group() -> Iterator[CommitGroup]:
+    """Group the writes of the enclosed block into one commit.
+
+    Nested groups join the outermost one. The group is committed when the
+    block exits, also when it raises, so that whatever was written is durable.
+
+    Yields:
+        The active commit group
+    """
+    outer = _active_group.get()
+    if outer is not None:
+        yield outer
+        return
+
+    group = CommitGroup()
+    token = _active_group.set(group)
+    try:
+        yield group
+    finally:
+        _active_group.reset(token)
+        group.commit()
+
+
+def sync_file(fd: int, path: str | Path) -> None:
+    """Flush a written temporary file before it is renamed into place.
+
+    Args:
+        fd: Open file descriptor of the temporary file
+        path: Final path of the file
+    """
+    if _mode == "relaxed":
+        return
+    group = active_commit_group()
+    if group is None:
+        os.fsync(fd)
+    else:
+        group.add(file_path=path)
+
+
+def sync_directory(directory: str | Path) -> None:
+    """Flush a directory after a file in it was created, renamed or removed.
+
+    Args:
+        directory: Directory whose entries changed
+    """
+    if _mode == "relaxed":
+        return
+    group = active_commit_group()
+    if group is None:
+        _fsync_path(directory)
+    else:
+        group.add(directory=directory)
+
+
+def _fsync_path(path: str | Path) -> None:
+    """Open a file or directory read-only and fsync it."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return  # Removed since it was written; its directory carries the change
+    try:
+        os.fsync(fd)
+    except OSError as e:
+        # Some filesystems refuse fsync on directories
+        if not os.path.isdir(path):
+            raise
+        logger.debug(f"Directory fsync not supported for {path}: {e}")
+    finally:
+        os.close(fd)
+
+
+def _on_devices(path: str, devices: set[int]) -> bool:
+    """Check whether a path lives on one of the given devices."""
+    try:
+        return os.stat(path).st_dev in devices
+    except FileNotFoundError:
+        return True  # Nothing left to flush
+
+
+_libc: Any = None
+
+
+def _syncfs(path: str) -> bool:
+    """Flush the filesystem containing a path with ``syncfs``.
+
+    Returns:
+        True if the filesystem was synced, False if ``syncfs`` is unavailable
+    """
+    global _libc
+    if _libc is None:
+        try:
+            _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        except OSError:
+            _libc = False
+    if not _libc or not hasattr(_libc, "syncfs"):
+        return False
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if _libc.syncfs(fd) != 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"syncfs failed for {path}: {os.strerror(err)}")
+    finally:
+        os.close(fd)
+    return True
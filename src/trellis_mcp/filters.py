@@ -3,6 +3,7 @@
 from pathlib import Path
 from typing import Iterator
 
+from .done_tasks import iter_task_files
 from .inference import KindInferenceEngine
 from .markdown_loader import load_markdown
 from .models.filter_params import FilterParams
@@ -104,8 +105,8 @@ def filter_by_scope(root: Path, scope_id: str) -> Iterator[TaskModel]:
                         if not task_dir.exists() or not task_dir.is_dir():
                             continue
 
-                        for task_file in task_dir.iterdir():
-                            if not task_file.is_file() or not task_file.name.endswith(".md"):
+                        for task_file in iter_task_files(task_dir):
+                            if not task_file.name.endswith(".md"):
                                 continue
 
                             # Security check: ensure file is within project root
@@ -144,8 +145,8 @@ def filter_by_scope(root: Path, scope_id: str) -> Iterator[TaskModel]:
             if not task_dir.exists() or not task_dir.is_dir():
                 continue
 
-            for task_file in task_dir.iterdir():
-                if not task_file.is_file() or not task_file.name.endswith(".md"):
+            for task_file in iter_task_files(task_dir):
+                if not task_file.name.endswith(".md"):
                     continue
 
                 # Security check: ensure file is within project root
@@ -0,0 +1,501 @@
+"""Filesystem watcher that publishes external planning changes to the caches.
+
+Planning files are also edited outside the server (editors, ``git checkout``,
+the CLI in another process). Without a watcher every cache has to re-stat
+files on each read to notice those edits. The watcher publishes every changed
+markdown file and directory on the invalidation bus. The inotify backend also
+marks the planning root as watched, which lets caches serve warm reads without
+any ``stat`` call.
+
+Two backends are available:
+
+- ``InotifyWatcher`` uses Linux inotify through ``ctypes``, with one watch per
+  directory of the planning tree (new directories are added as they appear)
+- ``PollingWatcher`` is the fallback for other platforms and filesystems
+  without inotify support (some network and container mounts). It sweeps
+  directory mtimes and only re-stats the files of directories that changed,
+  plus a full file sweep every few intervals to catch in-place edits. Its
+  changes arrive up to a few sweeps late, so it publishes them without marking
+  the root as watched and caches keep validating entries with ``stat``
+
+Hidden entries (such as the ``.trellis`` change journal) and non-markdown
+files (such as temp files from atomic writes) are ignored.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Literal
+
+from .invalidation import InvalidationBus, get_invalidation_bus
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+WatcherBackend = Literal["inotify", "polling"]
+
+# inotify event masks from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+# Every Nth polling sweep re-stats all files, not only those in changed directories
+DEFAULT_FULL_SWEEP_EVERY = 5
+
+
+def _load_libc() -> ctypes.CDLL:
+    """Load the C library with inotify bindings.
+
+    Raises:
+        OSError: If the C library has no inotify support
+    """
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError(errno.ENOSYS, "inotify is not available")
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+def inotify_available() -> bool:
+    """Check whether an inotify instance can be created on this system.
+
+    Returns:
+        True if ``inotify_init1`` succeeds
+    """
+    try:
+        libc = _load_libc()
+    except OSError:
+        return False
+    fd = libc.inotify_init1(IN_CLOEXEC)
+    if fd < 0:
+        return False
+    os.close(fd)
+    return True
+
+
+def _is_relevant(name: str) -> bool:
+    """Check whether a directory entry can affect cached planning data."""
+    return not name.startswith(".")
+
+
+class PlanningWatcher(ABC):
+    """Base class for watchers that publish changes below a planning root.
+
+    Subclasses implement ``_open`` (set up before the root is marked watched),
+    ``_loop`` (run on the background thread until ``_stop_event`` is set) and
+    optionally ``_wake`` and ``_close``. Start and stop are reference counted
+    so that every server session can acquire the watcher and the last one to
+    leave stops it.
+    """
+
+    backend: WatcherBackend
+    # Whether every change is published promptly enough for caches to skip stat
+    trusted: bool = True
+
+    def __init__(self, root: str | Path, bus: InvalidationBus | None = None):
+        """Initialize the watcher.
+
+        Args:
+            root: Planning directory to watch recursively
+            bus: Invalidation bus to publish on (default: the global bus)
+        """
+        self.root = os.path.abspath(root)
+        self.bus = bus or get_invalidation_bus()
+        self.events = 0
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._users = 0
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """True while the background thread is watching."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def acquire(self) -> None:
+        """Start watching if this is the first user."""
+        with self._lock:
+            self._users += 1
+            if self._users == 1:
+                self.start()
+
+    def release(self) -> None:
+        """Stop watching when the last user releases the watcher."""
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users == 0:
+                self.stop()
+
+    def start(self) -> None:
+        """Set up watches and start the background thread.
+
+        Raises:
+            OSError: If the backend cannot watch the root
+        """
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._open()
+        if self.trusted:
+            # Entries cached before this point stay untrusted until re-validated
+            self.bus.add_watched_root(self.root)
+        self._thread = threading.Thread(
+            target=self._run, name=f"trellis-{self.backend}-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background thread and stop trusting cached entries.
+
+        Args:
+            timeout: Seconds to wait for the thread to exit
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._wake()
+        self._thread.join(timeout)
+        self._thread = None
+        if self.trusted:
+            self.bus.remove_watched_root(self.root)
+            # Entries trusted while watched would otherwise outlive the watch
+            self.bus.publish(self.root)
+        self._close()
+
+    def _run(self) -> None:
+        """Thread body; a crashed loop stops trusting the caches."""
+        try:
+            self._loop()
+        except Exception as e:
+            logger.warning(f"{self.backend} watcher for {self.root} stopped: {e}")
+            if self.trusted:
+                self.bus.remove_watched_root(self.root)
+                self.bus.publish(self.root)
+
+    def _publish(self, path: str) -> None:
+        """Publish one changed path."""
+        self.events += 1
+        self.bus.publish(path)
+
+    @abstractmethod
+    def _open(self) -> None:
+        """Prepare the backend (called before the root is marked watched)."""
+
+    @abstractmethod
+    def _loop(self) -> None:
+        """Watch until ``_stop_event`` is set."""
+
+    def _wake(self) -> None:
+        """Interrupt a blocking wait in ``_loop``."""
+
+    def _close(self) -> None:
+        """Release backend resources."""
+
+
+class InotifyWatcher(PlanningWatcher):
+    """Watch a planning tree with Linux inotify.
+
+    Example:
+        >>> watcher = InotifyWatcher("/repo/planning")
+        >>> watcher.start()
+        >>> # ... caches now skip stat validation below /repo/planning
+        >>> watcher.stop()
+    """
+
+    backend: WatcherBackend = "inotify"
+
+    def __init__(self, root: str | Path, bus: InvalidationBus | None = None):
+        """Initialize the watcher.
+
+        Args:
+            root: Planning directory to watch recursively
+            bus: Invalidation bus to publish on (default: the global bus)
+
+        Raises:
+            OSError: If inotify is not available on this platform
+        """
+        super().__init__(root, bus)
+        self._libc = _load_libc()
+        self._fd = -1
+        self._wake_r = -1
+        self._wake_w = -1
+        self._dirs: dict[int, str] = {}
+
+    def _open(self) -> None:
+        """Create the inotify instance and watch every directory of the tree."""
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+        self._fd = fd
+        self._wake_r, self._wake_w = os.pipe()
+        self._dirs = {}
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            self._add_tree(self.root)
+        except OSError:
+            self._close()
+            raise
+
+    def _add_tree(self, directory: str) -> None:
+        """Add watches for a directory and all of its visible subdirectories."""
+        self._add_watch(directory)
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in entries:
+            if _is_relevant(entry.name) and entry.is_dir(follow_symlinks=False):
+                self._add_tree(entry.path)
+
+    def _add_watch(self, directory: str) -> None:
+        """Add a single directory watch.
+
+        Raises:
+            OSError: If the watch limit is reached (other failures are ignored
+                because the directory may already be gone)
+        """
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "inotify watch limit reached (fs.inotify.max_user_watches)")
+            return
+        self._dirs[wd] = directory
+
+    def _loop(self) -> None:
+        """Read and dispatch events until stopped."""
+        while not self._stop_event.is_set():
+            readable, _, _ = select.select([self._fd, self._wake_r], [], [])
+            if self._stop_event.is_set():
+                return
+            if self._fd not in readable:
+                continue
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                continue
+            self._dispatch(data)
+
+    def _dispatch(self, data: bytes) -> None:
+        """Translate a buffer of inotify events into published paths."""
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; everything below the root is suspect
+                self._publish(self.root)
+                continue
+
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                # Watch removed because the directory was deleted or moved away
+                self._dirs.pop(wd, None)
+                continue
+            if not raw_name:
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    self._publish(directory)
+                continue
+
+            name = os.fsdecode(raw_name)
+            if not _is_relevant(name):
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may already exist in the new directory before it is watched
+                    self._add_tree(path)
+                self._publish(path)
+            elif name.endswith(".md"):
+                self._publish(path)
+
+    def _wake(self) -> None:
+        """Wake the select call in ``_loop``."""
+        if self._wake_w >= 0:
+            os.write(self._wake_w, b"\0")
+
+    def _close(self) -> None:
+        """Close the inotify instance and the wake pipe."""
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            if fd >= 0:
+                os.close(fd)
+        self._fd = self._wake_r = self._wake_w = -1
+        self._dirs = {}
+
+
+class PollingWatcher(PlanningWatcher):
+    """Watch a planning tree by sweeping directory mtimes.
+
+    Creating, deleting or renaming a file updates its directory's mtime, which
+    covers Trellis' own atomic writes and git checkouts. In-place edits only
+    change the file itself and are caught by the periodic full sweep. Because
+    of that delay the root is not marked watched: caches keep validating their
+    entries with ``stat`` and the published paths only drive notifications.
+    """
+
+    backend: WatcherBackend = "polling"
+    trusted = False
+
+    def __init__(
+        self,
+        root: str | Path,
+        bus: InvalidationBus | None = None,
+        interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        full_sweep_every: int = DEFAULT_FULL_SWEEP_EVERY,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            root: Planning directory to watch recursively
+            bus: Invalidation bus to publish on (default: the global bus)
+            interval: Seconds between sweeps
+            full_sweep_every: Re-stat every file on every Nth sweep (0 disables)
+        """
+        super().__init__(root, bus)
+        self.interval = interval
+        self.full_sweep_every = full_sweep_every
+        self._dir_mtimes: dict[str, int] = {}
+        self._file_sigs: dict[str, dict[str, tuple[int, int, int]]] = {}
+
+    def _open(self) -> None:
+        """Record the initial state of the tree."""
+        self._dir_mtimes = self._scan_dirs()
+        self._file_sigs = {directory: self._scan_files(directory) for directory in self._dir_mtimes}
+
+    def _loop(self) -> None:
+        """Sweep until stopped."""
+        sweeps = 0
+        while not self._stop_event.wait(self.interval):
+            sweeps += 1
+            full = self.full_sweep_every > 0 and sweeps % self.full_sweep_every == 0
+            self.sweep(full=full)
+
+    def sweep(self, full: bool = False) -> None:
+        """Compare the tree with the last sweep and publish differences.
+
+        Args:
+            full: Re-stat the files of every directory, not only changed ones
+        """
+        dir_mtimes = self._scan_dirs()
+
+        for directory in self._dir_mtimes.keys() - dir_mtimes.keys():
+            # Directory removed: drop everything cached below it
+            self._file_sigs.pop(directory, None)
+            self._publish(directory)
+
+        for directory, mtime in dir_mtimes.items():
+            if not full and self._dir_mtimes.get(directory) == mtime:
+                continue
+            old = self._file_sigs.get(directory, {})
+            new = self._scan_files(directory)
+            for name in old.keys() | new.keys():
+                if old.get(name) != new.get(name):
+                    self._publish(os.path.join(directory, name))
+            self._file_sigs[directory] = new
+
+        self._dir_mtimes = dir_mtimes
+
+    def _scan_dirs(self) -> dict[str, int]:
+        """Collect the mtime of every visible directory below the root."""
+        found: dict[str, int] = {}
+        pending = [self.root]
+        while pending:
+            directory = pending.pop()
+            try:
+                found[directory] = os.stat(directory).st_mtime_ns
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if _is_relevant(entry.name) and entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+        return found
+
+    def _scan_files(self, directory: str) -> dict[str, tuple[int, int, int]]:
+        """Collect the signature of every markdown file in one directory."""
+        signatures: dict[str, tuple[int, int, int]] = {}
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return signatures
+        for entry in entries:
+            if not entry.name.endswith(".md") or not _is_relevant(entry.name):
+                continue
+            try:
+                stat_result = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            signatures[entry.name] = (
+                stat_result.st_ino,
+                stat_result.st_mtime_ns,
+                stat_result.st_size,
+            )
+        return signatures
+
+
+def create_watcher(
+    root: str | Path,
+    backend: Literal["auto", "inotify", "polling"] = "auto",
+    poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+    bus: InvalidationBus | None = None,
+) -> PlanningWatcher:
+    """Create a watcher for a planning root, preferring inotify.
+
+    Args:
+        root: Planning directory to watch
+        backend: "inotify", "polling", or "auto" to use inotify when available
+        poll_interval: Seconds between sweeps for the polling backend
+        bus: Invalidation bus to publish on (default: the global bus)
+
+    Returns:
+        An unstarted watcher
+
+    Raises:
+        OSError: If ``backend="inotify"`` and inotify is not available
+    """
+    if backend == "inotify" or (backend == "auto" and inotify_available()):
+        return InotifyWatcher(root, bus)
+    if backend == "auto":
+        logger.info(f"inotify unavailable; polling {root} for changes")
+    return PollingWatcher(root, bus, interval=poll_interval)
@@ -0,0 +1,496 @@
+"""In-memory ID index for resolving misspelled and truncated object IDs.
+
+Agents often send IDs that are close to, but not, a real one: ``T-impl-auth``
+for ``T-implement-auth``, or a typo. Finding that out used to cost a full
+``find_object_path`` walk, and the agent got no help with the retry.
+
+``IdIndex`` keeps a prefix trie of the IDs of each kind per planning
+directory. IDs are read from directory and file names only (as
+``find_object_path`` does), so building the index lists the tree's
+directories once and parses no files. Afterwards:
+
+- Paths published on the invalidation bus re-list only their directory.
+- Without a watcher, each lookup also compares the modification time of every
+  listed directory, since adding, removing or renaming an object always
+  changes its directory's; only changed directories are listed again.
+
+Lookups then return exact matches, completions (each hyphen-separated part
+of the query may be the start of the matching part, so ``impl-auth`` finds
+``implement-auth``) and IDs within a small edit distance.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal, TypedDict
+
+from .done_tasks import is_done_task_name, is_shard_name
+from .invalidation import get_invalidation_bus, is_under, is_watched
+from .storage.base import KIND_PREFIXES
+
+MatchType = Literal["exact", "prefix", "similar"]
+
+_MATCH_ORDER: dict[str, int] = {"exact": 0, "prefix": 1, "similar": 2}
+
+# Directories modified this recently are listed again on the next check, since a
+# further change within the filesystem's mtime granularity would not move the mtime
+_RACY_WINDOW_NS = 1_000_000_000
+
+# Role of each subdirectory name below a directory of the given role
+_CHILD_DIRS = {
+    "root": {"projects": "projects", "tasks-open": "tasks-open", "tasks-done": "tasks-done"},
+    "project": {"epics": "epics"},
+    "epic": {"features": "features"},
+    "feature": {"tasks-open": "tasks-open", "tasks-done": "tasks-done"},
+}
+
+# Object directory prefix and role below each container directory
+_CONTAINERS = {
+    "projects": ("P-", "project"),
+    "epics": ("E-", "epic"),
+    "features": ("F-", "feature"),
+}
+
+
+class IdMatch(TypedDict):
+    """One candidate for a looked-up ID."""
+
+    id: str  # Prefixed object ID
+    kind: str  # Object kind
+    match: str  # 'exact', 'prefix' or 'similar'
+    distance: int  # Edit distance from the looked-up ID
+
+
+class _Node:
+    """Trie node; ``count`` is the number of times the word ending here was added."""
+
+    __slots__ = ("children", "count")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.count = 0
+
+
+class IdTrie:
+    """Prefix trie of IDs with completion and edit-distance search.
+
+    Words are reference counted, so an ID present in two places stays until
+    both are removed.
+
+    Example:
+        >>> trie = IdTrie()
+        >>> trie.add("implement-auth")
+        >>> trie.complete("impl-auth")
+        ['implement-auth']
+        >>> trie.similar("implemnt-auth", 2)
+        [('implement-auth', 1)]
+    """
+
+    def __init__(self):
+        """Initialize an empty trie."""
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Get the number of distinct words."""
+        return self._size
+
+    def __contains__(self, word: object) -> bool:
+        """Check whether a word was added."""
+        if not isinstance(word, str):
+            return False
+        node = self._find(word)
+        return node is not None and node.count > 0
+
+    def add(self, word: str) -> None:
+        """Add a word, or one more reference to it."""
+        node = self._root
+        for char in word:
+            node = node.children.setdefault(char, _Node())
+        if node.count == 0:
+            self._size += 1
+        node.count += 1
+
+    def discard(self, word: str) -> None:
+        """Drop one reference to a word, pruning nodes no longer used."""
+        path = [self._root]
+        for char in word:
+            child = path[-1].children.get(char)
+            if child is None:
+                return
+            path.append(child)
+        if path[-1].count == 0:
+            return
+        path[-1].count -= 1
+        if path[-1].count:
+            return
+        self._size -= 1
+        for depth in range(len(word), 0, -1):
+            node = path[depth]
+            if node.count or node.children:
+                break
+            del path[depth - 1].children[word[depth - 1]]
+
+    def complete(self, query: str) -> list[str]:
+        """Find the words that complete a query part by part.
+
+        Each hyphen-separated part of the query must start the corresponding
+        part of the word, and the word may continue with more parts, so
+        ``impl-auth`` completes to ``implement-auth`` and ``impl-auth-flow``.
+
+        Args:
+            query: Start of a word, possibly with shortened parts
+
+        Returns:
+            Matching words in no particular order
+        """
+        words: list[str] = []
+        # (node, word so far, position in query, whether skipping the rest of a word part)
+        stack = [(self._root, "", 0, False)]
+        while stack:
+            node, word, position, skipping = stack.pop()
+            if position == len(query):
+                words.extend(self._words(node, word))
+                continue
+            for char, child in node.children.items():
+                if skipping:
+                    if char == "-":
+                        stack.append((child, word + char, position + 1, False))
+                    else:
+                        stack.append((child, word + char, position, True))
+                elif char == query[position]:
+                    stack.append((child, word + char, position + 1, False))
+                elif query[position] == "-":
+                    stack.append((child, word + char, position, True))
+        return words
+
+    def similar(self, query: str, max_distance: int) -> list[tuple[str, int]]:
+        """Find the words within an edit distance of a query.
+
+        Walks the trie with one row of the Levenshtein table per node, so
+        branches are dropped as soon as no word below them can be close enough.
+
+        Args:
+            query: Word to compare with
+            max_distance: Largest number of inserted, deleted or replaced characters
+
+        Returns:
+            (word, distance) pairs in no particular order
+        """
+        words: list[tuple[str, int]] = []
+        first_row = list(range(len(query) + 1))
+        stack = [(child, char, first_row) for char, child in self._root.children.items()]
+        while stack:
+            node, word, previous = stack.pop()
+            char = word[-1]
+            row = [previous[0] + 1]
+            for column in range(1, len(query) + 1):
+                row.append(
+                    min(
+                        row[column - 1] + 1,
+                        previous[column] + 1,
+                        previous[column - 1] + (query[column - 1] != char),
+                    )
+                )
+            if node.count and row[-1] <= max_distance:
+                words.append((word, row[-1]))
+            if min(row) <= max_distance:
+                stack.extend(
+                    (child, word + next_char, row) for next_char, child in node.children.items()
+                )
+        return words
+
+    def _find(self, word: str) -> _Node | None:
+        """Get the node a word ends at."""
+        node = self._root
+        for char in word:
+            next_node = node.children.get(char)
+            if next_node is None:
+                return None
+            node = next_node
+        return node
+
+    def _words(self, node: _Node, prefix: str) -> list[str]:
+        """Collect every word below a node."""
+        words: list[str] = []
+        stack = [(node, prefix)]
+        while stack:
+            node, word = stack.pop()
+            if node.count:
+                words.append(word)
+            stack.extend((child, word + char) for char, child in node.children.items())
+        return words
+
+
+@dataclass
+class _Directory:
+    """Listing of one directory of the planning tree."""
+
+    role: str
+    mtime_ns: int = -1
+    ids: list[tuple[str, str]] = field(default_factory=list)  # (kind, unprefixed ID)
+    subdirs: dict[str, str] = field(default_factory=dict)  # absolute path -> role
+
+
+@dataclass
+class _RootState:
+    """ID tries of one planning directory."""
+
+    directories: dict[str, _Directory] = field(default_factory=dict)
+    tries: dict[str, IdTrie] = field(default_factory=lambda: {k: IdTrie() for k in KIND_PREFIXES})
+    # Paths published since the last lookup, and whether a directory was published
+    dirty: set[str] = field(default_factory=set)
+    stale: bool = True
+    # Whether the last full check ran while a watcher covered the directory
+    trusted: bool = False
+
+
+class IdIndex:
+    """ID tries per planning directory.
+
+    Example:
+        >>> index = get_id_index()
+        >>> [m["id"] for m in index.resolve(Path("planning"), "T-impl-auth")]
+        ['T-implement-auth']
+    """
+
+    def __init__(self):
+        """Initialize an empty index subscribed to the invalidation bus."""
+        self._roots: dict[str, _RootState] = {}
+        # Serializes refreshes; published paths are recorded under the lighter lock
+        self._lock = threading.Lock()
+        self._dirty_lock = threading.Lock()
+        self.listings = 0
+        get_invalidation_bus().subscribe(self.invalidate_path)
+
+    def resolve(
+        self,
+        planning_root: str | Path,
+        object_id: str,
+        kind: str | None = None,
+        limit: int = 5,
+    ) -> list[IdMatch]:
+        """Find the IDs matching or resembling an ID.
+
+        Args:
+            planning_root: Planning directory (containing projects/ and tasks-*/)
+            object_id: ID to look up, with or without its kind prefix
+            kind: Kind to search; defaults to the kind of the ID's prefix, or
+                every kind for an unprefixed ID
+            limit: Maximum number of matches
+
+        Returns:
+            Exact match first, then completions, then similar IDs, each
+            ordered by edit distance and ID
+        """
+        query = object_id.strip()
+        kinds = [kind] if kind else list(KIND_PREFIXES)
+        for prefix_kind, prefix in KIND_PREFIXES.items():
+            if query[:2].upper() == prefix:
+                query = query[2:]
+                kinds = [kind or prefix_kind]
+                break
+        if not query:
+            return []
+        folded = query.lower()
+        max_distance = max(1, min(3, len(folded) // 4))
+
+        matches: dict[tuple[str, str], IdMatch] = {}
+        tries = self.tries(planning_root)
+        for kind_name in kinds:
+            trie = tries[kind_name]
+            candidates: list[tuple[str, MatchType, int]] = []
+            if query in trie:
+                candidates.append((query, "exact", 0))
+            candidates.extend(
+                (word, "prefix", len(word) - len(folded)) for word in trie.complete(folded)
+            )
+            candidates.extend(
+                (word, "similar", distance) for word, distance in trie.similar(folded, max_distance)
+            )
+            for word, match, distance in candidates:
+                # The first (best) way an ID matched wins
+                matches.setdefault(
+                    (kind_name, word),
+                    IdMatch(
+                        id=f"{KIND_PREFIXES[kind_name]}{word}",
+                        kind=kind_name,
+                        match=match,
+                        distance=distance,
+                    ),
+                )
+        ranked = sorted(
+            matches.values(), key=lambda m: (_MATCH_ORDER[m["match"]], m["distance"], m["id"])
+        )
+        return ranked[:limit]
+
+    def tries(self, planning_root: str | Path) -> dict[str, IdTrie]:
+        """Get the up-to-date ID tries of a planning directory.
+
+        Args:
+            planning_root: Planning directory (containing projects/ and tasks-*/)
+
+        Returns:
+            Trie of unprefixed IDs per object kind
+        """
+        key = os.path.abspath(planning_root)
+        with self._lock:
+            with self._dirty_lock:
+                state = self._roots.setdefault(key, _RootState())
+                dirty, state.dirty = state.dirty, set()
+                stale, state.stale = state.stale, False
+
+            for directory in {os.path.dirname(path) for path in dirty}:
+                self._relist_nearest(state, directory)
+            # Changes made before a watcher started were never published
+            watched = is_watched(key)
+            if stale or not watched or not state.trusted:
+                self._sweep(key, state)
+                state.trusted = watched
+            return state.tries
+
+    def invalidate_path(self, path: str) -> None:
+        """Record a changed path for the next lookup (invalidation bus listener).
+
+        Args:
+            path: Changed file, or directory whose contents may have changed
+        """
+        with self._dirty_lock:
+            for key, state in self._roots.items():
+                if is_under(path, key) and path.endswith(".md"):
+                    state.dirty.add(path)
+                elif is_under(path, key) or is_under(key, path):
+                    state.stale = True
+
+    def clear(self) -> None:
+        """Drop every index entry."""
+        with self._lock, self._dirty_lock:
+            self._roots.clear()
+
+    def _sweep(self, key: str, state: _RootState) -> None:
+        """List the directories whose modification time changed."""
+        if key not in state.directories:
+            state.directories[key] = _Directory("root")
+        for path in list(state.directories):
+            directory = state.directories.get(path)
+            if directory is None:
+                continue  # Dropped with a removed parent
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                self._drop(state, path)
+                continue
+            if mtime_ns != directory.mtime_ns:
+                self._relist(state, path)
+
+    def _relist_nearest(self, state: _RootState, path: str) -> None:
+        """List the closest listed directory at or above a path."""
+        while path not in state.directories:
+            parent = os.path.dirname(path)
+            if parent == path:
+                return
+            path = parent
+        self._relist(state, path)
+
+    def _relist(self, state: _RootState, path: str) -> None:
+        """List a directory again, updating its IDs and loading new subdirectories."""
+        directory = state.directories[path]
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            ids, subdirs = self._list(path, directory.role)
+        except OSError:
+            self._drop(state, path)
+            return
+
+        for kind, object_id in directory.ids:
+            state.tries[kind].discard(object_id)
+        for kind, object_id in ids:
+            state.tries[kind].add(object_id)
+        for subdir in set(directory.subdirs) - set(subdirs):
+            self._drop(state, subdir)
+        if time.time_ns() - mtime_ns < _RACY_WINDOW_NS:
+            mtime_ns = -1
+        directory.mtime_ns, directory.ids, directory.subdirs = mtime_ns, ids, subdirs
+
+        for subdir, role in subdirs.items():
+            if subdir not in state.directories:
+                state.directories[subdir] = _Directory(role)
+                self._relist(state, subdir)
+
+    def _drop(self, state: _RootState, path: str) -> None:
+        """Forget a directory and everything listed below it."""
+        directory = state.directories.pop(path, None)
+        if directory is None:
+            return
+        for kind, object_id in directory.ids:
+            state.tries[kind].discard(object_id)
+        for subdir in directory.subdirs:
+            self._drop(state, subdir)
+
+    def _list(self, path: str, role: str) -> tuple[list[tuple[str, str]], dict[str, str]]:
+        """Read the object IDs and relevant subdirectories of a directory.
+
+        Raises:
+            OSError: If the directory cannot be listed
+        """
+        self.listings += 1
+        ids: list[tuple[str, str]] = []
+        subdirs: dict[str, str] = {}
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = entry.name
+                if role in _CONTAINERS:
+                    prefix, child_role = _CONTAINERS[role]
+                    if name.startswith(prefix) and entry.is_dir():
+                        subdirs[entry.path] = child_role
+                elif role == "tasks-open":
+                    if name.startswith("T-") and name.endswith(".md"):
+                        ids.append(("task", name[2:-3]))
+                elif role in ("tasks-done", "shard"):
+                    if is_done_task_name(name):
+                        ids.append(("task", name.split("-T-", 1)[1][:-3]))
+                    elif role == "tasks-done" and is_shard_name(name) and entry.is_dir():
+                        subdirs[entry.path] = "shard"
+                elif name == f"{role}.md":
+                    ids.append((role, os.path.basename(path)[2:]))
+                elif name in _CHILD_DIRS[role] and entry.is_dir():
+                    subdirs[entry.path] = _CHILD_DIRS[role][name]
+        return ids, subdirs
+
+
+def did_you_mean(planning_root: str | Path, object_id: str, kind: str | None = None) -> str:
+    """Build a hint naming the IDs closest to one that was not found.
+
+    Args:
+        planning_root: Planning directory
+        object_id: ID that was not found
+        kind: Kind the ID had to be (default: inferred from its prefix)
+
+    Returns:
+        Text to append to the error message, such as " (did you mean T-a?)",
+        or "" without candidates
+    """
+    matches = get_id_index().resolve(planning_root, object_id, kind, limit=4)
+    suggestions = [m["id"] for m in matches if m["match"] != "exact"][:3]
+    if not suggestions:
+        return ""
+    return f" (did you mean {', '.join(suggestions)}?)"
+
+
+_id_index: IdIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_id_index() -> IdIndex:
+    """Get the shared ID index.
+
+    Returns:
+        Process-wide IdIndex instance
+    """
+    global _id_index
+    with _index_lock:
+        if _id_index is None:
+            _id_index = IdIndex()
+        return _id_index
@@ -3,6 +3,10 @@
 This module provides high-performance caching for inference results to optimize
 repeated kind inference operations. Follows existing cache patterns from the
 validation system and integrates with file system validation.
+
+Entries for an object are dropped when its file is published on the
+invalidation bus; entries validated while a filesystem watcher covered the
+object's file are served without re-checking its modification time.
 """
 
 import logging
@@ -12,6 +16,7 @@ import time
 from dataclasses import dataclass
 from typing import TypedDict
 
+from ..invalidation import get_invalidation_bus
 from .path_builder import PathBuilder
 from .validator import ValidationResult
 
@@ -46,6 +51,7 @@ class InferenceResult:
     cached_at: float
     validation_result: ValidationResult | None = None
     file_mtime: float | None = None
+    trusted: bool = False
 
     @classmethod
     def create(
@@ -116,6 +122,15 @@ class InferenceCache:
         self._misses = 0
         self._evictions = 0
 
+        # Bumped on every invalidation; lets callers detect changes during inference
+        self._generation = 0
+        get_invalidation_bus().subscribe(self.invalidate_path)
+
+    @property
+    def generation(self) -> int:
+        """Invalidation counter, read before validation and passed to ``put``."""
+        return self._generation
+
     def get(self, object_id: str) -> InferenceResult | None:
         """Retrieve cached inference result if valid.
 
@@ -154,7 +169,9 @@ class InferenceCache:
                 self._misses += 1
                 return None
 
-    def put(self, object_id: str, result: InferenceResult) -> None:
+    def put(
+        self, object_id: str, result: InferenceResult, trusted_generation: int | None = None
+    ) -> None:
         """Cache inference result with LRU eviction if needed.
 
         Stores the inference result in cache and evicts least recently
@@ -163,6 +180,9 @@ class InferenceCache:
         Args:
             object_id: Object ID to use as cache key
             result: InferenceResult to cache
+            trusted_generation: For objects whose file is watched, the
+                ``generation`` read before validation; if nothing was invalidated
+                since, the entry is served without modification time checks
 
         Raises:
             ValueError: If object_id is empty or result is None
@@ -174,6 +194,7 @@ class InferenceCache:
 
         with self._lock:
             clean_id = object_id.strip()
+            result.trusted = trusted_generation == self._generation
 
             # Remove existing entry if present
             if clean_id in self._cache:
@@ -199,6 +220,27 @@ class InferenceCache:
         with self._lock:
             self._invalidate_unsafe(object_id.strip())
 
+    def invalidate_path(self, path: str) -> None:
+        """Drop the entry for a changed object file, or all entries for a directory.
+
+        Args:
+            path: Absolute path published on the invalidation bus
+        """
+        from ..change_feed import object_id_from_path
+
+        with self._lock:
+            self._generation += 1
+            if not path.endswith(".md"):
+                self._cache.clear()
+                self._access_order.clear()
+                return
+            identity = object_id_from_path(path)
+            if identity is not None:
+                _, prefixed_id = identity
+                # Entries are keyed by the ID as requested, with or without prefix
+                self._invalidate_unsafe(prefixed_id)
+                self._invalidate_unsafe(prefixed_id[2:])
+
     def clear(self) -> None:
         """Clear entire cache and reset statistics."""
         with self._lock:
@@ -242,6 +284,10 @@ class InferenceCache:
         Returns:
             True if cache entry is valid, False if file has changed
         """
+        if result.trusted:
+            # Validated while watched; a change would have dropped the entry
+            return True
+
         if not self.path_builder:
             # Without path validation, use simple time-based expiration (1 minute)
             return time.time() - result.cached_at < 60.0
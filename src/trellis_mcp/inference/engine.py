@@ -11,6 +11,7 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from ..exceptions.validation_error import ValidationError, ValidationErrorCode
+from ..invalidation import is_watched
 from ..utils.sanitization import sanitize_for_audit
 from .cache import InferenceCache, InferenceCacheStats, InferenceResult
 from .path_builder import PathBuilder
@@ -328,15 +329,18 @@ class KindInferenceEngine:
             )
 
         # File system validation
+        generation = self.cache.generation
         validation_result = self.validator.validate_object_structure(inferred_kind, clean_id)
 
         # Get file modification time for cache validation
         file_mtime = None
+        watched = False
         if validation_result.is_valid:
             try:
                 path = self.path_builder.for_object(inferred_kind, clean_id).build_path()
                 if path.exists():
                     file_mtime = os.path.getmtime(path)
+                    watched = is_watched(os.path.abspath(path))
             except Exception:
                 # If we can't get file mtime, cache will use time-based expiration
                 pass
@@ -349,7 +353,9 @@ class KindInferenceEngine:
             validation_result=validation_result,
             file_mtime=file_mtime,
         )
-        self.cache.put(clean_id, inference_result)
+        self.cache.put(
+            clean_id, inference_result, trusted_generation=generation if watched else None
+        )
 
         inference_time = (time.time() - start_time) * 1000
 
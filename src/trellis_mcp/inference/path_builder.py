@@ -7,6 +7,7 @@ object structures while integrating with existing security validation.
 
 from pathlib import Path
 
+from ..done_tasks import done_task_path
 from ..exceptions.validation_error import ValidationError, ValidationErrorCode
 from ..path_resolver import resolve_project_roots
 from ..types import VALID_KINDS
@@ -264,6 +265,8 @@ class PathBuilder:
 
         task_dir = "tasks-done" if self._status == "done" else "tasks-open"
         filename = get_standalone_task_filename(clean_id, self._status)
+        if self._status == "done":
+            return done_task_path(self._resolution_root / task_dir, filename)
         return self._resolution_root / task_dir / filename
 
     def _build_hierarchical_task_path(self, clean_id: str) -> Path:
@@ -284,7 +287,7 @@ class PathBuilder:
             task_dir = "tasks-done" if self._status == "done" else "tasks-open"
             filename = get_standalone_task_filename(clean_id, self._status)
 
-            return (
+            tasks_path = (
                 self._resolution_root
                 / "projects"
                 / project_dir
@@ -293,8 +296,10 @@ class PathBuilder:
                 / "features"
                 / f"F-{parent_clean}"
                 / task_dir
-                / filename
             )
+            if self._status == "done":
+                return done_task_path(tasks_path, filename)
+            return tasks_path / filename
         except FileNotFoundError:
             raise ValueError(f"Parent feature '{self._parent_id}' not found")
 
@@ -0,0 +1,183 @@
+"""Cache invalidation bus shared by the planning caches.
+
+Caches (parse cache, children cache, inference caches and the dependency
+graph cache) subscribe a listener that drops entries for a changed path.
+Paths are published by Trellis' own write paths as they happen, and by the
+filesystem watcher (see ``fs_watcher``) for edits made outside the server,
+such as editor saves or git checkouts.
+
+A published path is either a markdown file or a directory; a directory means
+that anything below it may have changed. While a watcher covers a path, caches
+can trust entries for it without re-validating them against the filesystem.
+"""
+
+import functools
+import logging
+import os
+import threading
+import weakref
+from pathlib import Path
+from typing import Callable
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+InvalidationListener = Callable[[str], None]
+
+
+class InvalidationBus:
+    """Fan out changed paths to cache listeners.
+
+    Bound-method listeners are held weakly so caches can be garbage collected
+    without unsubscribing; plain functions are held strongly.
+
+    Example:
+        >>> bus = InvalidationBus()
+        >>> bus.subscribe(cache.invalidate_path)
+        >>> bus.publish("/repo/planning/tasks-open/T-a.md")
+    """
+
+    def __init__(self):
+        """Initialize an empty bus."""
+        self._listeners: list[Callable[[], InvalidationListener | None]] = []
+        self._watched_roots: dict[str, int] = {}
+        # Immutable snapshot of the watched roots for lock-free reads
+        self._watched: tuple[str, ...] = ()
+        self._lock = threading.RLock()
+        self._published = 0
+
+    def subscribe(self, listener: InvalidationListener) -> None:
+        """Register a listener called with each changed absolute path.
+
+        Args:
+            listener: Callable taking the changed path
+        """
+        ref: Callable[[], InvalidationListener | None]
+        if hasattr(listener, "__self__"):
+            ref = weakref.WeakMethod(listener)  # type: ignore[arg-type]
+        else:
+            ref = functools.partial(_identity, listener)
+
+        with self._lock:
+            self._listeners.append(ref)
+
+    def publish(self, path: str | Path) -> None:
+        """Notify listeners that a file or directory changed.
+
+        Listener errors are logged and never propagate to the writer.
+
+        Args:
+            path: Changed file, or directory whose contents may have changed
+        """
+        abs_path = os.path.abspath(path)
+        with self._lock:
+            self._published += 1
+            listeners = [ref() for ref in self._listeners]
+            if any(listener is None for listener in listeners):
+                self._listeners = [ref for ref in self._listeners if ref() is not None]
+
+        for listener in listeners:
+            if listener is None:
+                continue
+            try:
+                listener(abs_path)
+            except Exception as e:
+                logger.warning(f"Cache invalidation failed for {abs_path}: {e}")
+
+    def add_watched_root(self, root: str | Path) -> None:
+        """Mark a directory tree as covered by a running watcher.
+
+        Args:
+            root: Directory whose changes are being published
+        """
+        key = os.path.abspath(root)
+        with self._lock:
+            self._watched_roots[key] = self._watched_roots.get(key, 0) + 1
+            self._watched = tuple(self._watched_roots)
+
+    def remove_watched_root(self, root: str | Path) -> None:
+        """Remove a watcher's coverage of a directory tree.
+
+        Args:
+            root: Directory passed to ``add_watched_root``
+        """
+        key = os.path.abspath(root)
+        with self._lock:
+            count = self._watched_roots.get(key, 0) - 1
+            if count > 0:
+                self._watched_roots[key] = count
+            else:
+                self._watched_roots.pop(key, None)
+            self._watched = tuple(self._watched_roots)
+
+    def is_watched(self, path: str | Path) -> bool:
+        """Check whether changes to a path are guaranteed to be published.
+
+        Args:
+            path: Absolute file or directory path
+
+        Returns:
+            True if a running watcher covers the path
+        """
+        watched = self._watched
+        if not watched:
+            return False
+        path_str = str(path)
+        return any(is_under(path_str, root) for root in watched)
+
+    @property
+    def published(self) -> int:
+        """Number of paths published so far."""
+        return self._published
+
+
+def _identity(listener: InvalidationListener) -> InvalidationListener:
+    """Strong reference wrapper for plain-function listeners."""
+    return listener
+
+
+def is_under(path: str, directory: str) -> bool:
+    """Check whether a path equals or lies below a directory.
+
+    Args:
+        path: Absolute path
+        directory: Absolute directory path
+
+    Returns:
+        True if ``path`` is ``directory`` or inside it
+    """
+    return path == directory or path.startswith(directory + os.sep)
+
+
+# Global bus instance for singleton pattern
+_bus = InvalidationBus()
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    """Get the global invalidation bus.
+
+    Returns:
+        Global InvalidationBus instance
+    """
+    return _bus
+
+
+def invalidate_path(path: str | Path) -> None:
+    """Publish a changed path on the global bus.
+
+    Args:
+        path: Changed file, or directory whose contents may have changed
+    """
+    _bus.publish(path)
+
+
+def is_watched(path: str | Path) -> bool:
+    """Check whether a watcher covers a path on the global bus.
+
+    Args:
+        path: Absolute file or directory path
+
+    Returns:
+        True if a running watcher covers the path
+    """
+    return _bus.is_watched(path)
@@ -1,7 +1,9 @@
 """JSON-RPC logging middleware for Trellis MCP server.
 
 Provides middleware to log all JSON-RPC method calls with timing and status information.
-Each call is logged with method name, duration in milliseconds, and success/error status.
+Each call is logged with method name, duration in milliseconds, and success/error status,
+and recorded in the in-process server metrics. Calls slower than the configured threshold
+are logged with their full span tree.
 """
 
 import time
@@ -10,7 +12,9 @@ from typing import Any
 from fastmcp.server.middleware import Middleware, MiddlewareContext
 
 from ..settings import Settings
+from ..validation.benchmark import PerformanceBenchmark
 from .logger import write_event
+from .metrics import ServerMetrics, get_server_metrics, payload_size
 
 
 class JsonRpcLoggingMiddleware(Middleware):
@@ -21,17 +25,28 @@ class JsonRpcLoggingMiddleware(Middleware):
     - duration_ms: Call duration in milliseconds
     - status: "success" or "error" based on whether an exception was raised
 
-    All logs are written using the existing write_event function with INFO level.
+    All logs are written using the existing write_event function with INFO level
+    (WARNING for slow calls).
+    Each call is also recorded in the server metrics (latency histogram, error
+    count, and request and response sizes when ``measure_payload_sizes`` is
+    set, since measuring re-serializes both). When ``slow_call_threshold_ms`` is set,
+    the call is traced and calls exceeding the threshold are logged at WARNING
+    level with a ``spans`` field holding the phase breakdown.
     """
 
-    def __init__(self, settings: Settings | None = None):
+    def __init__(self, settings: Settings | None = None, metrics: ServerMetrics | None = None):
         """Initialize the middleware with optional settings.
 
         Args:
-            settings: Optional Settings instance. If None, write_event will create its own.
+            settings: Optional Settings instance. If None, write_event will create its own,
+                and tracing and payload sizes stay off.
+            metrics: Optional metrics collector. If None, the global collector is used.
         """
         super().__init__()
         self.settings = settings
+        self.metrics = metrics if metrics is not None else get_server_metrics()
+        self.slow_call_threshold_ms = settings.slow_call_threshold_ms if settings else 0
+        self.measure_payload_sizes = settings.measure_payload_sizes if settings else False
 
     async def on_call_tool(self, context: MiddlewareContext, call_next) -> Any:
         """Intercept and log JSON-RPC tool calls.
@@ -58,23 +73,43 @@ class JsonRpcLoggingMiddleware(Middleware):
         ):
             tool_name = context.message.name
         else:
-            tool_name = context.method
+            tool_name = context.method or "unknown"
+        request_bytes = (
+            payload_size(getattr(getattr(context, "message", None), "arguments", None))
+            if self.measure_payload_sizes
+            else 0
+        )
+
+        # Trace the call so slow calls can report where their time went
+        benchmark = PerformanceBenchmark() if self.slow_call_threshold_ms > 0 else None
 
         start_time = time.perf_counter()
 
         try:
             # Call the actual tool/next middleware
-            result = await call_next(context)
+            if benchmark is None:
+                result = await call_next(context)
+            else:
+                with benchmark.activate(), benchmark.span(tool_name):
+                    result = await call_next(context)
 
             # Calculate duration and log success
             duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+            slow_fields = self._slow_call_fields(benchmark, duration_ms)
             write_event(
-                level="INFO",
+                level="WARNING" if slow_fields else "INFO",
                 msg="JSON-RPC call completed",
                 settings=self.settings,
                 method=tool_name,
                 duration_ms=duration_ms,
                 status="success",
+                **slow_fields,
+            )
+            self.metrics.observe(
+                tool_name,
+                duration_ms,
+                request_bytes=request_bytes,
+                response_bytes=payload_size(result) if self.measure_payload_sizes else 0,
             )
 
             return result
@@ -82,15 +117,34 @@ class JsonRpcLoggingMiddleware(Middleware):
         except Exception as e:
             # Calculate duration and log error
             duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+            slow_fields = self._slow_call_fields(benchmark, duration_ms)
             write_event(
-                level="INFO",
+                level="WARNING" if slow_fields else "INFO",
                 msg="JSON-RPC call failed",
                 settings=self.settings,
                 method=tool_name,
                 duration_ms=duration_ms,
                 status="error",
                 error=str(e),
+                **slow_fields,
             )
+            self.metrics.observe(tool_name, duration_ms, error=True, request_bytes=request_bytes)
 
             # Re-raise the exception to maintain normal error handling
             raise
+
+    def _slow_call_fields(
+        self, benchmark: PerformanceBenchmark | None, duration_ms: float
+    ) -> dict[str, Any]:
+        """Build extra log fields for a call that exceeded the slow-call threshold.
+
+        Args:
+            benchmark: Benchmark that traced the call, or None if tracing is off
+            duration_ms: Call duration in milliseconds
+
+        Returns:
+            Dictionary with ``slow`` and ``spans`` fields, or empty if the call was fast
+        """
+        if benchmark is None or duration_ms < self.slow_call_threshold_ms:
+            return {}
+        return {"slow": True, "spans": benchmark.get_span_tree()}
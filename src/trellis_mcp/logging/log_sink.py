@@ -0,0 +1,361 @@
+"""Background JSONL log sink for Trellis MCP.
+
+Provides a queue-backed writer thread that keeps the daily log file open,
+batches writes, and flushes on a time or size threshold so that request
+handlers never block on log file I/O.
+"""
+
+import atexit
+import os
+import queue
+import random
+import threading
+import time
+from pathlib import Path
+from typing import IO, TypedDict
+
+from ..settings import Settings
+
+# Sentinel placed on the queue to stop the writer thread
+_STOP = object()
+
+
+class LogSinkStats(TypedDict):
+    """Type definition for log sink statistics."""
+
+    queued: int
+    written: int
+    dropped: int
+    sampled_out: int
+    write_errors: int
+    current_file: str | None
+
+
+class LogSink:
+    """Asynchronous JSONL writer for daily log files.
+
+    Events are submitted as pre-serialized JSON lines together with the daily
+    filename they belong to. A single daemon thread drains the queue, writes
+    consecutive lines for the same file in one call, and flushes once
+    ``flush_max_events`` lines are pending or ``flush_interval`` seconds have
+    passed since the first unflushed write. When the filename changes (daily
+    rollover) the old file is flushed and closed before the new one is opened.
+
+    ``submit`` never blocks: when the queue is full the event is dropped and
+    counted in the sink statistics.
+
+    Example:
+        >>> sink = LogSink(Path("./logs"), flush_interval=0.25)
+        >>> sink.submit("2025-07-15.log", '{"level":"INFO","msg":"hello"}')
+        >>> sink.flush()
+        True
+        >>> sink.close()
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        flush_interval: float = 0.25,
+        flush_max_events: int = 256,
+        max_queue_events: int = 10000,
+        success_sample_rate: float = 1.0,
+    ):
+        """Initialize the sink and start its writer thread.
+
+        Args:
+            log_dir: Directory where daily log files are written
+            flush_interval: Maximum seconds between a write and its flush
+            flush_max_events: Number of pending lines that forces a flush
+            max_queue_events: Queue capacity; events beyond it are dropped
+            success_sample_rate: Fraction (0.0-1.0) of success events to keep
+
+        Raises:
+            ValueError: If any threshold is out of range
+        """
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+        if flush_max_events <= 0:
+            raise ValueError("flush_max_events must be positive")
+        if max_queue_events <= 0:
+            raise ValueError("max_queue_events must be positive")
+        if not 0.0 <= success_sample_rate <= 1.0:
+            raise ValueError("success_sample_rate must be between 0.0 and 1.0")
+
+        self.log_dir = Path(log_dir)
+        self.flush_interval = flush_interval
+        self.flush_max_events = flush_max_events
+        self.success_sample_rate = success_sample_rate
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_events)
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._written = 0
+        self._dropped = 0
+        self._sampled_out = 0
+        self._write_errors = 0
+
+        # Writer-thread state (only touched by the writer thread)
+        self._file: IO[str] | None = None
+        self._file_name: str | None = None
+        self._pending = 0
+        self._first_pending_at = 0.0
+
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"trellis-log-sink:{self.log_dir}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, filename: str, line: str, status: str | None = None) -> bool:
+        """Queue a serialized log line for writing without blocking.
+
+        Args:
+            filename: Daily log filename the line belongs to (e.g. '2025-07-15.log')
+            line: JSON-serialized log entry without trailing newline
+            status: Optional event status; 'success' events are subject to sampling
+
+        Returns:
+            True if the line was queued, False if it was sampled out or dropped
+        """
+        if self._closed:
+            return False
+
+        if status == "success" and self.success_sample_rate < 1.0:
+            if random.random() >= self.success_sample_rate:
+                with self._stats_lock:
+                    self._sampled_out += 1
+                return False
+
+        try:
+            self._queue.put_nowait((filename, line))
+        except queue.Full:
+            with self._stats_lock:
+                self._dropped += 1
+            return False
+
+        with self._stats_lock:
+            self._queued += 1
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every line queued before this call is written and flushed.
+
+        Args:
+            timeout: Maximum seconds to wait for the writer thread
+
+        Returns:
+            True if the flush completed within the timeout, False otherwise
+        """
+        if self._closed or not self._thread.is_alive():
+            return False
+
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Drain the queue, close the log file, and stop the writer thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the writer thread to finish
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def get_stats(self) -> LogSinkStats:
+        """Get sink statistics for monitoring.
+
+        Returns:
+            Dictionary containing queue and write counters
+        """
+        with self._stats_lock:
+            return {
+                "queued": self._queued,
+                "written": self._written,
+                "dropped": self._dropped,
+                "sampled_out": self._sampled_out,
+                "write_errors": self._write_errors,
+                "current_file": self._file_name,
+            }
+
+    def _run(self) -> None:
+        """Writer thread main loop."""
+        while True:
+            # Block indefinitely while idle; only wake up on a timer when a flush is due
+            timeout = None
+            if self._pending:
+                elapsed = time.monotonic() - self._first_pending_at
+                timeout = max(self.flush_interval - elapsed, 0.0)
+
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush_file()
+                continue
+
+            batch = [item]
+            while len(batch) < self.flush_max_events:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if not self._process_batch(batch):
+                return
+
+    def _process_batch(self, batch: list) -> bool:
+        """Write a drained batch, honoring flush markers and the stop sentinel.
+
+        Returns:
+            False if the stop sentinel was reached, True otherwise
+        """
+        lines: list[str] = []
+        batch_file: str | None = None
+
+        for item in batch:
+            if isinstance(item, tuple):
+                filename, line = item
+                if batch_file is not None and filename != batch_file:
+                    self._write_lines(batch_file, lines)
+                    lines = []
+                batch_file = filename
+                lines.append(line)
+                continue
+
+            # Flush marker or stop sentinel: write everything queued before it first
+            if batch_file is not None and lines:
+                self._write_lines(batch_file, lines)
+                lines = []
+            self._flush_file()
+
+            if item is _STOP:
+                self._close_file()
+                return False
+            if isinstance(item, threading.Event):
+                item.set()
+
+        if batch_file is not None and lines:
+            self._write_lines(batch_file, lines)
+
+        if self._pending >= self.flush_max_events or (
+            self._pending and time.monotonic() - self._first_pending_at >= self.flush_interval
+        ):
+            self._flush_file()
+        return True
+
+    def _write_lines(self, filename: str, lines: list[str]) -> None:
+        """Append lines to the named daily file, rolling over if it changed."""
+        try:
+            if self._file is None or filename != self._file_name:
+                self._close_file()
+                self.log_dir.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.log_dir / filename, "a", encoding="utf-8")
+                self._file_name = filename
+
+            self._file.write("\n".join(lines) + "\n")
+        except OSError:
+            with self._stats_lock:
+                self._write_errors += 1
+            self._close_file()
+            return
+
+        if not self._pending:
+            self._first_pending_at = time.monotonic()
+        self._pending += len(lines)
+        with self._stats_lock:
+            self._written += len(lines)
+
+    def _flush_file(self) -> None:
+        """Flush pending writes to the operating system."""
+        if self._file is not None and self._pending:
+            try:
+                self._file.flush()
+            except OSError:
+                with self._stats_lock:
+                    self._write_errors += 1
+        self._pending = 0
+
+    def _close_file(self) -> None:
+        """Flush and close the current log file, if any."""
+        self._flush_file()
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+        self._file = None
+
+
+# Active sinks keyed by absolute log directory
+_sinks: dict[str, LogSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def _sink_key(log_dir: Path) -> str:
+    """Build the registry key for a log directory without touching the filesystem."""
+    return os.path.abspath(log_dir)
+
+
+def start_log_sink(settings: Settings) -> LogSink:
+    """Start (or reuse) the background log sink for the configured log directory.
+
+    While a sink is registered for a log directory, ``write_event`` calls that
+    target the same directory are queued instead of written synchronously.
+
+    Args:
+        settings: Settings providing the log directory and sink thresholds
+
+    Returns:
+        The active LogSink for ``settings.log_dir``
+    """
+    key = _sink_key(settings.log_dir)
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None:
+            sink = LogSink(
+                Path(key),
+                flush_interval=settings.log_flush_interval_ms / 1000,
+                flush_max_events=settings.log_flush_max_events,
+                max_queue_events=settings.log_queue_max_events,
+                success_sample_rate=settings.log_success_sample_rate,
+            )
+            _sinks[key] = sink
+        return sink
+
+
+def get_log_sink(log_dir: Path) -> LogSink | None:
+    """Get the active log sink for a log directory.
+
+    Args:
+        log_dir: Log directory to look up
+
+    Returns:
+        The registered LogSink, or None if events for this directory are written synchronously
+    """
+    if not _sinks:
+        return None
+    return _sinks.get(_sink_key(log_dir))
+
+
+def stop_log_sinks() -> None:
+    """Drain and stop every registered log sink."""
+    with _sinks_lock:
+        sinks = list(_sinks.values())
+        _sinks.clear()
+
+    for sink in sinks:
+        sink.close()
+
+
+# Make sure queued events reach disk on interpreter shutdown
+atexit.register(stop_log_sinks)
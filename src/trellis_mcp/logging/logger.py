@@ -2,6 +2,8 @@
 
 Provides thread-safe logging functionality for system events in JSONL format.
 Each log entry contains timestamp, level, message, and additional fields.
+When a background log sink is active for the log directory, entries are queued
+to it instead of being written synchronously.
 """
 
 import json
@@ -10,6 +12,7 @@ from typing import Any
 
 from ..settings import Settings
 from .log_filename import daily_log_filename
+from .log_sink import get_log_sink
 from .rfc3339_timestamp import rfc3339_timestamp
 
 # Global lock for thread-safe file operations
@@ -25,6 +28,10 @@ def write_event(level: str, msg: str, settings: Settings | None = None, **fields
 
     The log entry schema follows: {ts, level, msg, ...fields}
 
+    If a LogSink has been started for ``settings.log_dir`` (see
+    ``start_log_sink``), the serialized entry is handed to the sink's writer
+    thread and this function returns without touching the filesystem.
+
     Args:
         level: Log level (e.g., 'INFO', 'ERROR', 'DEBUG')
         msg: Log message describing the event
@@ -59,6 +66,15 @@ def write_event(level: str, msg: str, settings: Settings | None = None, **fields
 
     # Get log file path
     log_filename = daily_log_filename()
+
+    # Hand off to the background writer when one is active for this directory
+    sink = get_log_sink(settings.log_dir)
+    if sink is not None:
+        # Only routine INFO events are eligible for success sampling
+        status = fields.get("status") if level == "INFO" else None
+        sink.submit(log_filename, json_line, status=status)
+        return
+
     log_file_path = settings.log_dir / log_filename
 
     # Thread-safe file operation
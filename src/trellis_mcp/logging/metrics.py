@@ -0,0 +1,339 @@
+"""In-process server metrics for Trellis MCP.
+
+Collects per-tool latency histograms, error counts and payload sizes from the
+JSON-RPC middleware, and combines them with cache and log sink statistics into
+a snapshot suitable for the ``metrics://server`` resource or Prometheus text
+exposition.
+"""
+
+import bisect
+import threading
+import time
+from pathlib import Path
+from typing import Any, TypedDict
+
+import pydantic_core
+
+from ..children.cache import get_cache_stats as get_children_cache_stats
+from ..inference.cache import get_cache_stats as get_inference_cache_stats
+from ..parse_cache import get_cache_stats as get_parse_cache_stats
+from ..validation.cache import get_cache_stats as get_graph_cache_stats
+from .log_sink import get_log_sink
+
+# Histogram bucket upper bounds in milliseconds (an implicit +Inf bucket follows)
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+)
+
+
+class LatencySummary(TypedDict):
+    """Type definition for latency percentiles derived from a histogram."""
+
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    mean: float
+
+
+class ToolMetricsSnapshot(TypedDict):
+    """Type definition for per-tool metrics."""
+
+    count: int
+    errors: int
+    latency_ms: LatencySummary
+    buckets: list[int]
+    sum_ms: float
+    request_bytes: int
+    response_bytes: int
+
+
+class _ToolMetrics:
+    """Mutable per-tool counters. Guarded by the owning ServerMetrics lock."""
+
+    __slots__ = (
+        "count",
+        "errors",
+        "buckets",
+        "sum_ms",
+        "max_ms",
+        "request_bytes",
+        "response_bytes",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+class ServerMetrics:
+    """Thread-safe collector for per-tool call metrics.
+
+    Each observation costs a bucket lookup and a handful of counter updates
+    under a lock, so recording is cheap enough to run on every call.
+
+    Example:
+        >>> metrics = ServerMetrics()
+        >>> metrics.observe("getObject", 3.2, request_bytes=40, response_bytes=512)
+        >>> metrics.snapshot()["getObject"]["count"]
+        1
+    """
+
+    def __init__(self):
+        """Initialize an empty collector."""
+        self._lock = threading.Lock()
+        self._tools: dict[str, _ToolMetrics] = {}
+        self.started_at = time.time()
+
+    def observe(
+        self,
+        tool: str,
+        duration_ms: float,
+        error: bool = False,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+    ) -> None:
+        """Record a single tool call.
+
+        Args:
+            tool: Tool (or JSON-RPC method) name
+            duration_ms: Call duration in milliseconds
+            error: Whether the call raised an exception
+            request_bytes: Serialized size of the call arguments
+            response_bytes: Serialized size of the call result
+        """
+        index = bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)
+        with self._lock:
+            metrics = self._tools.get(tool)
+            if metrics is None:
+                metrics = self._tools[tool] = _ToolMetrics()
+            metrics.count += 1
+            metrics.buckets[index] += 1
+            metrics.sum_ms += duration_ms
+            if duration_ms > metrics.max_ms:
+                metrics.max_ms = duration_ms
+            if error:
+                metrics.errors += 1
+            metrics.request_bytes += request_bytes
+            metrics.response_bytes += response_bytes
+
+    def snapshot(self) -> dict[str, ToolMetricsSnapshot]:
+        """Get a consistent copy of all per-tool metrics.
+
+        Returns:
+            Dictionary mapping tool names to their metrics
+        """
+        result: dict[str, ToolMetricsSnapshot] = {}
+        with self._lock:
+            for name in sorted(self._tools):
+                m = self._tools[name]
+                result[name] = {
+                    "count": m.count,
+                    "errors": m.errors,
+                    "latency_ms": {
+                        "p50": _estimate_percentile(m.buckets, m.count, 0.50, m.max_ms),
+                        "p95": _estimate_percentile(m.buckets, m.count, 0.95, m.max_ms),
+                        "p99": _estimate_percentile(m.buckets, m.count, 0.99, m.max_ms),
+                        "max": round(m.max_ms, 2),
+                        "mean": round(m.sum_ms / m.count, 2) if m.count else 0.0,
+                    },
+                    "buckets": list(m.buckets),
+                    "sum_ms": round(m.sum_ms, 2),
+                    "request_bytes": m.request_bytes,
+                    "response_bytes": m.response_bytes,
+                }
+        return result
+
+    def reset(self) -> None:
+        """Discard all recorded observations."""
+        with self._lock:
+            self._tools.clear()
+            self.started_at = time.time()
+
+
+def _estimate_percentile(buckets: list[int], count: int, quantile: float, max_ms: float) -> float:
+    """Estimate a percentile by linear interpolation inside histogram buckets.
+
+    Args:
+        buckets: Non-cumulative bucket counts (last entry is the +Inf bucket)
+        count: Total number of observations
+        quantile: Quantile to estimate (0.0-1.0)
+        max_ms: Largest observed value, used to bound the +Inf bucket
+
+    Returns:
+        Estimated latency in milliseconds, rounded to 2 decimals
+    """
+    if count == 0:
+        return 0.0
+
+    rank = quantile * count
+    cumulative = 0
+    for index, bucket_count in enumerate(buckets):
+        if bucket_count == 0:
+            continue
+        if cumulative + bucket_count >= rank:
+            lower = LATENCY_BUCKETS_MS[index - 1] if index > 0 else 0.0
+            upper = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else max_ms
+            upper = min(upper, max_ms)
+            lower = min(lower, upper)
+            fraction = (rank - cumulative) / bucket_count
+            return round(lower + (upper - lower) * fraction, 2)
+        cumulative += bucket_count
+    return round(max_ms, 2)
+
+
+def payload_size(payload: Any) -> int:
+    """Estimate the serialized JSON size of a request or response payload.
+
+    Args:
+        payload: Tool arguments or tool result
+
+    Returns:
+        Size in bytes, or 0 if the payload cannot be serialized
+    """
+    if payload is None:
+        return 0
+
+    # Tool results carry their data in content/structured_content attributes
+    if hasattr(payload, "content"):
+        payload = {
+            "content": payload.content,
+            "structuredContent": getattr(payload, "structured_content", None),
+        }
+
+    try:
+        return len(pydantic_core.to_json(payload, fallback=str))
+    except Exception:
+        return 0
+
+
+# Global metrics instance for singleton pattern
+_server_metrics: ServerMetrics | None = None
+
+
+def get_server_metrics() -> ServerMetrics:
+    """Get the global server metrics collector.
+
+    Returns:
+        Global ServerMetrics instance
+    """
+    global _server_metrics
+    if _server_metrics is None:
+        _server_metrics = ServerMetrics()
+    return _server_metrics
+
+
+def collect_server_metrics(log_dir: Path | None = None) -> dict[str, Any]:
+    """Build a metrics snapshot covering tools, caches and the log sink.
+
+    Args:
+        log_dir: Optional log directory whose background sink should be reported
+
+    Returns:
+        Dictionary with uptime, per-tool metrics, cache statistics and log sink statistics
+    """
+    metrics = get_server_metrics()
+    graph_stats = get_graph_cache_stats()
+    sink = get_log_sink(log_dir) if log_dir is not None else None
+
+    return {
+        "uptime_seconds": round(time.time() - metrics.started_at, 3),
+        "latency_buckets_ms": list(LATENCY_BUCKETS_MS),
+        "tools": metrics.snapshot(),
+        "caches": {
+            "parse": dict(get_parse_cache_stats()),
+            "inference": dict(get_inference_cache_stats()),
+            "children": dict(get_children_cache_stats()),
+            "dependency_graph": {
+                "size": graph_stats["cached_projects"],
+                "hits": graph_stats["hits"],
+                "misses": graph_stats["misses"],
+                "hit_rate": graph_stats["hit_rate"],
+            },
+        },
+        "log_sink": dict(sink.get_stats()) if sink is not None else None,
+    }
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(snapshot: dict[str, Any]) -> str:
+    """Render a metrics snapshot in the Prometheus text exposition format.
+
+    Args:
+        snapshot: Snapshot returned by collect_server_metrics()
+
+    Returns:
+        Prometheus text format (version 0.0.4)
+    """
+    lines = [
+        "# HELP trellis_uptime_seconds Seconds since metrics collection started.",
+        "# TYPE trellis_uptime_seconds gauge",
+        f"trellis_uptime_seconds {snapshot['uptime_seconds']}",
+        "# HELP trellis_tool_duration_seconds Tool call latency.",
+        "# TYPE trellis_tool_duration_seconds histogram",
+    ]
+
+    tools: dict[str, ToolMetricsSnapshot] = snapshot["tools"]
+    for name, tool in tools.items():
+        label = f'tool="{_escape_label(name)}"'
+        cumulative = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS_MS, tool["buckets"]):
+            cumulative += bucket_count
+            le = f"{bound / 1000:g}"
+            lines.append(f'trellis_tool_duration_seconds_bucket{{{label},le="{le}"}} {cumulative}')
+        lines.append(f'trellis_tool_duration_seconds_bucket{{{label},le="+Inf"}} {tool["count"]}')
+        lines.append(f"trellis_tool_duration_seconds_sum{{{label}}} {tool['sum_ms'] / 1000:g}")
+        lines.append(f"trellis_tool_duration_seconds_count{{{label}}} {tool['count']}")
+
+    counters = [
+        ("trellis_tool_errors_total", "Tool calls that raised an error.", "errors"),
+        ("trellis_tool_request_bytes_total", "Serialized tool argument bytes.", "request_bytes"),
+        ("trellis_tool_response_bytes_total", "Serialized tool result bytes.", "response_bytes"),
+    ]
+    for metric, help_text, key in counters:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for name, tool in tools.items():
+            lines.append(f'{metric}{{tool="{_escape_label(name)}"}} {tool[key]}')
+
+    caches: dict[str, dict[str, Any]] = snapshot["caches"]
+    cache_metrics = [
+        ("trellis_cache_hits_total", "counter", "Cache lookups served from cache.", "hits"),
+        ("trellis_cache_misses_total", "counter", "Cache lookups that missed.", "misses"),
+        ("trellis_cache_entries", "gauge", "Entries currently cached.", "size"),
+    ]
+    for metric, metric_type, help_text, key in cache_metrics:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for cache_name, stats in caches.items():
+            lines.append(f'{metric}{{cache="{cache_name}"}} {stats[key]}')
+
+    sink = snapshot.get("log_sink")
+    if sink is not None:
+        for key in ("written", "dropped", "sampled_out", "write_errors"):
+            metric = f"trellis_log_events_{key}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {sink[key]}")
+
+    return "\n".join(lines) + "\n"
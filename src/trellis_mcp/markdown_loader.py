@@ -1,22 +1,39 @@
 """Markdown loader for parsing front-matter from markdown files.
 
 Provides functionality to load markdown files with YAML front-matter and
-separate the front-matter dictionary from the markdown body content.
+separate the front-matter dictionary from the markdown body content, plus the
+fingerprint helpers caches use to validate derived data by front-matter
+content rather than by modification time alone.
 """
 
+import os
 import re
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from .invalidation import is_watched
+from .parse_cache import (
+    FileFingerprint,
+    FileSignature,
+    file_signature,
+    get_parse_cache,
+    hash_frontmatter,
+)
+from .validation.benchmark import trace_span
+
 
 def load_markdown(path: str | Path) -> tuple[dict[str, Any], str]:
     """Load markdown file and parse YAML front-matter.
 
     Parses a markdown file with YAML front-matter delimited by '---' lines.
     The front-matter must be at the beginning of the file and is parsed using
-    yaml.safe_load for security.
+    yaml.safe_load for security. Parse results are reused from the parse cache
+    while the file's inode, size and mtime are unchanged, and without any
+    ``stat`` call while a filesystem watcher covers the file. When the file
+    changed but its front-matter block hashes the same, the cached front-matter
+    is reused without parsing the YAML again.
 
     Args:
         path: Path to the markdown file to load.
@@ -45,21 +62,162 @@ def load_markdown(path: str | Path) -> tuple[dict[str, Any], str]:
         >>> body.strip()
         'This is the task description.'
     """
+    frontmatter_dict, body_content, _ = load_markdown_with_signature(path)
+    return frontmatter_dict, body_content
+
+
+def load_markdown_with_signature(
+    path: str | Path,
+) -> tuple[dict[str, Any], str, FileSignature | None]:
+    """Load a markdown file like ``load_markdown`` and report which version was read.
+
+    Args:
+        path: Path to the markdown file to load.
+
+    Returns:
+        Tuple of (frontmatter_dict, body_str, signature); the signature is the
+        (inode, mtime in nanoseconds, size) of the version parsed, or None if
+        the parse cache dropped it concurrently
+
+    Raises:
+        FileNotFoundError: If the specified file does not exist.
+        OSError: If the file cannot be read.
+        yaml.YAMLError: If the YAML front-matter is invalid.
+        ValueError: If the front-matter format is invalid.
+    """
     file_path = Path(path)
+    cache = get_parse_cache()
+    cache_key = os.path.abspath(file_path)
 
-    if not file_path.exists():
-        raise FileNotFoundError(f"Markdown file not found: {file_path}")
+    # Watched files are invalidated on change, so their entries need no stat
+    watched = is_watched(cache_key)
+    if watched:
+        cached = cache.get_trusted(cache_key)
+        if cached is not None:
+            return (*cached, cache.signature(cache_key))
+    generation = cache.generation
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
+        signature = file_signature(os.stat(file_path))
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Markdown file not found: {file_path}") from None
+    except OSError as e:
+        raise OSError(f"Cannot read markdown file {file_path}: {e}") from e
+
+    cached = cache.get(cache_key, signature, trust=watched, keep_stale=True)
+    if cached is not None:
+        return (*cached, signature)
+
+    try:
+        with trace_span("read"), open(file_path, "r", encoding="utf-8") as f:
             content = f.read()
     except OSError as e:
         raise OSError(f"Cannot read markdown file {file_path}: {e}") from e
 
+    yaml_content, body_content = _split_content(content, file_path)
+    trusted_generation = generation if watched else None
+
+    # Same front-matter under a new mtime (e.g. after git checkout): skip the YAML parse
+    digest = hash_frontmatter(yaml_content)
+    cached = cache.revalidate(cache_key, signature, digest, body_content, trusted_generation)
+    if cached is not None:
+        return (*cached, signature)
+
+    frontmatter_dict = _parse_frontmatter(yaml_content, file_path)
+    cache.put(
+        cache_key,
+        signature,
+        frontmatter_dict,
+        body_content,
+        trusted_generation=trusted_generation,
+        frontmatter_hash=digest,
+    )
+    return frontmatter_dict, body_content, signature
+
+
+def parse_markdown(content: str, source: str | Path = "<string>") -> tuple[dict[str, Any], str]:
+    """Parse markdown text with YAML front-matter that is not read from a file.
+
+    Args:
+        content: Full markdown text
+        source: Where the text came from, used in error messages
+
+    Returns:
+        Tuple of (frontmatter_dict, body_str)
+
+    Raises:
+        yaml.YAMLError: If the YAML front-matter is invalid.
+        ValueError: If the front-matter format is invalid.
+    """
+    yaml_content, body_content = _split_content(content, Path(source))
+    return _parse_frontmatter(yaml_content, Path(source)), body_content
+
+
+def file_fingerprint(path: str | Path) -> FileFingerprint | None:
+    """Get the fingerprint of a file's current parsed version.
+
+    Args:
+        path: Path to the markdown file
+
+    Returns:
+        Tuple of (mtime in nanoseconds, size, front-matter hash), or None if the
+        file cannot be loaded
+    """
+    try:
+        load_markdown(path)
+    except Exception:
+        return None
+    return get_parse_cache().fingerprint(os.path.abspath(path))
+
+
+def revalidate_fingerprint(
+    path: str | Path, fingerprint: FileFingerprint
+) -> FileFingerprint | None:
+    """Check whether a file's front-matter still matches a stored fingerprint.
+
+    Costs one ``stat`` when the mtime and size are unchanged. Otherwise the file
+    is read and its front-matter block hashed; the YAML is not parsed again
+    when the hash matches.
+
+    Args:
+        path: Path to the markdown file
+        fingerprint: Fingerprint recorded when the derived data was cached
+
+    Returns:
+        The fingerprint to store from now on (refreshed when only the mtime or
+        body changed), or None if the front-matter changed or the file is gone
+    """
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    if (stat_result.st_mtime_ns, stat_result.st_size) == fingerprint[:2]:
+        return fingerprint
+
+    current = file_fingerprint(path)
+    if current is None or current[2] != fingerprint[2]:
+        return None
+    return current
+
+
+def _split_content(content: str, file_path: Path) -> tuple[str, str]:
+    """Split file content into the raw front-matter block and the body.
+
+    Args:
+        content: Full text of the markdown file
+        file_path: Path of the file, used in error messages
+
+    Returns:
+        Tuple of (yaml_str, body_str); yaml_str is "" when there is no front-matter
+
+    Raises:
+        ValueError: If the front-matter format is invalid.
+    """
+
     # Check if file starts with front-matter delimiter
     if not content.startswith("---"):
-        # No front-matter, return empty dict and full content as body
-        return {}, content
+        # No front-matter, return empty block and full content as body
+        return "", content
 
     # Find the closing front-matter delimiter
     # Use regex to find the second occurrence of '---' on its own line
@@ -73,12 +231,27 @@ def load_markdown(path: str | Path) -> tuple[dict[str, Any], str]:
         )
 
     # Extract front-matter YAML and body content
-    yaml_content = match.group(1)
-    body_content = content[match.end() :]
+    return match.group(1), content[match.end() :]
+
 
+def _parse_frontmatter(yaml_content: str, file_path: Path) -> dict[str, Any]:
+    """Parse a raw front-matter block.
+
+    Args:
+        yaml_content: YAML text between the ``---`` delimiters
+        file_path: Path of the file, used in error messages
+
+    Returns:
+        Parsed front-matter dictionary
+
+    Raises:
+        yaml.YAMLError: If the YAML front-matter is invalid.
+        ValueError: If the front-matter is not a mapping.
+    """
     # Parse YAML front-matter
     try:
-        frontmatter_dict = yaml.safe_load(yaml_content) or {}
+        with trace_span("yaml_parse"):
+            frontmatter_dict = yaml.safe_load(yaml_content) or {}
     except yaml.YAMLError as e:
         raise yaml.YAMLError(f"Invalid YAML in front-matter of {file_path}: {e}") from e
 
@@ -89,4 +262,4 @@ def load_markdown(path: str | Path) -> tuple[dict[str, Any], str]:
             f"got {type(frontmatter_dict).__name__}"
         )
 
-    return frontmatter_dict, body_content
+    return frontmatter_dict
@@ -0,0 +1,70 @@
+"""Compatibility shim for MCP features FastMCP does not expose.
+
+FastMCP 2.x has no API for resource subscriptions, so this module is the one
+place that reaches below it: it installs the ``resources/subscribe`` and
+``resources/unsubscribe`` handlers on the low-level MCP server that FastMCP
+keeps in the private ``_mcp_server`` attribute, and wraps that server's
+``get_capabilities`` so ``resources.subscribe`` is advertised.
+
+Both hooks are checked before anything is installed, so a FastMCP release
+that renames or removes them fails server creation instead of silently
+serving resources nobody is notified about. tests/unit/test_mcp_compat.py
+exercises the shim against the installed FastMCP.
+"""
+
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+
+# Called with (uri, server session, lifespan context of the session)
+SubscriptionHandler = Callable[[str, Any, Any], Awaitable[None]]
+
+_LOWLEVEL_HOOKS = ("subscribe_resource", "unsubscribe_resource", "get_capabilities")
+
+
+def enable_resource_subscriptions(
+    server: "FastMCP",
+    on_subscribe: SubscriptionHandler,
+    on_unsubscribe: SubscriptionHandler,
+) -> None:
+    """Handle resource subscriptions on a FastMCP server and advertise them.
+
+    Args:
+        server: Server to install the handlers on
+        on_subscribe: Called for each ``resources/subscribe`` request
+        on_unsubscribe: Called for each ``resources/unsubscribe`` request
+
+    Raises:
+        RuntimeError: If the installed FastMCP no longer exposes the hooks
+    """
+    import fastmcp
+    from mcp.server.lowlevel.server import request_ctx
+
+    lowlevel: Any = getattr(server, "_mcp_server", None)
+    missing = [name for name in _LOWLEVEL_HOOKS if not hasattr(lowlevel, name)]
+    if missing:
+        raise RuntimeError(
+            f"FastMCP {fastmcp.__version__} does not expose {', '.join(missing)} on its "
+            "low-level server; update trellis_mcp.mcp_compat for resource subscriptions"
+        )
+
+    @lowlevel.subscribe_resource()
+    async def subscribe(uri: Any) -> None:
+        context = request_ctx.get()
+        await on_subscribe(str(uri), context.session, context.lifespan_context)
+
+    @lowlevel.unsubscribe_resource()
+    async def unsubscribe(uri: Any) -> None:
+        context = request_ctx.get()
+        await on_unsubscribe(str(uri), context.session, context.lifespan_context)
+
+    get_capabilities = lowlevel.get_capabilities
+
+    def get_capabilities_with_subscribe(*args: Any, **kwargs: Any) -> Any:
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    lowlevel.get_capabilities = get_capabilities_with_subscribe  # type: ignore[method-assign]
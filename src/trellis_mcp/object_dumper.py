@@ -1,16 +1,16 @@
 """Object dumper for Trellis MCP - converts model instances to markdown with YAML front-matter."""
 
-import os
-import tempfile
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from trellis_mcp.change_feed import ChangeOp
 from trellis_mcp.object_parser import TrellisObjectModel
 from trellis_mcp.path_resolver import id_to_path
 from trellis_mcp.utils.fs_utils import ensure_parent_dirs
+from trellis_mcp.utils.io_utils import MarkdownDocument
 
 
 def dump_object(model: TrellisObjectModel) -> str:
@@ -218,49 +218,17 @@ def write_object(model: TrellisObjectModel, project_root: Path) -> None:
     # Ensure parent directories exist
     ensure_parent_dirs(target_path)
 
-    # Check if file already exists and preserve body content
-    existing_body = ""
-    if target_path.exists():
-        try:
-            from .utils.io_utils import read_markdown
-
-            _, existing_body = read_markdown(target_path)
-        except Exception:
-            # If we can't read the existing file, use empty body
-            existing_body = ""
-
-    # Get the markdown content with preserved body
-    markdown_content = dump_object_with_body(model, existing_body)
-
-    # Get the directory where the target file should be written
-    target_dir = target_path.parent
-
-    # Create a temporary file in the same directory for atomic operation
-    # Using the same directory ensures the move operation is atomic
-    temp_file = None
+    # Load the existing document to preserve its body; the parse cache usually
+    # already holds it from the scan that selected the object
+    change: ChangeOp | None = None
     try:
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            dir=target_dir,
-            prefix=f".{target_path.name}.",
-            suffix=".tmp",
-            delete=False,
-            encoding="utf-8",
-        ) as temp_file:
-            temp_file.write(markdown_content)
-            temp_file.flush()
-            os.fsync(temp_file.fileno())  # Ensure data is written to disk
-            temp_file_path = temp_file.name
-
-        # Atomically replace the target file
-        os.replace(temp_file_path, target_path)
-
-    except Exception as e:
-        # Clean up the temporary file if it was created
-        if temp_file is not None:
-            temp_file_path = temp_file.name
-            try:
-                os.unlink(temp_file_path)
-            except OSError:
-                pass  # File may already be gone
-        raise e
+        document = MarkdownDocument.load(target_path)
+    except FileNotFoundError:
+        document = MarkdownDocument(target_path, {}, "")
+    except Exception:
+        # If we can't read the existing file, use empty body
+        document = MarkdownDocument(target_path, {}, "")
+        change = "updated"
+
+    document.frontmatter = _serialize_model_dict(model.model_dump())
+    document.save(change)
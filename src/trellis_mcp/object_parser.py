@@ -14,6 +14,7 @@ from .schema.feature import FeatureModel
 from .schema.kind_enum import KindEnum
 from .schema.project import ProjectModel
 from .schema.task import TaskModel
+from .validation.benchmark import trace_span
 
 # Type alias for all possible model instances
 TrellisObjectModel = ProjectModel | EpicModel | FeatureModel | TaskModel
@@ -73,7 +74,8 @@ def parse_object(path: str | Path) -> TrellisObjectModel:
 
     # Instantiate and validate model
     try:
-        model_instance = model_class(**frontmatter)
+        with trace_span("model_validation"):
+            model_instance = model_class(**frontmatter)
     except ValidationError:
         # Re-raise ValidationError as-is (Pydantic provides detailed error info)
         raise
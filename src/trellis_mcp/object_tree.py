@@ -0,0 +1,189 @@
+"""Object lookup map and hierarchy export for batch retrieval.
+
+getObject resolves one ID per call, walking the tree to find the file and
+again to discover children. getObjects and getTree instead use an
+``ObjectMap`` the backlog index builds from its entries: every object's file
+path and the children of every object, derived from the file layout alone.
+Object files are then read through the parse cache, and only the front-matter
+fields (and bodies) asked for are returned.
+"""
+
+import os
+from typing import Any
+
+from .markdown_loader import load_markdown
+from .storage.base import KIND_PREFIXES
+
+ObjectKey = tuple[str, str]  # (kind, ID without prefix)
+
+_KIND_ORDER = {kind: order for order, kind in enumerate(KIND_PREFIXES)}
+_CONTAINER_FILES = {"project.md": "project", "epic.md": "epic", "feature.md": "feature"}
+_PARENT_KINDS = {"epic": "project", "feature": "epic"}
+
+
+class ObjectMap:
+    """File paths and children of the objects of one planning tree.
+
+    Example:
+        >>> object_map = get_backlog_index().object_map(Path("planning"))
+        >>> object_map.find("F-login")
+        ('feature', 'login')
+        >>> object_map.children[("feature", "login")]
+        [('task', 'add-form'), ('task', 'implement-auth')]
+    """
+
+    def __init__(self, planning_root: str, paths: list[str]):
+        """Index object files by ID and parent.
+
+        Args:
+            planning_root: Absolute planning directory
+            paths: Absolute paths of the object files
+        """
+        self.paths: dict[ObjectKey, str] = {}
+        parents: dict[ObjectKey, ObjectKey | None] = {}
+        for path in sorted(paths):
+            parts = os.path.relpath(path, planning_root).split(os.sep)
+            key, parent = _locate(parts)
+            if key is None:
+                continue
+            # Like find_object_path, an open task wins over a done one with the same ID
+            if key not in self.paths or "tasks-open" in parts:
+                self.paths[key] = path
+                parents[key] = parent
+
+        self.children: dict[ObjectKey | None, list[ObjectKey]] = {}
+        for key in sorted(parents, key=lambda k: (_KIND_ORDER[k[0]], k[1])):
+            self.children.setdefault(parents[key], []).append(key)
+
+    def find(self, object_id: str) -> ObjectKey | None:
+        """Find an object by ID.
+
+        Args:
+            object_id: Prefixed ID, or unprefixed ID of any kind
+
+        Returns:
+            The object's key, or None if no object has the ID
+        """
+        object_id = object_id.strip()
+        for kind, prefix in KIND_PREFIXES.items():
+            if object_id.startswith(prefix):
+                key = (kind, object_id[len(prefix) :])
+                return key if key in self.paths else None
+        for kind in KIND_PREFIXES:
+            if (kind, object_id) in self.paths:
+                return kind, object_id
+        return None
+
+
+def object_entry(
+    key: ObjectKey, path: str, fields: list[str] | None, include_body: bool
+) -> dict[str, Any]:
+    """Read an object file into a response entry.
+
+    Args:
+        key: The object's kind and ID
+        path: Object file path
+        fields: Front-matter fields to include (None or empty: all)
+        include_body: Whether to include the markdown body
+
+    Returns:
+        Dictionary with the prefixed id, kind, projected yaml and optionally body
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the front-matter is malformed
+    """
+    yaml_dict, body = load_markdown(path)
+    return project_entry(key, yaml_dict, body, fields, include_body)
+
+
+def project_entry(
+    key: ObjectKey,
+    yaml_dict: dict[str, Any],
+    body: str,
+    fields: list[str] | None,
+    include_body: bool,
+) -> dict[str, Any]:
+    """Build a response entry from front-matter and body already read.
+
+    Args:
+        key: The object's kind and ID
+        yaml_dict: The object's front-matter
+        body: The object's markdown body
+        fields: Front-matter fields to include (None or empty: all)
+        include_body: Whether to include the body
+
+    Returns:
+        Dictionary with the prefixed id, kind, projected yaml and optionally body
+    """
+    kind, clean_id = key
+    entry: dict[str, Any] = {
+        "id": f"{KIND_PREFIXES[kind]}{clean_id}",
+        "kind": kind,
+        "yaml": (
+            {name: yaml_dict[name] for name in fields if name in yaml_dict} if fields else yaml_dict
+        ),
+    }
+    if include_body:
+        entry["body"] = body
+    return entry
+
+
+def build_tree(
+    object_map: ObjectMap,
+    key: ObjectKey,
+    depth: int | None,
+    fields: list[str] | None,
+    include_body: bool,
+) -> dict[str, Any]:
+    """Build the nested entry of an object and its descendants.
+
+    Args:
+        object_map: Map of the planning tree
+        key: Root object
+        depth: Levels of children to include (None: all)
+        fields: Front-matter fields to include (None or empty: all)
+        include_body: Whether to include markdown bodies
+
+    Returns:
+        Entry of the root object with a ``children`` list of nested entries;
+        objects at the depth limit that have children report ``has_children``
+        instead
+
+    Raises:
+        OSError: If an object file cannot be read
+        ValueError: If an object's front-matter is malformed
+    """
+    entry = object_entry(key, object_map.paths[key], fields, include_body)
+    children = object_map.children.get(key, [])
+    if depth is not None and depth <= 0:
+        if children:
+            entry["has_children"] = True
+        return entry
+    next_depth = None if depth is None else depth - 1
+    entry["children"] = [
+        build_tree(object_map, child, next_depth, fields, include_body) for child in children
+    ]
+    return entry
+
+
+def _locate(parts: list[str]) -> tuple[ObjectKey | None, ObjectKey | None]:
+    """Get the key and parent key of an object file from its relative path parts."""
+    name = parts[-1]
+    kind = _CONTAINER_FILES.get(name)
+    if kind is not None:
+        # projects/P-*/project.md, .../epics/E-*/epic.md, .../features/F-*/feature.md
+        key = (kind, parts[-2][2:])
+        if kind == "project":
+            return key, None
+        return key, (_PARENT_KINDS[kind], parts[-4][2:])
+
+    if name.startswith("T-") and name.endswith(".md"):
+        clean_id = name[2:-3]
+    elif name.endswith(".md") and "-T-" in name:
+        clean_id = name.split("-T-", 1)[1][:-3]
+    else:
+        return None, None
+    # projects/P-*/epics/E-*/features/F-*/tasks-*/...; standalone tasks have no parent
+    parent = ("feature", parts[5][2:]) if parts[0] == "projects" and len(parts) > 6 else None
+    return ("task", clean_id), parent
@@ -0,0 +1,376 @@
+"""Stat-validated cache for parsed markdown front-matter.
+
+Every read path (object parsing, task scanning, children discovery and the
+dependency graph loader) goes through ``load_markdown``, and YAML parsing is
+the dominant cost of a full tree walk. This cache keeps the parsed
+front-matter and body for each file keyed by its resolved path, and reuses
+them while the file's inode, size and nanosecond mtime are unchanged.
+
+Trellis writes files atomically through a temp file and ``os.replace``, so
+every write produces a new inode and invalidates the entry even when the
+mtime granularity is coarse.
+
+Entries also record a hash of the raw front-matter block. When a file's
+signature changed but its front-matter did not (``git checkout`` rewrites
+files and mtimes without changing their content), the entry is revalidated
+from the hash and the YAML is not parsed again. The same hash backs the
+``FileFingerprint`` the children and dependency graph caches store.
+
+Entries also listen on the invalidation bus. While a filesystem watcher covers
+a file, its entry is marked trusted once its signature has been confirmed, and
+later reads return it without calling ``stat`` at all.
+"""
+
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, TypedDict
+
+from .invalidation import get_invalidation_bus, is_under
+
+
+class ParseCacheStats(TypedDict):
+    """Type definition for parse cache statistics."""
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    revalidations: int
+    hit_rate: float
+
+
+FileSignature = tuple[int, int, int]
+
+# (mtime in nanoseconds, size, front-matter hash) of a parsed file version
+FileFingerprint = tuple[int, int, bytes]
+
+
+def file_signature(stat_result: os.stat_result) -> FileSignature:
+    """Build the cache validation signature for a stat result.
+
+    Args:
+        stat_result: Result of ``os.stat`` for the file
+
+    Returns:
+        Tuple of (inode, mtime in nanoseconds, size)
+    """
+    return (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def hash_frontmatter(block: str) -> bytes:
+    """Hash the raw front-matter block of a file.
+
+    Args:
+        block: YAML text between the ``---`` delimiters ("" when there is none)
+
+    Returns:
+        16-byte BLAKE2b digest
+    """
+    return hashlib.blake2b(block.encode("utf-8"), digest_size=16).digest()
+
+
+@dataclass
+class ParseCacheEntry:
+    """Parsed front-matter and body for one file version."""
+
+    signature: FileSignature
+    frontmatter: dict[str, Any]
+    body: str
+    trusted: bool = False
+    frontmatter_hash: bytes = b""
+
+
+class ParseCache:
+    """Thread-safe LRU cache of parsed markdown files.
+
+    Entries are only returned when the caller's current file signature matches
+    the one recorded at parse time. Front-matter dictionaries are copied on the
+    way in and out, so callers may mutate what they get back.
+
+    Example:
+        >>> cache = ParseCache(max_entries=100)
+        >>> sig = file_signature(os.stat("task.md"))
+        >>> cache.put("task.md", sig, {"title": "Task"}, "Body")
+        >>> cache.get("task.md", sig)
+        ({'title': 'Task'}, 'Body')
+    """
+
+    def __init__(self, max_entries: int = 20000):
+        """Initialize cache with LRU eviction.
+
+        Args:
+            max_entries: Maximum number of cached files (default: 20000)
+
+        Raises:
+            ValueError: If max_entries is not positive
+        """
+        if max_entries <= 0:
+            raise ValueError("Cache max_entries must be positive")
+
+        self.max_entries = max_entries
+        self._cache: OrderedDict[str, ParseCacheEntry] = OrderedDict()
+        self._lock = threading.RLock()
+
+        # Cache statistics for monitoring
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._revalidations = 0
+
+        # Bumped on every invalidation; lets readers detect changes during a parse
+        self._generation = 0
+        get_invalidation_bus().subscribe(self.invalidate_path)
+
+    @property
+    def generation(self) -> int:
+        """Invalidation counter, read before ``stat`` and passed back to ``put``."""
+        return self._generation
+
+    def get(
+        self, path: str, signature: FileSignature, trust: bool = False, keep_stale: bool = False
+    ) -> tuple[dict[str, Any], str] | None:
+        """Return the cached parse for a file if its signature still matches.
+
+        Args:
+            path: Resolved path of the file
+            signature: Current signature of the file from ``file_signature``
+            trust: Mark a matching entry as trusted (the file is watched)
+            keep_stale: Keep a mismatching entry so the caller can ``revalidate`` it
+
+        Returns:
+            Tuple of (front-matter copy, body) on a hit, None otherwise
+        """
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is None or entry.signature != signature:
+                if entry is not None and not keep_stale:
+                    # Stale entry - file changed since it was parsed
+                    del self._cache[path]
+                self._misses += 1
+                return None
+
+            if trust:
+                entry.trusted = True
+            return self._hit(path, entry)
+
+    def get_trusted(self, path: str) -> tuple[dict[str, Any], str] | None:
+        """Return the cached parse for a watched file without validating it.
+
+        Args:
+            path: Resolved path of the file
+
+        Returns:
+            Tuple of (front-matter copy, body) if a trusted entry exists, None otherwise
+        """
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is None or not entry.trusted:
+                return None
+            return self._hit(path, entry)
+
+    def signature(self, path: str) -> FileSignature | None:
+        """Get the signature of the cached version of a file.
+
+        Args:
+            path: Resolved path of the file
+
+        Returns:
+            Signature recorded for the cached parse, or None if the file is not cached
+        """
+        with self._lock:
+            entry = self._cache.get(path)
+            return entry.signature if entry is not None else None
+
+    def revalidate(
+        self,
+        path: str,
+        signature: FileSignature,
+        frontmatter_hash: bytes,
+        body: str,
+        trusted_generation: int | None = None,
+    ) -> tuple[dict[str, Any], str] | None:
+        """Reuse a stale entry whose front-matter block is unchanged.
+
+        Args:
+            path: Resolved path of the file
+            signature: Current signature of the file
+            frontmatter_hash: ``hash_frontmatter`` of the current front-matter block
+            body: Current markdown body, which replaces the cached one
+            trusted_generation: As for ``put``
+
+        Returns:
+            Tuple of (front-matter copy, body) if the entry was reused, None otherwise
+        """
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is None or not entry.frontmatter_hash:
+                return None
+            if entry.frontmatter_hash != frontmatter_hash:
+                del self._cache[path]
+                return None
+
+            entry.signature = signature
+            entry.body = body
+            entry.trusted = trusted_generation == self._generation
+            self._revalidations += 1
+            self._cache.move_to_end(path)
+            return copy.deepcopy(entry.frontmatter), body
+
+    def fingerprint(self, path: str) -> FileFingerprint | None:
+        """Get the fingerprint of the cached version of a file.
+
+        Args:
+            path: Resolved path of the file
+
+        Returns:
+            Fingerprint of the parsed version, or None if the file is not cached
+            with a front-matter hash
+        """
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is None or not entry.frontmatter_hash:
+                return None
+            return (entry.signature[1], entry.signature[2], entry.frontmatter_hash)
+
+    def _hit(self, path: str, entry: ParseCacheEntry) -> tuple[dict[str, Any], str]:
+        """Record a hit and copy the entry out. Must be called with lock held."""
+        self._cache.move_to_end(path)
+        self._hits += 1
+        return copy.deepcopy(entry.frontmatter), entry.body
+
+    def put(
+        self,
+        path: str,
+        signature: FileSignature,
+        frontmatter: dict[str, Any],
+        body: str,
+        trusted_generation: int | None = None,
+        frontmatter_hash: bytes = b"",
+    ) -> None:
+        """Store the parse result for a file version.
+
+        Args:
+            path: Resolved path of the file
+            signature: Signature of the file version that was parsed
+            frontmatter: Parsed front-matter dictionary
+            body: Markdown body after the front-matter
+            trusted_generation: For watched files, the ``generation`` read before
+                the file was stat'ed; the entry is trusted only if nothing was
+                invalidated since then
+            frontmatter_hash: ``hash_frontmatter`` of the parsed block, enabling
+                ``revalidate`` and ``fingerprint``
+        """
+        entry = ParseCacheEntry(
+            signature=signature,
+            frontmatter=copy.deepcopy(frontmatter),
+            body=body,
+            frontmatter_hash=frontmatter_hash,
+        )
+        with self._lock:
+            entry.trusted = trusted_generation == self._generation
+            self._cache[path] = entry
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, path: str) -> None:
+        """Drop the entry for a single file.
+
+        Args:
+            path: Resolved path of the file
+        """
+        with self._lock:
+            self._generation += 1
+            self._cache.pop(path, None)
+
+    def invalidate_path(self, path: str) -> None:
+        """Drop entries for a changed file, or for everything below a directory.
+
+        Args:
+            path: Absolute path published on the invalidation bus
+        """
+        with self._lock:
+            self._generation += 1
+            if path.endswith(".md"):
+                self._cache.pop(path, None)
+                return
+            for key in [key for key in self._cache if is_under(key, path)]:
+                del self._cache[key]
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._revalidations = 0
+
+    def get_stats(self) -> ParseCacheStats:
+        """Get cache statistics for monitoring.
+
+        Returns:
+            Dictionary containing cache statistics
+        """
+        with self._lock:
+            total_requests = self._hits + self._misses
+            return {
+                "size": len(self._cache),
+                "max_size": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "revalidations": self._revalidations,
+                "hit_rate": self._hits / total_requests if total_requests > 0 else 0.0,
+            }
+
+
+# Global cache instance for singleton pattern
+_parse_cache: ParseCache | None = None
+
+
+def get_parse_cache(max_entries: int = 20000) -> ParseCache:
+    """Get global parse cache instance.
+
+    Args:
+        max_entries: Maximum cache size (only used on first call)
+
+    Returns:
+        Global ParseCache instance
+    """
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = ParseCache(max_entries=max_entries)
+    return _parse_cache
+
+
+def clear_parse_cache() -> None:
+    """Clear the global parse cache."""
+    if _parse_cache:
+        _parse_cache.clear()
+
+
+def get_cache_stats() -> ParseCacheStats:
+    """Get statistics about the global parse cache.
+
+    Returns:
+        Dictionary containing cache statistics
+    """
+    if _parse_cache:
+        return _parse_cache.get_stats()
+    return {
+        "size": 0,
+        "max_size": 0,
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "revalidations": 0,
+        "hit_rate": 0.0,
+    }
@@ -6,6 +6,7 @@ hierarchical project structure (Projects → Epics → Features → Tasks).
 
 from pathlib import Path
 
+from .done_tasks import done_task_path, is_done_task_name, iter_task_files
 from .types import VALID_KINDS
 from .utils.fs_utils import find_object_path
 
@@ -339,7 +340,9 @@ def resolve_path_for_new_object(
                 # Format: T-{task-id}.md
                 filename = f"T-{clean_id}.md"
 
-            # Return path: planning/tasks-{open|done}/[timestamp-]T-{task-id}.md
+            # Return path: planning/tasks-{open|done}/[YYYY-MM/][timestamp-]T-{task-id}.md
+            if status == "done":
+                return done_task_path(path_resolution_root / task_dir, filename)
             return path_resolution_root / task_dir / filename
         # Remove prefix if present to get clean parent ID
         parent_clean = parent_id.replace("F-", "") if parent_id.startswith("F-") else parent_id
@@ -364,7 +367,7 @@ def resolve_path_for_new_object(
                 # Use simple format for open tasks
                 filename = f"T-{clean_id}.md"
 
-            return (
+            tasks_path = (
                 path_resolution_root
                 / "projects"
                 / project_dir
@@ -373,8 +376,10 @@ def resolve_path_for_new_object(
                 / "features"
                 / f"F-{parent_clean}"
                 / task_dir
-                / filename
             )
+            if status == "done":
+                return done_task_path(tasks_path, filename)
+            return tasks_path / filename
         except FileNotFoundError:
             raise ValueError(f"Parent feature '{parent_id}' not found")
 
@@ -734,6 +739,7 @@ def discover_immediate_children(kind: str, obj_id: str, project_root: Path) -> l
     cached_children = cache.get_children(parent_path)
     if cached_children is not None:
         return cached_children
+    generation = cache.generation
 
     # Cache miss - proceed with file system scan
     # Get the parent directory containing the children
@@ -779,7 +785,7 @@ def discover_immediate_children(kind: str, obj_id: str, project_root: Path) -> l
 
     # Store results in cache after successful discovery
     try:
-        cache.set_children(parent_path, children_metadata)
+        cache.set_children(parent_path, children_metadata, trusted_generation=generation)
     except Exception as e:
         # Cache storage failure should not break children discovery
         import logging
@@ -849,14 +855,12 @@ def _add_immediate_tasks_metadata(
                 if task_metadata:
                     children_metadata.append(task_metadata)
 
-    # Check tasks-done directory
-    tasks_done_dir = feature_dir / "tasks-done"
-    if tasks_done_dir.exists():
-        for task_file in tasks_done_dir.iterdir():
-            if task_file.is_file() and task_file.name.endswith(".md") and "-T-" in task_file.name:
-                task_metadata = _extract_child_metadata(task_file, "task", load_markdown_func)
-                if task_metadata:
-                    children_metadata.append(task_metadata)
+    # Check tasks-done directory, including monthly shards
+    for task_file in iter_task_files(feature_dir / "tasks-done"):
+        if is_done_task_name(task_file.name):
+            task_metadata = _extract_child_metadata(task_file, "task", load_markdown_func)
+            if task_metadata:
+                children_metadata.append(task_metadata)
 
 
 def _add_tasks_from_feature(feature_dir: Path, descendant_paths: list[Path]) -> None:
@@ -877,12 +881,10 @@ def _add_tasks_from_feature(feature_dir: Path, descendant_paths: list[Path]) ->
             ):
                 descendant_paths.append(task_file)
 
-    # Check tasks-done directory
-    tasks_done_dir = feature_dir / "tasks-done"
-    if tasks_done_dir.exists():
-        for task_file in tasks_done_dir.iterdir():
-            if task_file.is_file() and task_file.name.endswith(".md") and "-T-" in task_file.name:
-                descendant_paths.append(task_file)
+    # Check tasks-done directory, including monthly shards
+    for task_file in iter_task_files(feature_dir / "tasks-done"):
+        if is_done_task_name(task_file.name):
+            descendant_paths.append(task_file)
 
 
 def construct_standalone_task_path(
@@ -948,6 +950,8 @@ def construct_standalone_task_path(
     filename = get_standalone_task_filename(clean_id, status)
 
     # Return the complete path
+    if status == "done":
+        return done_task_path(path_resolution_root / task_dir, filename)
     return path_resolution_root / task_dir / filename
 
 
@@ -0,0 +1,273 @@
+"""On-demand profiling of Trellis MCP tool calls.
+
+Runs a real tool invocation (argument validation included) under cProfile and,
+optionally, tracemalloc, and reports the hottest functions and the largest
+allocation sites. Used by the debug-only ``profileTool`` MCP tool and the
+``trellis-mcp profile`` CLI command to investigate slow calls against
+production-shaped planning trees.
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, TypedDict
+
+from .choices import PROFILE_SORT_KEYS, ProfileSortKey
+from .settings import Settings
+
+
+class ProfileStatRow(TypedDict):
+    """Type definition for a single cProfile row."""
+
+    function: str
+    calls: int
+    primitive_calls: int
+    tottime_ms: float
+    cumtime_ms: float
+
+
+class AllocationSite(TypedDict):
+    """Type definition for a tracemalloc allocation site."""
+
+    location: str
+    size_bytes: int
+    count: int
+
+
+class MemoryProfile(TypedDict):
+    """Type definition for tracemalloc results."""
+
+    peak_bytes: int
+    current_bytes: int
+    top_allocations: list[AllocationSite]
+
+
+class ProfileReport(TypedDict):
+    """Type definition for a profiled tool call."""
+
+    tool: str
+    arguments: dict[str, Any]
+    duration_ms: float
+    success: bool
+    result: Any
+    error: str | None
+    sort: str
+    stats: list[ProfileStatRow]
+    stats_text: str
+    memory: MemoryProfile | None
+    output_path: str | None
+
+
+def get_profileable_tools(settings: Settings) -> dict[str, Any]:
+    """Build the server's tools keyed by their MCP name.
+
+    Args:
+        settings: Settings used to configure the tools
+
+    Returns:
+        Dictionary mapping tool names (e.g. 'updateObject') to FastMCP tools
+    """
+    from .tools.claim_next_task import create_claim_next_task_tool
+    from .tools.complete_task import create_complete_task_tool
+    from .tools.create_object import create_create_object_tool
+    from .tools.get_object import create_get_object_tool
+    from .tools.health_check import create_health_check_tool
+    from .tools.list_backlog import create_list_backlog_tool
+    from .tools.update_object import create_update_object_tool
+
+    factories = [
+        create_health_check_tool,
+        create_create_object_tool,
+        create_get_object_tool,
+        create_update_object_tool,
+        create_list_backlog_tool,
+        create_claim_next_task_tool,
+        create_complete_task_tool,
+    ]
+    tools = [factory(settings) for factory in factories]
+    return {tool.name: tool for tool in tools}
+
+
+async def profile_tool_call(
+    settings: Settings,
+    tool_name: str,
+    arguments: dict[str, Any],
+    sort: ProfileSortKey = "cumulative",
+    limit: int = 25,
+    trace_memory: bool = False,
+    memory_limit: int = 10,
+    output_path: str | Path | None = None,
+) -> ProfileReport:
+    """Run a tool call under cProfile (and optionally tracemalloc).
+
+    The call goes through the tool's normal argument validation and runs
+    against whatever project root the arguments name, so the profile reflects
+    the real planning tree. Tool errors are captured in the report rather
+    than raised, since a failing call is often the one worth profiling.
+
+    Args:
+        settings: Settings used to configure the tools
+        tool_name: MCP tool name (e.g. 'listBacklog')
+        arguments: Tool arguments as they would be sent by a client
+        sort: Sort key for the stats ('cumulative', 'tottime' or 'calls')
+        limit: Number of stats rows to report
+        trace_memory: Whether to record allocations with tracemalloc
+        memory_limit: Number of allocation sites to report
+        output_path: Optional path to save the raw cProfile stats (pstats format)
+
+    Returns:
+        Report with timing, the tool result or error, sorted stats and memory data
+
+    Raises:
+        ValueError: If the tool name or sort key is unknown, or limits are not positive
+    """
+    if sort not in PROFILE_SORT_KEYS:
+        raise ValueError(f"Invalid sort key '{sort}'. Must be one of: {list(PROFILE_SORT_KEYS)}")
+    if limit <= 0 or memory_limit <= 0:
+        raise ValueError("limit and memory_limit must be positive")
+
+    tools = get_profileable_tools(settings)
+    tool = tools.get(tool_name)
+    if tool is None:
+        raise ValueError(f"Unknown tool '{tool_name}'. Available tools: {sorted(tools)}")
+
+    # Only manage tracemalloc if nobody else (e.g. PYTHONTRACEMALLOC) already is
+    started_tracemalloc = trace_memory and not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+
+    result: Any = None
+    error: str | None = None
+    profiler = cProfile.Profile()
+    start_time = time.perf_counter()
+    profiler.enable()
+    try:
+        tool_result = await tool.run(arguments)
+        result = tool_result.structured_content
+        if result is None:
+            result = [getattr(block, "text", str(block)) for block in tool_result.content]
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        profiler.disable()
+        duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+
+    memory: MemoryProfile | None = None
+    if trace_memory:
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        if started_tracemalloc:
+            tracemalloc.stop()
+        memory = {
+            "peak_bytes": peak_bytes,
+            "current_bytes": current_bytes,
+            "top_allocations": _top_allocations(snapshot, memory_limit),
+        }
+
+    if output_path is not None:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(output_path))
+
+    stats_stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stats_stream)
+    stats.sort_stats(sort).print_stats(limit)
+
+    return {
+        "tool": tool_name,
+        "arguments": arguments,
+        "duration_ms": duration_ms,
+        "success": error is None,
+        "result": result,
+        "error": error,
+        "sort": sort,
+        "stats": _top_stats(stats, sort, limit),
+        "stats_text": stats_stream.getvalue(),
+        "memory": memory,
+        "output_path": str(output_path) if output_path is not None else None,
+    }
+
+
+def _top_stats(stats: pstats.Stats, sort: ProfileSortKey, limit: int) -> list[ProfileStatRow]:
+    """Extract the top rows from profiler stats as dictionaries."""
+    sort_index = {"cumulative": 3, "tottime": 2, "calls": 1}[sort]
+    raw_stats: dict[tuple[str, int, str], tuple] = stats.stats  # type: ignore[attr-defined]
+    entries = sorted(raw_stats.items(), key=lambda item: item[1][sort_index], reverse=True)
+
+    rows: list[ProfileStatRow] = []
+    for (filename, line, function), (cc, nc, tt, ct, _callers) in entries[:limit]:
+        rows.append(
+            {
+                "function": f"{filename}:{line}({function})",
+                "calls": nc,
+                "primitive_calls": cc,
+                "tottime_ms": round(tt * 1000, 3),
+                "cumtime_ms": round(ct * 1000, 3),
+            }
+        )
+    return rows
+
+
+def _top_allocations(snapshot: tracemalloc.Snapshot, limit: int) -> list[AllocationSite]:
+    """Extract the largest allocation sites still held when the snapshot was taken."""
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+    )
+    sites: list[AllocationSite] = []
+    for stat in snapshot.statistics("lineno")[:limit]:
+        frame = stat.traceback[0]
+        sites.append(
+            {
+                "location": f"{frame.filename}:{frame.lineno}",
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+        )
+    return sites
+
+
+def format_profile_report(report: ProfileReport) -> str:
+    """Render a profile report as human-readable text.
+
+    Args:
+        report: Report returned by profile_tool_call()
+
+    Returns:
+        Multi-line summary followed by the pstats table and allocation sites
+    """
+    status = "success" if report["success"] else f"error ({report['error']})"
+    lines = [
+        f"Tool: {report['tool']}",
+        f"Duration: {report['duration_ms']}ms",
+        f"Status: {status}",
+    ]
+    if report["output_path"]:
+        lines.append(f"Stats saved to: {report['output_path']}")
+
+    lines.extend(["", report["stats_text"].strip()])
+
+    memory = report["memory"]
+    if memory is not None:
+        lines.extend(
+            [
+                "",
+                f"Peak traced memory: {memory['peak_bytes'] / 1024:.1f} KiB",
+                "Top allocation sites:",
+            ]
+        )
+        for site in memory["top_allocations"]:
+            lines.append(
+                f"  {site['size_bytes'] / 1024:8.1f} KiB  {site['count']:6d} blocks  "
+                f"{site['location']}"
+            )
+
+    return "\n".join(lines)
@@ -4,8 +4,10 @@ Provides functions to query and filter objects based on their properties.
 """
 
 from pathlib import Path
+from typing import cast
 
-from .scanner import scan_tasks
+from .backlog_index import TASK_COLUMNS, get_backlog_index
+from .object_parser import parse_object
 from .schema.base_schema import BaseSchemaModel
 from .schema.status_enum import StatusEnum
 from .schema.task import TaskModel
@@ -30,9 +32,9 @@ def is_reviewable(obj: BaseSchemaModel) -> bool:
 def get_oldest_review(project_root: Path) -> TaskModel | None:
     """Get the oldest reviewable task by updated timestamp with priority tiebreaker.
 
-    Scans all tasks across both hierarchical and standalone task structures and returns
-    the task in 'review' status that has the oldest 'updated' timestamp. If multiple
-    tasks have the same timestamp, priority is used as a tiebreaker (high > normal > low).
+    Returns the task in 'review' status, across both hierarchical and standalone
+    task structures, that has the oldest 'updated' timestamp. If multiple tasks
+    have the same timestamp, priority is used as a tiebreaker (high > normal > low).
 
     Args:
         project_root: Root directory of the planning structure (e.g., ./planning)
@@ -41,29 +43,12 @@ def get_oldest_review(project_root: Path) -> TaskModel | None:
         TaskModel instance of the oldest reviewable task, or None if no reviewable tasks exist
 
     Note:
-        - Scans both hierarchical tasks (planning/projects/.../tasks-open) and standalone tasks
-          (planning/tasks-open)
+        - Served from the review queue of the backlog index, which is kept ordered
+          as tasks change status, so only the returned task's file is read
         - Ordering: oldest updated timestamp first, then priority (high=1, normal=2, low=3)
         - Skips files that cannot be parsed (malformed YAML, invalid schema)
     """
-    reviewable_tasks: list[TaskModel] = []
-
-    # scan_tasks expects the project root that contains the planning directory,
-    # but this function receives the planning directory itself
-    # So we need to get the parent directory
-    actual_project_root = project_root.parent
-
-    # Use the existing scan_tasks function to get all tasks (both hierarchical and standalone)
-    for task in scan_tasks(actual_project_root):
-        if is_reviewable(task):
-            reviewable_tasks.append(task)
-
-    # Return None if no reviewable tasks found
-    if not reviewable_tasks:
+    rows, _, _ = get_backlog_index().review_queue(project_root, limit=1)
+    if not rows:
         return None
-
-    # Sort by updated timestamp (oldest first), then by priority (higher priority first)
-    # Priority: HIGH=1, NORMAL=2, LOW=3, so lower values have higher priority
-    reviewable_tasks.sort(key=lambda task: (task.updated, task.priority))
-
-    return reviewable_tasks[0]
+    return cast(TaskModel, parse_object(project_root / rows[0][TASK_COLUMNS.index("file_path")]))
@@ -0,0 +1,101 @@
+"""Ordered queue of the tasks waiting for review.
+
+Reviewer agents repeatedly ask for the task that has waited longest in
+review. ``ReviewQueue`` keeps the review tasks of one planning tree as keys
+``(updated, priority rank, file path)`` in a sorted list, maintained by the
+backlog index as task files change status. The oldest task is the first key,
+and a page of the queue is a binary search for the cursor followed by a
+slice, so neither parses or sorts the other tasks of the tree.
+
+Cursors encode the key of the last task returned. Paging continues after it
+even if that task has left the queue meanwhile.
+"""
+
+import bisect
+from datetime import datetime
+
+# (updated as UTC, priority rank with high first, file path relative to the planning directory)
+ReviewKey = tuple[datetime, int, str]
+
+
+class ReviewQueue:
+    """Review tasks ordered by update time, then priority.
+
+    Example:
+        >>> queue = ReviewQueue()
+        >>> queue.put("/p/tasks-open/T-a.md", (updated, 2, "tasks-open/T-a.md"))
+        >>> queue.page(limit=1)
+        [(updated, 2, 'tasks-open/T-a.md')]
+    """
+
+    def __init__(self):
+        """Initialize an empty queue."""
+        self._keys: list[ReviewKey] = []
+        self._by_path: dict[str, ReviewKey] = {}
+
+    def __len__(self) -> int:
+        """Get the number of tasks in review."""
+        return len(self._keys)
+
+    def put(self, path: str, key: ReviewKey | None) -> None:
+        """Set the position of a task file, or remove it from the queue.
+
+        Args:
+            path: Absolute task file path
+            key: Queue key of the task, or None if it is not (or no longer) in review
+        """
+        old_key = self._by_path.pop(path, None)
+        if old_key is not None:
+            del self._keys[bisect.bisect_left(self._keys, old_key)]
+        if key is not None:
+            bisect.insort(self._keys, key)
+            self._by_path[path] = key
+
+    def page(self, after: ReviewKey | None = None, limit: int | None = None) -> list[ReviewKey]:
+        """Get keys in queue order.
+
+        Args:
+            after: Key to continue after (default: start of the queue)
+            limit: Maximum number of keys (default: all)
+
+        Returns:
+            Keys following ``after``
+        """
+        start = 0 if after is None else bisect.bisect_right(self._keys, after)
+        end = len(self._keys) if limit is None else start + limit
+        return self._keys[start:end]
+
+
+def encode_cursor(key: ReviewKey) -> str:
+    """Encode a queue key as a page cursor.
+
+    Args:
+        key: Key of the last task on a page
+
+    Returns:
+        Opaque cursor string
+    """
+    updated, rank, path = key
+    return f"{updated.isoformat()}|{rank}|{path}"
+
+
+def decode_cursor(cursor: str) -> ReviewKey:
+    """Decode a page cursor.
+
+    Args:
+        cursor: Cursor from ``encode_cursor``
+
+    Returns:
+        The queue key it encodes
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        updated, rank, path = cursor.split("|", 2)
+        key = datetime.fromisoformat(updated), int(rank), path
+    except ValueError as e:
+        raise ValueError(f"Invalid review queue cursor: {cursor!r}") from e
+    if key[0].tzinfo is None:
+        raise ValueError(f"Invalid review queue cursor: {cursor!r}")
+    return key
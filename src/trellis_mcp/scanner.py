@@ -3,8 +3,10 @@
 from pathlib import Path
 from typing import Iterator
 
+from .done_tasks import iter_task_files
 from .object_parser import parse_object
 from .schema.task import TaskModel
+from .validation.benchmark import trace_span
 
 
 def scan_tasks(project_root: Path) -> Iterator[TaskModel]:
@@ -26,6 +28,32 @@ def scan_tasks(project_root: Path) -> Iterator[TaskModel]:
     if not planning_dir.exists() or not planning_dir.is_dir():
         return
 
+    # Collect task files first so the directory walk is timed separately from parsing
+    with trace_span("walk"):
+        task_files = list(_iter_task_files(planning_dir, project_root))
+
+    for task_file in task_files:
+        try:
+            task_obj = parse_object(task_file)
+            if isinstance(task_obj, TaskModel):
+                yield task_obj
+        except Exception:
+            # Skip unparseable files gracefully
+            continue
+
+
+def _iter_task_files(planning_dir: Path, project_root: Path) -> Iterator[Path]:
+    """Yield task markdown files from hierarchy and standalone task directories.
+
+    Args:
+        planning_dir: The planning directory to walk
+        project_root: Resolved project root; files resolving outside it are skipped
+
+    Yields:
+        Path: Task file paths (hierarchy tasks first, then standalone tasks)
+    """
+    task_dirs: list[Path] = []
+
     projects_dir = planning_dir / "projects"
     # Note: projects_dir might not exist if there are only standalone tasks
 
@@ -53,44 +81,23 @@ def scan_tasks(project_root: Path) -> Iterator[TaskModel]:
 
                     # Scan both tasks-open and tasks-done directories
                     for task_dir_name in ["tasks-open", "tasks-done"]:
-                        task_dir = feature_dir / task_dir_name
-                        if not task_dir.exists() or not task_dir.is_dir():
-                            continue
-
-                        for task_file in task_dir.iterdir():
-                            if not task_file.is_file() or not task_file.suffix == ".md":
-                                continue
-
-                            # Security check: ensure file is within project root
-                            if not task_file.resolve().is_relative_to(project_root):
-                                continue
-
-                            try:
-                                task_obj = parse_object(task_file)
-                                if isinstance(task_obj, TaskModel):
-                                    yield task_obj
-                            except Exception:
-                                # Skip unparseable files gracefully
-                                continue
+                        task_dirs.append(feature_dir / task_dir_name)
 
     # Also scan standalone tasks at the root level
     for task_dir_name in ["tasks-open", "tasks-done"]:
-        task_dir = planning_dir / task_dir_name
+        task_dirs.append(planning_dir / task_dir_name)
+
+    for task_dir in task_dirs:
         if not task_dir.exists() or not task_dir.is_dir():
             continue
 
-        for task_file in task_dir.iterdir():
-            if not task_file.is_file() or not task_file.suffix == ".md":
+        # Includes tasks-done/YYYY-MM shards
+        for task_file in iter_task_files(task_dir):
+            if not task_file.suffix == ".md":
                 continue
 
             # Security check: ensure file is within project root
             if not task_file.resolve().is_relative_to(project_root):
                 continue
 
-            try:
-                task_obj = parse_object(task_file)
-                if isinstance(task_obj, TaskModel):
-                    yield task_obj
-            except Exception:
-                # Skip unparseable files gracefully
-                continue
+            yield task_file
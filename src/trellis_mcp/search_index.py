@@ -0,0 +1,392 @@
+"""Persistent full-text index of task titles, descriptions and logs.
+
+Backs the searchTasks tool. The index lives in an SQLite database at
+``planning/.trellis/search.db``: a ``documents`` table with each task
+file's stat signature and filter fields, and an FTS5 table with its title,
+description and ``### Log`` section. FTS5 keeps the inverted index on disk,
+ranks matches with BM25 and answers prefix queries, so a restarted server
+starts from the saved index and only re-reads the files that changed.
+
+The index follows the files like the other planning caches. Paths published
+on the invalidation bus (every Trellis write, and the filesystem watcher)
+are applied before the next search. While no watcher covers the planning
+tree, every search first compares the task files' stat signatures with the
+saved ones.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, TypedDict
+
+from .backlog_index import parent_chain
+from .change_feed import CHANGE_JOURNAL_DIR
+from .durability import get_durability_mode
+from .invalidation import get_invalidation_bus, is_under, is_watched
+from .markdown_loader import load_markdown
+from .parse_cache import FileSignature, file_signature
+from .validation.object_loader import OBJECT_FILE_PATTERNS
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+SEARCH_DB_FILE = "search.db"
+
+SCHEMA_VERSION = 1
+
+# Glob patterns, relative to the planning directory, of every task file
+TASK_FILE_PATTERNS = tuple(pattern for pattern in OBJECT_FILE_PATTERNS if "T-" in pattern)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    inode INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    id TEXT,
+    status TEXT,
+    priority TEXT,
+    parent TEXT,
+    project TEXT,
+    epic TEXT,
+    feature TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS task_text USING fts5 (
+    title, description, log, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# BM25 weights of the title, description and log columns
+_RANK = "bm25(task_text, 10.0, 1.0, 0.5)"
+
+# SQLite flushing matching each durability mode
+_SYNCHRONOUS = {"strict": "FULL", "group": "NORMAL", "relaxed": "OFF"}
+
+_TERM = re.compile(r'"[^"]*"\*?|[^\s"]+')
+
+_LOG_HEADING = "### Log"
+
+
+class SearchHit(TypedDict):
+    """Type definition for one searchTasks result."""
+
+    id: str
+    title: str
+    status: str
+    priority: str
+    parent: str
+    file_path: str
+    score: float
+    snippet: str
+
+
+def build_match(query: str) -> str:
+    """Translate a search query into an FTS5 match expression.
+
+    Every term must match. A term ending in ``*`` matches as a prefix, and
+    a double-quoted phrase matches its words in order. Punctuation inside a
+    term splits it into a phrase, so ``jwt-refresh`` finds "JWT refresh".
+
+    Args:
+        query: Search terms
+
+    Returns:
+        FTS5 expression
+
+    Raises:
+        ValueError: If the query has no terms
+    """
+    terms: list[str] = []
+    for term in _TERM.findall(query):
+        prefix = term.endswith("*")
+        text = term.rstrip("*").strip('"')
+        if not re.search(r"\w", text):
+            continue
+        terms.append('"' + text.replace('"', '""') + '"' + ("*" if prefix else ""))
+    if not terms:
+        raise ValueError(f"Search query has no terms: '{query}'")
+    return " ".join(terms)
+
+
+class SearchIndex:
+    """Full-text index of the tasks of one planning directory.
+
+    Example:
+        >>> index = get_search_index(Path("planning"))
+        >>> index.search("jwt refr*", scope="E-auth")[0]["id"]
+        'T-add-jwt-refresh'
+    """
+
+    def __init__(self, planning_root: str | Path):
+        """Open or create the index database.
+
+        Args:
+            planning_root: Planning directory
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened or SQLite lacks FTS5
+        """
+        self.planning_root = Path(os.path.abspath(planning_root))
+        self.path = self.planning_root / CHANGE_JOURNAL_DIR / SEARCH_DB_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Serializes refreshes and searches on the shared connection
+        self._lock = threading.RLock()
+        self._dirty_lock = threading.Lock()
+        self._dirty: set[str] = set()
+        self._stale = True
+        # Whether the last full sweep ran while a watcher covered the directory
+        self._trusted = False
+        self.parses = 0
+
+        self._connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        connection = self._connection
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA busy_timeout = 5000")
+        connection.execute(f"PRAGMA synchronous = {_SYNCHRONOUS[get_durability_mode()]}")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            # The index only caches the files; rebuild it from them
+            connection.executescript(
+                "DROP TABLE IF EXISTS documents; DROP TABLE IF EXISTS task_text;"
+            )
+        connection.executescript(_SCHEMA)
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        get_invalidation_bus().subscribe(self.invalidate_path)
+
+    def search(
+        self,
+        query: str,
+        scope: str = "",
+        statuses: list[str] | None = None,
+        limit: int = 20,
+    ) -> list[SearchHit]:
+        """Find the tasks matching a query, best match first.
+
+        Args:
+            query: Search terms (see ``build_match``)
+            scope: Project, epic or feature ID the tasks must belong to; like
+                listBacklog, a project scope also covers standalone tasks
+            statuses: Status values, any of which matches (None for all)
+            limit: Maximum number of results
+
+        Returns:
+            Matching tasks with their BM25 score and a snippet of the match
+
+        Raises:
+            ValueError: If the query has no terms
+        """
+        match = build_match(query)
+        clauses = ["task_text MATCH ?", "documents.id IS NOT NULL"]
+        params: list[Any] = [match]
+        if scope:
+            standalone = " OR documents.project IS NULL" if scope.startswith("P-") else ""
+            clauses.append(
+                "(documents.project = ? OR documents.epic = ? OR documents.feature = ?"
+                f" OR (documents.project IS NOT NULL AND documents.parent = ?){standalone})"
+            )
+            params.extend([scope] * 4)
+        if statuses:
+            clauses.append(f"documents.status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        params.append(limit)
+
+        self.refresh()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT documents.id, task_text.title, documents.status, documents.priority, "
+                f"documents.parent, documents.path, {_RANK}, "
+                "snippet(task_text, -1, '[', ']', '...', 12) "
+                "FROM task_text JOIN documents ON documents.doc = task_text.rowid "
+                f"WHERE {' AND '.join(clauses)} ORDER BY {_RANK} LIMIT ?",
+                params,
+            ).fetchall()
+        return [
+            {
+                "id": obj_id,
+                "title": title,
+                "status": status or "",
+                "priority": priority or "",
+                "parent": parent or "",
+                "file_path": str(self.planning_root / path),
+                "score": round(-rank, 4),
+                "snippet": snippet,
+            }
+            for obj_id, title, status, priority, parent, path, rank, snippet in rows
+        ]
+
+    def refresh(self) -> int:
+        """Bring the index up to date with the task files.
+
+        Returns:
+            Number of files added, re-read or removed
+        """
+        with self._lock:
+            with self._dirty_lock:
+                dirty, self._dirty = self._dirty, set()
+                stale, self._stale = self._stale, False
+
+            # Changes made before a watcher started were never published
+            watched = is_watched(self.planning_root)
+            with self._transaction():
+                if stale or not watched or not self._trusted:
+                    changed = self._sweep()
+                    self._trusted = watched
+                else:
+                    changed = sum(self._update(path) for path in sorted(dirty))
+            return changed
+
+    def invalidate_path(self, path: str) -> None:
+        """Record a changed path for the next search (invalidation bus listener).
+
+        Args:
+            path: Changed file, or directory whose contents may have changed
+        """
+        root = str(self.planning_root)
+        with self._dirty_lock:
+            if is_under(path, root) and path.endswith(".md"):
+                self._dirty.add(path)
+            elif is_under(path, root) or is_under(root, path):
+                self._stale = True
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _sweep(self) -> int:
+        """Compare every task file with its saved signature, re-reading changed ones."""
+        root = self.planning_root
+        known = {
+            str(root / relative): tuple(signature)
+            for relative, *signature in self._connection.execute(
+                "SELECT path, inode, mtime_ns, size FROM documents"
+            )
+        }
+        changed = 0
+        for path in sorted(str(p) for pattern in TASK_FILE_PATTERNS for p in root.glob(pattern)):
+            try:
+                signature = file_signature(os.stat(path))
+            except OSError:
+                continue  # Removed since the listing; handled with the vanished files
+            if known.pop(path, None) != signature:
+                changed += self._update(path)
+        # Files that are no longer there
+        return changed + sum(self._update(path) for path in sorted(known))
+
+    def _update(self, path: str) -> bool:
+        """Bring one file's document up to date.
+
+        Returns:
+            True if the document was added, replaced or removed
+        """
+        relative = os.path.relpath(path, self.planning_root).replace(os.sep, "/")
+        if relative.startswith("../"):
+            return False
+        row = self._connection.execute(
+            "SELECT doc, inode, mtime_ns, size FROM documents WHERE path = ?", (relative,)
+        ).fetchone()
+        try:
+            signature = file_signature(os.stat(path))
+        except OSError:
+            if row is None:
+                return False
+            self._delete(row[0])
+            return True
+        if row is not None and tuple(row[1:]) == signature:
+            return False
+        if row is None and not _is_task_file(relative):
+            return False
+        if row is not None:
+            self._delete(row[0])
+        self._insert(path, relative, signature)
+        return True
+
+    def _insert(self, path: str, relative: str, signature: FileSignature) -> None:
+        """Parse a task file into a document; unparseable files are kept without text."""
+        self.parses += 1
+        try:
+            front_matter, body = load_markdown(path)
+        except Exception as e:
+            logger.warning(f"Not indexing invalid file {path}: {e}")
+            front_matter, body = {}, ""
+        if _field(front_matter.get("kind")) != "task" or not front_matter.get("id"):
+            front_matter, body = {}, ""
+
+        obj_id = front_matter.get("id")
+        if obj_id is not None:
+            obj_id = str(obj_id)
+            obj_id = obj_id if obj_id.startswith("T-") else f"T-{obj_id}"
+        description, _, log = body.partition(_LOG_HEADING)
+        cursor = self._connection.execute(
+            "INSERT INTO documents (path, inode, mtime_ns, size, id, status, priority, parent, "
+            "project, epic, feature) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                relative,
+                *signature,
+                obj_id,
+                _field(front_matter.get("status")),
+                _field(front_matter.get("priority")),
+                _field(front_matter.get("parent")),
+                *parent_chain(relative),
+            ),
+        )
+        self._connection.execute(
+            "INSERT INTO task_text (rowid, title, description, log) VALUES (?, ?, ?, ?)",
+            (cursor.lastrowid, str(front_matter.get("title") or ""), description, log),
+        )
+
+    def _delete(self, doc: int) -> None:
+        """Remove a document and its text."""
+        self._connection.execute("DELETE FROM task_text WHERE rowid = ?", (doc,))
+        self._connection.execute("DELETE FROM documents WHERE doc = ?", (doc,))
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Commit the enclosed updates together, rolling them back on error."""
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+
+def _is_task_file(relative: str) -> bool:
+    """Check whether a path relative to the planning directory names a task file."""
+    return any(fnmatch.fnmatchcase(relative, pattern) for pattern in TASK_FILE_PATTERNS)
+
+
+def _field(value: Any) -> str | None:
+    """Get the text of a front-matter field that may hold an enum."""
+    value = getattr(value, "value", value)
+    return str(value) if value is not None else None
+
+
+# Indexes per planning root for singleton access
+_indexes: dict[str, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(planning_root: str | Path) -> SearchIndex:
+    """Get the search index for a planning root.
+
+    Args:
+        planning_root: Planning directory
+
+    Returns:
+        The process-wide SearchIndex for that directory
+    """
+    key = os.path.abspath(planning_root)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = SearchIndex(Path(key))
+            _indexes[key] = index
+        return index
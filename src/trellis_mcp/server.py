@@ -4,19 +4,187 @@ Creates and configures the FastMCP server instance for the Trellis MCP applicati
 Provides server setup with basic tools and resources for project management.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import anyio
 from fastmcp import FastMCP
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
+from .cache_warmup import CacheWarmup, warmup_planning_dir
+from .coherence import StampCoherence, StampCoherenceMiddleware
+from .done_tasks import get_done_layout, set_done_layout
+from .durability import commit_group, get_durability_mode, set_durability_mode
+from .fs_watcher import PlanningWatcher, create_watcher
 from .logging.json_rpc_logging_middleware import JsonRpcLoggingMiddleware
+from .logging.log_sink import LogSink, start_log_sink
 from .logging.logger import write_event
+from .logging.metrics import collect_server_metrics, render_prometheus
 from .logging.prune_logs import prune_logs
 from .settings import Settings
+from .subscriptions import (
+    SubscriptionManager,
+    create_subscription_manager,
+    register_task_resources,
+)
 from .tools.claim_next_task import create_claim_next_task_tool
 from .tools.complete_task import create_complete_task_tool
 from .tools.create_object import create_create_object_tool
+from .tools.get_changes import create_get_changes_tool
 from .tools.get_object import create_get_object_tool
+from .tools.get_objects import create_get_objects_tool
+from .tools.get_tree import create_get_tree_tool
 from .tools.health_check import create_health_check_tool
 from .tools.list_backlog import create_list_backlog_tool
+from .tools.list_review_queue import create_list_review_queue_tool
+from .tools.profile_tool import create_profile_tool
+from .tools.resolve_id import create_resolve_id_tool
+from .tools.search_tasks import create_search_tasks_tool
 from .tools.update_object import create_update_object_tool
+from .wal import recover_planning_root
+
+
+class _CommitGroupMiddleware(Middleware):
+    """Commit the writes of each tool call as one durability group."""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next) -> Any:
+        """Run the tool inside a commit group."""
+        with commit_group():
+            return await call_next(context)
+
+
+class _ServerRuntime:
+    """Process-wide setup a server applies while it has open sessions.
+
+    Building a server has no side effects. The first session applies the
+    durability mode and done-task layout, replays operations a previous
+    process left half done, and starts the log sink and cache warm-up. The
+    last session to end stops the warm-up, flushes the sink and restores the
+    modes that were in effect before.
+    """
+
+    def __init__(self, settings: Settings, warmup: CacheWarmup | None):
+        """Initialize the runtime.
+
+        Args:
+            settings: Server configuration settings
+            warmup: Cache warm-up to start with the first session, if enabled
+        """
+        self.settings = settings
+        self.warmup = warmup
+        self.sink: LogSink | None = None
+        self._sessions = 0
+        self._recovered = False
+        self._previous_modes: tuple[Any, Any] | None = None
+
+    async def session_started(self) -> None:
+        """Apply the process-wide setup if this is the first open session."""
+        self._sessions += 1
+        if self._sessions > 1:
+            return
+
+        # Flush writes once per tool call instead of once per file in group mode
+        self._previous_modes = (get_durability_mode(), get_done_layout())
+        set_durability_mode(self.settings.durability)
+        set_done_layout(self.settings.done_layout)
+
+        # Start the background log writer so request handling never waits on log I/O
+        if self.settings.log_async:
+            self.sink = start_log_sink(self.settings)
+
+        # Finish operations a previous process left half done before serving requests
+        if not self._recovered:
+            self._recovered = True
+            planning_dir = warmup_planning_dir(self.settings.planning_root)
+            recovery = await asyncio.to_thread(recover_planning_root, planning_dir)
+            if recovery["replayed"] or recovery["discarded"]:
+                write_event(
+                    "WARNING",
+                    "Recovered interrupted operations",
+                    settings=self.settings,
+                    **recovery,
+                )
+
+        # Fill caches in the background; requests arriving earlier are served from disk
+        if self.warmup is not None:
+            self.warmup.start()
+
+    async def session_ended(self) -> None:
+        """Undo the process-wide setup when the last open session ends."""
+        self._sessions -= 1
+        if self._sessions > 0:
+            return
+
+        if self.warmup is not None:
+            self.warmup.cancel()
+        if self._previous_modes is not None:
+            durability, done_layout = self._previous_modes
+            set_durability_mode(durability)
+            set_done_layout(done_layout)
+            self._previous_modes = None
+        if self.sink is not None:
+            # Make sure every event from this session reaches disk, without
+            # blocking the event loop while the writer thread drains
+            await asyncio.to_thread(self.sink.flush)
+
+
+def _server_lifespan(
+    settings: Settings,
+    runtime: _ServerRuntime,
+    subscriptions: SubscriptionManager,
+    watcher: PlanningWatcher | None,
+    coherence: StampCoherence | None = None,
+):
+    """Build a server lifespan that runs per-session background work.
+
+    Args:
+        settings: Server configuration settings
+        runtime: Process-wide setup applied while any session is open
+        subscriptions: Subscription manager for the task resources
+        watcher: Planning root watcher, if enabled; runs while any session is open
+        coherence: Generation stamp tracker, if enabled; trusted while any session is open
+
+    Returns:
+        Async context manager factory suitable for FastMCP's lifespan parameter
+    """
+
+    @asynccontextmanager
+    async def lifespan(_server: FastMCP) -> AsyncIterator[Any]:
+        await runtime.session_started()
+        session = subscriptions.session_started()
+        watching = False
+        if watcher is not None:
+            try:
+                watcher.acquire()
+                watching = True
+            except OSError as e:
+                # Caches fall back to stat validation without a watcher
+                write_event(
+                    "WARNING",
+                    "Planning root watcher failed to start",
+                    settings=settings,
+                    backend=watcher.backend,
+                    error=str(e),
+                )
+        if coherence is not None:
+            coherence.acquire()
+        try:
+            # Request handlers see this as the lifespan context of their session
+            yield session
+        finally:
+            subscriptions.session_ended(session)
+            if watching and watcher is not None:
+                watcher.release()
+            if coherence is not None:
+                coherence.release()
+            # Sessions end by cancellation; finish the flush before returning
+            with anyio.CancelScope(shield=True):
+                await runtime.session_ended()
+
+    return lifespan
 
 
 def create_server(settings: Settings) -> FastMCP:
@@ -24,6 +192,8 @@ def create_server(settings: Settings) -> FastMCP:
 
     Creates a Trellis MCP server with basic tools and resources for hierarchical
     project management. Server is configured using the provided settings.
+    Building the server starts no threads and touches neither the planning
+    root nor process-wide modes; that happens when the first session opens.
 
     Args:
         settings: Configuration settings for server setup
@@ -31,6 +201,27 @@ def create_server(settings: Settings) -> FastMCP:
     Returns:
         Configured FastMCP server instance ready to run
     """
+    # Log sink, recovery, modes and cache warm-up start with the first session
+    warmup = CacheWarmup(settings) if settings.warm_cache_on_start else None
+    runtime = _ServerRuntime(settings, warmup)
+
+    # Subscribed task resources are polled for changes while sessions are connected
+    subscriptions = create_subscription_manager(settings)
+
+    # Publish external edits to the caches so warm reads can skip stat validation
+    watcher = None
+    if settings.watch_planning_root:
+        watcher = create_watcher(
+            warmup_planning_dir(settings.planning_root),
+            backend=settings.watch_backend,
+            poll_interval=settings.watch_poll_interval_ms / 1000,
+        )
+
+    # Follow other processes' writes through the generation stamp instead of stat checks
+    coherence = None
+    if settings.trust_generation_stamp:
+        coherence = StampCoherence(warmup_planning_dir(settings.planning_root))
+
     # Create server with descriptive name and instructions
     server = FastMCP(
         name="Trellis MCP Server",
@@ -42,10 +233,18 @@ def create_server(settings: Settings) -> FastMCP:
         The server manages planning data stored as Markdown files with YAML front-matter
         in a nested directory structure under the planning root directory.
         """,
+        lifespan=_server_lifespan(settings, runtime, subscriptions, watcher, coherence),
     )
+    if coherence is not None:
+        server.add_middleware(StampCoherenceMiddleware(coherence))
+    if settings.durability == "group":
+        server.add_middleware(_CommitGroupMiddleware())
+
+    # Task resources agents can subscribe to instead of polling claimNextTask
+    register_task_resources(server, subscriptions)
 
     # Create and register health check tool
-    health_check = create_health_check_tool(settings)
+    health_check = create_health_check_tool(settings, warmup)
     server.add_tool(health_check)
 
     # Create and register createObject tool
@@ -72,6 +271,35 @@ def create_server(settings: Settings) -> FastMCP:
     complete_task_tool = create_complete_task_tool(settings)
     server.add_tool(complete_task_tool)
 
+    # Create and register getChanges tool
+    get_changes_tool = create_get_changes_tool(settings)
+    server.add_tool(get_changes_tool)
+
+    # Create and register searchTasks tool
+    search_tasks_tool = create_search_tasks_tool(settings)
+    server.add_tool(search_tasks_tool)
+
+    # Create and register resolveId tool
+    resolve_id_tool = create_resolve_id_tool(settings)
+    server.add_tool(resolve_id_tool)
+
+    # Create and register listReviewQueue tool
+    list_review_queue_tool = create_list_review_queue_tool(settings)
+    server.add_tool(list_review_queue_tool)
+
+    # Create and register getObjects tool
+    get_objects_tool = create_get_objects_tool(settings)
+    server.add_tool(get_objects_tool)
+
+    # Create and register getTree tool
+    get_tree_tool = create_get_tree_tool(settings)
+    server.add_tool(get_tree_tool)
+
+    # Register the profiling tool only in debug mode
+    if settings.debug_mode:
+        profile_tool = create_profile_tool(settings)
+        server.add_tool(profile_tool)
+
     @server.resource("info://server")
     def server_info() -> dict[str, str | int | bool]:
         """Provide server configuration and runtime information.
@@ -90,6 +318,23 @@ def create_server(settings: Settings) -> FastMCP:
             "auto_create_dirs": settings.auto_create_dirs,
         }
 
+    @server.resource("metrics://server")
+    def server_metrics() -> dict[str, Any]:
+        """Provide in-process performance metrics.
+
+        Returns per-tool latency percentiles and histograms, error counts,
+        request/response sizes, cache hit rates and log sink statistics.
+        """
+        return collect_server_metrics(settings.log_dir)
+
+    @server.custom_route("/metrics", methods=["GET"])
+    async def prometheus_metrics(_request: Request) -> PlainTextResponse:
+        """Expose server metrics in Prometheus text format (HTTP transport only)."""
+        return PlainTextResponse(
+            render_prometheus(collect_server_metrics(settings.log_dir)),
+            media_type="text/plain; version=0.0.4",
+        )
+
     # Register JSON-RPC logging middleware
     server.add_middleware(JsonRpcLoggingMiddleware(settings))
 
@@ -40,6 +40,49 @@ class Settings(BaseSettings):
         default=30, description="Number of days to retain log files before automatic cleanup", gt=0
     )
 
+    log_async: bool = Field(
+        default=True,
+        description="Write server log events through a background writer thread",
+    )
+
+    log_flush_interval_ms: int = Field(
+        default=250, description="Maximum delay in ms before queued log lines are flushed", gt=0
+    )
+
+    log_flush_max_events: int = Field(
+        default=256, description="Number of pending log lines that forces a flush", gt=0
+    )
+
+    log_queue_max_events: int = Field(
+        default=10000,
+        description="Capacity of the background log queue; events beyond it are dropped",
+        gt=0,
+    )
+
+    log_success_sample_rate: float = Field(
+        default=1.0,
+        description="Fraction of successful call events to log (1.0 logs all)",
+        ge=0.0,
+        le=1.0,
+    )
+
+    measure_payload_sizes: bool = Field(
+        default=False,
+        description=(
+            "Serialize each tool call's arguments and result again to report their sizes "
+            "in the server metrics (sizes read 0 when off)"
+        ),
+    )
+
+    slow_call_threshold_ms: int = Field(
+        default=0,
+        description=(
+            "Trace tool calls and log those slower than this with their span tree "
+            "(0, the default, disables tracing)"
+        ),
+        ge=0,
+    )
+
     # Transport Configuration
     default_transport: Literal["stdio", "http"] = Field(
         default="stdio", description="Default transport type for MCP server"
@@ -91,6 +134,57 @@ class Settings(BaseSettings):
         default=10, description="Maximum file size in MB for safety checks", gt=0
     )
 
+    warm_cache_on_start: bool = Field(
+        default=False,
+        description="Pre-walk the planning root on a background thread at server start",
+    )
+
+    watch_planning_root: bool = Field(
+        default=False,
+        description=(
+            "Watch the planning root for external edits so caches skip per-read stat validation"
+        ),
+    )
+
+    watch_backend: Literal["auto", "inotify", "polling"] = Field(
+        default="auto",
+        description="Watcher backend; auto uses inotify when available and polling otherwise",
+    )
+
+    watch_poll_interval_ms: int = Field(
+        default=1000, description="Interval in ms between sweeps of the polling watcher", gt=0
+    )
+
+    trust_generation_stamp: bool = Field(
+        default=False,
+        description=(
+            "Trust caches between changes recorded in the planning root's generation stamp; "
+            "edits made outside Trellis are only seen with watch_planning_root enabled"
+        ),
+    )
+
+    durability: Literal["strict", "group", "relaxed"] = Field(
+        default="strict",
+        description=(
+            "How writes are flushed: fsync every file and directory (strict), once per "
+            "tool call (group), or never (relaxed)"
+        ),
+    )
+
+    done_layout: Literal["flat", "monthly"] = Field(
+        default="flat",
+        description=(
+            "Where completed tasks are written: directly in tasks-done (flat) or in "
+            "tasks-done/YYYY-MM shards (monthly)"
+        ),
+    )
+
+    subscription_poll_interval_ms: int = Field(
+        default=250,
+        description="Interval in ms between change checks for subscribed task resources",
+        gt=0,
+    )
+
     # CLI Configuration
     cli_prog_name: str = Field(
         default="trellis-mcp", description="Program name displayed in CLI help"
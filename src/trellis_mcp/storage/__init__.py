@@ -0,0 +1,23 @@
+"""Storage backends for Trellis objects.
+
+``StorageBackend`` is the persistence interface: get, put, move, delete,
+list-by-scope and query, plus transactions. ``MarkdownBackend`` stores the
+markdown planning tree the tools work on; ``SQLiteBackend`` stores a single
+indexed database. ``copy_objects`` moves a tree between backends, which the
+``import`` and ``export`` CLI commands use to keep markdown as the exchange
+format.
+"""
+
+from .base import StorageBackend, StoredObject
+from .markdown import MarkdownBackend
+from .sqlite import SQLiteBackend
+from .transfer import copy_objects, open_backend
+
+__all__ = [
+    "MarkdownBackend",
+    "SQLiteBackend",
+    "StorageBackend",
+    "StoredObject",
+    "copy_objects",
+    "open_backend",
+]
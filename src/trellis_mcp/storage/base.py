@@ -0,0 +1,157 @@
+"""Storage backend interface for Trellis objects.
+
+A backend stores objects as front-matter plus markdown body, the same pair
+``read_markdown`` returns for an object file, keyed by their prefixed IDs.
+The markdown planning tree is the default backend; others must hold the
+same objects so that any backend can be exported to and imported from the
+markdown tree without loss.
+"""
+
+from contextlib import AbstractContextManager
+from typing import Any, Iterable, Protocol, TypedDict, runtime_checkable
+
+KIND_PREFIXES = {"project": "P-", "epic": "E-", "feature": "F-", "task": "T-"}
+
+# Parents before children, the order objects must be created in
+KIND_ORDER = ("project", "epic", "feature", "task")
+
+PARENT_KINDS = {"epic": "project", "feature": "epic", "task": "feature"}
+
+
+class StoredObject(TypedDict):
+    """Type definition for an object as held by a storage backend."""
+
+    yaml: dict[str, Any]  # front-matter, including kind and prefixed id
+    body: str  # markdown body
+
+
+@runtime_checkable
+class StorageBackend(Protocol):
+    """Persistence operations every storage backend provides."""
+
+    def get(self, kind: str, obj_id: str) -> StoredObject | None:
+        """Get an object by kind and ID (with or without prefix), or None."""
+        ...
+
+    def put(self, obj: StoredObject) -> None:
+        """Create or replace an object; a task moves when its status moves it."""
+        ...
+
+    def move(self, task_id: str, feature_id: str | None) -> None:
+        """Move a task to another feature, or out of the hierarchy with None."""
+        ...
+
+    def delete(self, kind: str, obj_id: str) -> list[str]:
+        """Delete an object and its descendants, returning their prefixed IDs."""
+        ...
+
+    def list_scope(self, scope_id: str | None = None) -> list[StoredObject]:
+        """List the descendants of a project, epic or feature, or every object."""
+        ...
+
+    def query(
+        self,
+        kind: str | None = None,
+        status: str | None = None,
+        priority: str | None = None,
+        parent: str | None = None,
+        prerequisite: str | None = None,
+    ) -> list[StoredObject]:
+        """List objects matching every given field."""
+        ...
+
+    def transaction(self) -> AbstractContextManager[None]:
+        """Group the writes of the enclosed block."""
+        ...
+
+    def close(self) -> None:
+        """Release the backend's resources."""
+        ...
+
+
+def prefixed_id(kind: str, obj_id: str) -> str:
+    """Add the kind prefix to an ID that lacks it.
+
+    Args:
+        kind: Object kind
+        obj_id: ID with or without prefix
+
+    Returns:
+        Prefixed ID
+
+    Raises:
+        ValueError: If the kind is unknown
+    """
+    if kind not in KIND_PREFIXES:
+        raise ValueError(f"Unknown object kind: {kind}")
+    prefix = KIND_PREFIXES[kind]
+    return obj_id if obj_id.startswith(prefix) else prefix + obj_id
+
+
+def clean_id(obj_id: str) -> str:
+    """Strip the kind prefix from an ID."""
+    return obj_id[2:] if obj_id.startswith(tuple(KIND_PREFIXES.values())) else obj_id
+
+
+def field_value(value: Any) -> Any:
+    """Get the plain value of a front-matter field that may hold an enum."""
+    return getattr(value, "value", value)
+
+
+def object_kind(obj: StoredObject) -> str:
+    """Get the kind of a stored object."""
+    return str(field_value(obj["yaml"].get("kind")))
+
+
+def object_id(obj: StoredObject) -> str:
+    """Get the prefixed ID of a stored object.
+
+    Raises:
+        ValueError: If the object has no kind or ID
+    """
+    obj_id = obj["yaml"].get("id")
+    if not obj_id:
+        raise ValueError("Stored object has no id")
+    return prefixed_id(object_kind(obj), str(obj_id))
+
+
+def parent_id(obj: StoredObject) -> str | None:
+    """Get the prefixed ID of a stored object's parent, if it has one."""
+    parent = obj["yaml"].get("parent")
+    parent_kind = PARENT_KINDS.get(object_kind(obj))
+    if not parent or parent_kind is None:
+        return None
+    return prefixed_id(parent_kind, str(parent))
+
+
+def prerequisite_ids(obj: StoredObject) -> list[str]:
+    """Get a stored object's prerequisites as IDs without prefix."""
+    return [clean_id(str(prereq)) for prereq in obj["yaml"].get("prerequisites") or []]
+
+
+def matches(
+    obj: StoredObject,
+    kind: str | None = None,
+    status: str | None = None,
+    priority: str | None = None,
+    parent: str | None = None,
+    prerequisite: str | None = None,
+) -> bool:
+    """Check a stored object against ``StorageBackend.query`` filters."""
+    yaml = obj["yaml"]
+    if kind is not None and object_kind(obj) != kind:
+        return False
+    if status is not None and str(field_value(yaml.get("status"))) != status:
+        return False
+    if priority is not None and str(field_value(yaml.get("priority"))) != priority:
+        return False
+    if parent is not None and parent not in (parent_id(obj), clean_id(parent_id(obj) or "")):
+        return False
+    if prerequisite is not None and clean_id(prerequisite) not in prerequisite_ids(obj):
+        return False
+    return True
+
+
+def creation_order(objects: Iterable[StoredObject]) -> list[StoredObject]:
+    """Sort objects so every parent comes before its children."""
+    return sorted(objects, key=lambda obj: (KIND_ORDER.index(object_kind(obj)), object_id(obj)))
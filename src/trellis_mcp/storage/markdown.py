@@ -0,0 +1,250 @@
+"""Markdown planning tree storage backend.
+
+Objects live where the rest of Trellis reads them: one markdown file per
+object under ``planning/projects/...``, ``planning/tasks-open`` and
+``planning/tasks-done``. Every write is atomic per file and recorded in the
+change feed. A transaction groups the flush of its writes (see
+``trellis_mcp.durability``) but cannot make several files change at once.
+"""
+
+import copy
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+from ..change_feed import object_id_from_path, record_change
+from ..done_tasks import done_task_path, tasks_dir_of
+from ..durability import commit_group
+from ..path_resolver import id_to_path, resolve_path_for_new_object
+from ..utils.fs_utils import recursive_delete
+from ..utils.io_utils import MarkdownDocument, read_markdown, write_markdown
+from ..validation.object_loader import OBJECT_FILE_PATTERNS
+from .base import (
+    StoredObject,
+    clean_id,
+    field_value,
+    matches,
+    object_id,
+    object_kind,
+    parent_id,
+    prefixed_id,
+)
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+
+class MarkdownBackend:
+    """Storage backend over a markdown planning directory.
+
+    Example:
+        >>> backend = MarkdownBackend(Path("planning"))
+        >>> backend.query(kind="task", status="open")
+    """
+
+    def __init__(self, planning_root: str | Path):
+        """Initialize the backend.
+
+        Args:
+            planning_root: Planning directory (containing projects/ and tasks-*/)
+        """
+        self.planning_root = Path(planning_root).absolute()
+
+    def get(self, kind: str, obj_id: str) -> StoredObject | None:
+        """Get an object by kind and ID.
+
+        Args:
+            kind: Object kind
+            obj_id: ID with or without prefix
+
+        Returns:
+            The object, or None if it does not exist
+        """
+        path = self._find(kind, obj_id)
+        if path is None:
+            return None
+        return self._read(path)
+
+    def put(self, obj: StoredObject) -> None:
+        """Create or replace an object file.
+
+        A task whose status moves it between tasks-open and tasks-done is
+        renamed into place. Parents must exist before their children.
+
+        Args:
+            obj: Object to store
+
+        Raises:
+            ValueError: If the object has no ID or its parent does not exist
+            OSError: If the file cannot be written
+        """
+        kind = object_kind(obj)
+        current = self._find(kind, object_id(obj))
+        target = self._path_for(obj, current)
+        if current is None or current == target:
+            write_markdown(target, obj["yaml"], obj["body"])
+        else:
+            MarkdownDocument(current, dict(obj["yaml"]), obj["body"]).move_to(target)
+
+    def move(self, task_id: str, feature_id: str | None) -> None:
+        """Move a task to another feature's task directories, or to the standalone ones.
+
+        Args:
+            task_id: Task ID with or without prefix
+            feature_id: Feature ID with or without prefix, or None
+
+        Raises:
+            FileNotFoundError: If the task does not exist
+            ValueError: If the feature does not exist
+        """
+        current = self._find("task", task_id)
+        if current is None:
+            raise FileNotFoundError(f"Task not found: {prefixed_id('task', task_id)}")
+        document = MarkdownDocument.load(current)
+        document.frontmatter["parent"] = (
+            prefixed_id("feature", feature_id) if feature_id is not None else None
+        )
+        obj: StoredObject = {"yaml": document.frontmatter, "body": document.body}
+        target = self._path_for(obj, None, keep_name=current.name)
+        if target != current:
+            document.move_to(target)
+        else:
+            document.save()
+
+    def delete(self, kind: str, obj_id: str) -> list[str]:
+        """Delete an object file, with its directory and descendants for containers.
+
+        Args:
+            kind: Object kind
+            obj_id: ID with or without prefix
+
+        Returns:
+            Prefixed IDs of the deleted objects (empty if it did not exist)
+        """
+        path = self._find(kind, obj_id)
+        if path is None:
+            return []
+        deleted: list[str] = []
+        for removed in recursive_delete(path if kind == "task" else path.parent):
+            identity = object_id_from_path(removed)
+            if removed.suffix == ".md" and identity is not None:
+                record_change(removed, "deleted")
+                deleted.append(identity[1])
+        return deleted
+
+    def list_scope(self, scope_id: str | None = None) -> list[StoredObject]:
+        """List the descendants of a project, epic or feature, or every object.
+
+        Args:
+            scope_id: Prefixed project, epic or feature ID, or None for all objects
+
+        Returns:
+            Matching objects; files that cannot be parsed are skipped
+        """
+        objects: list[StoredObject] = []
+        for pattern in OBJECT_FILE_PATTERNS:
+            for path in sorted(self.planning_root.glob(pattern)):
+                try:
+                    objects.append(self._read(path))
+                except Exception as e:
+                    logger.warning(f"Skipping invalid file {path}: {e}")
+        if scope_id is None:
+            return objects
+
+        parents = {object_id(obj): parent_id(obj) for obj in objects}
+        return [obj for obj in objects if scope_id in _ancestors(object_id(obj), parents)]
+
+    def query(
+        self,
+        kind: str | None = None,
+        status: str | None = None,
+        priority: str | None = None,
+        parent: str | None = None,
+        prerequisite: str | None = None,
+    ) -> list[StoredObject]:
+        """List objects matching every given field by reading the whole tree.
+
+        Args:
+            kind: Object kind
+            status: Status value
+            priority: Priority value
+            parent: Parent ID with or without prefix
+            prerequisite: ID of a prerequisite the object must have
+
+        Returns:
+            Matching objects
+        """
+        return [
+            obj
+            for obj in self.list_scope()
+            if matches(obj, kind, status, priority, parent, prerequisite)
+        ]
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Flush the enclosed writes together in group durability mode."""
+        with commit_group():
+            yield
+
+    def close(self) -> None:
+        """Nothing to release; files are not kept open."""
+
+    def _find(self, kind: str, obj_id: str) -> Path | None:
+        """Find an object's file, or None."""
+        try:
+            return id_to_path(self.planning_root, kind, clean_id(obj_id))
+        except FileNotFoundError:
+            return None
+
+    def _read(self, path: Path) -> StoredObject:
+        """Read an object file into a private copy."""
+        yaml, body = read_markdown(path)
+        return {"yaml": copy.deepcopy(yaml), "body": body}
+
+    def _path_for(self, obj: StoredObject, current: Path | None, keep_name: str = "") -> Path:
+        """Get the path an object belongs at given its parent and status."""
+        kind = object_kind(obj)
+        if current is not None and kind != "task":
+            return current
+
+        status = str(field_value(obj["yaml"].get("status")))
+        parent = parent_id(obj)
+        resolved = resolve_path_for_new_object(
+            kind,
+            clean_id(object_id(obj)),
+            clean_id(parent) if parent else None,
+            self.planning_root,
+            status=status,
+        )
+        if kind != "task" or status != "done":
+            return resolved
+
+        tasks_done_dir = tasks_dir_of(resolved)
+        if current is not None and tasks_dir_of(current) == tasks_done_dir:
+            return current
+        return done_task_path(tasks_done_dir, keep_name or _done_name(obj, resolved.name))
+
+
+def _done_name(obj: StoredObject, default: str) -> str:
+    """Name a done task file after its last update, keeping its completion time."""
+    updated = obj["yaml"].get("updated")
+    if isinstance(updated, str):
+        try:
+            updated = datetime.fromisoformat(updated)
+        except ValueError:
+            return default
+    if not isinstance(updated, datetime):
+        return default
+    return f"{updated:%Y%m%d_%H%M%S}-T-{clean_id(object_id(obj))}.md"
+
+
+def _ancestors(obj_id: str, parents: dict[str, str | None]) -> set[str]:
+    """Collect the prefixed IDs of an object's ancestors."""
+    found: set[str] = set()
+    parent = parents.get(obj_id)
+    while parent and parent not in found:
+        found.add(parent)
+        parent = parents.get(parent)
+    return found
@@ -0,0 +1,303 @@
+"""SQLite storage backend.
+
+Holds every object in one database file, for trees too large to scan as
+files. Status, priority, parent and prerequisites are stored in indexed
+columns so queries do not read every object, and a transaction commits the
+writes of several objects atomically. The database runs in WAL journal mode
+so readers in other processes are not blocked by a writer.
+
+Front-matter is stored as JSON with datetimes as ISO strings and enums as
+their values, the form ``write_markdown`` serializes them in.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+from ..durability import get_durability_mode
+from .base import (
+    StoredObject,
+    clean_id,
+    field_value,
+    object_id,
+    object_kind,
+    parent_id,
+    prefixed_id,
+    prerequisite_ids,
+)
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    parent TEXT,
+    status TEXT,
+    priority TEXT,
+    front_matter TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS objects_kind_status ON objects (kind, status);
+CREATE INDEX IF NOT EXISTS objects_priority ON objects (priority);
+CREATE INDEX IF NOT EXISTS objects_parent ON objects (parent);
+CREATE TABLE IF NOT EXISTS prerequisites (
+    object_id TEXT NOT NULL REFERENCES objects (id) ON DELETE CASCADE,
+    prerequisite_id TEXT NOT NULL,
+    PRIMARY KEY (object_id, prerequisite_id)
+);
+CREATE INDEX IF NOT EXISTS prerequisites_target ON prerequisites (prerequisite_id);
+"""
+
+# SQLite flushing matching each durability mode
+_SYNCHRONOUS = {"strict": "FULL", "group": "NORMAL", "relaxed": "OFF"}
+
+# Descendants of an object, the object included
+_SUBTREE = """
+WITH RECURSIVE subtree (id) AS (
+    SELECT id FROM objects WHERE id = ?
+    UNION
+    SELECT objects.id FROM objects JOIN subtree ON objects.parent = subtree.id
+)
+"""
+
+
+class SQLiteBackend:
+    """Storage backend over a SQLite database file.
+
+    Example:
+        >>> backend = SQLiteBackend(Path("trellis.db"))
+        >>> with backend.transaction():
+        ...     backend.put(feature)
+        ...     backend.put(task)
+        >>> backend.query(kind="task", status="open", priority="high")
+    """
+
+    def __init__(self, path: str | Path):
+        """Open or create the database.
+
+        Args:
+            path: Database file
+
+        Raises:
+            ValueError: If the database has an unsupported schema version
+            sqlite3.Error: If the database cannot be opened
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Transactions are issued explicitly; the lock serializes threads on the connection
+        self._connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._depth = 0
+
+        connection = self._connection
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA busy_timeout = 5000")
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.execute(f"PRAGMA synchronous = {_SYNCHRONOUS[get_durability_mode()]}")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            connection.close()
+            raise ValueError(f"Unsupported Trellis database schema version {version} in {path}")
+        connection.executescript(_SCHEMA)
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def get(self, kind: str, obj_id: str) -> StoredObject | None:
+        """Get an object by kind and ID.
+
+        Args:
+            kind: Object kind
+            obj_id: ID with or without prefix
+
+        Returns:
+            The object, or None if it does not exist
+        """
+        rows = self._select("WHERE id = ? AND kind = ?", [prefixed_id(kind, obj_id), kind])
+        return rows[0] if rows else None
+
+    def put(self, obj: StoredObject) -> None:
+        """Create or replace an object.
+
+        Args:
+            obj: Object to store
+
+        Raises:
+            ValueError: If the object has no ID
+        """
+        key = object_id(obj)
+        yaml = obj["yaml"]
+        row = (
+            key,
+            object_kind(obj),
+            parent_id(obj),
+            _text(yaml.get("status")),
+            _text(yaml.get("priority")),
+            json.dumps(yaml, default=_json_default),
+            obj["body"],
+        )
+        with self.transaction():
+            self._connection.execute(
+                "INSERT INTO objects (id, kind, parent, status, priority, front_matter, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET kind = excluded.kind, parent = excluded.parent, "
+                "status = excluded.status, priority = excluded.priority, "
+                "front_matter = excluded.front_matter, body = excluded.body",
+                row,
+            )
+            self._connection.execute("DELETE FROM prerequisites WHERE object_id = ?", (key,))
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO prerequisites (object_id, prerequisite_id) VALUES (?, ?)",
+                [(key, prereq) for prereq in prerequisite_ids(obj)],
+            )
+
+    def move(self, task_id: str, feature_id: str | None) -> None:
+        """Move a task to another feature, or out of the hierarchy.
+
+        Args:
+            task_id: Task ID with or without prefix
+            feature_id: Feature ID with or without prefix, or None
+
+        Raises:
+            FileNotFoundError: If the task does not exist
+            ValueError: If the feature does not exist
+        """
+        with self.transaction():
+            task = self.get("task", task_id)
+            if task is None:
+                raise FileNotFoundError(f"Task not found: {prefixed_id('task', task_id)}")
+            if feature_id is not None and self.get("feature", feature_id) is None:
+                raise ValueError(f"Parent feature '{feature_id}' not found")
+            task["yaml"]["parent"] = (
+                prefixed_id("feature", feature_id) if feature_id is not None else None
+            )
+            self.put(task)
+
+    def delete(self, kind: str, obj_id: str) -> list[str]:
+        """Delete an object and its descendants in one transaction.
+
+        Args:
+            kind: Object kind
+            obj_id: ID with or without prefix
+
+        Returns:
+            Prefixed IDs of the deleted objects (empty if it did not exist)
+        """
+        key = prefixed_id(kind, obj_id)
+        with self.transaction():
+            deleted = [
+                row[0]
+                for row in self._connection.execute(f"{_SUBTREE} SELECT id FROM subtree", (key,))
+            ]
+            self._connection.execute(f"{_SUBTREE} DELETE FROM objects WHERE id IN subtree", (key,))
+        return deleted
+
+    def list_scope(self, scope_id: str | None = None) -> list[StoredObject]:
+        """List the descendants of a project, epic or feature, or every object.
+
+        Args:
+            scope_id: Prefixed project, epic or feature ID, or None for all objects
+
+        Returns:
+            Matching objects ordered by ID
+        """
+        if scope_id is None:
+            return self._select("", [])
+        return self._select(
+            "WHERE id IN (SELECT id FROM subtree) AND id != ?", [scope_id, scope_id], _SUBTREE
+        )
+
+    def query(
+        self,
+        kind: str | None = None,
+        status: str | None = None,
+        priority: str | None = None,
+        parent: str | None = None,
+        prerequisite: str | None = None,
+    ) -> list[StoredObject]:
+        """List objects matching every given field through the column indexes.
+
+        Args:
+            kind: Object kind
+            status: Status value
+            priority: Priority value
+            parent: Parent ID with or without prefix
+            prerequisite: ID of a prerequisite the object must have
+
+        Returns:
+            Matching objects ordered by ID
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column, value in (("kind", kind), ("status", status), ("priority", priority)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if parent is not None:
+            # A bare ID may name a project, epic or feature
+            candidates = [parent] if clean_id(parent) != parent else _container_ids(parent)
+            clauses.append(f"parent IN ({', '.join('?' * len(candidates))})")
+            params.extend(candidates)
+        if prerequisite is not None:
+            clauses.append("id IN (SELECT object_id FROM prerequisites WHERE prerequisite_id = ?)")
+            params.append(clean_id(prerequisite))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._select(where, params)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Commit the enclosed writes atomically; nested transactions join the outer one.
+
+        Raises:
+            sqlite3.Error: If the transaction cannot be started or committed
+        """
+        with self._lock:
+            if self._depth == 0:
+                self._connection.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._connection.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _select(self, where: str, params: list[Any], prefix: str = "") -> list[StoredObject]:
+        """Load objects from the rows matching a WHERE clause."""
+        with self._lock:
+            rows = self._connection.execute(
+                f"{prefix} SELECT front_matter, body FROM objects {where} ORDER BY id", params
+            ).fetchall()
+        return [{"yaml": json.loads(front_matter), "body": body} for front_matter, body in rows]
+
+
+def _container_ids(bare_id: str) -> list[str]:
+    """Get the prefixed IDs a bare parent ID may stand for."""
+    return [prefixed_id(kind, bare_id) for kind in ("project", "epic", "feature")]
+
+
+def _text(value: Any) -> str | None:
+    """Get a column value for an indexed front-matter field."""
+    value = field_value(value)
+    return str(value) if value is not None else None
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize front-matter values JSON has no type for."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return str(value)
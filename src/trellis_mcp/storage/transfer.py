@@ -0,0 +1,56 @@
+"""Opening backends by name and copying objects between them.
+
+Backends are named by a spec string: ``sqlite:PATH`` for a SQLite database,
+``markdown:PATH`` or a bare path for a markdown planning directory.
+"""
+
+from pathlib import Path
+
+from .base import StorageBackend, creation_order
+from .markdown import MarkdownBackend
+from .sqlite import SQLiteBackend
+
+BACKEND_SCHEMES = ("markdown", "sqlite")
+
+
+def open_backend(spec: str) -> StorageBackend:
+    """Open the backend a spec string names.
+
+    Args:
+        spec: ``sqlite:PATH``, ``markdown:PATH`` or a planning directory path
+
+    Returns:
+        The opened backend
+
+    Raises:
+        ValueError: If the spec has no path
+    """
+    scheme, separator, location = spec.partition(":")
+    if not separator or scheme not in BACKEND_SCHEMES:
+        scheme, location = "markdown", spec
+    if not location:
+        raise ValueError(f"Backend spec '{spec}' has no path")
+    if scheme == "sqlite":
+        return SQLiteBackend(Path(location))
+    return MarkdownBackend(Path(location))
+
+
+def copy_objects(source: StorageBackend, target: StorageBackend) -> int:
+    """Copy every object of one backend into another.
+
+    Objects are written parents first inside one target transaction, so a
+    SQLite target receives all of them or none. Objects already in the
+    target with the same ID are replaced; others are left alone.
+
+    Args:
+        source: Backend to read from
+        target: Backend to write to
+
+    Returns:
+        Number of objects copied
+    """
+    objects = creation_order(source.list_scope())
+    with target.transaction():
+        for obj in objects:
+            target.put(obj)
+    return len(objects)
@@ -0,0 +1,436 @@
+"""Subscribable task resources with change notifications.
+
+Exposes the ready / in-progress task view of a planning root, optionally
+narrowed to a project, epic or feature scope, as MCP resources:
+
+- ``trellis://tasks`` and ``trellis://tasks/{scope}`` for the server's
+  configured planning root
+- ``trellis://roots/{root}/tasks`` and ``trellis://roots/{root}/tasks/{scope}``
+  for any planning root, with ``root`` percent-encoded (see ``task_resource_uri``)
+
+Clients that subscribe to one of these URIs receive
+``notifications/resources/updated`` when a task in it becomes ready, is
+claimed or is completed, and can then re-read the resource instead of
+polling ``claimNextTask``. Changes are detected from the change feed, so
+writes made by other processes (the CLI, other servers) are picked up too.
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote, unquote
+
+from .change_feed import ChangeEntry, ChangesResult, get_change_feed
+
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+
+    from .settings import Settings
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+TASKS_URI = "trellis://tasks"
+ROOTS_URI_PREFIX = "trellis://roots/"
+
+# How often subscribed planning roots are checked for new changes
+DEFAULT_POLL_INTERVAL_SECONDS = 0.25
+
+_PRIORITY_ORDER = {"high": 0, "normal": 1, "low": 2}
+_SCOPE_PREFIXES = ("P-", "E-", "F-")
+
+
+def task_resource_uri(planning_root: str | Path | None = None, scope: str | None = None) -> str:
+    """Build the resource URI for a planning root and optional scope.
+
+    Args:
+        planning_root: Planning directory, or None for the server's configured root
+        scope: Optional project, epic or feature ID
+
+    Returns:
+        Resource URI suitable for resources/read and resources/subscribe
+    """
+    if planning_root is None:
+        base = TASKS_URI
+    else:
+        base = f"{ROOTS_URI_PREFIX}{quote(str(planning_root), safe='')}/tasks"
+    return f"{base}/{scope}" if scope else base
+
+
+def parse_task_resource_uri(uri: str, default_root: Path) -> tuple[Path, str | None] | None:
+    """Resolve a task resource URI to its planning directory and scope.
+
+    Args:
+        uri: Resource URI
+        default_root: Planning directory used for ``trellis://tasks`` URIs
+
+    Returns:
+        Tuple of (planning directory, scope or None), or None for other URIs
+    """
+    if uri == TASKS_URI:
+        return default_root, None
+    if uri.startswith(TASKS_URI + "/"):
+        return default_root, uri[len(TASKS_URI) + 1 :] or None
+    if uri.startswith(ROOTS_URI_PREFIX):
+        encoded_root, _, rest = uri[len(ROOTS_URI_PREFIX) :].partition("/")
+        if rest == "tasks":
+            return _planning_dir(unquote(encoded_root)), None
+        if rest.startswith("tasks/"):
+            return _planning_dir(unquote(encoded_root)), rest[len("tasks/") :] or None
+    return None
+
+
+def _planning_dir(project_root: str | Path) -> Path:
+    """Resolve a project root to its planning directory without creating it."""
+    root = Path(project_root).absolute()
+    return root if root.name == "planning" else root / "planning"
+
+
+def _value(field: Any) -> Any:
+    """Unwrap enum values from model dumps."""
+    return getattr(field, "value", field)
+
+
+def _prefixed_id(obj: dict[str, Any]) -> str:
+    """Return an object's ID with its kind prefix."""
+    obj_id = str(obj.get("id", ""))
+    prefix = {"project": "P-", "epic": "E-", "feature": "F-", "task": "T-"}.get(
+        _value(obj.get("kind")), ""
+    )
+    return obj_id if obj_id.startswith(prefix) else f"{prefix}{obj_id}"
+
+
+def _ancestors(obj: dict[str, Any], objects: dict[str, dict[str, Any]]) -> set[str]:
+    """Collect the prefixed IDs of an object's parents up to its project."""
+    from .utils.id_utils import clean_prerequisite_id
+
+    found: set[str] = set()
+    parent = obj.get("parent")
+    while parent and parent not in found:
+        found.add(parent)
+        parent_obj = objects.get(clean_prerequisite_id(parent))
+        parent = parent_obj.get("parent") if parent_obj else None
+    return found
+
+
+def build_task_snapshot(planning_root: Path, scope: str | None = None) -> dict[str, Any]:
+    """Build the resource contents: ready and in-progress tasks for a scope.
+
+    A task is ready when it is open and all of its prerequisites are done,
+    matching ``is_unblocked``; the object tree is loaded once for all tasks.
+
+    Args:
+        planning_root: Planning directory
+        scope: Optional project, epic or feature ID; standalone tasks are only
+            included without a scope
+
+    Returns:
+        Dictionary with the current generation and task summaries
+    """
+    from .utils.id_utils import clean_prerequisite_id
+    from .validation.object_loader import get_all_objects
+
+    generation = get_change_feed(planning_root).current_generation()
+    objects: dict[str, dict[str, Any]] = {}
+    if planning_root.is_dir():
+        objects = get_all_objects(planning_root)  # type: ignore[assignment]
+
+    ready: list[dict[str, Any]] = []
+    in_progress: list[dict[str, Any]] = []
+    for obj in objects.values():
+        if _value(obj.get("kind")) != "task":
+            continue
+        if scope and scope not in _ancestors(obj, objects):
+            continue
+
+        status = _value(obj.get("status"))
+        summary = {
+            "id": _prefixed_id(obj),
+            "title": obj.get("title"),
+            "priority": str(_value(obj.get("priority"))),
+            "parent": obj.get("parent"),
+            "worktree": obj.get("worktree"),
+            "created": str(obj.get("created", "")),
+        }
+        if status == "in-progress":
+            in_progress.append(summary)
+        elif status == "open":
+            prerequisites = obj.get("prerequisites") or []
+            if all(
+                _value(objects.get(clean_prerequisite_id(p), {}).get("status")) == "done"
+                for p in prerequisites
+            ):
+                ready.append(summary)
+
+    ready.sort(key=lambda t: (_PRIORITY_ORDER.get(t["priority"], 1), t["created"]))
+    in_progress.sort(key=lambda t: t["created"])
+    return {
+        "planning_root": str(planning_root),
+        "scope": scope,
+        "generation": generation,
+        "ready": ready,
+        "in_progress": in_progress,
+    }
+
+
+def _entry_scopes(entry: ChangeEntry) -> set[str]:
+    """Collect the project/epic/feature IDs on a changed object's paths."""
+    paths = [entry["path"], entry.get("old_path") or entry["path"]]
+    return {part for path in paths for part in Path(path).parts if part.startswith(_SCOPE_PREFIXES)}
+
+
+def _affects(entry: ChangeEntry, scope: str | None) -> bool:
+    """Decide whether a change should notify subscribers of a scope."""
+    if scope is None:
+        return True
+    if entry["kind"] == "task" and entry["status"] == "done":
+        # Completing a task can unblock dependants in any scope
+        return True
+    return scope in _entry_scopes(entry)
+
+
+def _read_changes(since_by_root: dict[Path, int]) -> dict[Path, ChangesResult]:
+    """Read the new changes of each planning root that moved past its generation."""
+    results: dict[Path, ChangesResult] = {}
+    for root, since in since_by_root.items():
+        feed = get_change_feed(root)
+        if feed.current_generation() != since:
+            results[root] = feed.changes_since(since)
+    return results
+
+
+class _SessionHandle:
+    """Lifespan context tying one server session to its subscriptions."""
+
+    __slots__ = ("session",)
+
+    def __init__(self) -> None:
+        self.session: Any = None
+
+
+class SubscriptionManager:
+    """Track resource subscriptions per session and push change notifications.
+
+    While at least one server session is running, a background task polls the
+    change feed of every subscribed planning root (one ``stat`` per root when
+    nothing changed) and sends ``notifications/resources/updated`` for each
+    subscribed URI affected by the new changes. Feed reads run in a worker
+    thread so polling never blocks the event loop.
+    """
+
+    def __init__(self, default_root: Path, poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS):
+        """Initialize the manager.
+
+        Args:
+            default_root: Planning directory for ``trellis://tasks`` URIs
+            poll_interval: Seconds between change feed checks
+        """
+        self.default_root = default_root
+        self.poll_interval = poll_interval
+        # uri -> (planning dir, scope, subscribed sessions)
+        self._subscriptions: dict[str, tuple[Path, str | None, set[Any]]] = {}
+        self._generations: dict[Path, int] = {}
+        self._active_sessions = 0
+        self._task: asyncio.Task[None] | None = None
+
+    def subscribe(self, uri: str, session: Any, handle: Any = None) -> None:
+        """Register a session's subscription to a task resource URI.
+
+        Args:
+            uri: Resource URI
+            session: Server session that receives notifications
+            handle: Value returned by ``session_started`` for the session, so
+                its subscriptions are dropped when it ends
+
+        Raises:
+            ValueError: If the URI is not a task resource
+        """
+        planning_root, scope = self._target(uri)
+        if planning_root not in self._generations:
+            self._generations[planning_root] = get_change_feed(planning_root).current_generation()
+        self._subscriptions.setdefault(uri, (planning_root, scope, set()))[2].add(session)
+        if isinstance(handle, _SessionHandle):
+            handle.session = session
+
+    async def subscribe_async(self, uri: str, session: Any, handle: Any = None) -> None:
+        """Register a subscription, reading a new root's generation off the event loop.
+
+        Args:
+            uri: Resource URI
+            session: Server session that receives notifications
+            handle: Value returned by ``session_started`` for the session
+
+        Raises:
+            ValueError: If the URI is not a task resource
+        """
+        planning_root, _ = self._target(uri)
+        if planning_root not in self._generations:
+            generation = await asyncio.to_thread(
+                lambda: get_change_feed(planning_root).current_generation()
+            )
+            self._generations.setdefault(planning_root, generation)
+        self.subscribe(uri, session, handle)
+
+    def unsubscribe(self, uri: str, session: Any) -> None:
+        """Remove a session's subscription to a URI.
+
+        Args:
+            uri: Resource URI
+            session: Server session that subscribed
+        """
+        entry = self._subscriptions.get(uri)
+        if entry is None:
+            return
+        entry[2].discard(session)
+        if not entry[2]:
+            del self._subscriptions[uri]
+
+    def subscribed_uris(self) -> list[str]:
+        """List URIs that have at least one subscriber."""
+        return sorted(self._subscriptions)
+
+    def session_started(self) -> Any:
+        """Start polling when the first session begins (call from the event loop).
+
+        Returns:
+            Handle for the session; the server lifespan yields it as the
+            session's lifespan context and passes it to ``session_ended``
+        """
+        self._active_sessions += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._poll_forever())
+        return _SessionHandle()
+
+    def session_ended(self, handle: Any = None) -> None:
+        """Drop a session's subscriptions, and stop polling when the last session ends.
+
+        Args:
+            handle: Value returned by ``session_started`` for the session
+        """
+        session = handle.session if isinstance(handle, _SessionHandle) else None
+        if session is not None:
+            for uri in list(self._subscriptions):
+                self.unsubscribe(uri, session)
+            subscribed_roots = {root for root, _, _ in self._subscriptions.values()}
+            for root in list(self._generations):
+                if root not in subscribed_roots:
+                    del self._generations[root]
+
+        self._active_sessions = max(0, self._active_sessions - 1)
+        if self._active_sessions == 0:
+            if self._task is not None:
+                self._task.cancel()
+                self._task = None
+            self._subscriptions.clear()
+            self._generations.clear()
+
+    async def _poll_forever(self) -> None:
+        """Poll subscribed roots until cancelled."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logger.warning(f"Subscription polling failed: {e}")
+
+    async def poll_once(self) -> list[str]:
+        """Check subscribed roots for changes and notify affected subscribers.
+
+        Returns:
+            URIs that were notified
+        """
+        notified: list[str] = []
+        since_by_root = {
+            root: self._generations.get(root, 0) for root, _, _ in self._subscriptions.values()
+        }
+        if not since_by_root:
+            return notified
+        results = await asyncio.to_thread(_read_changes, since_by_root)
+        for root, result in results.items():
+            self._generations[root] = result["generation"]
+
+            for uri, (sub_root, scope, sessions) in list(self._subscriptions.items()):
+                if sub_root != root:
+                    continue
+                if not result["resync_required"] and not any(
+                    _affects(entry, scope) for entry in result["changes"]
+                ):
+                    continue
+                await self._notify(uri, sessions)
+                notified.append(uri)
+        return notified
+
+    def _target(self, uri: str) -> tuple[Path, str | None]:
+        """Resolve a subscribable URI, rejecting other resources."""
+        target = parse_task_resource_uri(uri, self.default_root)
+        if target is None:
+            raise ValueError(f"Resource does not support subscriptions: {uri}")
+        return target
+
+    async def _notify(self, uri: str, sessions: set[Any]) -> None:
+        """Send a resource-updated notification, dropping sessions that are gone."""
+        from pydantic import AnyUrl
+
+        for session in list(sessions):
+            try:
+                await session.send_resource_updated(AnyUrl(uri))
+            except Exception:
+                sessions.discard(session)
+
+
+def create_subscription_manager(settings: "Settings") -> SubscriptionManager:
+    """Create a subscription manager for the server's configured planning root.
+
+    Args:
+        settings: Server configuration settings
+
+    Returns:
+        SubscriptionManager polling at the configured interval
+    """
+    return SubscriptionManager(
+        _planning_dir(settings.planning_root),
+        poll_interval=settings.subscription_poll_interval_ms / 1000,
+    )
+
+
+def register_task_resources(server: "FastMCP", manager: SubscriptionManager) -> None:
+    """Register the task resources and subscription handlers on a server.
+
+    Snapshots are built in a worker thread, since they load the object tree.
+    FastMCP does not expose resource subscriptions; ``mcp_compat`` installs
+    the handlers and advertises the ``resources.subscribe`` capability.
+
+    Args:
+        server: Server to register the resources on
+        manager: Subscription manager whose ``session_started``/``session_ended``
+            hooks are called from the server lifespan
+    """
+    from .mcp_compat import enable_resource_subscriptions
+
+    default_root = manager.default_root
+
+    @server.resource(TASKS_URI, mime_type="application/json")
+    async def tasks() -> dict[str, Any]:
+        """Ready and in-progress tasks in the server's planning root (subscribable)."""
+        return await asyncio.to_thread(build_task_snapshot, default_root)
+
+    @server.resource(TASKS_URI + "/{scope}", mime_type="application/json")
+    async def tasks_in_scope(scope: str) -> dict[str, Any]:
+        """Ready and in-progress tasks under a project, epic or feature (subscribable)."""
+        return await asyncio.to_thread(build_task_snapshot, default_root, scope)
+
+    @server.resource(ROOTS_URI_PREFIX + "{root}/tasks", mime_type="application/json")
+    async def root_tasks(root: str) -> dict[str, Any]:
+        """Ready and in-progress tasks in a percent-encoded project root (subscribable)."""
+        return await asyncio.to_thread(build_task_snapshot, _planning_dir(root))
+
+    @server.resource(ROOTS_URI_PREFIX + "{root}/tasks/{scope}", mime_type="application/json")
+    async def root_tasks_in_scope(root: str, scope: str) -> dict[str, Any]:
+        """Ready and in-progress tasks under a scope in a percent-encoded project root."""
+        return await asyncio.to_thread(build_task_snapshot, _planning_dir(root), scope)
+
+    async def unsubscribe(uri: str, session: Any, _handle: Any) -> None:
+        manager.unsubscribe(uri, session)
+
+    enable_resource_subscriptions(server, manager.subscribe_async, unsubscribe)
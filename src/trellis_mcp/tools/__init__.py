@@ -12,9 +12,16 @@ Tools will be added to this package as they are extracted from server.py.
 from .claim_next_task import create_claim_next_task_tool
 from .complete_task import create_complete_task_tool
 from .create_object import create_create_object_tool
+from .get_changes import create_get_changes_tool
 from .get_object import create_get_object_tool
+from .get_objects import create_get_objects_tool
+from .get_tree import create_get_tree_tool
 from .health_check import create_health_check_tool
 from .list_backlog import create_list_backlog_tool
+from .list_review_queue import create_list_review_queue_tool
+from .profile_tool import create_profile_tool
+from .resolve_id import create_resolve_id_tool
+from .search_tasks import create_search_tasks_tool
 from .update_object import create_update_object_tool
 
 __all__ = [
@@ -26,4 +33,11 @@ __all__ = [
     "create_update_object_tool",
     "create_claim_next_task_tool",
     "create_complete_task_tool",
+    "create_profile_tool",
+    "create_get_changes_tool",
+    "create_search_tasks_tool",
+    "create_resolve_id_tool",
+    "create_list_review_queue_tool",
+    "create_get_objects_tool",
+    "create_get_tree_tool",
 ]
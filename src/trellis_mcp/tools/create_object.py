@@ -9,6 +9,7 @@ from datetime import datetime
 
 from fastmcp import FastMCP
 
+from ..change_feed import record_change
 from ..exceptions.validation_error import ValidationError, ValidationErrorCode
 from ..path_resolver import resolve_path_for_new_object, resolve_project_roots
 from ..settings import Settings
@@ -246,6 +247,7 @@ def create_create_object_tool(settings: Settings):
                 # If cycles are detected, remove the created file and raise error
                 try:
                     file_path.unlink()
+                    record_change(file_path, "deleted")
                 except OSError:
                     pass  # File removal failed, but we still need to report the cycle
                 raise ValidationError(
@@ -264,6 +266,7 @@ def create_create_object_tool(settings: Settings):
             # If cycle check fails for other reasons, remove the created file
             try:
                 file_path.unlink()
+                record_change(file_path, "deleted")
             except OSError:
                 pass
             raise ValidationError(
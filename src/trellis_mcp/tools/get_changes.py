@@ -0,0 +1,92 @@
+"""Get changes tool for Trellis MCP server.
+
+Returns the objects created, updated or deleted since a generation number so
+agents can keep a local view of the backlog in sync without re-listing it.
+"""
+
+from fastmcp import FastMCP
+
+from ..change_feed import get_change_feed
+from ..exceptions.validation_error import ValidationError, ValidationErrorCode
+from ..path_resolver import resolve_project_roots
+from ..settings import Settings
+
+
+def create_get_changes_tool(settings: Settings):
+    """Create a getChanges tool configured with the provided settings.
+
+    Args:
+        settings: Server configuration settings
+
+    Returns:
+        Configured getChanges tool function
+    """
+    mcp = FastMCP()
+
+    @mcp.tool
+    def getChanges(projectRoot: str, sinceGeneration: int = 0, limit: int = 1000):
+        """Get the objects that changed since a generation number.
+
+        Every mutation (create, update, claim, complete, cascade delete) is
+        recorded with a monotonically increasing generation. Pass the
+        ``generation`` from the previous response as ``sinceGeneration`` to
+        receive only what changed since then; when nothing changed the
+        response is returned without scanning the planning tree.
+
+        Args:
+            projectRoot: Root directory for the planning structure
+            sinceGeneration: Last generation seen by the client (0 returns all
+                recorded changes)
+            limit: Maximum number of changed objects to return
+
+        Returns:
+            Dictionary with structure:
+            {
+                "generation": int,        # Latest generation; use as next sinceGeneration
+                "since_generation": int,  # Echo of the request
+                "changed": bool,          # False when the client is current
+                "resync_required": bool,  # True when older changes were trimmed or the
+                                          # journal was reset; do a full listBacklog
+                "changes": [
+                    {
+                        "generation": int,
+                        "op": str,              # "created", "updated" or "deleted"
+                        "id": str,              # Prefixed object ID
+                        "kind": str,
+                        "status": str | None,
+                        "title": str | None,
+                        "parent": str | None,
+                        "path": str,            # File path relative to the planning root
+                        "old_path": str | None, # Path before the window, for moved files
+                        "ts": str,              # Time the change was recorded
+                    },
+                    ...
+                ]
+            }
+
+        Raises:
+            ValidationError: If projectRoot is empty or sinceGeneration/limit is negative
+        """
+        if not projectRoot or not projectRoot.strip():
+            raise ValidationError(
+                errors=["Project root cannot be empty"],
+                error_codes=[ValidationErrorCode.MISSING_REQUIRED_FIELD],
+                context={"field": "projectRoot"},
+            )
+        if sinceGeneration < 0:
+            raise ValidationError(
+                errors=["sinceGeneration must be zero or positive"],
+                error_codes=[ValidationErrorCode.INVALID_FIELD],
+                context={"field": "sinceGeneration", "value": sinceGeneration},
+            )
+        if limit < 0:
+            raise ValidationError(
+                errors=["limit must be zero or positive"],
+                error_codes=[ValidationErrorCode.INVALID_FIELD],
+                context={"field": "limit", "value": limit},
+            )
+
+        _, planning_root = resolve_project_roots(projectRoot, ensure_planning_subdir=True)
+        return dict(get_change_feed(planning_root).changes_since(sinceGeneration, limit))
+
+    return getChanges
@@ -10,7 +10,9 @@ from typing import Annotated
 from fastmcp import FastMCP
 from pydantic import Field
 
+from ..archive import read_archived_task
 from ..exceptions.validation_error import ValidationError, ValidationErrorCode
+from ..id_index import did_you_mean
 from ..inference import KindInferenceEngine
 from ..path_resolver import discover_immediate_children, id_to_path, resolve_project_roots
 from ..settings import Settings
@@ -69,9 +71,13 @@ def create_get_object_tool(settings: Settings):
 
             Each child object contains: {id, title, status, kind, created}
 
+            Tasks moved to the archive (``trellis-mcp archive``) are read from it
+            and have no children.
+
         Raises:
             ValidationError: If ID is invalid, inference fails, or validation fails
-            FileNotFoundError: If object with the given ID cannot be found
+            FileNotFoundError: If object with the given ID cannot be found; the
+                message suggests similar existing IDs
             OSError: If file cannot be read due to permissions or other IO errors
             yaml.YAMLError: If YAML front-matter is malformed
         """
@@ -117,8 +123,19 @@ def create_get_object_tool(settings: Settings):
         # Resolve the file path using path_resolver
         try:
             file_path = id_to_path(planning_root, kind, clean_id)
-        except FileNotFoundError:
-            raise
+        except FileNotFoundError as e:
+            # Archived done tasks are read from the packed archive
+            archived = read_archived_task(planning_root, clean_id) if kind == "task" else None
+            if archived is None:
+                raise FileNotFoundError(f"{e}{did_you_mean(planning_root, id, kind)}") from e
+            yaml_dict, body_str = archived
+            return {
+                "yaml": yaml_dict,
+                "body": body_str,
+                "kind": kind,
+                "id": clean_id,
+                "children": [],
+            }
         except ValueError as e:
             raise ValidationError(
                 errors=[f"Invalid kind or ID: {e}"],
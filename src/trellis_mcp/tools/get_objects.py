@@ -0,0 +1,117 @@
+"""Get objects tool for Trellis MCP server.
+
+Retrieves several objects in one call, resolving their IDs through the
+backlog index's object map (see ``trellis_mcp.object_tree``) instead of one
+tree walk per ID, and returning only the requested front-matter fields.
+"""
+
+from fastmcp import FastMCP
+
+from ..archive import read_archived_task
+from ..backlog_index import get_backlog_index
+from ..exceptions.validation_error import ValidationError, ValidationErrorCode
+from ..id_index import did_you_mean
+from ..object_tree import object_entry, project_entry
+from ..path_resolver import resolve_project_roots
+from ..settings import Settings
+
+
+def create_get_objects_tool(settings: Settings):
+    """Create a getObjects tool configured with the provided settings.
+
+    Args:
+        settings: Server configuration settings
+
+    Returns:
+        Configured getObjects tool function
+    """
+    mcp = FastMCP()
+
+    @mcp.tool
+    def getObjects(
+        projectRoot: str,
+        ids: list[str],
+        fields: list[str] | None = None,
+        includeBody: bool = False,
+    ):
+        """Retrieve several objects by ID in one call.
+
+        IDs may carry their prefix (P-, E-, F-, T-) or not. Objects that
+        cannot be found or read are listed under ``missing`` instead of
+        failing the whole call; tasks moved to the archive are read from it.
+
+        Args:
+            projectRoot: Root directory for the planning structure
+            ids: Object IDs to retrieve, e.g. ['F-login', 'T-implement-auth']
+            fields: Front-matter fields to return (default: all), e.g.
+                ['title', 'status']
+            includeBody: Whether to return each object's markdown body
+
+        Returns:
+            Dictionary with structure:
+            {
+                "objects": [
+                    {
+                        "id": str,      # Prefixed object ID
+                        "kind": str,    # Object kind
+                        "yaml": dict,   # Requested front-matter fields
+                        "body": str,    # Markdown body (only with includeBody)
+                    },
+                    ...
+                ],
+                "missing": [
+                    {"id": str, "error": str},  # Requested ID and why it was not returned
+                    ...
+                ]
+            }
+
+        Raises:
+            ValidationError: If projectRoot or ids is empty (MISSING_REQUIRED_FIELD)
+        """
+        if not projectRoot or not projectRoot.strip():
+            raise ValidationError(
+                errors=["Project root cannot be empty"],
+                error_codes=[ValidationErrorCode.MISSING_REQUIRED_FIELD],
+                context={"field": "projectRoot"},
+            )
+        if not ids:
+            raise ValidationError(
+                errors=["At least one object ID is required"],
+                error_codes=[ValidationErrorCode.MISSING_REQUIRED_FIELD],
+                context={"field": "ids"},
+            )
+
+        _, path_resolution_root = resolve_project_roots(projectRoot, ensure_planning_subdir=True)
+        object_map = get_backlog_index().object_map(path_resolution_root)
+
+        objects = []
+        missing = []
+        for object_id in dict.fromkeys(ids):
+            key = object_map.find(object_id)
+            try:
+                if key is not None:
+                    objects.append(object_entry(key, object_map.paths[key], fields, includeBody))
+                    continue
+                clean_id = object_id.strip().removeprefix("T-")
+                archived = (
+                    read_archived_task(path_resolution_root, clean_id)
+                    if clean_id and not clean_id.startswith(("P-", "E-", "F-"))
+                    else None
+                )
+                if archived is not None:
+                    objects.append(
+                        project_entry(("task", clean_id), *archived, fields, includeBody)
+                    )
+                    continue
+                error = (
+                    f"Object not found: {object_id}"
+                    f"{did_you_mean(path_resolution_root, object_id)}"
+                )
+            except Exception as e:
+                # One unreadable file does not fail the rest of the batch
+                error = f"Failed to read object {object_id}: {e}"
+            missing.append({"id": object_id, "error": error})
+
+        return {"objects": objects, "missing": missing}
+
+    return getObjects
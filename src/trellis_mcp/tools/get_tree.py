@@ -0,0 +1,105 @@
+"""Get tree tool for Trellis MCP server.
+
+Exports an object and its descendants, or the whole planning tree, as one
+nested response. The hierarchy comes from the backlog index's object map
+(see ``trellis_mcp.object_tree``) rather than per-object children discovery,
+and only the requested front-matter fields are returned.
+"""
+
+from fastmcp import FastMCP
+
+from ..backlog_index import get_backlog_index
+from ..exceptions.validation_error import ValidationError, ValidationErrorCode
+from ..id_index import did_you_mean
+from ..object_tree import build_tree
+from ..path_resolver import resolve_project_roots
+from ..settings import Settings
+
+
+def create_get_tree_tool(settings: Settings):
+    """Create a getTree tool configured with the provided settings.
+
+    Args:
+        settings: Server configuration settings
+
+    Returns:
+        Configured getTree tool function
+    """
+    mcp = FastMCP()
+
+    @mcp.tool
+    def getTree(
+        projectRoot: str,
+        rootId: str = "",
+        depth: int | None = None,
+        fields: list[str] | None = None,
+        includeBody: bool = False,
+    ):
+        """Get an object and its descendants as a nested hierarchy.
+
+        Children are ordered epics, features, then tasks, each by ID. Tasks
+        moved to the archive are not included.
+
+        Args:
+            projectRoot: Root directory for the planning structure
+            rootId: Object to start from (e.g. 'P-web-app'); empty exports every
+                project and standalone task
+            depth: Levels of children to include below the roots (default: all;
+                0 returns the roots alone)
+            fields: Front-matter fields to return for each object (default: all),
+                e.g. ['title', 'status']
+            includeBody: Whether to return markdown bodies
+
+        Returns:
+            Dictionary with structure:
+            {
+                "roots": [
+                    {
+                        "id": str,              # Prefixed object ID
+                        "kind": str,            # Object kind
+                        "yaml": dict,           # Requested front-matter fields
+                        "body": str,            # Markdown body (only with includeBody)
+                        "children": [...],      # Nested entries of the same shape
+                        "has_children": bool,   # Only at the depth limit, instead of children
+                    },
+                    ...
+                ]
+            }
+
+        Raises:
+            ValidationError: If the parameters are invalid, including:
+                - MISSING_REQUIRED_FIELD: Empty projectRoot
+                - INVALID_FIELD: Negative depth
+            FileNotFoundError: If no object has rootId; the message suggests
+                similar existing IDs
+        """
+        if not projectRoot or not projectRoot.strip():
+            raise ValidationError(
+                errors=["Project root cannot be empty"],
+                error_codes=[ValidationErrorCode.MISSING_REQUIRED_FIELD],
+                context={"field": "projectRoot"},
+            )
+        if depth is not None and depth < 0:
+            raise ValidationError(
+                errors=[f"Depth cannot be negative, got {depth}"],
+                error_codes=[ValidationErrorCode.INVALID_FIELD],
+                context={"field": "depth"},
+            )
+
+        _, path_resolution_root = resolve_project_roots(projectRoot, ensure_planning_subdir=True)
+        object_map = get_backlog_index().object_map(path_resolution_root)
+
+        if rootId.strip():
+            key = object_map.find(rootId)
+            if key is None:
+                raise FileNotFoundError(
+                    f"Object not found: {rootId.strip()}"
+                    f"{did_you_mean(path_resolution_root, rootId)}"
+                )
+            roots = [key]
+        else:
+            roots = object_map.children.get(None, [])
+
+        return {"roots": [build_tree(object_map, key, depth, fields, includeBody) for key in roots]}
+
+    return getTree
@@ -1,19 +1,23 @@
 """Health check tool for Trellis MCP server.
 
 Provides server health status and basic information including server name,
-schema version, and planning root directory.
+schema version, planning root directory and cache warm-up readiness.
 """
 
+from typing import Any
+
 from fastmcp import FastMCP
 
+from ..cache_warmup import CacheWarmup
 from ..settings import Settings
 
 
-def create_health_check_tool(settings: Settings):
+def create_health_check_tool(settings: Settings, warmup: CacheWarmup | None = None):
     """Create a health check tool configured with the provided settings.
 
     Args:
         settings: Server configuration settings
+        warmup: Background cache warm-up started by the server, if any
 
     Returns:
         Configured health check tool function
@@ -21,17 +25,19 @@ def create_health_check_tool(settings: Settings):
     mcp = FastMCP()
 
     @mcp.tool
-    def health_check() -> dict[str, str]:
+    def health_check() -> dict[str, Any]:
         """Check server health and return status information.
 
         Returns basic server health information including server name,
-        schema version, and planning root directory.
+        schema version, planning root directory and cache warm-up state.
+        The server is healthy while warm-up runs; requests are served from disk.
         """
         return {
             "status": "healthy",
             "server": "Trellis MCP Server",
             "schema_version": settings.schema_version,
             "planning_root": str(settings.planning_root),
+            "cache_warmup": dict(warmup.status()) if warmup is not None else {"state": "disabled"},
         }
 
     return health_check
@@ -1,18 +1,19 @@
 """List backlog tool for Trellis MCP server.
 
-Lists tasks filtered by scope, status, and priority using modular task scanner,
-filters, and sorting components to efficiently find and filter tasks across
-the entire project hierarchy.
+Lists tasks filtered by scope, status, priority, worktree, title, timestamps
+and prerequisite state, or counts them per field value. Queries are answered
+from the in-memory backlog index (see ``trellis_mcp.backlog_index``), which
+re-parses only the task files that changed since the previous query.
 """
 
+from datetime import datetime
+
 from fastmcp import FastMCP
 
+from ..backlog_index import GROUP_FIELDS, BacklogQuery, TaskColumns, get_backlog_index
 from ..exceptions.validation_error import ValidationError, ValidationErrorCode
-from ..filters import apply_filters, filter_by_scope
 from ..models.filter_params import FilterParams
-from ..models.task_sort_key import task_sort_key
-from ..path_resolver import id_to_path, resolve_project_roots
-from ..scanner import scan_tasks
+from ..path_resolver import resolve_project_roots
 from ..settings import Settings
 
 
@@ -34,27 +35,49 @@ def create_list_backlog_tool(settings: Settings):
         status: str = "",
         priority: str = "",
         sortByPriority: bool = True,
+        worktree: str = "",
+        titleContains: str = "",
+        createdAfter: str = "",
+        createdBefore: str = "",
+        updatedAfter: str = "",
+        updatedBefore: str = "",
+        hasUnfinishedPrerequisites: bool | None = None,
+        groupBy: list[str] | None = None,
+        countOnly: bool = False,
     ):
-        """List tasks filtered by scope, status, and priority.
+        """List tasks matching a query, or count them per field value.
 
-        Uses the modular task scanner, filters, and sorting components to efficiently
-        find and filter tasks across the entire project hierarchy. Supports cross-system
-        task discovery, automatically scanning both hierarchical tasks (within project/epic/feature
-        structure) and standalone tasks, providing unified filtering and sorting across
+        Finds tasks across the entire project hierarchy. Supports cross-system
+        task discovery, covering both hierarchical tasks (within project/epic/feature
+        structure) and standalone tasks, with unified filtering and sorting across
         both task systems.
 
-        Performance is optimized for cross-system operations with multi-layer caching,
-        typically achieving 1-5ms response times (warm cache) for mixed task queries.
+        Queries are answered from an in-memory columnar index of the planning tree,
+        so filtering and counting do not parse task files; only files changed since
+        the previous query are read again.
 
         Args:
             projectRoot: Root directory for the planning structure
             scope: Optional scope ID to filter tasks by parent (project/epic/feature ID).
                 Supports cross-system scoping - can filter by hierarchical parents or
                 show standalone tasks by omitting scope filter.
-            status: Optional status filter ('open', 'in-progress', 'review', 'done')
-            priority: Optional priority filter ('high', 'normal', 'low')
+            status: Optional status filter ('open', 'in-progress', 'review', 'done');
+                several statuses may be given separated by commas
+            priority: Optional priority filter ('high', 'normal', 'low'); several
+                priorities may be given separated by commas
             sortByPriority: Whether to sort tasks by priority and creation date (default: True).
                 Sorting works consistently across both hierarchical and standalone tasks.
+            worktree: Optional worktree the tasks were claimed in
+            titleContains: Optional case-insensitive substring of the title
+            createdAfter: Optional ISO timestamp; only tasks created at or after it
+            createdBefore: Optional ISO timestamp; only tasks created before it
+            updatedAfter: Optional ISO timestamp; only tasks updated at or after it
+            updatedBefore: Optional ISO timestamp; only tasks updated before it
+            hasUnfinishedPrerequisites: Optional; True for tasks with a prerequisite that
+                is missing or not done, False for tasks without one
+            groupBy: Optional fields to count matching tasks by ('status', 'priority',
+                'parent', 'feature', 'epic', 'project', 'worktree')
+            countOnly: Return only the number of matching tasks (ignored with groupBy)
 
         Returns:
             Dictionary with structure containing tasks from both hierarchical and
@@ -74,11 +97,13 @@ def create_list_backlog_tool(settings: Settings):
                     ...
                 ]
             }
+            With groupBy, {"groups": [{<field>: value, ..., "count": int}, ...],
+            "total": int}, largest group first; with countOnly, {"count": int}.
 
         Raises:
-            ValidationError: If cross-system task discovery fails, including:
+            ValidationError: If the query is invalid, including:
                 - MISSING_REQUIRED_FIELD: Invalid projectRoot parameter
-                - INVALID_FIELD: Issues during cross-system task scanning or filtering
+                - INVALID_FIELD: Malformed timestamp or unknown groupBy field
             ValueError: If projectRoot is empty or invalid
             OSError: If there are file system access issues during cross-system scanning
         """
@@ -90,58 +115,91 @@ def create_list_backlog_tool(settings: Settings):
                 context={"field": "projectRoot"},
             )
 
+        groupBy = groupBy or []
+        invalid_fields = [name for name in groupBy if name not in GROUP_FIELDS]
+        if invalid_fields:
+            raise ValidationError(
+                errors=[
+                    f"Cannot group by '{name}'; expected one of: {', '.join(GROUP_FIELDS)}"
+                    for name in invalid_fields
+                ],
+                error_codes=[ValidationErrorCode.INVALID_FIELD] * len(invalid_fields),
+                context={"field": "groupBy"},
+            )
+        timestamps = {
+            name: _parse_timestamp(name, value)
+            for name, value in (
+                ("createdAfter", createdAfter),
+                ("createdBefore", createdBefore),
+                ("updatedAfter", updatedAfter),
+                ("updatedBefore", updatedBefore),
+            )
+        }
+
         # Resolve project roots using centralized utility
-        scanning_root, path_resolution_root = resolve_project_roots(
-            projectRoot, ensure_planning_subdir=True
-        )
+        _, path_resolution_root = resolve_project_roots(projectRoot, ensure_planning_subdir=True)
 
-        # Create FilterParams from individual parameters, handling validation gracefully
+        # Validate status and priority through FilterParams, handling invalid values gracefully
         try:
-            filter_status = [status] if status and status.strip() else []
-            filter_priority = [priority] if priority and priority.strip() else []
-            filter_params = FilterParams(status=filter_status, priority=filter_priority)
+            filter_params = FilterParams(status=_split(status), priority=_split(priority))
         except Exception:
-            # If validation fails (e.g., invalid status/priority), return empty results
-            return {"tasks": []}
-
-        # Get tasks using modular components
-        if scope and scope.strip():
-            # Use scope filtering if provided
-            tasks_iterator = filter_by_scope(scanning_root, scope)
-        else:
-            # Use scanner to get all tasks
-            tasks_iterator = scan_tasks(scanning_root)
-
-        # Apply status and priority filters
-        filtered_tasks = apply_filters(tasks_iterator, filter_params)
-
-        # Convert to list and sort if requested
-        tasks_list = list(filtered_tasks)
+            # If validation fails (e.g., invalid status/priority), nothing matches
+            return _result([], None, groupBy, countOnly)
+
+        query = BacklogQuery(
+            statuses=frozenset(str(getattr(s, "value", s)) for s in filter_params.status),
+            priorities=frozenset(str(p) for p in filter_params.priority),
+            scope=scope.strip(),
+            worktree=worktree.strip(),
+            title_contains=titleContains.strip(),
+            created_after=timestamps["createdAfter"],
+            created_before=timestamps["createdBefore"],
+            updated_after=timestamps["updatedAfter"],
+            updated_before=timestamps["updatedBefore"],
+            has_unfinished_prerequisites=hasUnfinishedPrerequisites,
+        )
+        columns = get_backlog_index().columns(path_resolution_root)
+        rows = columns.select(query)
+        if groupBy or countOnly:
+            return _result(rows, columns, groupBy, countOnly)
+
         if sortByPriority:
-            tasks_list.sort(key=task_sort_key)
-
-        # Convert TaskModel objects to JSON-serializable format
-        result_tasks = []
-        for task in tasks_list:
-            try:
-                # Resolve file path - use path_resolution_root for path resolution
-                task_file_path = id_to_path(path_resolution_root, "task", task.id)
-
-                task_data = {
-                    "id": f"T-{task.id}" if not task.id.startswith("T-") else task.id,
-                    "title": task.title,
-                    "status": task.status.value,
-                    "priority": str(task.priority),
-                    "parent": task.parent or "",
-                    "file_path": str(task_file_path),
-                    "created": task.created.isoformat(),
-                    "updated": task.updated.isoformat(),
-                }
-                result_tasks.append(task_data)
-            except Exception:
-                # Skip tasks that can't be processed
-                continue
-
-        return {"tasks": result_tasks}
+            rows = columns.order(rows)
+        return {"tasks": [columns.record(row, path_resolution_root) for row in rows]}
 
     return listBacklog
+
+
+def _split(values: str) -> list[str]:
+    """Split a comma-separated filter value, dropping empty parts."""
+    return [value.strip() for value in values.split(",") if value.strip()]
+
+
+def _parse_timestamp(name: str, value: str) -> datetime | None:
+    """Parse an optional ISO timestamp parameter.
+
+    Raises:
+        ValidationError: If the value is not an ISO timestamp
+    """
+    if not value or not value.strip():
+        return None
+    try:
+        return datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValidationError(
+            errors=[f"{name} must be an ISO 8601 timestamp, got '{value}'"],
+            error_codes=[ValidationErrorCode.INVALID_FIELD],
+            context={"field": name},
+        ) from None
+
+
+def _result(
+    rows: list[int], columns: TaskColumns | None, group_by: list[str], count_only: bool
+) -> dict:
+    """Build the response of an aggregating or empty query."""
+    if group_by:
+        groups = columns.count_by(rows, group_by) if columns is not None else []
+        return {"groups": groups, "total": len(rows)}
+    if count_only:
+        return {"count": len(rows)}
+    return {"tasks": []}
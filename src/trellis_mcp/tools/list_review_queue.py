@@ -0,0 +1,100 @@
+"""List review queue tool for Trellis MCP server.
+
+Pages through the tasks waiting for review, longest-waiting first, from the
+review queue the backlog index keeps ordered (see
+``trellis_mcp.review_queue``).
+"""
+
+from fastmcp import FastMCP
+
+from ..backlog_index import get_backlog_index, task_record
+from ..exceptions.validation_error import ValidationError, ValidationErrorCode
+from ..path_resolver import resolve_project_roots
+from ..review_queue import ReviewKey, decode_cursor, encode_cursor
+from ..settings import Settings
+
+
+def create_list_review_queue_tool(settings: Settings):
+    """Create a listReviewQueue tool configured with the provided settings.
+
+    Args:
+        settings: Server configuration settings
+
+    Returns:
+        Configured listReviewQueue tool function
+    """
+    mcp = FastMCP()
+
+    @mcp.tool
+    def listReviewQueue(projectRoot: str, limit: int = 20, cursor: str = ""):
+        """List the tasks in review, oldest update first.
+
+        Tasks updated at the same time are ordered by priority (high first).
+        Pass the returned ``next_cursor`` as ``cursor`` to get the next page;
+        tasks entering or leaving review between calls do not shift the pages.
+
+        Args:
+            projectRoot: Root directory for the planning structure
+            limit: Maximum number of tasks per page (default: 20)
+            cursor: Cursor from the previous page (default: first page)
+
+        Returns:
+            Dictionary with structure:
+            {
+                "tasks": [
+                    {
+                        "id": str,          # Task ID
+                        "title": str,       # Task title
+                        "status": str,      # Always "review"
+                        "priority": str,    # Task priority
+                        "parent": str,      # Parent feature ID ("" for standalone tasks)
+                        "file_path": str,   # Path to task file
+                        "created": str,     # ISO timestamp
+                        "updated": str,     # ISO timestamp
+                    },
+                    ...
+                ],
+                "total": int,               # Number of tasks in review
+                "next_cursor": str | None,  # Cursor of the next page, None on the last page
+            }
+
+        Raises:
+            ValidationError: If the parameters are invalid, including:
+                - MISSING_REQUIRED_FIELD: Empty projectRoot
+                - INVALID_FIELD: Malformed cursor, or a limit below 1
+        """
+        if not projectRoot or not projectRoot.strip():
+            raise ValidationError(
+                errors=["Project root cannot be empty"],
+                error_codes=[ValidationErrorCode.MISSING_REQUIRED_FIELD],
+                context={"field": "projectRoot"},
+            )
+        if limit < 1:
+            raise ValidationError(
+                errors=[f"Limit must be at least 1, got {limit}"],
+                error_codes=[ValidationErrorCode.INVALID_FIELD],
+                context={"field": "limit"},
+            )
+        after: ReviewKey | None = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError as e:
+                raise ValidationError(
+                    errors=[str(e)],
+                    error_codes=[ValidationErrorCode.INVALID_FIELD],
+                    context={"field": "cursor"},
+                ) from e
+
+        _, path_resolution_root = resolve_project_roots(projectRoot, ensure_planning_subdir=True)
+
+        # One extra key tells whether another page follows
+        rows, keys, total = get_backlog_index().review_queue(path_resolution_root, after, limit + 1)
+        next_cursor = encode_cursor(keys[limit - 1]) if len(keys) > limit else None
+        return {
+            "tasks": [task_record(row, path_resolution_root) for row in rows[:limit]],
+            "total": total,
+            "next_cursor": next_cursor,
+        }
+
+    return listReviewQueue
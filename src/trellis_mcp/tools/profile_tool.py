@@ -0,0 +1,73 @@
+"""Profile tool for Trellis MCP server.
+
+Debug-only tool that runs another tool call under cProfile (and optionally
+tracemalloc) and returns the sorted stats and largest allocation sites. Only
+registered when the server runs in debug mode.
+"""
+
+from typing import Any
+
+from fastmcp import FastMCP
+
+from ..profiling import PROFILE_SORT_KEYS, profile_tool_call
+from ..settings import Settings
+
+
+def create_profile_tool(settings: Settings):
+    """Create a profileTool tool configured with the provided settings.
+
+    Args:
+        settings: Server configuration settings
+
+    Returns:
+        Configured profileTool tool function
+    """
+    mcp = FastMCP()
+
+    @mcp.tool
+    async def profileTool(
+        toolName: str,
+        arguments: dict[str, Any] | None = None,
+        sortBy: str = "cumulative",
+        limit: int = 25,
+        traceMemory: bool = False,
+        outputPath: str = "",
+    ) -> dict[str, Any]:
+        """Profile a real tool invocation with cProfile and optionally tracemalloc.
+
+        Runs the named tool with the given arguments against the project root they
+        reference, so investigations use the actual planning tree. Errors raised by
+        the profiled tool are reported in the result instead of failing this call.
+
+        Args:
+            toolName: Name of the tool to profile (e.g. 'listBacklog', 'updateObject')
+            arguments: Arguments to pass to the profiled tool
+            sortBy: Stats sort key ('cumulative', 'tottime' or 'calls')
+            limit: Number of stats rows to return (default: 25)
+            traceMemory: Whether to record peak memory and top allocation sites
+            outputPath: Optional file path to save raw pstats data for offline analysis
+
+        Returns:
+            Dictionary containing the profiled call's duration, result or error,
+            sorted stats rows, the formatted pstats table and memory data
+
+        Raises:
+            ValueError: If the tool name or sort key is unknown
+        """
+        if sortBy not in PROFILE_SORT_KEYS:
+            raise ValueError(
+                f"Invalid sortBy '{sortBy}'. Must be one of: {list(PROFILE_SORT_KEYS)}"
+            )
+
+        report = await profile_tool_call(
+            settings,
+            toolName,
+            arguments or {},
+            sort=sortBy,  # type: ignore[arg-type]
+            limit=limit,
+            trace_memory=traceMemory,
+            output_path=outputPath or None,
+        )
+        return dict(report)
+
+    return profileTool
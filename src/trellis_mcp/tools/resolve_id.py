@@ -0,0 +1,103 @@
+"""Resolve ID tool for Trellis MCP server.
+
+Checks whether an object ID exists and suggests the closest existing IDs for
+misspelled or shortened ones, from the in-memory ID index (see
+``trellis_mcp.id_index``) without walking the planning tree.
+"""
+
+from fastmcp import FastMCP
+
+from ..exceptions.validation_error import ValidationError, ValidationErrorCode
+from ..id_index import get_id_index
+from ..path_resolver import resolve_project_roots
+from ..settings import Settings
+from ..types import VALID_KINDS
+
+
+def create_resolve_id_tool(settings: Settings):
+    """Create a resolveId tool configured with the provided settings.
+
+    Args:
+        settings: Server configuration settings
+
+    Returns:
+        Configured resolveId tool function
+    """
+    mcp = FastMCP()
+
+    @mcp.tool
+    def resolveId(
+        projectRoot: str,
+        id: str,
+        kind: str = "",
+        limit: int = 5,
+    ):
+        """Resolve a possibly misspelled or shortened object ID.
+
+        Returns the ID itself if it exists, then IDs it is the start of (each
+        hyphen-separated part may be shortened, so 'T-impl-auth' finds
+        'T-implement-auth'), then IDs within a few typos of it.
+
+        Args:
+            projectRoot: Root directory for the planning structure
+            id: ID to resolve, with or without prefix (e.g. 'T-impl-auth')
+            kind: Optional kind to search ('project', 'epic', 'feature' or 'task');
+                defaults to the kind of the ID's prefix, or all kinds
+            limit: Maximum number of matches (default: 5)
+
+        Returns:
+            Dictionary with the lookup result:
+            {
+                "id": str,          # The ID as given
+                "exists": bool,     # Whether an object with exactly this ID exists
+                "matches": [
+                    {
+                        "id": str,        # Prefixed ID of an existing object
+                        "kind": str,      # Object kind
+                        "match": str,     # 'exact', 'prefix' or 'similar'
+                        "distance": int,  # Edit distance from the given ID
+                    },
+                    ...
+                ]
+            }
+
+        Raises:
+            ValidationError: If the parameters are invalid, including:
+                - MISSING_REQUIRED_FIELD: Empty projectRoot or id
+                - INVALID_FIELD: Unknown kind, or a limit below 1
+        """
+        if not projectRoot or not projectRoot.strip():
+            raise ValidationError(
+                errors=["Project root cannot be empty"],
+                error_codes=[ValidationErrorCode.MISSING_REQUIRED_FIELD],
+                context={"field": "projectRoot"},
+            )
+        if not id or not id.strip():
+            raise ValidationError(
+                errors=["Object ID cannot be empty"],
+                error_codes=[ValidationErrorCode.MISSING_REQUIRED_FIELD],
+                context={"field": "id"},
+            )
+        if kind and kind not in VALID_KINDS:
+            raise ValidationError(
+                errors=[f"Invalid kind '{kind}'. Must be one of: {', '.join(sorted(VALID_KINDS))}"],
+                error_codes=[ValidationErrorCode.INVALID_FIELD],
+                context={"field": "kind"},
+            )
+        if limit < 1:
+            raise ValidationError(
+                errors=[f"Limit must be at least 1, got {limit}"],
+                error_codes=[ValidationErrorCode.INVALID_FIELD],
+                context={"field": "limit"},
+            )
+
+        _, path_resolution_root = resolve_project_roots(projectRoot, ensure_planning_subdir=True)
+
+        matches = get_id_index().resolve(path_resolution_root, id, kind or None, limit)
+        return {
+            "id": id.strip(),
+            "exists": bool(matches) and matches[0]["match"] == "exact",
+            "matches": matches,
+        }
+
+    return resolveId
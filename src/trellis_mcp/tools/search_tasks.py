@@ -0,0 +1,116 @@
+"""Search tasks tool for Trellis MCP server.
+
+Finds tasks by the words in their titles, descriptions and logs, ranked by
+relevance, from the persistent full-text index (see
+``trellis_mcp.search_index``).
+"""
+
+from fastmcp import FastMCP
+
+from ..exceptions.validation_error import ValidationError, ValidationErrorCode
+from ..models.filter_params import FilterParams
+from ..path_resolver import resolve_project_roots
+from ..search_index import get_search_index
+from ..settings import Settings
+
+
+def create_search_tasks_tool(settings: Settings):
+    """Create a searchTasks tool configured with the provided settings.
+
+    Args:
+        settings: Server configuration settings
+
+    Returns:
+        Configured searchTasks tool function
+    """
+    mcp = FastMCP()
+
+    @mcp.tool
+    def searchTasks(
+        projectRoot: str,
+        query: str,
+        scope: str = "",
+        status: str = "",
+        limit: int = 20,
+    ):
+        """Search task titles, descriptions and logs, best match first.
+
+        Every term must match; a term ending in '*' matches as a prefix (e.g.
+        'refr*'), and a double-quoted phrase matches its words in order. Title
+        matches rank above description matches, which rank above log matches.
+        Covers hierarchical and standalone tasks, open and done, but not tasks
+        moved into the archive.
+
+        Args:
+            projectRoot: Root directory for the planning structure
+            query: Search terms, e.g. 'jwt refresh' or '"token rotation" auth*'
+            scope: Optional project, epic or feature ID the tasks must belong to
+                (a project scope also covers standalone tasks, as in listBacklog)
+            status: Optional status filter; several statuses may be given
+                separated by commas
+            limit: Maximum number of results (default: 20)
+
+        Returns:
+            Dictionary with the matching tasks:
+            {
+                "results": [
+                    {
+                        "id": str,          # Task ID
+                        "title": str,       # Task title
+                        "status": str,      # Task status
+                        "priority": str,    # Task priority
+                        "parent": str,      # Parent feature ID ("" for standalone tasks)
+                        "file_path": str,   # Path to task file
+                        "score": float,     # Relevance (higher is better)
+                        "snippet": str,     # Matching text with terms in [brackets]
+                    },
+                    ...
+                ]
+            }
+
+        Raises:
+            ValidationError: If the parameters are invalid, including:
+                - MISSING_REQUIRED_FIELD: Empty projectRoot or query
+                - INVALID_FIELD: Query without searchable terms, or a limit below 1
+        """
+        if not projectRoot or not projectRoot.strip():
+            raise ValidationError(
+                errors=["Project root cannot be empty"],
+                error_codes=[ValidationErrorCode.MISSING_REQUIRED_FIELD],
+                context={"field": "projectRoot"},
+            )
+        if not query or not query.strip():
+            raise ValidationError(
+                errors=["Search query cannot be empty"],
+                error_codes=[ValidationErrorCode.MISSING_REQUIRED_FIELD],
+                context={"field": "query"},
+            )
+        if limit < 1:
+            raise ValidationError(
+                errors=[f"Limit must be at least 1, got {limit}"],
+                error_codes=[ValidationErrorCode.INVALID_FIELD],
+                context={"field": "limit"},
+            )
+
+        _, path_resolution_root = resolve_project_roots(projectRoot, ensure_planning_subdir=True)
+
+        statuses = [value.strip() for value in status.split(",") if value.strip()]
+        try:
+            FilterParams(status=statuses)
+        except Exception:
+            # Like listBacklog, an unknown status matches nothing
+            return {"results": []}
+
+        try:
+            results = get_search_index(path_resolution_root).search(
+                query, scope=scope.strip(), statuses=statuses or None, limit=limit
+            )
+        except ValueError as e:
+            raise ValidationError(
+                errors=[str(e)],
+                error_codes=[ValidationErrorCode.INVALID_FIELD],
+                context={"field": "query"},
+            ) from e
+        return {"results": results}
+
+    return searchTasks
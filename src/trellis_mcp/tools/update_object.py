@@ -10,6 +10,7 @@ from typing import Annotated, Any
 from fastmcp import FastMCP
 from pydantic import Field
 
+from ..change_feed import record_change
 from ..exceptions.cascade_error import CascadeError
 from ..exceptions.protected_object_error import ProtectedObjectError
 from ..exceptions.validation_error import ValidationError, ValidationErrorCode
@@ -18,13 +19,14 @@ from ..path_resolver import children_of, id_to_path, resolve_project_roots
 from ..settings import Settings
 from ..utils.fs_utils import recursive_delete
 from ..utils.graph_utils import DependencyGraph
-from ..utils.io_utils import read_markdown, write_markdown
+from ..utils.io_utils import MarkdownDocument, read_markdown
 from ..validation import (
     TrellisValidationError,
     enforce_status_transition,
     validate_front_matter,
     validate_object_data,
 )
+from ..wal import delete_action, journal_operation
 
 
 def _deep_merge_dict(base: dict[str, Any], patch: dict[str, Any]) -> dict[str, Any]:
@@ -208,11 +210,12 @@ def create_update_object_tool(settings: Settings):
             )
 
         try:
-            existing_yaml, existing_body = read_markdown(file_path)
+            document = MarkdownDocument.load(file_path)
         except FileNotFoundError:
             raise FileNotFoundError(f"Object not found: {file_path}")
         except OSError as e:
             raise OSError(f"Failed to read object file: {e}")
+        existing_yaml, existing_body = document.frontmatter, document.body
 
         # Store original status for transition validation
         original_status = existing_yaml.get("status")
@@ -343,16 +346,23 @@ def create_update_object_tool(settings: Settings):
                 # First, add the object's own file to the deletion list
                 paths_to_delete = [file_path] + child_paths
 
-                # Use recursive_delete to remove all paths
+                # Use recursive_delete to remove all paths; the journal entry lets
+                # recovery finish the deletion if the process dies partway
                 deleted_paths = []
-                for path in paths_to_delete:
-                    if path.exists():
-                        try:
-                            # Use recursive_delete for each path
-                            path_deleted = recursive_delete(path, dry_run=False)
-                            deleted_paths.extend(path_deleted)
-                        except Exception as e:
-                            raise CascadeError(f"Failed to delete {path}: {str(e)}")
+                actions = [delete_action(planning_root, path) for path in paths_to_delete]
+                with journal_operation(planning_root, "cascade_delete", actions):
+                    for path in paths_to_delete:
+                        if path.exists():
+                            try:
+                                # Use recursive_delete for each path
+                                path_deleted = recursive_delete(path, dry_run=False)
+                                deleted_paths.extend(path_deleted)
+                            except Exception as e:
+                                raise CascadeError(f"Failed to delete {path}: {str(e)}")
+
+                for path in deleted_paths:
+                    if path.suffix == ".md":
+                        record_change(path, "deleted")
 
                 # Return cascade deletion result
                 return {
@@ -386,7 +396,8 @@ def create_update_object_tool(settings: Settings):
 
         # Write the updated file atomically
         try:
-            write_markdown(file_path, updated_yaml, updated_body)
+            document.frontmatter, document.body = updated_yaml, updated_body
+            document.save()
         except OSError as e:
             raise OSError(f"Failed to write updated object file: {e}")
 
@@ -401,7 +412,8 @@ def create_update_object_tool(settings: Settings):
             if dependency_graph.has_cycle():
                 # If cycles are detected, restore the original file and raise error
                 try:
-                    write_markdown(file_path, existing_yaml, existing_body)
+                    document.frontmatter, document.body = existing_yaml, existing_body
+                    document.save()
                 except OSError:
                     pass  # Restoration failed, but we still need to report the cycle
                 raise ValidationError(
@@ -419,7 +431,8 @@ def create_update_object_tool(settings: Settings):
         except Exception as e:
             # If cycle check fails for other reasons, restore the original file
             try:
-                write_markdown(file_path, existing_yaml, existing_body)
+                document.frontmatter, document.body = existing_yaml, existing_body
+                document.save()
             except OSError:
                 pass
             raise ValidationError(
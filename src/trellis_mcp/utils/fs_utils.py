@@ -4,9 +4,13 @@ Provides utilities for filesystem operations required by the Trellis MCP server,
 including directory creation, path handling, and object discovery.
 """
 
+import os
 import shutil
 from pathlib import Path
 
+from ..done_tasks import find_done_task, find_done_task_in_tree, tasks_dir_of
+from ..durability import sync_directory
+from ..invalidation import invalidate_path, is_watched
 from ..types import VALID_KINDS
 
 
@@ -80,7 +84,8 @@ def find_object_path(kind: str, obj_id: str, project_root: Path) -> Path | None:
 
     Note:
         For tasks, this function checks both tasks-open and tasks-done directories,
-        preferring tasks-open if the same ID exists in both locations.
+        preferring tasks-open if the same ID exists in both locations. Done tasks
+        are found through the done-task index, in flat or monthly sharded layout.
     """
     # Validate inputs
     if not kind or kind not in VALID_KINDS:
@@ -138,12 +143,19 @@ def find_object_path(kind: str, obj_id: str, project_root: Path) -> Path | None:
         if open_task.exists():
             return open_task
 
-        # Check tasks-done (files have timestamp prefixes)
-        done_dir = project_root / "tasks-done"
-        if done_dir.exists():
-            for done_file in done_dir.iterdir():
-                if done_file.is_file() and done_file.name.endswith(f"-T-{clean_id}.md"):
-                    return done_file
+        # Check tasks-done (files have timestamp prefixes; looked up through the index)
+        done_task = find_done_task(project_root / "tasks-done", clean_id)
+        if done_task is not None:
+            return done_task
+
+        # While a watcher covers the tree, the index knows every done task at once
+        tree_indexed = is_watched(os.path.abspath(project_root))
+        if tree_indexed:
+            done_task = find_done_task_in_tree(project_root, clean_id)
+            if done_task is not None:
+                # Prefer an open file of the same task next to it
+                open_task = tasks_dir_of(done_task).parent / "tasks-open" / f"T-{clean_id}.md"
+                return open_task if open_task.exists() else done_task
 
         # Then scan all projects, epics, and features to find hierarchical tasks
         projects_dir = project_root / "projects"
@@ -165,14 +177,12 @@ def find_object_path(kind: str, obj_id: str, project_root: Path) -> Path | None:
                                         if open_task.exists():
                                             return open_task
 
-                                        # Check tasks-done (files have timestamp prefixes)
-                                        done_dir = feature_dir / "tasks-done"
-                                        if done_dir.exists():
-                                            for done_file in done_dir.iterdir():
-                                                if done_file.is_file() and done_file.name.endswith(
-                                                    f"-T-{clean_id}.md"
-                                                ):
-                                                    return done_file
+                                        if not tree_indexed:
+                                            done_task = find_done_task(
+                                                feature_dir / "tasks-done", clean_id
+                                            )
+                                            if done_task is not None:
+                                                return done_task
 
         return None
 
@@ -240,6 +250,8 @@ def recursive_delete(path: Path, dry_run: bool = False) -> list[Path]:
         paths_to_delete.append(abs_path)
         if not dry_run:
             abs_path.unlink()
+            sync_directory(abs_path.parent)
+            invalidate_path(abs_path)
     elif abs_path.is_dir():
         # Directory deletion - collect all paths first
         for root, dirs, files in abs_path.walk():
@@ -257,6 +269,8 @@ def recursive_delete(path: Path, dry_run: bool = False) -> list[Path]:
         if not dry_run:
             # Use shutil.rmtree for safe recursive directory removal
             shutil.rmtree(abs_path)
+            sync_directory(abs_path.parent)
+            invalidate_path(abs_path)
     else:
         raise ValueError(f"Path is neither a file nor directory: {abs_path}")
 
@@ -12,6 +12,7 @@ from ..validation import (
     build_prerequisites_graph,
     get_all_objects,
 )
+from ..validation.benchmark import trace_span
 
 
 class DependencyGraph:
@@ -40,7 +41,8 @@ class DependencyGraph:
             ValueError: If object parsing fails
         """
         # Load all objects from the filesystem
-        objects_result = get_all_objects(project_root)
+        with trace_span("load_objects"):
+            objects_result = get_all_objects(project_root)
 
         # Handle both tuple and dict return types from get_all_objects
         if isinstance(objects_result, tuple):
@@ -49,7 +51,8 @@ class DependencyGraph:
             self._objects = objects_result
 
         # Build prerequisites graph from loaded objects
-        self._graph = build_prerequisites_graph(self._objects)
+        with trace_span("graph_build"):
+            self._graph = build_prerequisites_graph(self._objects)
 
     def has_cycle(self) -> bool:
         """Check if the dependency graph contains any cycles.
@@ -60,6 +63,11 @@ class DependencyGraph:
         Returns:
             True if a cycle is detected, False otherwise
         """
+        with trace_span("cycle_check"):
+            return self._has_cycle()
+
+    def _has_cycle(self) -> bool:
+        """Run Kahn's algorithm over the graph (see has_cycle)."""
         if not self._graph:
             return False
 
@@ -237,4 +237,11 @@ def _id_exists(kind: str, obj_id: str, project_root: Path) -> bool:
     Returns:
         True if an object with this ID exists, False otherwise
     """
-    return find_object_path(kind, obj_id, project_root) is not None
+    if find_object_path(kind, obj_id, project_root) is not None:
+        return True
+    if kind == "task":
+        # Archived tasks keep their IDs so prerequisites on them stay unambiguous
+        from ..archive import is_archived
+
+        return is_archived(project_root, obj_id)
+    return False
@@ -1,17 +1,107 @@
 """I/O utilities for Trellis MCP markdown file operations.
 
 This module provides utilities for reading and writing markdown files with YAML front-matter.
+
+``MarkdownDocument`` carries one file's front-matter, body and stat signature
+through a read-modify-write operation, so that claiming, updating or
+completing an object reads the file once and writes it once.
 """
 
 import os
 import tempfile
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import yaml
 
-from ..markdown_loader import load_markdown
+from ..change_feed import ChangeOp, record_change
+from ..durability import sync_directory, sync_file
+from ..markdown_loader import load_markdown, load_markdown_with_signature
+from ..parse_cache import FileSignature, file_signature
+from ..validation.benchmark import trace_span
+
+
+@dataclass
+class MarkdownDocument:
+    """One version of a markdown object file, loaded for modification.
+
+    Example:
+        >>> document = MarkdownDocument.load("planning/tasks-open/T-auth.md")
+        >>> document.frontmatter["status"] = "in-progress"
+        >>> document.save()
+    """
+
+    path: Path
+    frontmatter: dict[str, Any]
+    body: str
+    signature: FileSignature | None = None
+
+    @classmethod
+    def load(cls, path: str | Path) -> "MarkdownDocument":
+        """Read a markdown file into a document.
+
+        Args:
+            path: Path to the markdown file
+
+        Returns:
+            Document holding a private copy of the front-matter
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            OSError: If the file cannot be read
+            yaml.YAMLError: If the YAML front-matter is invalid
+            ValueError: If the front-matter format is invalid
+        """
+        frontmatter, body, signature = load_markdown_with_signature(path)
+        return cls(Path(path), frontmatter, body, signature)
+
+    def render(self) -> str:
+        """Format the document as markdown with YAML front-matter."""
+        return render_markdown(self.frontmatter, self.body)
+
+    def save(self, change: ChangeOp | None = None) -> None:
+        """Atomically write the document back to its path.
+
+        Args:
+            change: Change type to record; defaults to 'updated' for documents
+                that were loaded and 'created' for new ones
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        stat_result = atomic_write_text(self.path, self.render())
+        existed = self.signature is not None
+        self.signature = file_signature(stat_result)
+        record_change(self.path, change or ("updated" if existed else "created"), self.frontmatter)
+
+    def move_to(self, destination: str | Path, change: ChangeOp = "updated") -> None:
+        """Write the document in place, then rename it to a new path.
+
+        The rename is a single ``os.replace``, so exactly one copy of the file
+        exists at every point, unlike writing the destination and deleting the
+        source. Both paths must be on the same filesystem.
+
+        Args:
+            destination: New path of the file
+            change: Change type to record for the destination
+
+        Raises:
+            OSError: If the file cannot be written or renamed
+        """
+        target_path = Path(destination)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        stat_result = atomic_write_text(self.path, self.render())
+        os.replace(self.path, target_path)
+        sync_directory(target_path.parent)
+        if target_path.parent != self.path.parent:
+            sync_directory(self.path.parent)
+
+        source_path = self.path
+        self.path = target_path
+        self.signature = file_signature(stat_result)
+        record_change(self.path, change, self.frontmatter, old_path=source_path)
 
 
 def read_markdown(path: str | Path) -> tuple[dict[str, Any], str]:
@@ -51,17 +141,25 @@ def read_markdown(path: str | Path) -> tuple[dict[str, Any], str]:
     return load_markdown(path)
 
 
-def write_markdown(path: str | Path, yaml_dict: dict[str, Any], body_str: str) -> None:
+def write_markdown(
+    path: str | Path,
+    yaml_dict: dict[str, Any],
+    body_str: str,
+    change: ChangeOp | None = None,
+) -> None:
     """Write markdown file with YAML front-matter.
 
     Creates a markdown file with YAML front-matter delimited by '---' lines.
     The front-matter is serialized using yaml.safe_dump with pretty-printing.
     The write operation is atomic - uses a temporary file and atomic move.
+    Writes to object files inside a planning tree are recorded in its change feed.
 
     Args:
         path: Path to the markdown file to write.
         yaml_dict: Dictionary to serialize as YAML front-matter.
         body_str: The markdown content to write after front-matter.
+        change: Change type to record; defaults to 'created' for new files and
+            'updated' for existing ones.
 
     Raises:
         OSError: If there are permission issues creating directories or files.
@@ -84,7 +182,26 @@ def write_markdown(path: str | Path, yaml_dict: dict[str, Any], body_str: str) -
         >>> # This is the task description.
     """
     target_path = Path(path)
+    markdown_content = render_markdown(yaml_dict, body_str)
 
+    # Ensure parent directory exists
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    existed = target_path.exists()
+
+    atomic_write_text(target_path, markdown_content)
+    record_change(target_path, change or ("updated" if existed else "created"), yaml_dict)
+
+
+def render_markdown(yaml_dict: dict[str, Any], body_str: str) -> str:
+    """Format front-matter and body as a markdown file.
+
+    Args:
+        yaml_dict: Dictionary to serialize as YAML front-matter.
+        body_str: The markdown content to write after front-matter.
+
+    Returns:
+        Markdown text with '---' delimited YAML front-matter
+    """
     # Serialize YAML front-matter
     front_matter = _serialize_yaml_dict(yaml_dict)
     yaml_content = yaml.safe_dump(
@@ -92,42 +209,60 @@ def write_markdown(path: str | Path, yaml_dict: dict[str, Any], body_str: str) -
     )
 
     # Format as markdown with YAML front-matter
-    markdown_content = f"---\n{yaml_content}---\n{body_str}"
+    return f"---\n{yaml_content}---\n{body_str}"
 
-    # Ensure parent directory exists
-    target_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Get the directory where the target file should be written
-    target_dir = target_path.parent
-
-    # Create a temporary file in the same directory for atomic operation
-    temp_file = None
-    try:
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            dir=target_dir,
-            prefix=f".{target_path.name}.",
-            suffix=".tmp",
-            delete=False,
-            encoding="utf-8",
-        ) as temp_file:
-            temp_file.write(markdown_content)
-            temp_file.flush()
-            os.fsync(temp_file.fileno())  # Ensure data is written to disk
-            temp_file_path = temp_file.name
-
-        # Atomically replace the target file
-        os.replace(temp_file_path, target_path)
-
-    except Exception as e:
-        # Clean up the temporary file if it was created
-        if temp_file is not None:
-            temp_file_path = temp_file.name
-            try:
-                os.unlink(temp_file_path)
-            except OSError:
-                pass  # File may already be gone
-        raise e
+def atomic_write_text(path: Path, content: str) -> os.stat_result:
+    """Atomically replace a file's content through a temp file and ``os.replace``.
+
+    The temp file and the directory are flushed as the durability mode requires
+    (see ``trellis_mcp.durability``).
+
+    Args:
+        path: File to write; its directory must exist
+        content: Text to write
+
+    Returns:
+        Stat result of the written file (the rename keeps its inode and mtime)
+
+    Raises:
+        OSError: If there are permission issues or the filesystem write fails
+    """
+    target_dir = path.parent
+
+    with trace_span("write"):
+        # Create a temporary file in the same directory for atomic operation
+        temp_file = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                mode="w",
+                dir=target_dir,
+                prefix=f".{path.name}.",
+                suffix=".tmp",
+                delete=False,
+                encoding="utf-8",
+            ) as temp_file:
+                temp_file.write(content)
+                temp_file.flush()
+                sync_file(temp_file.fileno(), path)  # Flush per the durability mode
+                stat_result = os.fstat(temp_file.fileno())
+                temp_file_path = temp_file.name
+
+            # Atomically replace the target file
+            os.replace(temp_file_path, path)
+            sync_directory(target_dir)
+
+        except Exception as e:
+            # Clean up the temporary file if it was created
+            if temp_file is not None:
+                temp_file_path = temp_file.name
+                try:
+                    os.unlink(temp_file_path)
+                except OSError:
+                    pass  # File may already be gone
+            raise e
+
+    return stat_result
 
 
 def _serialize_yaml_dict(yaml_dict: dict[str, Any]) -> dict[str, Any]:
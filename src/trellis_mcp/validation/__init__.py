@@ -2,76 +2,120 @@
 
 This module provides validation functions for checking object relationships
 and constraints beyond basic field validation.
+
+Public names are loaded lazily on first access (PEP 562) so that importing a
+single submodule, such as ``validation.benchmark`` from the markdown loader,
+does not pull in every validator and its dependencies.
 """
 
-# Re-export all public APIs to maintain backward compatibility
-
-from .benchmark import PerformanceBenchmark, benchmark_cycle_detection
-
-# Cache and performance utilities
-from .cache import DependencyGraphCache, clear_dependency_cache, get_cache_stats
-
-# Context utilities
-from .context_utils import (
-    format_validation_error_with_context,
-    generate_contextual_error_message,
-    get_task_type_context,
-)
-
-# Core validation
-from .core import validate_object_data, validate_standalone_task_data
-
-# Cycle detection
-from .cycle_detection import (
-    check_prereq_cycles,
-    check_prereq_cycles_in_memory,
-    validate_acyclic_prerequisites,
-)
-
-# Error collection and aggregation
-from .error_collector import ErrorCategory, ErrorSeverity, ValidationErrorCollector
-
-# Exception classes
-from .exceptions import CircularDependencyError, TrellisValidationError
-
-# Field validation
-from .field_validation import (
-    validate_enum_membership,
-    validate_front_matter,
-    validate_priority_field,
-    validate_required_fields_per_kind,
-    validate_status_for_kind,
-)
-
-# Graph operations
-from .graph_operations import (
-    build_dependency_graph_in_memory,
-    build_prerequisites_graph,
-    detect_cycle_dfs,
-)
-
-# Object loading
-from .object_loader import get_all_objects
-
-# Parent validation
-from .parent_validation import validate_parent_exists, validate_parent_exists_for_object
-
-# Security validation
-from .security import validate_standalone_task_security
-
-# Status transitions
-from .status_transitions import enforce_status_transition
-
-# Task utilities
-from .task_utils import (
-    is_hierarchy_task,
-    is_hierarchy_task_guard,
-    is_standalone_task,
-    is_standalone_task_guard,
-    validate_standalone_task_with_enhanced_errors,
-)
-
-# Export all public APIs
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .benchmark import PerformanceBenchmark, benchmark_cycle_detection
+
+    # Cache and performance utilities
+    from .cache import DependencyGraphCache, clear_dependency_cache, get_cache_stats
+
+    # Context utilities
+    from .context_utils import (
+        format_validation_error_with_context,
+        generate_contextual_error_message,
+        get_task_type_context,
+    )
+
+    # Core validation
+    from .core import validate_object_data, validate_standalone_task_data
+
+    # Cycle detection
+    from .cycle_detection import (
+        check_prereq_cycles,
+        check_prereq_cycles_in_memory,
+        validate_acyclic_prerequisites,
+    )
+
+    # Error collection and aggregation
+    from .error_collector import ErrorCategory, ErrorSeverity, ValidationErrorCollector
+
+    # Exception classes
+    from .exceptions import CircularDependencyError, TrellisValidationError
+
+    # Field validation
+    from .field_validation import (
+        validate_enum_membership,
+        validate_front_matter,
+        validate_priority_field,
+        validate_required_fields_per_kind,
+        validate_status_for_kind,
+    )
+
+    # Graph operations
+    from .graph_operations import (
+        build_dependency_graph_in_memory,
+        build_prerequisites_graph,
+        detect_cycle_dfs,
+    )
+
+    # Object loading
+    from .object_loader import get_all_objects
+
+    # Parent validation
+    from .parent_validation import validate_parent_exists, validate_parent_exists_for_object
+
+    # Security validation
+    from .security import validate_standalone_task_security
+
+    # Status transitions
+    from .status_transitions import enforce_status_transition
+
+    # Task utilities
+    from .task_utils import (
+        is_hierarchy_task,
+        is_hierarchy_task_guard,
+        is_standalone_task,
+        is_standalone_task_guard,
+        validate_standalone_task_with_enhanced_errors,
+    )
+
+_LAZY_IMPORTS: dict[str, str] = {
+    "PerformanceBenchmark": ".benchmark",
+    "benchmark_cycle_detection": ".benchmark",
+    "DependencyGraphCache": ".cache",
+    "clear_dependency_cache": ".cache",
+    "get_cache_stats": ".cache",
+    "format_validation_error_with_context": ".context_utils",
+    "generate_contextual_error_message": ".context_utils",
+    "get_task_type_context": ".context_utils",
+    "validate_object_data": ".core",
+    "validate_standalone_task_data": ".core",
+    "check_prereq_cycles": ".cycle_detection",
+    "check_prereq_cycles_in_memory": ".cycle_detection",
+    "validate_acyclic_prerequisites": ".cycle_detection",
+    "ErrorCategory": ".error_collector",
+    "ErrorSeverity": ".error_collector",
+    "ValidationErrorCollector": ".error_collector",
+    "CircularDependencyError": ".exceptions",
+    "TrellisValidationError": ".exceptions",
+    "validate_enum_membership": ".field_validation",
+    "validate_front_matter": ".field_validation",
+    "validate_priority_field": ".field_validation",
+    "validate_required_fields_per_kind": ".field_validation",
+    "validate_status_for_kind": ".field_validation",
+    "build_dependency_graph_in_memory": ".graph_operations",
+    "build_prerequisites_graph": ".graph_operations",
+    "detect_cycle_dfs": ".graph_operations",
+    "get_all_objects": ".object_loader",
+    "validate_parent_exists": ".parent_validation",
+    "validate_parent_exists_for_object": ".parent_validation",
+    "validate_standalone_task_security": ".security",
+    "enforce_status_transition": ".status_transitions",
+    "is_hierarchy_task": ".task_utils",
+    "is_hierarchy_task_guard": ".task_utils",
+    "is_standalone_task": ".task_utils",
+    "is_standalone_task_guard": ".task_utils",
+    "validate_standalone_task_with_enhanced_errors": ".task_utils",
+}
+
 __all__ = [
     # Exception classes
     "CircularDependencyError",
@@ -123,3 +167,18 @@ __all__ = [
     # Status transitions
     "enforce_status_transition",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names from their submodule on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Include lazily loaded names in dir()."""
+    return sorted(set(globals()) | set(__all__))
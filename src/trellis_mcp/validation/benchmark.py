@@ -1,23 +1,85 @@
-"""Performance benchmarking utilities for validation operations.
+"""Performance benchmarking and tracing utilities.
 
-This module provides performance measurement tools for cycle detection
-and other validation operations.
+This module provides performance measurement tools for cycle detection and a
+lightweight span tracer used to break slow calls down into phases (walk, read,
+YAML parse, model validation, graph build, cycle check, write).
+
+Spans are recorded on a PerformanceBenchmark. Code deep in the call stack uses
+``trace_span(name)``, which records into the benchmark activated for the
+current context and is a no-op when none is active.
 """
 
+import functools
 import logging
 import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
 from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterator, TypeVar
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    """A named, timed phase with nested child spans.
+
+    Repeated sibling spans with the same name (for example one ``read`` per
+    file) are merged into a single span that tracks the call count and the
+    accumulated duration, keeping trees small for large planning trees.
+    """
+
+    __slots__ = ("name", "count", "duration", "children", "_started_at", "_index")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.duration = 0.0
+        self.children: list[Span] = []
+        self._started_at: float | None = None
+        self._index: dict[str, Span] = {}
+
+    def child(self, name: str) -> "Span":
+        """Get or create the child span with the given name."""
+        span = self._index.get(name)
+        if span is None:
+            span = self._index[name] = Span(name)
+            self.children.append(span)
+        return span
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the span and its children to a JSON-serializable dictionary."""
+        result: dict[str, Any] = {"name": self.name, "ms": round(self.duration * 1000, 3)}
+        if self.count > 1:
+            result["count"] = self.count
+        if self.children:
+            result["children"] = [child.to_dict() for child in self.children]
+        return result
+
 
 class PerformanceBenchmark:
-    """Utility class for benchmarking cycle detection performance."""
+    """Utility class for benchmarking and tracing operations.
+
+    ``start``/``end`` pairs may be nested; each nested pair becomes a child span
+    of the enclosing one. ``timings`` keeps the accumulated duration per
+    operation name for flat summaries.
+
+    Example:
+        >>> benchmark = PerformanceBenchmark()
+        >>> with benchmark.span("updateObject"):
+        ...     with benchmark.span("read"):
+        ...         pass
+        >>> benchmark.get_span_tree()[0]["children"][0]["name"]
+        'read'
+    """
 
     def __init__(self):
         self.start_time: float | None = None
         self.timings: dict[str, float] = {}
+        self._root = Span("")
+        self._stack: list[Span] = []
 
     def start(self, operation: str) -> None:
         """Start timing an operation.
@@ -25,28 +87,68 @@ class PerformanceBenchmark:
         Args:
             operation: Name of the operation being timed
         """
-        self.start_time = time.perf_counter()
+        parent = self._stack[-1] if self._stack else self._root
+        span = parent.child(operation)
+        span._started_at = time.perf_counter()
+        self._stack.append(span)
+        self.start_time = span._started_at
         logger.debug(f"Starting benchmark: {operation}")
 
     def end(self, operation: str) -> float:
         """End timing an operation and record the duration.
 
+        Any spans opened inside the operation that were not ended are closed
+        along with it.
+
         Args:
             operation: Name of the operation being timed
 
         Returns:
             Duration in seconds
         """
-        if self.start_time is None:
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index].name == operation:
+                break
+        else:
             logger.warning(f"No start time recorded for operation: {operation}")
             return 0.0
 
-        duration = time.perf_counter() - self.start_time
-        self.timings[operation] = duration
+        now = time.perf_counter()
+        duration = 0.0
+        while len(self._stack) > index:
+            span = self._stack.pop()
+            duration = now - (span._started_at or now)
+            span._started_at = None
+            span.count += 1
+            span.duration += duration
+            self.timings[span.name] = self.timings.get(span.name, 0.0) + duration
+
+        self.start_time = self._stack[-1]._started_at if self._stack else None
         logger.debug(f"Completed benchmark: {operation} in {duration:.4f}s")
-        self.start_time = None
         return duration
 
+    @contextmanager
+    def span(self, operation: str) -> Iterator[None]:
+        """Time the enclosed block as a (possibly nested) span.
+
+        Args:
+            operation: Name of the operation being timed
+        """
+        self.start(operation)
+        try:
+            yield
+        finally:
+            self.end(operation)
+
+    @contextmanager
+    def activate(self) -> Iterator["PerformanceBenchmark"]:
+        """Make this benchmark the target of ``trace_span`` in the current context."""
+        token = _active_benchmark.set(self)
+        try:
+            yield self
+        finally:
+            _active_benchmark.reset(token)
+
     def get_timings(self) -> dict[str, float]:
         """Get all recorded timings.
 
@@ -55,6 +157,28 @@ class PerformanceBenchmark:
         """
         return self.timings.copy()
 
+    def get_span_tree(self) -> list[dict[str, Any]]:
+        """Get the recorded spans as a nested, JSON-serializable tree.
+
+        Returns:
+            List of root spans, each with name, duration in ms, call count and children
+        """
+        return [span.to_dict() for span in self._root.children]
+
+    def format_span_tree(self) -> str:
+        """Render the span tree as indented text, one span per line."""
+        lines: list[str] = []
+
+        def render(span: Span, depth: int) -> None:
+            count = f" x{span.count}" if span.count > 1 else ""
+            lines.append(f"{'  ' * depth}{span.name}: {span.duration * 1000:.2f}ms{count}")
+            for child in span.children:
+                render(child, depth + 1)
+
+        for root in self._root.children:
+            render(root, 0)
+        return "\n".join(lines)
+
     def log_summary(self) -> None:
         """Log a summary of all benchmarked operations."""
         if not self.timings:
@@ -68,6 +192,72 @@ class PerformanceBenchmark:
             logger.info(f"  {operation}: {duration:.4f}s ({percentage:.1f}%)")
 
 
+# Benchmark that trace_span records into for the current context (None when tracing is off)
+_active_benchmark: ContextVar[PerformanceBenchmark | None] = ContextVar(
+    "trellis_active_benchmark", default=None
+)
+
+_NO_SPAN = nullcontext()
+
+
+def get_active_benchmark() -> PerformanceBenchmark | None:
+    """Get the benchmark activated for the current context, if any.
+
+    Returns:
+        Active PerformanceBenchmark, or None when tracing is off
+    """
+    return _active_benchmark.get()
+
+
+def trace_span(operation: str) -> ContextManager[Any]:
+    """Record the enclosed block as a span on the active benchmark.
+
+    Costs a single context variable lookup when tracing is off.
+
+    Args:
+        operation: Span name (e.g. 'read', 'yaml_parse', 'write')
+
+    Returns:
+        Context manager timing the block
+
+    Example:
+        >>> with trace_span("read"):
+        ...     content = path.read_text()
+    """
+    benchmark = _active_benchmark.get()
+    if benchmark is None:
+        return _NO_SPAN
+    return benchmark.span(operation)
+
+
+def traced(operation: str) -> Callable[[F], F]:
+    """Decorate a function so each call is recorded as a span on the active benchmark.
+
+    Args:
+        operation: Span name for the decorated function
+
+    Returns:
+        Decorator preserving the wrapped function's signature
+
+    Example:
+        >>> @traced("validation")
+        ... def validate(data): ...
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            benchmark = _active_benchmark.get()
+            if benchmark is None:
+                return func(*args, **kwargs)
+            with benchmark.span(operation):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
 def benchmark_cycle_detection(project_root: str | Path, operations: int = 10) -> dict[str, float]:
     """Benchmark cycle detection performance.
 
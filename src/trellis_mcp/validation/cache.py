@@ -2,111 +2,217 @@
 
 This module provides caching functionality for dependency graphs to avoid
 redundant file I/O operations when validating prerequisites.
+
+Graphs record a fingerprint (mtime in nanoseconds, size and front-matter
+hash) per object file. A file whose mtime changed but whose front-matter
+hashes the same, as after ``git checkout``, keeps the graph valid.
+
+While a filesystem watcher covers the root, a cached graph is reused without
+re-checking modification times or globbing for new files. Paths published on
+the invalidation bus are then re-checked one by one on the next lookup: an
+edited or new object file only replaces its own graph entry, and the graph is
+rebuilt only when an object file disappears without reappearing elsewhere.
+Directory events fall back to re-validating every fingerprint.
+
+The cache is shared by request handlers, the warm-up thread and the watcher
+thread, so every access holds its lock.
 """
 
+import fnmatch
 import logging
 import os
+import threading
 from pathlib import Path
 from typing import TypedDict
 
+from ..invalidation import get_invalidation_bus, is_under, is_watched
+from ..markdown_loader import file_fingerprint, revalidate_fingerprint
+from ..parse_cache import FileFingerprint
+from .object_loader import OBJECT_FILE_PATTERNS
+
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+_CONTAINER_FILES = ("project.md", "epic.md", "feature.md")
+
 
 class CacheStats(TypedDict):
     """Type definition for cache statistics."""
 
     cached_projects: int
     cache_keys: list[str]
+    hits: int
+    misses: int
+    hit_rate: float
 
 
 class DependencyGraphCache:
-    """Simple cache for dependency graphs with file modification time validation.
+    """Simple cache for dependency graphs with file fingerprint validation.
 
     This cache improves performance by avoiding redundant file I/O when
     no objects have changed since the last graph build.
     """
 
     def __init__(self):
-        self._cache: dict[str, tuple[dict[str, list[str]], dict[str, float]]] = {}
+        self._cache: dict[str, tuple[dict[str, list[str]], dict[str, FileFingerprint]]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.RLock()
+
+        # Cache keys whose graphs can be reused without validation while watched
+        self._trusted: set[str] = set()
+        # Paths published under trusted graphs, re-checked on the next lookup
+        self._dirty: dict[str, set[str]] = {}
+        # Bumped on every invalidation; lets callers detect changes during a build
+        self._generation = 0
+        get_invalidation_bus().subscribe(self.invalidate_path)
+
+    @property
+    def generation(self) -> int:
+        """Invalidation counter, read before loading objects and passed to ``cache_graph``."""
+        return self._generation
 
     def get_cached_graph(
         self, project_root: Path
-    ) -> tuple[dict[str, list[str]], dict[str, float]] | None:
+    ) -> tuple[dict[str, list[str]], dict[str, FileFingerprint]] | None:
         """Get cached graph if it exists for the project root.
 
         Args:
             project_root: The project root path
 
         Returns:
-            Tuple of (graph, file_mtimes) if cached, None otherwise
+            Tuple of (graph, file_fingerprints) if cached, None otherwise
         """
-        cache_key = str(project_root)
-        return self._cache.get(cache_key)
+        with self._lock:
+            cached = self._cache.get(str(project_root))
+            if cached is None:
+                self._misses += 1
+            return cached
+
+    def get_valid_graph(self, project_root: Path) -> dict[str, list[str]] | None:
+        """Get the cached graph for a project root if it is still valid.
+
+        Args:
+            project_root: The project root path
+
+        Returns:
+            The graph, with the entries of changed files replaced, or None if
+            nothing is cached or the graph has to be rebuilt
+        """
+        with self._lock:
+            cached = self.get_cached_graph(project_root)
+            if cached is None or not self.is_cache_valid(project_root, cached[1]):
+                return None
+            return self._cache[str(project_root)][0]
 
     def cache_graph(
-        self, project_root: Path, graph: dict[str, list[str]], file_mtimes: dict[str, float]
+        self,
+        project_root: Path,
+        graph: dict[str, list[str]],
+        file_fingerprints: dict[str, FileFingerprint],
+        trusted_generation: int | None = None,
     ) -> None:
-        """Cache a dependency graph with its file modification times.
+        """Cache a dependency graph with the fingerprints of its object files.
 
         Args:
             project_root: The project root path
             graph: The dependency graph (adjacency list)
-            file_mtimes: Dictionary mapping file paths to modification times
+            file_fingerprints: Dictionary mapping file paths to fingerprints
+            trusted_generation: The ``generation`` read before objects were
+                loaded; if nothing was invalidated since and the root is watched,
+                the graph is reused without validation
         """
         cache_key = str(project_root)
-        self._cache[cache_key] = (graph, file_mtimes)
-
-    def is_cache_valid(self, project_root: Path, cached_mtimes: dict[str, float]) -> bool:
-        """Check if cached graph is still valid by comparing file modification times.
-
-        Uses tolerance-based comparison (1ms) to avoid floating point precision
-        issues and filesystem timestamp resolution differences across platforms.
+        with self._lock:
+            self._cache[cache_key] = (graph, file_fingerprints)
+            self._dirty.pop(cache_key, None)
+            if trusted_generation == self._generation and is_watched(os.path.abspath(project_root)):
+                self._trusted.add(cache_key)
+            else:
+                self._trusted.discard(cache_key)
+
+    def is_cache_valid(
+        self, project_root: Path, cached_fingerprints: dict[str, FileFingerprint]
+    ) -> bool:
+        """Check if cached graph is still valid by comparing file fingerprints.
+
+        Files whose nanosecond mtime or size changed are read and their
+        front-matter hashed; the graph stays valid, and the stored fingerprint
+        is refreshed, when the hash is unchanged. For a watched root only the
+        paths published since the last lookup are checked.
 
         Args:
             project_root: The project root path
-            cached_mtimes: Cached file modification times
+            cached_fingerprints: Cached file fingerprints, refreshed in place
 
         Returns:
             True if cache is valid, False if any files have changed
         """
-        try:
-            # Check if any cached files have been modified
-            for file_path, cached_mtime in cached_mtimes.items():
-                if not os.path.exists(file_path):
-                    # File was deleted
-                    return False
-                current_mtime = os.path.getmtime(file_path)
-                if abs(current_mtime - cached_mtime) > 0.001:
-                    # File was modified (using tolerance to avoid float precision issues)
-                    return False
+        cache_key = str(project_root)
+        with self._lock:
+            if cache_key in self._trusted and is_watched(os.path.abspath(project_root)):
+                if self._refresh_dirty(project_root, cached_fingerprints):
+                    self._hits += 1
+                    return True
+                self._trusted.discard(cache_key)
+                self._misses += 1
+                return False
 
-            # Check for new files that might have been added
-            # This is a simplified check - we'll let the cache miss handle new files
-            patterns = [
-                "projects/P-*/project.md",
-                "projects/P-*/epics/E-*/epic.md",
-                "projects/P-*/epics/E-*/features/F-*/feature.md",
-                "projects/P-*/epics/E-*/features/F-*/tasks-open/T-*.md",
-                "projects/P-*/epics/E-*/features/F-*/tasks-done/*-T-*.md",
-            ]
+            try:
+                # Check if any cached files have been deleted or had their front-matter changed
+                for file_path, fingerprint in cached_fingerprints.items():
+                    current = revalidate_fingerprint(file_path, fingerprint)
+                    if current is None:
+                        self._misses += 1
+                        return False
+                    cached_fingerprints[file_path] = current
+
+                # Check for new files that might have been added
+                current_files = {
+                    str(file_path)
+                    for pattern in OBJECT_FILE_PATTERNS
+                    for file_path in project_root.glob(pattern)
+                }
+
+                # If new files were added, cache is invalid
+                if current_files != set(cached_fingerprints):
+                    self._misses += 1
+                    return False
 
-            current_files = set()
-            for pattern in patterns:
-                for file_path in project_root.glob(pattern):
-                    current_files.add(str(file_path))
+                self._hits += 1
+                return True
+            except Exception as e:
+                # If anything goes wrong, consider cache invalid
+                logger.debug(f"Cache validation failed: {e}")
+                self._misses += 1
+                return False
 
-            cached_files = set(cached_mtimes.keys())
+    def invalidate_path(self, path: str) -> None:
+        """Mark the graph entries a changed path may affect.
 
-            # If new files were added, cache is invalid
-            if current_files != cached_files:
-                return False
+        An object file is queued for a re-check of that file alone; any other
+        path (a directory, or the root itself) makes the next lookup validate
+        every fingerprint.
 
-            return True
-        except Exception as e:
-            # If anything goes wrong, consider cache invalid
-            logger.debug(f"Cache validation failed: {e}")
-            return False
+        Args:
+            path: Absolute path published on the invalidation bus
+        """
+        with self._lock:
+            self._generation += 1
+            for cache_key in self._cache:
+                root = os.path.abspath(cache_key)
+                if not (is_under(path, root) or is_under(root, path)):
+                    continue
+                if (
+                    path.endswith(".md")
+                    and path != root
+                    and cache_key in self._trusted
+                    and os.path.isabs(cache_key)
+                ):
+                    self._dirty.setdefault(cache_key, set()).add(path)
+                else:
+                    self._trusted.discard(cache_key)
+                    self._dirty.pop(cache_key, None)
 
     def clear_cache(self, project_root: Path | None = None) -> None:
         """Clear cache for a specific project or all projects.
@@ -114,11 +220,88 @@ class DependencyGraphCache:
         Args:
             project_root: Project to clear cache for, or None to clear all
         """
-        if project_root:
-            cache_key = str(project_root)
-            self._cache.pop(cache_key, None)
-        else:
-            self._cache.clear()
+        with self._lock:
+            self._generation += 1
+            if project_root:
+                cache_key = str(project_root)
+                self._cache.pop(cache_key, None)
+                self._trusted.discard(cache_key)
+                self._dirty.pop(cache_key, None)
+            else:
+                self._cache.clear()
+                self._trusted.clear()
+                self._dirty.clear()
+
+    def _refresh_dirty(self, project_root: Path, fingerprints: dict[str, FileFingerprint]) -> bool:
+        """Apply the paths published under a trusted graph to its entries.
+
+        Returns:
+            False if the graph has to be rebuilt
+        """
+        from ..object_parser import parse_object
+        from ..utils.id_utils import clean_prerequisite_id
+
+        cache_key = str(project_root)
+        dirty = self._dirty.pop(cache_key, set())
+        if not dirty:
+            return True
+
+        graph = self._cache[cache_key][0]
+        patched: dict[str, list[str]] = {}
+        removed: list[str] = []
+        root = os.path.abspath(project_root)
+        for path in sorted(dirty):
+            fingerprint = fingerprints.get(path)
+            if fingerprint is not None and revalidate_fingerprint(path, fingerprint) is not None:
+                continue  # Front-matter unchanged
+            if not os.path.exists(path):
+                if fingerprint is not None:
+                    removed.append(path)
+                continue
+            if fingerprint is None and not _is_object_file(root, path):
+                continue
+            try:
+                obj = parse_object(path)
+                current = file_fingerprint(path)
+            except Exception as e:
+                logger.debug(f"Rebuilding dependency graph after {path} failed to parse: {e}")
+                return False
+            if current is None:
+                return False
+            patched[clean_prerequisite_id(obj.id)] = [
+                clean_prerequisite_id(prereq) for prereq in obj.prerequisites
+            ]
+            fingerprints[path] = current
+
+        for path in removed:
+            # A file that moved (a completed task) reappears under another path;
+            # anything else may have gone to the archive, so rebuild
+            if _object_id(path) not in patched:
+                return False
+            fingerprints.pop(path, None)
+
+        if any(graph.get(obj_id) != prereqs for obj_id, prereqs in patched.items()):
+            # Replace rather than mutate: other threads may be walking the old graph
+            self._cache[cache_key] = ({**graph, **patched}, fingerprints)
+        return True
+
+
+def _is_object_file(planning_root: str, path: str) -> bool:
+    """Check whether a path matches one of the object file patterns."""
+    relative = os.path.relpath(path, planning_root).replace(os.sep, "/")
+    return any(fnmatch.fnmatchcase(relative, pattern) for pattern in OBJECT_FILE_PATTERNS)
+
+
+def _object_id(path: str) -> str:
+    """Get the clean object ID of an object file from its path alone."""
+    name = os.path.basename(path)
+    if name in _CONTAINER_FILES:
+        return os.path.basename(os.path.dirname(path))[2:]
+    if "-T-" in name and not name.startswith("T-"):
+        name = name.split("-T-", 1)[1]
+    else:
+        name = name[2:]
+    return name[:-3]
 
 
 # Global cache instance
@@ -131,10 +314,15 @@ def get_cache_stats() -> CacheStats:
     Returns:
         Dictionary containing cache statistics
     """
-    return {
-        "cached_projects": len(_graph_cache._cache),
-        "cache_keys": list(_graph_cache._cache.keys()) if _graph_cache._cache else [],
-    }
+    with _graph_cache._lock:
+        total_requests = _graph_cache._hits + _graph_cache._misses
+        return {
+            "cached_projects": len(_graph_cache._cache),
+            "cache_keys": list(_graph_cache._cache.keys()) if _graph_cache._cache else [],
+            "hits": _graph_cache._hits,
+            "misses": _graph_cache._misses,
+            "hit_rate": _graph_cache._hits / total_requests if total_requests > 0 else 0.0,
+        }
 
 
 def clear_dependency_cache(project_root: str | Path | None = None) -> None:
@@ -7,9 +7,11 @@ coordinate all aspects of object validation.
 from pathlib import Path
 from typing import Any
 
+from .benchmark import traced
 from .task_utils import is_standalone_task
 
 
+@traced("validation")
 def validate_object_data(data: dict[str, Any], project_root: str | Path) -> None:
     """Comprehensive validation of object data with enhanced error handling.
 
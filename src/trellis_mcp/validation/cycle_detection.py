@@ -8,7 +8,7 @@ import logging
 from pathlib import Path
 from typing import Any
 
-from .benchmark import PerformanceBenchmark
+from .benchmark import PerformanceBenchmark, get_active_benchmark
 from .cache import _graph_cache
 from .exceptions import CircularDependencyError
 from .graph_operations import (
@@ -45,12 +45,17 @@ def check_prereq_cycles_in_memory(
         CircularDependencyError: If a cycle is detected (for compatibility with existing
             error handling)
     """
+    # Record graph build and cycle check phases when a trace is active
+    benchmark = get_active_benchmark()
+
     try:
         # Build dependency graph including proposed changes
-        graph = build_dependency_graph_in_memory(project_root, proposed_object_data, operation_type)
+        graph = build_dependency_graph_in_memory(
+            project_root, proposed_object_data, operation_type, benchmark
+        )
 
         # Detect cycles in the combined graph
-        cycle = detect_cycle_dfs(graph)
+        cycle = detect_cycle_dfs(graph, benchmark)
 
         if cycle:
             # Get all objects for enhanced error context
@@ -104,6 +109,8 @@ def validate_acyclic_prerequisites(
     Raises:
         CircularDependencyError: If a cycle is detected
     """
+    if benchmark is None:
+        benchmark = get_active_benchmark()
     if benchmark:
         benchmark.start("validate_acyclic_prerequisites")
 
@@ -111,48 +118,47 @@ def validate_acyclic_prerequisites(
         project_root_path = Path(project_root)
 
         # Try to use cached graph first
-        cached_data = _graph_cache.get_cached_graph(project_root_path)
-
-        if cached_data is not None:
-            cached_graph, cached_mtimes = cached_data
-
-            # Check if cache is still valid
-            if _graph_cache.is_cache_valid(project_root_path, cached_mtimes):
-                # Use cached graph
-                if benchmark:
-                    benchmark.start("cached_cycle_detection")
-                cycle = detect_cycle_dfs(cached_graph, benchmark)
-                if benchmark:
-                    benchmark.end("cached_cycle_detection")
+        cached_graph = _graph_cache.get_valid_graph(project_root_path)
 
-                if cycle:
-                    if benchmark:
-                        benchmark.end("validate_acyclic_prerequisites")
-                    # Load objects for enhanced error context
-                    objects = get_all_objects(project_root)
-                    if isinstance(objects, tuple):
-                        objects = objects[0]
-                    raise CircularDependencyError(cycle, objects)
+        if cached_graph is not None:
+            # Use the cached graph; changed files have replaced their entries
+            if benchmark:
+                benchmark.start("cached_cycle_detection")
+            cycle = detect_cycle_dfs(cached_graph, benchmark)
+            if benchmark:
+                benchmark.end("cached_cycle_detection")
 
+            if cycle:
                 if benchmark:
                     benchmark.end("validate_acyclic_prerequisites")
-                return []
+                # Load objects for enhanced error context
+                objects = get_all_objects(project_root)
+                if isinstance(objects, tuple):
+                    objects = objects[0]
+                raise CircularDependencyError(cycle, objects)
+
+            if benchmark:
+                benchmark.end("validate_acyclic_prerequisites")
+            return []
 
         # Cache miss or invalid - load objects and build graph
         if benchmark:
             benchmark.start("load_objects_and_build_graph")
 
+        generation = _graph_cache.generation
         result = get_all_objects(project_root, include_mtimes=True)
         if isinstance(result, tuple):
-            objects, file_mtimes = result
+            objects, file_fingerprints = result
         else:
             # Should not happen when include_mtimes=True, but handle gracefully
             objects = result
-            file_mtimes = {}
+            file_fingerprints = {}
         graph = build_prerequisites_graph(objects, benchmark)
 
         # Cache the new graph
-        _graph_cache.cache_graph(project_root_path, graph, file_mtimes)
+        _graph_cache.cache_graph(
+            project_root_path, graph, file_fingerprints, trusted_generation=generation
+        )
 
         if benchmark:
             benchmark.end("load_objects_and_build_graph")
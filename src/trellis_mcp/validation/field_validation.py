@@ -12,6 +12,7 @@ from pydantic import ValidationError
 from ..models.common import Priority
 from ..schema.kind_enum import KindEnum
 from ..schema.status_enum import StatusEnum
+from .benchmark import traced
 
 if TYPE_CHECKING:
     from .error_collector import ValidationErrorCollector
@@ -289,6 +290,7 @@ def validate_status_for_kind(status: StatusEnum, object_kind: KindEnum) -> bool:
         raise e
 
 
+@traced("validation")
 def validate_front_matter(yaml_dict: dict[str, Any], kind: str | KindEnum) -> list[str]:
     """Validate front matter for required fields and enum values.
 
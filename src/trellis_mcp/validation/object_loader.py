@@ -9,25 +9,45 @@ import os
 from pathlib import Path
 from typing import Any
 
+from .benchmark import trace_span
+
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+# Glob patterns, relative to the planning directory, of every object file
+OBJECT_FILE_PATTERNS = (
+    "projects/P-*/project.md",  # Projects
+    "projects/P-*/epics/E-*/epic.md",  # Epics
+    "projects/P-*/epics/E-*/features/F-*/feature.md",  # Features
+    "projects/P-*/epics/E-*/features/F-*/tasks-open/T-*.md",  # Open tasks
+    "projects/P-*/epics/E-*/features/F-*/tasks-done/*-T-*.md",  # Done tasks
+    "projects/P-*/epics/E-*/features/F-*/tasks-done/*/*-T-*.md",  # Sharded done tasks
+    "tasks-open/T-*.md",  # Standalone open tasks
+    "tasks-done/*-T-*.md",  # Standalone done tasks
+    "tasks-done/*/*-T-*.md",  # Sharded standalone done tasks
+)
+
 
 def get_all_objects(project_root: str | Path, include_mtimes: bool = False):
     """Load all objects from the filesystem using glob patterns for resilient discovery.
 
     Args:
         project_root: The root directory of the project
-        include_mtimes: If True, also return file modification times for caching
+        include_mtimes: If True, also return file fingerprints (mtime in
+            nanoseconds, size and front-matter hash) for caching
 
     Returns:
-        Dictionary mapping object IDs to their parsed data, optionally with file mtimes
+        Dictionary mapping object IDs to their parsed data, optionally with the
+        fingerprints of the files they were parsed from
 
     Raises:
         FileNotFoundError: If the project root doesn't exist
         ValueError: If object parsing fails
     """
+    from ..archive import archived_objects
+    from ..markdown_loader import file_fingerprint
     from ..object_parser import parse_object
+    from ..parse_cache import FileFingerprint, get_parse_cache
     from ..utils.id_utils import clean_prerequisite_id
 
     project_root_path = Path(project_root)
@@ -35,35 +55,38 @@ def get_all_objects(project_root: str | Path, include_mtimes: bool = False):
         raise FileNotFoundError(f"Project root not found: {project_root}")
 
     objects: dict[str, dict[str, Any]] = {}
-    file_mtimes: dict[str, float] = {}
+    file_fingerprints: dict[str, FileFingerprint] = {}
 
     # Use glob patterns to find all object files more efficiently
-    patterns = [
-        "projects/P-*/project.md",  # Projects
-        "projects/P-*/epics/E-*/epic.md",  # Epics
-        "projects/P-*/epics/E-*/features/F-*/feature.md",  # Features
-        "projects/P-*/epics/E-*/features/F-*/tasks-open/T-*.md",  # Open tasks
-        "projects/P-*/epics/E-*/features/F-*/tasks-done/*-T-*.md",  # Done tasks
-        "tasks-open/T-*.md",  # Standalone open tasks
-        "tasks-done/*-T-*.md",  # Standalone done tasks
-    ]
-
-    for pattern in patterns:
-        for file_path in project_root_path.glob(pattern):
-            try:
-                obj = parse_object(file_path)
-                # Store objects using clean IDs (without prefixes) for consistent lookup
-                clean_id = clean_prerequisite_id(obj.id)
-                objects[clean_id] = obj.model_dump()
-
-                # Record file modification time for caching
-                if include_mtimes and file_mtimes is not None:
-                    file_mtimes[str(file_path)] = os.path.getmtime(file_path)
-
-            except Exception as e:
-                logger.warning(f"Skipping invalid file {file_path}: {e}")
-                continue
+    with trace_span("walk"):
+        file_paths = [
+            path for pattern in OBJECT_FILE_PATTERNS for path in project_root_path.glob(pattern)
+        ]
+
+    for file_path in file_paths:
+        try:
+            obj = parse_object(file_path)
+            # Store objects using clean IDs (without prefixes) for consistent lookup
+            clean_id = clean_prerequisite_id(obj.id)
+            objects[clean_id] = obj.model_dump()
+
+            # Record the fingerprint of the parsed version for caching
+            if include_mtimes:
+                fingerprint = get_parse_cache().fingerprint(
+                    os.path.abspath(file_path)
+                ) or file_fingerprint(file_path)
+                if fingerprint is not None:
+                    file_fingerprints[str(file_path)] = fingerprint
+
+        except Exception as e:
+            logger.warning(f"Skipping invalid file {file_path}: {e}")
+            continue
+
+    # Archived done tasks come from the archive index; a file on disk wins
+    for clean_id, data in archived_objects(project_root_path).items():
+        if clean_id not in objects:
+            objects[clean_id] = dict(data)
 
     if include_mtimes:
-        return objects, file_mtimes
+        return objects, file_fingerprints
     return objects
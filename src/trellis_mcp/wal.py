@@ -0,0 +1,373 @@
+"""Write-ahead journal for operations that touch several planning files.
+
+Completing a task (write plus move to ``tasks-done``) and cascade deletion
+change more than one file. Before such an operation touches anything it
+writes an entry under ``planning/.trellis/wal/`` describing the end state:
+the full content of every file it writes and every path it removes. The
+entry is flushed to disk first and removed once the operation's own writes
+are durable, so an entry left behind marks an operation that may have
+stopped partway.
+
+Recovery, run when the server starts, replays each leftover entry. Every
+action is idempotent (write this content, remove this path), so replaying
+an operation that had partly or fully completed converges on its end
+state. Entries are locked while their operation runs, so recovery in one
+process never replays an operation another process is still applying.
+Recovery also removes temporary files left by interrupted atomic writes.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Literal, TypedDict
+
+from .change_feed import CHANGE_JOURNAL_DIR, record_change
+from .durability import active_commit_group, get_durability_mode
+from .markdown_loader import load_markdown
+from .utils.fs_utils import recursive_delete
+from .utils.io_utils import atomic_write_text
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+WAL_DIR_NAME = "wal"
+
+# Temporary files younger than this may belong to a write still in progress
+TMP_FILE_MAX_AGE_SECONDS = 60.0
+
+
+class WalAction(TypedDict, total=False):
+    """Type definition for one idempotent action of a journaled operation."""
+
+    op: Literal["write", "delete"]
+    path: str  # relative to the planning root
+    content: str  # for writes
+
+
+class WalEntry(TypedDict):
+    """Type definition for a journal entry."""
+
+    id: str
+    operation: str
+    actions: list[WalAction]
+
+
+class RecoveryReport(TypedDict):
+    """Type definition for the result of recovering a planning root."""
+
+    replayed: int
+    discarded: int
+    tmp_removed: int
+
+
+def write_action(planning_root: str | Path, path: str | Path, content: str) -> WalAction:
+    """Build an action that leaves a file with the given content.
+
+    Args:
+        planning_root: Planning directory the path lies in
+        path: File to write
+        content: Full content of the file after the operation
+
+    Returns:
+        Journal action
+
+    Raises:
+        ValueError: If the path is outside the planning root
+    """
+    return {"op": "write", "path": _relative(planning_root, path), "content": content}
+
+
+def delete_action(planning_root: str | Path, path: str | Path) -> WalAction:
+    """Build an action that removes a file or directory tree.
+
+    Args:
+        planning_root: Planning directory the path lies in
+        path: File or directory to remove
+
+    Returns:
+        Journal action
+
+    Raises:
+        ValueError: If the path is outside the planning root
+    """
+    return {"op": "delete", "path": _relative(planning_root, path)}
+
+
+def wal_dir(planning_root: str | Path) -> Path:
+    """Get the journal directory of a planning root.
+
+    Args:
+        planning_root: Planning directory
+
+    Returns:
+        Path of ``.trellis/wal`` under the planning directory
+    """
+    return Path(os.path.abspath(planning_root)) / CHANGE_JOURNAL_DIR / WAL_DIR_NAME
+
+
+@contextmanager
+def journal_operation(
+    planning_root: str | Path, operation: str, actions: list[WalAction]
+) -> Iterator[WalEntry]:
+    """Journal a multi-file operation around the block that applies it.
+
+    The entry is durable before the block runs. When the block finishes the
+    entry is removed, after the enclosing commit group (if any) has flushed
+    the operation's writes.
+
+    When the block raises, the error is reported to the caller as before.
+    The entry is kept for recovery only when the block was interrupted (an
+    ``OSError``, or a ``KeyboardInterrupt``-style ``BaseException``) after
+    it changed one of the action paths: recovery at the next start then
+    finishes the operation instead of leaving it half-applied. When none of
+    the action paths changed, or the block raised a domain error, the
+    operation failed for the caller and the entry is dropped, so it is not
+    completed later behind the caller's back.
+
+    Args:
+        planning_root: Planning directory the operation's paths lie in
+        operation: Short name of the operation, for logs
+        actions: End state the operation establishes
+
+    Yields:
+        The journal entry
+
+    Example:
+        >>> actions = [write_action(root, done_path, content), delete_action(root, open_path)]
+        >>> with journal_operation(root, "complete", actions):
+        ...     document.move_to(done_path)
+    """
+    entry: WalEntry = {"id": uuid.uuid4().hex, "operation": operation, "actions": actions}
+    root = Path(os.path.abspath(planning_root))
+    before = _action_signatures(root, actions)
+    entry_path, handle = _write_entry(wal_dir(root), entry)
+
+    def finish() -> None:
+        try:
+            os.unlink(entry_path)
+        except FileNotFoundError:
+            pass  # Already replayed by another process's recovery
+        finally:
+            handle.close()
+
+    try:
+        yield entry
+    except BaseException as e:
+        interrupted = isinstance(e, OSError) or not isinstance(e, Exception)
+        if interrupted and _action_signatures(root, actions) != before:
+            # Stopped partway: unlock the entry so recovery can replay it
+            handle.close()
+        else:
+            finish()
+        raise
+
+    group = active_commit_group()
+    if group is None:
+        finish()
+    else:
+        # Keep the entry until the deferred writes are on disk
+        group.call_after_commit(finish)
+
+
+def recover_planning_root(planning_root: str | Path) -> RecoveryReport:
+    """Replay interrupted operations and remove stale temporary files.
+
+    Args:
+        planning_root: Planning directory to recover
+
+    Returns:
+        Counts of replayed and discarded journal entries and removed temp files
+    """
+    root = Path(os.path.abspath(planning_root))
+    report: RecoveryReport = {"replayed": 0, "discarded": 0, "tmp_removed": 0}
+
+    journal = wal_dir(root)
+    try:
+        names = sorted(os.listdir(journal))
+    except FileNotFoundError:
+        names = []
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        outcome = _recover_entry(root, journal / name)
+        if outcome is not None:
+            report[outcome] += 1
+
+    report["tmp_removed"] = remove_stale_tmp_files(root)
+    if report["replayed"] or report["discarded"] or report["tmp_removed"]:
+        logger.info(f"Recovered planning root {root}: {report}")
+    return report
+
+
+def remove_stale_tmp_files(
+    planning_root: str | Path, max_age: float = TMP_FILE_MAX_AGE_SECONDS
+) -> int:
+    """Remove temporary files left by atomic writes that never reached their rename.
+
+    Args:
+        planning_root: Planning directory to sweep
+        max_age: Minimum age in seconds, so writes in progress are left alone
+
+    Returns:
+        Number of files removed
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    for directory, _dirs, files in os.walk(planning_root):
+        for name in files:
+            if not (name.startswith(".") and name.endswith(".tmp")):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                if os.stat(path).st_mtime > cutoff:
+                    continue
+                os.unlink(path)
+            except OSError:
+                continue
+            removed += 1
+    return removed
+
+
+def _recover_entry(root: Path, entry_path: Path) -> Literal["replayed", "discarded"] | None:
+    """Replay one journal entry unless its operation is still running."""
+    try:
+        handle = open(entry_path, "rb")
+    except FileNotFoundError:
+        return None
+    with handle:
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return None  # Operation in progress in another process
+
+        try:
+            entry = json.loads(handle.read().decode("utf-8"))
+            actions = entry["actions"]
+        except (ValueError, KeyError, TypeError) as e:
+            # Nothing was applied before the entry was complete
+            logger.warning(f"Discarding unreadable journal entry {entry_path}: {e}")
+            _unlink(entry_path)
+            return "discarded"
+
+        logger.warning(
+            f"Replaying interrupted {entry.get('operation', 'operation')} from {entry_path}"
+        )
+        try:
+            for action in actions:
+                _replay(root, action)
+        except Exception as e:
+            # Keep the entry for the next start rather than refuse to serve
+            logger.error(f"Failed to replay journal entry {entry_path}: {e}")
+            return None
+        _unlink(entry_path)
+        return "replayed"
+
+
+def _replay(root: Path, action: dict[str, Any]) -> None:
+    """Apply one journal action; a no-op when its effect is already in place."""
+    target = root / action["path"]
+    if not _is_inside(root, target):
+        raise ValueError(f"Journal action path escapes the planning root: {action['path']}")
+
+    if action["op"] == "write":
+        target.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(target, action["content"])
+        try:
+            front_matter = load_markdown(target)[0]
+        except Exception:
+            front_matter = None
+        record_change(target, "updated", front_matter)
+    elif action["op"] == "delete":
+        if not target.exists():
+            return
+        for path in recursive_delete(target):
+            if path.suffix == ".md":
+                record_change(path, "deleted")
+    else:
+        raise ValueError(f"Unknown journal action: {action['op']}")
+
+
+def _action_signatures(root: Path, actions: list[WalAction]) -> list[tuple[int, int] | None]:
+    """Stat the action paths, to tell whether an operation changed any of them.
+
+    Returns:
+        (inode, mtime in nanoseconds) per action, None for missing paths
+    """
+    signatures: list[tuple[int, int] | None] = []
+    for action in actions:
+        try:
+            stat_result = os.stat(root / action.get("path", ""))
+        except OSError:
+            signatures.append(None)
+            continue
+        signatures.append((stat_result.st_ino, stat_result.st_mtime_ns))
+    return signatures
+
+
+def _write_entry(directory: Path, entry: WalEntry) -> tuple[Path, Any]:
+    """Durably write a locked journal entry.
+
+    Outside a commit group the entry is fsynced but its directory is not:
+    the operation's own first fsync commits the filesystem journal, rename
+    of the entry included, on journaling filesystems. Inside a group the
+    entry is flushed with the operation's writes by the group's one sync.
+
+    Returns:
+        Tuple of (entry path, open handle holding the entry's lock)
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    entry_path = directory / f"{entry['id']}.json"
+    group = active_commit_group()
+    durable = group is None and get_durability_mode() != "relaxed"
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{entry['id']}.", suffix=".tmp")
+    handle = os.fdopen(fd, "wb")
+    try:
+        # Lock before the rename, so recovery never sees the entry unlocked
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        handle.write(json.dumps(entry, separators=(",", ":")).encode("utf-8"))
+        handle.flush()
+        if durable:
+            os.fsync(handle.fileno())
+        os.replace(temp_path, entry_path)
+        if group is not None:
+            group.add(file_path=entry_path, directory=directory)
+    except Exception:
+        handle.close()
+        _unlink(Path(temp_path))
+        raise
+    return entry_path, handle
+
+
+def _relative(planning_root: str | Path, path: str | Path) -> str:
+    """Express a path relative to the planning root."""
+    root = os.path.abspath(planning_root)
+    relative = os.path.relpath(os.path.abspath(path), root)
+    if relative == os.curdir or relative.startswith(os.pardir):
+        raise ValueError(f"Path {path} is not inside planning root {root}")
+    return relative
+
+
+def _is_inside(root: Path, path: Path) -> bool:
+    """Check that a path stays below the root after normalization."""
+    return os.path.abspath(path).startswith(str(root) + os.sep)
+
+
+def _unlink(path: Path) -> None:
+    """Remove a file if it still exists."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
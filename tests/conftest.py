@@ -29,6 +29,22 @@ def temp_dir() -> Generator[Path, None, None]:
         yield Path(tmpdir)
 
 
+@pytest.fixture(autouse=True)
+def isolated_log_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the default log directory at a per-test temporary directory.
+
+    Servers built from default Settings log to ``./logs`` through a background
+    sink; without this, every test run would write log files into the checkout.
+    Settings given an explicit ``log_dir`` are unaffected.
+
+    Returns:
+        Path: The log directory used by default Settings
+    """
+    log_dir = tmp_path / "logs"
+    monkeypatch.setenv("MCP_LOG_DIR", str(log_dir))
+    return log_dir
+
+
 @pytest.fixture
 def clean_working_dir(temp_dir: Path) -> Generator[Path, None, None]:
     """Provide a clean working directory and change to it during the test.
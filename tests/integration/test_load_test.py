@@ -0,0 +1,58 @@
+"""Multi-agent load test harness tests.
+
+Runs the real server in subprocesses with concurrent agent processes and
+checks the tree integrity report.
+"""
+
+from trellis_mcp.bench import (
+    TreeShape,
+    check_tree_integrity,
+    format_load_test_reports,
+    generate_tree,
+    load_test_shape,
+    run_load_test,
+)
+
+
+def test_check_tree_integrity_detects_corruption(temp_dir):
+    """Test that misplaced, duplicated, unparseable and temp files are reported."""
+    root = temp_dir / "planning"
+    tree = generate_tree(
+        root, TreeShape(projects=1, epics_per_project=1, features_per_epic=1, standalone_tasks=2)
+    )
+    assert check_tree_integrity(root) == []
+
+    open_file = next(root.glob("tasks-open/T-*.md"))
+    (root / "tasks-done").mkdir(exist_ok=True)
+    (root / "tasks-done" / f"20250101_000000-{open_file.name}").write_text(open_file.read_text())
+    (root / "tasks-open" / ".T-s000001.md.abc.tmp").write_text("partial")
+    (root / "tasks-open" / "T-broken.md").write_text("---\nkind: [unclosed\n---\n")
+
+    violations = check_tree_integrity(root)
+    assert any("Leftover temp file" in v for v in violations)
+    assert any("Unparseable file" in v for v in violations)
+    assert any("in tasks-done has status 'open'" in v for v in violations)
+    assert any(f"{open_file.stem} stored in 2 files" in v for v in violations)
+    assert tree["counts"]["task"] == 12
+
+
+def test_stdio_agents_complete_tasks_without_corruption(temp_dir):
+    """Test a small concurrent run over STDIO servers."""
+    report = run_load_test(
+        agents=2,
+        transport="stdio",
+        iterations=2,
+        shape=load_test_shape(30),
+        work_dir=temp_dir,
+        connect_seconds=8.0,
+    )
+
+    assert report["agents"] == 2
+    assert report["operations"]["claimNextTask"]["count"] >= 2
+    assert report["completed_tasks"] >= 1
+    # Duplicate claims are a known race; a task claimed twice may also complete twice
+    assert report["completed_tasks"] <= report["operations"]["claimNextTask"]["count"] <= 4
+    assert report["integrity_violations"] == []
+    assert report["operations"]["claimNextTask"]["p50_ms"] > 0
+    assert "stdio x 2 agents" in format_load_test_reports([report])
+    assert (temp_dir / "stdio-2" / "planning" / "tasks-open").is_dir()
@@ -0,0 +1,163 @@
+"""Unit tests for log_sink.py covering batching, flushing, rollover, sampling,
+and write_event routing through an active sink.
+"""
+
+import json
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastmcp import Client
+
+from trellis_mcp.logging.log_sink import LogSink, get_log_sink, start_log_sink, stop_log_sinks
+from trellis_mcp.logging.logger import write_event
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+
+
+@pytest.fixture
+def log_dir():
+    """Provide a temporary log directory and stop any sinks afterwards."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+        stop_log_sinks()
+
+
+class TestLogSinkWriting:
+    """Test queued writes, flushing and rollover."""
+
+    def test_flush_writes_all_queued_lines(self, log_dir):
+        """Test that flush() returns only after queued lines are on disk."""
+        sink = LogSink(log_dir, flush_interval=60)
+        try:
+            for i in range(50):
+                assert sink.submit("2025-07-15.log", json.dumps({"n": i}))
+
+            assert sink.flush()
+
+            lines = (log_dir / "2025-07-15.log").read_text(encoding="utf-8").splitlines()
+            assert [json.loads(line)["n"] for line in lines] == list(range(50))
+            assert sink.get_stats()["written"] == 50
+        finally:
+            sink.close()
+
+    def test_daily_rollover_switches_files(self, log_dir):
+        """Test that lines land in the file named at submission time."""
+        sink = LogSink(log_dir)
+        try:
+            sink.submit("2025-07-15.log", '{"day":15}')
+            sink.submit("2025-07-16.log", '{"day":16}')
+            sink.submit("2025-07-16.log", '{"day":16}')
+            assert sink.flush()
+
+            assert (log_dir / "2025-07-15.log").read_text().splitlines() == ['{"day":15}']
+            assert len((log_dir / "2025-07-16.log").read_text().splitlines()) == 2
+            assert sink.get_stats()["current_file"] == "2025-07-16.log"
+        finally:
+            sink.close()
+
+    def test_close_drains_queue(self, log_dir):
+        """Test that close() writes remaining lines and rejects new ones."""
+        sink = LogSink(log_dir, flush_interval=60)
+        for i in range(10):
+            sink.submit("2025-07-15.log", json.dumps({"n": i}))
+
+        sink.close()
+
+        assert len((log_dir / "2025-07-15.log").read_text().splitlines()) == 10
+        assert sink.submit("2025-07-15.log", "{}") is False
+
+    def test_full_queue_drops_without_blocking(self, log_dir):
+        """Test that submit() drops events instead of blocking when the queue is full."""
+        release = threading.Event()
+        sink = LogSink(log_dir, max_queue_events=1)
+        try:
+            # Hold the writer back so the queue cannot drain
+            with patch.object(sink, "_process_batch", side_effect=lambda batch: release.wait(5)):
+                results = [sink.submit("2025-07-15.log", "{}") for _ in range(100)]
+                release.set()
+
+            assert not all(results)
+            assert sink.get_stats()["dropped"] > 0
+        finally:
+            release.set()
+            sink.close()
+
+
+class TestLogSinkSampling:
+    """Test sampling of success events."""
+
+    def test_zero_sample_rate_drops_success_events_only(self, log_dir):
+        """Test that sampling applies to success events but never to errors."""
+        sink = LogSink(log_dir, success_sample_rate=0.0)
+        try:
+            assert sink.submit("2025-07-15.log", '{"s":1}', status="success") is False
+            assert sink.submit("2025-07-15.log", '{"s":2}', status="error") is True
+            assert sink.submit("2025-07-15.log", '{"s":3}') is True
+            assert sink.flush()
+
+            lines = (log_dir / "2025-07-15.log").read_text().splitlines()
+            assert lines == ['{"s":2}', '{"s":3}']
+            assert sink.get_stats()["sampled_out"] == 1
+        finally:
+            sink.close()
+
+    def test_invalid_sample_rate_rejected(self, log_dir):
+        """Test that out-of-range thresholds raise ValueError."""
+        with pytest.raises(ValueError):
+            LogSink(log_dir, success_sample_rate=1.5)
+        with pytest.raises(ValueError):
+            LogSink(log_dir, flush_interval=0)
+
+
+class TestWriteEventRouting:
+    """Test write_event integration with the sink registry."""
+
+    def test_write_event_uses_active_sink(self, log_dir):
+        """Test that write_event queues to the sink registered for its log_dir."""
+        settings = Settings(log_dir=log_dir)
+        sink = start_log_sink(settings)
+        assert get_log_sink(log_dir) is sink
+        assert start_log_sink(settings) is sink
+
+        write_event("INFO", "queued", settings=settings, status="success")
+        assert sink.flush()
+
+        log_files = list(log_dir.glob("*.log"))
+        assert len(log_files) == 1
+        entry = json.loads(log_files[0].read_text().strip())
+        assert entry["msg"] == "queued"
+        assert sink.get_stats()["written"] == 1
+
+    def test_write_event_synchronous_without_sink(self, log_dir):
+        """Test that write_event writes directly when no sink targets its log_dir."""
+        other_dir = log_dir / "other"
+        start_log_sink(Settings(log_dir=log_dir))
+
+        write_event("INFO", "direct", settings=Settings(log_dir=other_dir))
+
+        log_files = list(other_dir.glob("*.log"))
+        assert len(log_files) == 1
+        assert json.loads(log_files[0].read_text().strip())["msg"] == "direct"
+
+
+@pytest.mark.asyncio
+async def test_session_end_flushes_off_event_loop(log_dir):
+    """Test that a server session flushes its sink from a worker thread on shutdown."""
+    flush_threads = []
+    original_flush = LogSink.flush
+
+    def recording_flush(self, *args, **kwargs):
+        flush_threads.append(threading.current_thread())
+        return original_flush(self, *args, **kwargs)
+
+    server = create_server(Settings(planning_root=log_dir / "planning", log_dir=log_dir))
+    with patch.object(LogSink, "flush", recording_flush):
+        async with Client(server) as client:
+            await client.call_tool("health_check", {})
+
+    assert flush_threads
+    assert threading.main_thread() not in flush_threads
+    assert list(log_dir.glob("*.log"))
@@ -0,0 +1,177 @@
+"""Unit tests for metrics.py covering histogram recording, percentile estimation,
+snapshot aggregation and Prometheus rendering.
+"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastmcp import Client
+from fastmcp.server.middleware import MiddlewareContext
+from mcp.types import TextResourceContents
+
+from trellis_mcp.logging.json_rpc_logging_middleware import JsonRpcLoggingMiddleware
+from trellis_mcp.logging.metrics import (
+    LATENCY_BUCKETS_MS,
+    ServerMetrics,
+    collect_server_metrics,
+    get_server_metrics,
+    payload_size,
+    render_prometheus,
+)
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+
+
+class TestServerMetrics:
+    """Test the ServerMetrics collector."""
+
+    def test_observe_updates_counts_and_buckets(self):
+        """Test that observations land in the right bucket and counters."""
+        metrics = ServerMetrics()
+        metrics.observe("getObject", 0.5, request_bytes=10, response_bytes=100)
+        metrics.observe("getObject", 30.0, request_bytes=12, response_bytes=200)
+        metrics.observe("getObject", 20000.0, error=True)
+
+        snapshot = metrics.snapshot()["getObject"]
+        assert snapshot["count"] == 3
+        assert snapshot["errors"] == 1
+        assert snapshot["request_bytes"] == 22
+        assert snapshot["response_bytes"] == 300
+        assert snapshot["buckets"][0] == 1
+        assert snapshot["buckets"][LATENCY_BUCKETS_MS.index(50)] == 1
+        assert snapshot["buckets"][-1] == 1
+        assert snapshot["latency_ms"]["max"] == 20000.0
+
+    def test_percentiles_follow_distribution(self):
+        """Test that estimated percentiles stay within the observed bucket bounds."""
+        metrics = ServerMetrics()
+        for _ in range(95):
+            metrics.observe("listBacklog", 4.0)
+        for _ in range(5):
+            metrics.observe("listBacklog", 400.0)
+
+        latency = metrics.snapshot()["listBacklog"]["latency_ms"]
+        assert 2.5 <= latency["p50"] <= 4.0
+        assert 2.5 <= latency["p95"] <= 5.0
+        assert 250 <= latency["p99"] <= 400.0
+        assert latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+
+    def test_empty_snapshot_and_reset(self):
+        """Test that reset clears observations."""
+        metrics = ServerMetrics()
+        assert metrics.snapshot() == {}
+        metrics.observe("health_check", 1.0)
+        metrics.reset()
+        assert metrics.snapshot() == {}
+
+    def test_payload_size(self):
+        """Test payload size estimation for dicts, tool results and None."""
+        assert payload_size(None) == 0
+        assert payload_size({"id": "T-1"}) == len(json.dumps({"id": "T-1"}, separators=(",", ":")))
+
+        result = MagicMock()
+        result.content = [{"type": "text", "text": "x" * 50}]
+        result.structured_content = None
+        assert payload_size(result) > 50
+
+
+class TestMiddlewareMetrics:
+    """Test that the logging middleware records metrics."""
+
+    @pytest.mark.asyncio
+    async def test_success_and_error_recorded(self):
+        """Test that both successful and failed calls are observed."""
+        metrics = ServerMetrics()
+        middleware = JsonRpcLoggingMiddleware(Settings(measure_payload_sizes=True), metrics)
+        context = MagicMock(spec=MiddlewareContext)
+        context.method = "tools/call"
+        context.message = MagicMock()
+        context.message.name = "getObject"
+        context.message.arguments = {"id": "T-1"}
+
+        with patch("trellis_mcp.logging.json_rpc_logging_middleware.write_event"):
+            await middleware.on_call_tool(context, AsyncMock(return_value={"ok": True}))
+            with pytest.raises(RuntimeError):
+                await middleware.on_call_tool(context, AsyncMock(side_effect=RuntimeError("x")))
+
+        snapshot = metrics.snapshot()["getObject"]
+        assert snapshot["count"] == 2
+        assert snapshot["errors"] == 1
+        assert snapshot["request_bytes"] == 2 * payload_size({"id": "T-1"})
+        assert snapshot["response_bytes"] == payload_size({"ok": True})
+
+    @pytest.mark.asyncio
+    async def test_payload_sizes_are_not_measured_by_default(self):
+        """Test that calls are not serialized again unless sizes are requested."""
+        metrics = ServerMetrics()
+        middleware = JsonRpcLoggingMiddleware(Settings(), metrics)
+        context = MagicMock(spec=MiddlewareContext)
+        context.method = "tools/call"
+        context.message = MagicMock()
+        context.message.name = "listBacklog"
+        context.message.arguments = {"projectRoot": "."}
+
+        with (
+            patch("trellis_mcp.logging.json_rpc_logging_middleware.write_event"),
+            patch("trellis_mcp.logging.json_rpc_logging_middleware.payload_size") as size,
+        ):
+            await middleware.on_call_tool(context, AsyncMock(return_value={"tasks": []}))
+
+        size.assert_not_called()
+        snapshot = metrics.snapshot()["listBacklog"]
+        assert (snapshot["request_bytes"], snapshot["response_bytes"]) == (0, 0)
+
+
+class TestMetricsExposition:
+    """Test snapshot aggregation, Prometheus rendering and the MCP resource."""
+
+    def test_collect_includes_caches(self):
+        """Test that the snapshot reports all four caches."""
+        snapshot = collect_server_metrics()
+        assert set(snapshot["caches"]) == {"parse", "inference", "children", "dependency_graph"}
+        for stats in snapshot["caches"].values():
+            assert {"hits", "misses", "hit_rate", "size"} <= set(stats)
+        assert snapshot["log_sink"] is None
+
+    def test_render_prometheus(self):
+        """Test Prometheus text output for histograms and counters."""
+        get_server_metrics().observe("createObject", 7.0, request_bytes=5)
+        text = render_prometheus(collect_server_metrics())
+
+        assert "# TYPE trellis_tool_duration_seconds histogram" in text
+        assert 'trellis_tool_duration_seconds_bucket{tool="createObject",le="0.01"}' in text
+        assert 'trellis_tool_duration_seconds_bucket{tool="createObject",le="+Inf"}' in text
+        assert 'trellis_cache_hits_total{cache="dependency_graph"}' in text
+        assert text.endswith("\n")
+
+    @pytest.mark.asyncio
+    async def test_metrics_resource(self, temp_dir):
+        """Test that metrics://server reflects tool calls made through the server."""
+        settings = Settings(planning_root=temp_dir / "planning", log_dir=temp_dir / "logs")
+        server = create_server(settings)
+
+        async with Client(server) as client:
+            await client.call_tool("health_check")
+            resources = await client.read_resource("metrics://server")
+
+        content = resources[0]
+        assert isinstance(content, TextResourceContents)
+        data = json.loads(content.text)
+        assert data["tools"]["health_check"]["count"] >= 1
+        assert data["log_sink"] is not None
+
+    @pytest.mark.asyncio
+    async def test_prometheus_http_route(self, temp_dir):
+        """Test that the HTTP app serves Prometheus text at /metrics."""
+        settings = Settings(planning_root=temp_dir / "planning", log_dir=temp_dir / "logs")
+        app = create_server(settings).http_app()
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "trellis_uptime_seconds" in response.text
@@ -0,0 +1,155 @@
+"""Unit tests for archiving old completed tasks.
+
+Tests which tasks are packed, that the archive is readable as gzip JSON
+lines and by offset, that archived tasks still satisfy prerequisites and
+reserve their IDs, and that getObject and the CLI command reach them.
+"""
+
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from click.testing import CliRunner
+from fastmcp import Client
+
+from trellis_mcp.archive import (
+    ARCHIVE_DATA_FILE,
+    archive_dir,
+    archive_done_tasks,
+    is_archived,
+    parse_age,
+    read_archived_task,
+)
+from trellis_mcp.cli import cli
+from trellis_mcp.dependency_resolver import is_unblocked
+from trellis_mcp.object_parser import parse_object
+from trellis_mcp.scanner import scan_tasks
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+from trellis_mcp.utils.id_utils import generate_id
+from trellis_mcp.utils.io_utils import write_markdown
+
+NOW = datetime(2025, 7, 1, 12, 0, 0)
+
+
+def _task_yaml(task_id: str, status: str = "done", prerequisites=None) -> dict:
+    return {
+        "kind": "task",
+        "id": f"T-{task_id}",
+        "parent": None,
+        "status": status,
+        "title": f"Task {task_id}",
+        "priority": "normal",
+        "worktree": None,
+        "created": "2025-01-01T12:00:00Z",
+        "updated": "2025-01-01T12:00:00Z",
+        "schema_version": "1.1",
+        "prerequisites": prerequisites or [],
+    }
+
+
+@pytest.fixture
+def planning(temp_dir):
+    """Planning tree with an old done task, a recent one and an open task depending on both."""
+    root = temp_dir / "planning"
+    done = root / "tasks-done"
+    write_markdown(done / "20250101_120000-T-old.md", _task_yaml("old"), "Old body\n")
+    write_markdown(done / "2025-06/20250625_120000-T-recent.md", _task_yaml("recent"), "")
+    write_markdown(
+        root / "tasks-open" / "T-next.md",
+        _task_yaml("next", "open", ["T-old", "T-recent"]),
+        "",
+    )
+    return root
+
+
+class TestArchiveDoneTasks:
+    """Test packing tasks into the archive."""
+
+    def test_only_old_tasks_are_archived(self, planning):
+        """Test the cutoff, the removed file and the archive contents."""
+        archived = archive_done_tasks(planning, timedelta(days=90), now=NOW)
+
+        assert [path.name for path in archived] == ["20250101_120000-T-old.md"]
+        assert not (planning / "tasks-done" / "20250101_120000-T-old.md").exists()
+        assert is_archived(planning, "old")
+        assert not is_archived(planning, "recent")
+
+        with gzip.open(archive_dir(planning) / ARCHIVE_DATA_FILE, "rt") as f:
+            records = [json.loads(line) for line in f]
+        assert [record["id"] for record in records] == ["T-old"]
+
+        front_matter, body = read_archived_task(planning, "old")  # type: ignore[misc]
+        assert front_matter["status"] == "done"
+        assert body == "Old body\n"
+
+    def test_archiving_appends(self, planning):
+        """Test a second run appending after the first run's members."""
+        archive_done_tasks(planning, timedelta(days=90), now=NOW)
+        archive_done_tasks(planning, timedelta(days=1), now=NOW)
+
+        assert read_archived_task(planning, "old") is not None
+        assert read_archived_task(planning, "recent") is not None
+        assert not (planning / "tasks-done" / "2025-06").exists()
+
+    def test_dry_run_changes_nothing(self, planning):
+        """Test that a dry run only reports."""
+        assert len(archive_done_tasks(planning, timedelta(days=1), dry_run=True, now=NOW)) == 2
+        assert not archive_dir(planning).exists()
+
+
+class TestArchivedTasksAsObjects:
+    """Test that archived tasks still take part in resolution."""
+
+    def test_archived_prerequisites_stay_done(self, planning):
+        """Test prerequisite resolution and scanning after archiving."""
+        archive_done_tasks(planning, timedelta(days=1), now=NOW)
+        next_task = parse_object(planning / "tasks-open" / "T-next.md")
+
+        assert is_unblocked(next_task, planning)  # type: ignore[arg-type]
+        assert [task.id for task in scan_tasks(planning.parent)] == ["T-next"]
+
+    def test_archived_ids_are_not_reused(self, planning):
+        """Test ID generation skipping archived IDs."""
+        archive_done_tasks(planning, timedelta(days=90), now=NOW)
+        assert generate_id("task", "old", planning) != "old"
+
+    @pytest.mark.asyncio
+    async def test_get_object_reads_archived_task(self, planning, temp_dir):
+        """Test the getObject fallback to the archive."""
+        archive_done_tasks(planning, timedelta(days=90), now=NOW)
+        server = create_server(Settings(planning_root=planning, log_dir=temp_dir / "logs"))
+
+        async with Client(server) as client:
+            result = await client.call_tool(
+                "getObject", {"id": "T-old", "projectRoot": str(planning)}
+            )
+
+        assert result.data["yaml"]["id"] == "T-old"
+        assert result.data["body"] == "Old body\n"
+        assert result.data["children"] == []
+
+
+def test_parse_age():
+    """Test the age format."""
+    assert parse_age("90d") == timedelta(days=90)
+    assert parse_age("2w") == timedelta(weeks=2)
+    with pytest.raises(ValueError, match="Invalid age"):
+        parse_age("0d")
+    with pytest.raises(ValueError, match="Invalid age"):
+        parse_age("3 months")
+
+
+def test_cli_command(planning):
+    """Test the archive command and its option validation."""
+    env = {"MCP_PLANNING_ROOT": str(planning)}
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["archive", "--older-than", "1d"], env=env)
+    assert result.exit_code == 0, result.output
+    assert "Archived 2 done task(s)" in result.output
+
+    result = runner.invoke(cli, ["archive", "--older-than", "soon"], env=env)
+    assert result.exit_code != 0
+    assert "Invalid age" in result.output
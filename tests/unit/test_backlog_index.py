@@ -0,0 +1,266 @@
+"""Unit tests for the columnar backlog index and the listBacklog query surface.
+
+Tests each query condition and the group-by counts against a small tree,
+that only changed files are parsed again, that a watched tree is refreshed
+from published paths alone, and the new listBacklog parameters.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+from trellis_mcp.archive import archive_done_tasks
+from trellis_mcp.backlog_index import BacklogIndex, BacklogQuery
+from trellis_mcp.invalidation import get_invalidation_bus
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+from trellis_mcp.utils.io_utils import write_markdown
+
+FEATURE_DIR = "projects/P-app/epics/E-auth/features/F-login"
+
+
+def _yaml(kind: str, obj_id: str, parent: str | None = None, **fields) -> dict:
+    yaml = {
+        "kind": kind,
+        "id": obj_id,
+        "parent": parent,
+        "status": "open",
+        "title": f"Title of {obj_id}",
+        "priority": "normal",
+        "created": "2025-01-01T12:00:00Z",
+        "updated": "2025-01-01T12:00:00Z",
+        "schema_version": "1.1",
+    }
+    if kind == "task":
+        yaml.update(prerequisites=[], worktree=None)
+    else:
+        yaml["status"] = "in-progress"
+    if kind == "project":
+        yaml.pop("parent")
+    yaml.update(fields)
+    return yaml
+
+
+@pytest.fixture
+def planning(temp_dir):
+    """Planning tree with one feature holding three tasks, and two standalone tasks."""
+    root = temp_dir / "planning"
+    write_markdown(root / "projects/P-app/project.md", _yaml("project", "P-app"), "")
+    write_markdown(
+        root / "projects/P-app/epics/E-auth/epic.md", _yaml("epic", "E-auth", "P-app"), ""
+    )
+    write_markdown(root / FEATURE_DIR / "feature.md", _yaml("feature", "F-login", "E-auth"), "")
+    write_markdown(
+        root / FEATURE_DIR / "tasks-open/T-form.md",
+        _yaml("task", "T-form", "F-login", priority="high", title="Build login form"),
+        "",
+    )
+    write_markdown(
+        root / FEATURE_DIR / "tasks-open/T-submit.md",
+        _yaml(
+            "task",
+            "T-submit",
+            "F-login",
+            status="in-progress",
+            worktree="wt-1",
+            prerequisites=["T-form"],
+            created="2025-03-01T12:00:00Z",
+        ),
+        "",
+    )
+    write_markdown(
+        root / FEATURE_DIR / "tasks-done/20250102_120000-T-schema.md",
+        _yaml("task", "T-schema", "F-login", status="done", updated="2025-01-02T12:00:00Z"),
+        "",
+    )
+    write_markdown(
+        root / "tasks-open/T-chore.md",
+        _yaml("task", "T-chore", priority="high", prerequisites=["T-old"]),
+        "",
+    )
+    write_markdown(
+        root / "tasks-done/20250101_130000-T-old.md",
+        _yaml("task", "T-old", status="done", updated="2025-01-01T13:00:00Z"),
+        "",
+    )
+    return root
+
+
+def _ids(planning, query: BacklogQuery, index: BacklogIndex | None = None) -> list[str]:
+    columns = (index or BacklogIndex()).columns(planning)
+    return sorted(columns.columns["id"][row] for row in columns.select(query))
+
+
+class TestQueries:
+    """Test each query condition."""
+
+    def test_status_priority_and_scope(self, planning):
+        """Test multiple statuses, priority and the scope chain."""
+        assert _ids(planning, BacklogQuery(statuses=frozenset({"open", "in-progress"}))) == [
+            "T-chore",
+            "T-form",
+            "T-submit",
+        ]
+        assert _ids(planning, BacklogQuery(priorities=frozenset({"high"}))) == [
+            "T-chore",
+            "T-form",
+        ]
+        assert _ids(planning, BacklogQuery(scope="E-auth", priorities=frozenset({"high"}))) == [
+            "T-form"
+        ]
+        # A project scope also covers standalone tasks, as filter_by_scope does
+        assert len(_ids(planning, BacklogQuery(scope="P-app"))) == 5
+
+    def test_worktree_title_and_ranges(self, planning):
+        """Test worktree, title substring and timestamp ranges."""
+        assert _ids(planning, BacklogQuery(worktree="wt-1")) == ["T-submit"]
+        assert _ids(planning, BacklogQuery(title_contains="LOGIN")) == ["T-form"]
+        assert _ids(planning, BacklogQuery(created_after=datetime(2025, 2, 1))) == ["T-submit"]
+        assert _ids(
+            planning,
+            BacklogQuery(
+                updated_after=datetime.fromisoformat("2025-01-01T12:30:00+00:00"),
+                updated_before=datetime(2025, 1, 2),
+            ),
+        ) == ["T-old"]
+
+    def test_unfinished_prerequisites(self, planning):
+        """Test prerequisite state, with an archived prerequisite counting as done."""
+        assert _ids(planning, BacklogQuery(has_unfinished_prerequisites=True)) == ["T-submit"]
+
+        archive_done_tasks(planning, timedelta(days=1), now=datetime(2025, 7, 1))
+        query = BacklogQuery(statuses=frozenset({"open"}), has_unfinished_prerequisites=False)
+        assert _ids(planning, query) == ["T-chore", "T-form"]
+
+    def test_order_mixes_naive_and_aware_dates(self, planning):
+        """Test priority ordering when some creation dates carry no timezone."""
+        write_markdown(
+            planning / "tasks-open/T-naive.md",
+            _yaml("task", "T-naive", priority="high", created="2025-01-01T11:00:00"),
+            "",
+        )
+        columns = BacklogIndex().columns(planning)
+        rows = columns.order(columns.select(BacklogQuery(statuses=frozenset({"open"}))))
+
+        assert [columns.columns["id"][row] for row in rows] == ["T-naive", "T-form", "T-chore"]
+
+    def test_count_by(self, planning):
+        """Test counting per epic and per status."""
+        columns = BacklogIndex().columns(planning)
+        rows = columns.select(BacklogQuery(statuses=frozenset({"open", "in-progress"})))
+
+        assert columns.count_by(rows, ["epic"]) == [
+            {"epic": "E-auth", "count": 2},
+            {"epic": None, "count": 1},
+        ]
+        assert columns.count_by(rows, ["status", "priority"])[0] == {
+            "status": "open",
+            "priority": "high",
+            "count": 2,
+        }
+        with pytest.raises(ValueError, match="Cannot group by 'title'"):
+            columns.count_by(rows, ["title"])
+
+
+class TestRefresh:
+    """Test keeping the index in step with the files."""
+
+    def test_only_changed_files_are_parsed(self, planning):
+        """Test that a query after one edit parses one file."""
+        index = BacklogIndex()
+        index.columns(planning)
+        parses = index.parses
+
+        assert index.columns(planning) is index.columns(planning)
+        assert index.parses == parses
+
+        path = planning / FEATURE_DIR / "tasks-open/T-form.md"
+        write_markdown(path, _yaml("task", "T-form", "F-login", status="review"), "")
+        assert _ids(planning, BacklogQuery(statuses=frozenset({"review"})), index) == ["T-form"]
+        assert index.parses == parses + 1
+
+        path.unlink()
+        assert "T-form" not in _ids(planning, BacklogQuery(), index)
+
+    def test_watched_tree_reads_published_paths_only(self, planning):
+        """Test that a watched tree trusts its entries until a path is published."""
+        index = BacklogIndex()
+        bus = get_invalidation_bus()
+        bus.add_watched_root(planning)
+        try:
+            index.columns(planning)
+            path = planning / "tasks-open" / "T-new.md"
+            write_markdown(path, _yaml("task", "T-new"), "")
+            assert "T-new" in _ids(planning, BacklogQuery(), index)
+
+            # An unpublished edit is not seen while the tree is watched
+            path.write_text(path.read_text().replace("status: open", "status: review"))
+            assert _ids(planning, BacklogQuery(statuses=frozenset({"review"})), index) == []
+
+            bus.publish(path)
+            assert _ids(planning, BacklogQuery(statuses=frozenset({"review"})), index) == ["T-new"]
+        finally:
+            bus.remove_watched_root(planning)
+
+
+class TestListBacklogTool:
+    """Test the listBacklog query parameters."""
+
+    @pytest.mark.asyncio
+    async def test_filters_and_aggregations(self, planning, temp_dir):
+        """Test comma-separated statuses, groupBy, countOnly and the default listing."""
+        server = create_server(Settings(planning_root=planning, log_dir=temp_dir / "logs"))
+        root = str(temp_dir)
+
+        async with Client(server) as client:
+            listing = await client.call_tool(
+                "listBacklog", {"projectRoot": root, "status": "open, in-progress"}
+            )
+            assert [task["id"] for task in listing.data["tasks"]] == [
+                "T-form",
+                "T-chore",
+                "T-submit",
+            ]
+            assert listing.data["tasks"][0]["file_path"] == str(
+                planning / FEATURE_DIR / "tasks-open/T-form.md"
+            )
+
+            grouped = await client.call_tool(
+                "listBacklog",
+                {"projectRoot": root, "priority": "high", "groupBy": ["project", "status"]},
+            )
+            assert grouped.data == {
+                "groups": [
+                    {"project": None, "status": "open", "count": 1},
+                    {"project": "P-app", "status": "open", "count": 1},
+                ],
+                "total": 2,
+            }
+
+            counted = await client.call_tool(
+                "listBacklog",
+                {"projectRoot": root, "countOnly": True, "hasUnfinishedPrerequisites": False},
+            )
+            assert counted.data == {"count": 4}
+
+            invalid = await client.call_tool(
+                "listBacklog", {"projectRoot": root, "status": "bogus", "countOnly": True}
+            )
+            assert invalid.data == {"count": 0}
+
+    @pytest.mark.asyncio
+    async def test_invalid_parameters(self, planning, temp_dir):
+        """Test that unknown group fields and bad timestamps are rejected."""
+        server = create_server(Settings(planning_root=planning, log_dir=temp_dir / "logs"))
+
+        async with Client(server) as client:
+            with pytest.raises(ToolError, match="Cannot group by 'title'"):
+                await client.call_tool(
+                    "listBacklog", {"projectRoot": str(temp_dir), "groupBy": ["title"]}
+                )
+            with pytest.raises(ToolError, match="createdAfter must be an ISO 8601 timestamp"):
+                await client.call_tool(
+                    "listBacklog", {"projectRoot": str(temp_dir), "createdAfter": "yesterday"}
+                )
@@ -0,0 +1,173 @@
+"""Tests for the synthetic tree generator, benchmark suite and bench CLI command."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from trellis_mcp.bench import (
+    FileOpenCounter,
+    TreeShape,
+    compare_to_baseline,
+    format_bench_report,
+    generate_tree,
+    run_benchmark_suite,
+)
+from trellis_mcp.cli import cli
+from trellis_mcp.scanner import scan_tasks
+from trellis_mcp.schema.status_enum import StatusEnum
+from trellis_mcp.settings import Settings
+
+SMALL_SHAPE = TreeShape(
+    projects=1,
+    epics_per_project=2,
+    features_per_epic=2,
+    tasks_per_feature=8,
+    standalone_tasks=6,
+    done_ratio=0.4,
+    in_progress_ratio=0.2,
+    prereq_density=0.6,
+    seed=7,
+)
+
+
+def _tree_files(root):
+    return {str(path.relative_to(root)): path.read_text() for path in sorted(root.rglob("*.md"))}
+
+
+class TestTreeGenerator:
+    """Test generate_tree and TreeShape."""
+
+    def test_counts_and_determinism(self, temp_dir):
+        """Test that the same shape and seed produce identical trees."""
+        first = generate_tree(temp_dir / "a" / "planning", SMALL_SHAPE)
+        second = generate_tree(temp_dir / "b" / "planning", SMALL_SHAPE)
+
+        assert first["done_task_ids"] == second["done_task_ids"]
+        assert first["counts"] == {"project": 1, "epic": 2, "feature": 4, "task": 38}
+        assert first["total_objects"] == SMALL_SHAPE.total_objects == 45
+        assert _tree_files(temp_dir / "a" / "planning") == _tree_files(temp_dir / "b" / "planning")
+        assert len(_tree_files(temp_dir / "a" / "planning")) == 45
+
+    def test_tree_is_consistent(self, temp_dir):
+        """Test that generated tasks load and prerequisites are acyclic and status-consistent."""
+        root = temp_dir / "planning"
+        tree = generate_tree(root, SMALL_SHAPE)
+        tasks = {task.id: task for task in scan_tasks(temp_dir)}
+
+        assert len(tasks) == 38
+        assert set(tree["done_task_ids"]) == {
+            task_id for task_id, task in tasks.items() if task.status == StatusEnum.DONE
+        }
+        assert any(task.prerequisites for task in tasks.values())
+        for task in tasks.values():
+            for prereq in task.prerequisites:
+                assert prereq in tasks
+                assert tasks[prereq].created < task.created
+                if task.status in (StatusEnum.DONE, StatusEnum.IN_PROGRESS):
+                    assert tasks[prereq].status == StatusEnum.DONE
+
+    def test_shape_validation_and_sizing(self):
+        """Test shape validation and sizing presets."""
+        with pytest.raises(ValueError, match="done_ratio"):
+            TreeShape(done_ratio=1.5)
+        with pytest.raises(ValueError, match="must not exceed"):
+            TreeShape(done_ratio=0.8, in_progress_ratio=0.3)
+        with pytest.raises(ValueError, match="negative"):
+            TreeShape(projects=-1)
+
+        for objects in (1000, 10000, 100000):
+            shape = TreeShape.for_object_count(objects)
+            assert abs(shape.total_objects - objects) / objects < 0.1
+
+
+class TestBenchmarkSuite:
+    """Test the benchmark suite and baseline comparison."""
+
+    def test_file_open_counter(self, temp_dir):
+        """Test that file opens are counted only while the counter is active."""
+        path = temp_dir / "file.txt"
+        path.write_text("x")
+        with FileOpenCounter() as counter:
+            path.read_text()
+            path.read_text()
+        path.read_text()
+        assert counter.count == 2
+
+    @pytest.mark.asyncio
+    async def test_suite_and_baseline_comparison(self, temp_dir):
+        """Test a small run and regression detection against baselines."""
+        report = await run_benchmark_suite(
+            Settings(planning_root=temp_dir / "planning"),
+            sizes=[100],
+            operations=["getObject", "updateObject", "completeTask"],
+            repeat=2,
+            work_dir=temp_dir / "bench",
+        )
+
+        result = report["sizes"]["100"]
+        assert result["objects"] == TreeShape.for_object_count(100).total_objects
+        for operation in ("getObject", "updateObject", "completeTask"):
+            measured = result["operations"][operation]
+            assert measured["runs"] == 3
+            assert measured["errors"] == 0
+            assert measured["cold_ms"] > 0
+            assert measured["cold_file_opens"] >= 1
+        assert (temp_dir / "bench" / "size-100" / "planning" / "projects").is_dir()
+
+        assert compare_to_baseline(report, json.loads(json.dumps(report))) == []
+
+        faster = json.loads(json.dumps(report))
+        faster["sizes"]["100"]["operations"]["getObject"]["cold_file_opens"] = 0
+        faster["sizes"]["100"]["operations"]["updateObject"]["warm_p50_ms"] = 0.001
+        regressions = compare_to_baseline(report, faster)
+        assert {(r["operation"], r["metric"]) for r in regressions} == {
+            ("getObject", "cold_file_opens"),
+            ("updateObject", "warm_p50_ms"),
+        }
+        assert "2 regression(s)" in format_bench_report(report, regressions)
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments(self):
+        """Test validation of operations, repeat and sizes."""
+        settings = Settings()
+        with pytest.raises(ValueError, match="Unknown operations"):
+            await run_benchmark_suite(settings, sizes=[10], operations=["deleteObject"])
+        with pytest.raises(ValueError, match="repeat"):
+            await run_benchmark_suite(settings, sizes=[10], repeat=0)
+        with pytest.raises(ValueError, match="sizes"):
+            await run_benchmark_suite(settings, sizes=[0])
+
+
+class TestBenchCommand:
+    """Test the bench CLI command."""
+
+    def test_save_and_compare_baseline(self, temp_dir):
+        """Test saving a baseline and failing on regressions against it."""
+        baseline = temp_dir / "baseline.json"
+        runner = CliRunner()
+        args = ["bench", "--sizes", "100", "--operation", "getObject", "--repeat", "1"]
+
+        result = runner.invoke(cli, args + ["--save", str(baseline)])
+        assert result.exit_code == 0, result.output
+        assert "getObject" in result.output
+        saved = json.loads(baseline.read_text())
+        assert saved["sizes"]["100"]["operations"]["getObject"]["runs"] == 2
+
+        saved["sizes"]["100"]["operations"]["getObject"]["cold_file_opens"] = 0
+        baseline.write_text(json.dumps(saved))
+        result = runner.invoke(cli, args + ["--baseline", str(baseline), "--json"])
+        assert result.exit_code != 0
+        assert "regression(s)" in result.output
+
+    def test_invalid_sizes(self):
+        """Test that malformed --sizes is rejected."""
+        result = CliRunner().invoke(cli, ["bench", "--sizes", "small"])
+        assert result.exit_code != 0
+        assert "--sizes must be comma-separated integers" in result.output
+
+    def test_loadtest_invalid_agents(self):
+        """Test that malformed --agents is rejected."""
+        result = CliRunner().invoke(cli, ["loadtest", "--agents", "many"])
+        assert result.exit_code != 0
+        assert "--agents must be comma-separated integers" in result.output
@@ -0,0 +1,181 @@
+"""Tests for nested span tracing in PerformanceBenchmark and trace_span."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastmcp import Client
+
+from trellis_mcp.logging import json_rpc_logging_middleware as middleware_module
+from trellis_mcp.object_parser import parse_object
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+from trellis_mcp.validation.benchmark import (
+    PerformanceBenchmark,
+    get_active_benchmark,
+    trace_span,
+    traced,
+)
+
+
+class TestNestedSpans:
+    """Test span nesting, merging and timings."""
+
+    def test_nested_start_end_builds_tree(self):
+        """Test that nested start/end pairs become parent/child spans."""
+        benchmark = PerformanceBenchmark()
+        benchmark.start("outer")
+        benchmark.start("inner")
+        benchmark.end("inner")
+        benchmark.end("outer")
+
+        tree = benchmark.get_span_tree()
+        assert [span["name"] for span in tree] == ["outer"]
+        assert [span["name"] for span in tree[0]["children"]] == ["inner"]
+        assert tree[0]["ms"] >= tree[0]["children"][0]["ms"]
+        assert set(benchmark.get_timings()) == {"outer", "inner"}
+
+    def test_repeated_siblings_are_merged(self):
+        """Test that repeated sibling spans merge into one span with a count."""
+        benchmark = PerformanceBenchmark()
+        with benchmark.span("load"):
+            for _ in range(3):
+                with benchmark.span("read"):
+                    pass
+
+        load = benchmark.get_span_tree()[0]
+        assert len(load["children"]) == 1
+        assert load["children"][0]["count"] == 3
+
+    def test_end_closes_unfinished_children(self):
+        """Test that ending an outer span also closes spans left open inside it."""
+        benchmark = PerformanceBenchmark()
+        benchmark.start("outer")
+        benchmark.start("dangling")
+        benchmark.end("outer")
+
+        assert benchmark.start_time is None
+        assert "dangling" in benchmark.get_timings()
+
+    def test_end_without_start(self):
+        """Test that ending an unknown operation returns 0.0."""
+        assert PerformanceBenchmark().end("missing") == 0.0
+
+    def test_format_span_tree(self):
+        """Test the indented text rendering of the span tree."""
+        benchmark = PerformanceBenchmark()
+        with benchmark.span("updateObject"):
+            with benchmark.span("write"):
+                pass
+
+        lines = benchmark.format_span_tree().splitlines()
+        assert lines[0].startswith("updateObject: ")
+        assert lines[1].startswith("  write: ")
+
+
+class TestActiveBenchmark:
+    """Test context-based span recording."""
+
+    def test_trace_span_noop_without_active_benchmark(self):
+        """Test that trace_span does nothing when tracing is off."""
+        assert get_active_benchmark() is None
+        with trace_span("read"):
+            pass
+
+    def test_trace_span_and_traced_record_on_active_benchmark(self):
+        """Test that trace_span and @traced record into the activated benchmark."""
+
+        @traced("validation")
+        def validate() -> str:
+            with trace_span("schema"):
+                return "ok"
+
+        benchmark = PerformanceBenchmark()
+        with benchmark.activate():
+            assert get_active_benchmark() is benchmark
+            with trace_span("call"):
+                assert validate() == "ok"
+        assert get_active_benchmark() is None
+
+        call = benchmark.get_span_tree()[0]
+        assert call["children"][0]["name"] == "validation"
+        assert call["children"][0]["children"][0]["name"] == "schema"
+
+    def test_parse_object_records_phases(self, temp_dir):
+        """Test that parsing a file records read, YAML parse and model validation spans."""
+        task_file = temp_dir / "T-sample.md"
+        task_file.write_text(
+            "---\nkind: task\nid: T-sample\ntitle: Sample\nstatus: open\npriority: normal\n"
+            "prerequisites: []\ncreated: '2025-01-01T00:00:00'\n"
+            "updated: '2025-01-01T00:00:00'\nschema_version: '1.1'\n---\nBody\n",
+            encoding="utf-8",
+        )
+
+        benchmark = PerformanceBenchmark()
+        with benchmark.activate():
+            parse_object(task_file)
+
+        names = [span["name"] for span in benchmark.get_span_tree()]
+        assert names == ["read", "yaml_parse", "model_validation"]
+
+
+class TestSlowCallLogging:
+    """Test that slow tool calls are logged with their span tree."""
+
+    @pytest.mark.asyncio
+    async def test_calls_are_not_traced_by_default(self, monkeypatch):
+        """Test that tracing is opt-in, with or without settings."""
+        def no_tracing():
+            raise AssertionError("call was traced")
+
+        monkeypatch.setattr(middleware_module, "PerformanceBenchmark", no_tracing)
+        monkeypatch.setattr(middleware_module, "write_event", MagicMock())
+        for settings in (Settings(), None):
+            middleware = middleware_module.JsonRpcLoggingMiddleware(settings)
+            context = MagicMock()
+            context.method = "tools/call"
+            context.message.name = "getObject"
+            assert await middleware.on_call_tool(context, AsyncMock(return_value={})) == {}
+
+    @pytest.mark.asyncio
+    async def test_slow_call_logged_with_spans(self, temp_dir):
+        """Test that a call over the threshold logs its phases at WARNING level."""
+        planning_root = temp_dir / "planning"
+        settings = Settings(
+            planning_root=planning_root,
+            log_dir=temp_dir / "logs",
+            slow_call_threshold_ms=0,
+        )
+        server = create_server(settings)
+        async with Client(server) as client:
+            await client.call_tool(
+                "createObject",
+                {"kind": "project", "title": "Traced", "projectRoot": str(planning_root)},
+            )
+
+        # Tracing disabled: no span trees in the log
+        entries = _read_log_entries(temp_dir / "logs")
+        assert all("spans" not in entry for entry in entries)
+
+        settings = settings.model_copy(update={"slow_call_threshold_ms": 1})
+        server = create_server(settings)
+        async with Client(server) as client:
+            await client.call_tool(
+                "createObject",
+                {"kind": "project", "title": "Traced two", "projectRoot": str(planning_root)},
+            )
+
+        slow = [entry for entry in _read_log_entries(temp_dir / "logs") if entry.get("slow")]
+        assert slow, "expected the createObject call to exceed a 1ms threshold"
+        entry = slow[-1]
+        assert entry["level"] == "WARNING"
+        assert entry["spans"][0]["name"] == "createObject"
+        assert "write" in json.dumps(entry["spans"])
+
+
+def _read_log_entries(log_dir):
+    """Read all JSONL entries from the log directory."""
+    entries = []
+    for log_file in sorted(log_dir.glob("*.log")):
+        entries.extend(json.loads(line) for line in log_file.read_text().splitlines() if line)
+    return entries
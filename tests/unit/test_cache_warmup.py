@@ -0,0 +1,122 @@
+"""Unit tests for background cache warm-up at server start."""
+
+import asyncio
+
+import pytest
+from fastmcp import Client
+
+from trellis_mcp.bench import TreeShape, generate_tree
+from trellis_mcp.cache_warmup import CacheWarmup, warmup_planning_dir
+from trellis_mcp.children.cache import clear_children_cache, get_children_cache
+from trellis_mcp.parse_cache import clear_parse_cache, get_cache_stats
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+from trellis_mcp.validation.cache import clear_dependency_cache
+from trellis_mcp.validation.cache import get_cache_stats as graph_stats
+
+
+@pytest.fixture(autouse=True)
+def _cold_caches():
+    """Run each test against empty caches."""
+    clear_parse_cache()
+    clear_children_cache()
+    clear_dependency_cache()
+    yield
+    clear_parse_cache()
+    clear_children_cache()
+    clear_dependency_cache()
+
+
+def _small_tree(temp_dir):
+    shape = TreeShape(projects=1, epics_per_project=2, features_per_epic=2, standalone_tasks=3)
+    return generate_tree(temp_dir / "planning", shape)
+
+
+def test_warmup_planning_dir_matches_tool_resolution(temp_dir):
+    """Test that both the planning dir and its parent resolve to the planning dir."""
+    assert warmup_planning_dir(temp_dir) == temp_dir / "planning"
+    assert warmup_planning_dir(temp_dir / "planning") == temp_dir / "planning"
+
+
+def test_warmup_fills_parse_children_and_graph_caches(temp_dir):
+    """Test that a finished warm-up has parsed every object."""
+    tree = _small_tree(temp_dir)
+    warmup = CacheWarmup(Settings(planning_root=temp_dir / "planning", log_dir=temp_dir / "logs"))
+
+    assert warmup.status()["state"] == "pending"
+    warmup.start()
+    assert warmup.wait(timeout=60)
+
+    status = warmup.status()
+    assert status["state"] == "ready"
+    assert status["ready"] is True
+    assert status["objects"] == tree["total_objects"]
+    # One project, two epics and four features
+    assert status["children_indexed"] == 7
+    assert status["duration_ms"] is not None
+
+    assert get_cache_stats()["size"] == tree["total_objects"]
+    assert get_children_cache().get_stats()["size"] == 7
+    assert str(temp_dir / "planning") in graph_stats()["cache_keys"]
+
+
+def test_warmup_missing_planning_root_is_ready(temp_dir):
+    """Test that an empty root finishes immediately without creating directories."""
+    warmup = CacheWarmup(Settings(planning_root=temp_dir / "absent", log_dir=temp_dir / "logs"))
+    warmup.start()
+    assert warmup.wait(timeout=10)
+
+    assert warmup.status()["state"] == "ready"
+    assert warmup.status()["objects"] == 0
+    assert not (temp_dir / "absent").exists()
+
+
+def test_cancelled_warmup_reports_cancelled(temp_dir):
+    """Test that cancelling before the first step stops the walk."""
+    _small_tree(temp_dir)
+    warmup = CacheWarmup(Settings(planning_root=temp_dir / "planning", log_dir=temp_dir / "logs"))
+    warmup.cancel()
+    warmup.start()
+    assert warmup.wait(timeout=60)
+
+    assert warmup.status()["state"] == "cancelled"
+    assert warmup.status()["children_indexed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_health_check_reports_warmup_and_requests_are_served(temp_dir):
+    """Test readiness reporting and that calls during warm-up read from disk."""
+    tree = _small_tree(temp_dir)
+    settings = Settings(
+        planning_root=temp_dir / "planning",
+        log_dir=temp_dir / "logs",
+        warm_cache_on_start=True,
+    )
+    server = create_server(settings)
+
+    async with Client(server) as client:
+        # May run before or after warm-up completes; either way it must be correct
+        backlog = await client.call_tool("listBacklog", {"projectRoot": str(temp_dir)})
+        assert len(backlog.data["tasks"]) == tree["counts"]["task"]
+
+        health = (await client.call_tool("health_check")).data
+        assert health["status"] == "healthy"
+        assert health["cache_warmup"]["planning_root"] == str(temp_dir / "planning")
+
+        for _ in range(600):
+            if health["cache_warmup"]["state"] != "running":
+                break
+            await asyncio.sleep(0.05)
+            health = (await client.call_tool("health_check")).data
+        assert health["cache_warmup"]["state"] == "ready"
+        assert health["cache_warmup"]["ready"] is True
+
+
+@pytest.mark.asyncio
+async def test_health_check_reports_disabled_warmup(temp_dir):
+    """Test that warm-up is off by default."""
+    server = create_server(Settings(planning_root=temp_dir / "planning", log_dir=temp_dir / "logs"))
+
+    async with Client(server) as client:
+        health = (await client.call_tool("health_check")).data
+        assert health["cache_warmup"] == {"state": "disabled"}
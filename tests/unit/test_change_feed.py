@@ -0,0 +1,212 @@
+"""Unit tests for the change feed and the getChanges tool.
+
+Tests generation numbering, delta queries, collapsing per object, journal
+sharing between feed instances (as between processes), trimming, and the
+mutation hooks in the write paths.
+"""
+
+import pytest
+from fastmcp import Client
+
+from trellis_mcp.bench import TreeShape, generate_tree
+from trellis_mcp.change_feed import (
+    ChangeFeed,
+    clear_change_feeds,
+    find_planning_root,
+    get_change_feed,
+    object_id_from_path,
+)
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+from trellis_mcp.utils.io_utils import write_markdown
+
+
+@pytest.fixture(autouse=True)
+def _fresh_feeds():
+    """Drop feeds cached by earlier tests."""
+    clear_change_feeds()
+    yield
+    clear_change_feeds()
+
+
+class TestChangeFeed:
+    """Test ChangeFeed in isolation."""
+
+    def test_generations_increase_and_current_client_gets_nothing(self, temp_dir):
+        """Test numbering and the 'nothing changed' answer."""
+        feed = ChangeFeed(temp_dir / "planning")
+        assert feed.changes_since(0) == {
+            "generation": 0,
+            "since_generation": 0,
+            "changed": False,
+            "resync_required": False,
+            "changes": [],
+        }
+
+        assert feed.record("created", "task", "T-a", "tasks-open/T-a.md", status="open") == 1
+        assert feed.record("created", "task", "T-b", "tasks-open/T-b.md", status="open") == 2
+
+        result = feed.changes_since(1)
+        assert result["generation"] == 2
+        assert result["changed"] is True
+        assert [c["id"] for c in result["changes"]] == ["T-b"]
+        assert feed.changes_since(2)["changed"] is False
+
+    def test_changes_collapse_to_latest_per_object(self, temp_dir):
+        """Test that created+updated reports 'created' with the latest state."""
+        feed = ChangeFeed(temp_dir / "planning")
+        feed.record("created", "task", "T-a", "tasks-open/T-a.md", status="open")
+        feed.record("updated", "task", "T-a", "tasks-open/T-a.md", status="in-progress")
+        feed.record("updated", "task", "T-b", "tasks-open/T-b.md", status="done")
+        feed.record("deleted", "task", "T-c", "tasks-open/T-c.md", status="deleted")
+
+        changes = feed.changes_since(0)["changes"]
+        assert [(c["id"], c["op"], c["status"]) for c in changes] == [
+            ("T-a", "created", "in-progress"),
+            ("T-b", "updated", "done"),
+            ("T-c", "deleted", "deleted"),
+        ]
+        assert len(feed.changes_since(0, limit=1)["changes"]) == 1
+
+    def test_moves_keep_the_path_before_the_window(self, temp_dir):
+        """Test old_path on collapsed moves and the uncollapsed entries."""
+        feed = ChangeFeed(temp_dir / "planning")
+        feed.record("updated", "task", "T-a", "tasks-open/T-a.md", status="in-progress")
+        feed.record("updated", "task", "T-a", "b/T-a.md", old_path="tasks-open/T-a.md")
+        feed.record("updated", "task", "T-a", "c/T-a.md", old_path="b/T-a.md")
+
+        (change,) = feed.changes_since(0)["changes"]
+        assert (change["path"], change["old_path"]) == ("c/T-a.md", "tasks-open/T-a.md")
+        (change,) = feed.changes_since(2)["changes"]
+        assert (change["path"], change["old_path"]) == ("c/T-a.md", "b/T-a.md")
+
+        entries = feed.changes_since(0, collapse=False)["changes"]
+        assert [(c["path"], c["old_path"]) for c in entries] == [
+            ("tasks-open/T-a.md", None),
+            ("b/T-a.md", "tasks-open/T-a.md"),
+            ("c/T-a.md", "b/T-a.md"),
+        ]
+
+    def test_second_instance_sees_journal_written_by_first(self, temp_dir):
+        """Test that feeds sharing a journal stay in sync, as across processes."""
+        writer = ChangeFeed(temp_dir / "planning")
+        reader = ChangeFeed(temp_dir / "planning")
+
+        writer.record("created", "task", "T-a", "tasks-open/T-a.md")
+        assert reader.current_generation() == 1
+        assert reader.record("updated", "task", "T-a", "tasks-open/T-a.md") == 2
+        assert writer.changes_since(1)["changes"][0]["op"] == "updated"
+
+        # A restarted process picks up where the journal left off
+        assert ChangeFeed(temp_dir / "planning").generation == 2
+
+    def test_trimmed_history_requires_resync(self, temp_dir):
+        """Test that clients behind the trimmed journal are told to resync."""
+        feed = ChangeFeed(temp_dir / "planning", ring_size=2, journal_max_entries=4)
+        for i in range(6):
+            feed.record("created", "task", f"T-{i}", f"tasks-open/T-{i}.md")
+
+        assert feed.changes_since(0)["resync_required"] is True
+        recent = feed.changes_since(4)
+        assert recent["resync_required"] is False
+        assert [c["id"] for c in recent["changes"]] == ["T-4", "T-5"]
+
+        # A client ahead of the journal (e.g. after the journal was removed) must resync
+        assert feed.changes_since(99)["resync_required"] is True
+
+    def test_object_identity_from_paths(self, temp_dir):
+        """Test planning root and ID derivation from object paths."""
+        planning = temp_dir / "planning"
+        task = planning / "projects/P-a/epics/E-b/features/F-c/tasks-done/20250101_000000-T-d.md"
+
+        assert find_planning_root(task) == planning
+        assert find_planning_root(planning / "tasks-open/T-x.md") == planning
+        assert find_planning_root(temp_dir / "notes.md") is None
+        assert object_id_from_path(task) == ("task", "T-d")
+        assert object_id_from_path(planning / "projects/P-a/project.md") == ("project", "P-a")
+
+
+class TestMutationHooks:
+    """Test that write paths record changes."""
+
+    def test_write_markdown_records_created_then_updated(self, temp_dir):
+        """Test op inference from the target file's existence."""
+        path = temp_dir / "planning" / "tasks-open" / "T-a.md"
+        write_markdown(path, {"kind": "task", "id": "T-a", "status": "open", "title": "A"}, "")
+        write_markdown(path, {"kind": "task", "id": "T-a", "status": "review", "title": "A"}, "")
+
+        changes = get_change_feed(temp_dir / "planning").changes_since(0)["changes"]
+        assert [(c["op"], c["status"]) for c in changes] == [("created", "review")]
+        assert changes[0]["path"] == "tasks-open/T-a.md"
+
+    def test_files_outside_planning_tree_are_ignored(self, temp_dir):
+        """Test that arbitrary markdown writes do not create a journal."""
+        write_markdown(temp_dir / "notes.md", {"title": "Notes"}, "")
+        assert not (temp_dir / ".trellis").exists()
+
+    @pytest.mark.asyncio
+    async def test_get_changes_tool_tracks_claim_complete_and_delete(self, temp_dir):
+        """Test the tool end to end over the server's mutation tools."""
+        generate_tree(
+            temp_dir / "planning",
+            TreeShape(projects=1, epics_per_project=1, features_per_epic=1, standalone_tasks=2),
+        )
+        server = create_server(
+            Settings(planning_root=temp_dir / "planning", log_dir=temp_dir / "logs")
+        )
+        root = str(temp_dir)
+
+        async with Client(server) as client:
+            start = (await client.call_tool("getChanges", {"projectRoot": root})).data
+            assert start == {
+                "generation": 0,
+                "since_generation": 0,
+                "changed": False,
+                "resync_required": False,
+                "changes": [],
+            }
+
+            claimed = (await client.call_tool("claimNextTask", {"projectRoot": root})).data
+            task_id = claimed["task"]["id"]
+            await client.call_tool(
+                "completeTask", {"projectRoot": root, "taskId": task_id, "summary": "done"}
+            )
+            await client.call_tool(
+                "createObject",
+                {"kind": "task", "title": "New standalone task", "projectRoot": root},
+            )
+
+            result = (
+                await client.call_tool("getChanges", {"projectRoot": root, "sinceGeneration": 0})
+            ).data
+            by_id = {change["id"]: change for change in result["changes"]}
+            assert by_id[task_id]["op"] == "updated"
+            assert by_id[task_id]["status"] == "done"
+            assert "tasks-done" in by_id[task_id]["path"]
+            assert [c["op"] for c in result["changes"]].count("created") == 1
+
+            current = result["generation"]
+            noop = (
+                await client.call_tool(
+                    "getChanges", {"projectRoot": root, "sinceGeneration": current}
+                )
+            ).data
+            assert noop["changed"] is False
+
+            await client.call_tool(
+                "updateObject",
+                {
+                    "id": "P-p0001",
+                    "projectRoot": root,
+                    "yamlPatch": {"status": "deleted"},
+                    "force": True,
+                },
+            )
+            deleted = (
+                await client.call_tool(
+                    "getChanges", {"projectRoot": root, "sinceGeneration": current}
+                )
+            ).data
+            ops = {change["op"] for change in deleted["changes"]}
+            assert ops == {"deleted"}
+            assert {"P-p0001", "E-e00001", "F-f000001"} <= {c["id"] for c in deleted["changes"]}
@@ -0,0 +1,237 @@
+"""Unit tests for the tasks-done layouts and the done-task index.
+
+Tests that completed tasks are written into monthly shards when configured,
+that lookups, scans and validation read both layouts, that the index only
+lists a directory again when it changed, that done tasks in features are
+found without visiting each feature while the tree is watched, and that
+migration moves files
+between layouts in both directions.
+"""
+
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from trellis_mcp.cli import cli
+from trellis_mcp.complete_task import complete_task
+from trellis_mcp.done_tasks import (
+    find_done_task,
+    get_done_task_index,
+    migrate_done_layout,
+    set_done_layout,
+    shard_for,
+    tasks_dir_of,
+)
+from trellis_mcp.invalidation import get_invalidation_bus
+from trellis_mcp.path_resolver import id_to_path, resolve_path_for_new_object
+from trellis_mcp.scanner import scan_tasks
+from trellis_mcp.utils.fs_utils import find_object_path
+from trellis_mcp.utils.io_utils import write_markdown
+from trellis_mcp.validation.object_loader import get_all_objects
+
+
+@pytest.fixture(autouse=True)
+def _restore_layout():
+    """Put the process back in the flat layout after each test."""
+    yield
+    set_done_layout("flat")
+
+
+def _task_yaml(task_id: str, status: str = "done", parent: str | None = None) -> dict:
+    return {
+        "kind": "task",
+        "id": f"T-{task_id}",
+        "parent": parent,
+        "status": status,
+        "title": f"Task {task_id}",
+        "priority": "normal",
+        "worktree": None,
+        "created": "2025-01-01T12:00:00Z",
+        "updated": "2025-01-01T12:00:00Z",
+        "schema_version": "1.1",
+        "prerequisites": [],
+    }
+
+
+def _write_done(planning, relative: str, task_id: str) -> None:
+    write_markdown(planning / "tasks-done" / relative, _task_yaml(task_id), "Body")
+
+
+class TestLayout:
+    """Test where completed tasks are written."""
+
+    def test_shard_names(self):
+        """Test deriving the monthly shard from the timestamp prefix."""
+        assert shard_for("20250715_103045-T-login.md") == "2025-07"
+        assert shard_for("T-login.md") is None
+
+    def test_monthly_layout_shards_new_done_tasks(self, temp_dir):
+        """Test the path for a done task in each layout."""
+        planning = temp_dir / "planning"
+        flat = resolve_path_for_new_object("task", "a", None, planning, status="done")
+        assert flat.parent == planning / "tasks-done"
+
+        set_done_layout("monthly")
+        sharded = resolve_path_for_new_object("task", "a", None, planning, status="done")
+        assert sharded.parent.parent == planning / "tasks-done"
+        assert sharded.parent.name == shard_for(sharded.name)
+        assert tasks_dir_of(sharded) == planning / "tasks-done"
+
+    def test_completing_in_monthly_layout(self, temp_dir):
+        """Test that completion moves the task into its shard and it stays findable."""
+        planning = temp_dir / "planning"
+        write_markdown(
+            planning / "tasks-open" / "T-ship.md", _task_yaml("ship", "in-progress"), "Body"
+        )
+        set_done_layout("monthly")
+
+        complete_task(planning, "T-ship", "Shipped")
+
+        done_path = id_to_path(planning, "task", "ship")
+        assert done_path.parent.parent == planning / "tasks-done"
+        assert done_path.parent.name == shard_for(done_path.name)
+        assert [task.id for task in scan_tasks(temp_dir)] == ["T-ship"]
+
+    def test_unknown_layout_is_rejected(self):
+        """Test layout validation."""
+        with pytest.raises(ValueError, match="Unknown tasks-done layout"):
+            set_done_layout("yearly")  # type: ignore[arg-type]
+
+
+class TestReaders:
+    """Test that readers accept both layouts at once."""
+
+    def test_mixed_layout_is_read_everywhere(self, temp_dir):
+        """Test lookups, scanning and validation loading over a half-migrated tree."""
+        planning = temp_dir / "planning"
+        _write_done(planning, "20250101_120000-T-flat.md", "flat")
+        _write_done(planning, "2025-02/20250201_120000-T-sharded.md", "sharded")
+
+        assert id_to_path(planning, "task", "flat").name == "20250101_120000-T-flat.md"
+        assert id_to_path(planning, "task", "sharded").parent.name == "2025-02"
+        assert sorted(task.id for task in scan_tasks(temp_dir)) == ["T-flat", "T-sharded"]
+        assert set(get_all_objects(planning)) == {"flat", "sharded"}
+
+
+class TestDoneTaskIndex:
+    """Test that lookups list a tasks-done directory only when it changed."""
+
+    def test_lookups_reuse_the_index(self, temp_dir):
+        """Test repeated lookups and a directory changed behind the index's back."""
+        tasks_done = temp_dir / "planning" / "tasks-done"
+        _write_done(temp_dir / "planning", "2025-03/20250301_120000-T-a.md", "a")
+        index = get_done_task_index()
+        index.clear()
+        builds = index.builds
+
+        for _ in range(3):
+            assert find_done_task(tasks_done, "a") is not None
+        assert find_done_task(tasks_done, "missing") is None
+        assert index.builds == builds + 1
+
+        # A file added without notification bumps the shard mtime
+        shard_file = tasks_done / "2025-03" / "20250302_120000-T-b.md"
+        shard_file.write_text("---\nkind: task\n---\n")
+        os.utime(shard_file.parent, ns=(1, 1))
+        assert find_done_task(tasks_done, "b") == shard_file
+        assert index.builds == builds + 2
+
+    def test_completion_updates_the_index_in_place(self, temp_dir):
+        """Test that completing a task does not force a rebuild."""
+        planning = temp_dir / "planning"
+        _write_done(planning, "20250101_120000-T-old.md", "old")
+        write_markdown(
+            planning / "tasks-open" / "T-new.md", _task_yaml("new", "in-progress"), "Body"
+        )
+        index = get_done_task_index()
+        assert find_done_task(planning / "tasks-done", "old") is not None
+        builds = index.builds
+
+        set_done_layout("monthly")
+        complete_task(planning, "T-new", "Done")
+
+        assert find_done_task(planning / "tasks-done", "new") is not None
+        assert index.builds == builds
+
+    def test_watched_tree_finds_feature_done_tasks_without_scanning(self, temp_dir, monkeypatch):
+        """Test that hierarchical done tasks come from the tree-wide map while watched."""
+        planning = temp_dir / "planning"
+        features = []
+        for number in range(3):
+            feature = planning / f"projects/P-p/epics/E-e/features/F-f{number}"
+            write_markdown(
+                feature / "feature.md",
+                {"kind": "feature", "id": f"F-f{number}", "parent": "E-e", "status": "open"},
+                "",
+            )
+            write_markdown(
+                feature / "tasks-done" / f"2025010{number}_120000-T-d{number}.md",
+                _task_yaml(f"d{number}", parent=f"F-f{number}"),
+                "Body",
+            )
+            features.append(feature)
+        write_markdown(
+            features[1] / "tasks-open" / "T-late.md",
+            _task_yaml("late", "in-progress", parent="F-f1"),
+            "Body",
+        )
+        bus = get_invalidation_bus()
+        bus.add_watched_root(planning)
+        try:
+            assert find_object_path("task", "d2", planning) is not None
+            # Completions are applied to the tree-wide map in place
+            complete_task(planning, "T-late", "Done")
+
+            def no_scans(self, *args):
+                raise AssertionError(f"scanned {self}")
+
+            monkeypatch.setattr(type(planning), "iterdir", no_scans)
+            monkeypatch.setattr(type(planning), "glob", no_scans)
+            builds = get_done_task_index().builds
+            for number in range(3):
+                done = find_object_path("task", f"d{number}", planning)
+                assert done is not None and done.parent == features[number] / "tasks-done"
+            done = find_object_path("task", "late", planning)
+            assert done is not None and done.parent == features[1] / "tasks-done"
+            assert get_done_task_index().builds == builds
+        finally:
+            bus.remove_watched_root(planning)
+            bus.publish(planning)
+
+
+class TestMigration:
+    """Test moving existing files between layouts."""
+
+    def test_round_trip(self, temp_dir):
+        """Test migrating to monthly and back, including a dry run."""
+        planning = temp_dir / "planning"
+        _write_done(planning, "20250101_120000-T-a.md", "a")
+        _write_done(planning, "20250215_120000-T-b.md", "b")
+
+        preview = migrate_done_layout(planning, "monthly", dry_run=True)
+        assert len(preview) == 2
+        assert (planning / "tasks-done" / "20250101_120000-T-a.md").exists()
+
+        migrate_done_layout(planning, "monthly")
+        assert (planning / "tasks-done" / "2025-01" / "20250101_120000-T-a.md").exists()
+        assert id_to_path(planning, "task", "b").parent.name == "2025-02"
+        assert migrate_done_layout(planning, "monthly") == []
+
+        migrate_done_layout(planning, "flat")
+        assert sorted(os.listdir(planning / "tasks-done")) == [
+            "20250101_120000-T-a.md",
+            "20250215_120000-T-b.md",
+        ]
+
+    def test_cli_command(self, temp_dir):
+        """Test the migrate-done command."""
+        planning = temp_dir / "planning"
+        _write_done(planning, "20250101_120000-T-a.md", "a")
+        env = {"MCP_PLANNING_ROOT": str(planning)}
+
+        result = CliRunner().invoke(cli, ["migrate-done", "--layout", "monthly"], env=env)
+
+        assert result.exit_code == 0, result.output
+        assert "Moved 1 done task file(s) to the monthly layout" in result.output
+        assert (planning / "tasks-done" / "2025-01" / "20250101_120000-T-a.md").exists()
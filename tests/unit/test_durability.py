@@ -0,0 +1,115 @@
+"""Unit tests for the durability modes.
+
+Tests how many fsync calls each mode makes for a batch of writes, that a
+commit group flushes once when it exits, and the server wiring for group
+commits per tool call.
+"""
+
+import os
+
+import pytest
+from fastmcp import Client
+
+from trellis_mcp import durability
+from trellis_mcp.durability import (
+    commit_group,
+    get_durability_mode,
+    set_durability_mode,
+)
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+from trellis_mcp.utils.io_utils import read_markdown, write_markdown
+
+
+@pytest.fixture(autouse=True)
+def _restore_mode():
+    """Put the process back in strict mode after each test."""
+    yield
+    set_durability_mode("strict")
+
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    """Count fsync and syncfs calls."""
+    calls: list[str] = []
+    real_fsync = os.fsync
+
+    def counting_fsync(fd):
+        calls.append("fsync")
+        return real_fsync(fd)
+
+    def counting_syncfs(path):
+        calls.append("syncfs")
+        return True
+
+    monkeypatch.setattr(os, "fsync", counting_fsync)
+    monkeypatch.setattr(durability, "_syncfs", counting_syncfs)
+    return calls
+
+
+def _write_batch(directory, count: int = 5) -> None:
+    for index in range(count):
+        write_markdown(directory / f"T-{index}.md", {"kind": "task", "id": f"T-{index}"}, "Body")
+
+
+class TestDurabilityModes:
+    """Test the flushes made for each mode."""
+
+    def test_strict_fsyncs_every_file_and_directory(self, temp_dir, fsyncs):
+        """Test one file fsync and one directory fsync per write."""
+        _write_batch(temp_dir)
+        assert fsyncs == ["fsync"] * 10
+
+    def test_group_flushes_once_when_the_group_exits(self, temp_dir, fsyncs):
+        """Test that writes inside a group are committed together."""
+        set_durability_mode("group")
+        with commit_group() as group:
+            _write_batch(temp_dir)
+            with commit_group() as inner:
+                assert inner is group
+            assert fsyncs == []
+            assert read_markdown(temp_dir / "T-4.md")[0]["id"] == "T-4"
+        assert fsyncs == ["syncfs"]
+        assert group.committed
+
+        # Writes outside a group are flushed immediately
+        _write_batch(temp_dir, 1)
+        assert fsyncs == ["syncfs", "fsync", "fsync"]
+
+    def test_group_falls_back_to_fsync_per_path(self, temp_dir, fsyncs, monkeypatch):
+        """Test the commit without syncfs."""
+        monkeypatch.setattr(durability, "_syncfs", lambda path: False)
+        set_durability_mode("group")
+        with commit_group():
+            _write_batch(temp_dir, 3)
+        assert fsyncs == ["fsync"] * 4  # three files and their directory
+
+    def test_relaxed_never_fsyncs(self, temp_dir, fsyncs):
+        """Test that relaxed mode leaves flushing to the operating system."""
+        set_durability_mode("relaxed")
+        _write_batch(temp_dir)
+        assert fsyncs == []
+
+    def test_unknown_mode_is_rejected(self):
+        """Test mode validation."""
+        with pytest.raises(ValueError, match="Unknown durability mode"):
+            set_durability_mode("eventual")  # type: ignore[arg-type]
+        assert get_durability_mode() == "strict"
+
+
+@pytest.mark.asyncio
+async def test_server_commits_each_tool_call_as_a_group(temp_dir, fsyncs):
+    """Test the middleware wiring for group mode."""
+    server = create_server(
+        Settings(planning_root=temp_dir / "planning", log_dir=temp_dir / "logs", durability="group")
+    )
+    assert get_durability_mode() == "strict"  # building the server changes nothing
+
+    async with Client(server) as client:
+        assert get_durability_mode() == "group"
+        fsyncs.clear()
+        await client.call_tool(
+            "createObject", {"kind": "task", "title": "Grouped", "projectRoot": str(temp_dir)}
+        )
+        assert fsyncs == ["syncfs"]
+    assert get_durability_mode() == "strict"
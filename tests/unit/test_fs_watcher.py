@@ -0,0 +1,366 @@
+"""Unit tests for the invalidation bus and the planning root watchers.
+
+Tests listener fan-out, inotify and polling change detection, and that warm
+reads of watched files skip stat validation while still seeing external and
+in-process edits.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import cast
+
+import pytest
+
+from trellis_mcp.children.cache import ChildrenCache
+from trellis_mcp.fs_watcher import (
+    InotifyWatcher,
+    PlanningWatcher,
+    PollingWatcher,
+    create_watcher,
+    inotify_available,
+)
+from trellis_mcp.invalidation import InvalidationBus, get_invalidation_bus
+from trellis_mcp.markdown_loader import load_markdown
+from trellis_mcp.parse_cache import FileFingerprint, clear_parse_cache
+from trellis_mcp.utils.io_utils import write_markdown
+from trellis_mcp.validation.cache import DependencyGraphCache
+from trellis_mcp.validation.graph_operations import build_prerequisites_graph
+from trellis_mcp.validation.object_loader import get_all_objects
+
+requires_inotify = pytest.mark.skipif(not inotify_available(), reason="inotify not available")
+
+
+class _Recorder:
+    """Listener that records published paths and signals waiters."""
+
+    def __init__(self):
+        self.paths: list[str] = []
+        self._changed = threading.Condition()
+
+    def __call__(self, path: str) -> None:
+        with self._changed:
+            self.paths.append(path)
+            self._changed.notify_all()
+
+    def wait_for(self, path: Path, timeout: float = 5.0) -> bool:
+        with self._changed:
+            return self._changed.wait_for(lambda: str(path) in self.paths, timeout)
+
+
+def _write(path: Path, title: str) -> None:
+    """Write a task file the way an editor would, bypassing Trellis."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\nkind: task\nid: T-a\ntitle: {title}\nstatus: open\n---\nBody\n")
+
+
+class TestInvalidationBus:
+    """Test the bus in isolation."""
+
+    def test_publish_fans_out_and_drops_collected_listeners(self, temp_dir):
+        """Test that bound-method listeners are held weakly."""
+        bus = InvalidationBus()
+        recorder = _Recorder()
+        bus.subscribe(recorder)
+        cache = ChildrenCache()
+        bus.subscribe(cache.invalidate_path)
+
+        bus.publish(temp_dir / "a.md")
+        assert recorder.paths == [str(temp_dir / "a.md")]
+
+        del cache
+        bus.publish(temp_dir / "b.md")
+        assert len(bus._listeners) == 1
+
+    def test_watched_roots_are_reference_counted(self, temp_dir):
+        """Test coverage checks for nested paths."""
+        bus = InvalidationBus()
+        bus.add_watched_root(temp_dir / "planning")
+        bus.add_watched_root(temp_dir / "planning")
+
+        assert bus.is_watched(str(temp_dir / "planning" / "tasks-open" / "T-a.md"))
+        assert not bus.is_watched(str(temp_dir / "planning-old" / "T-a.md"))
+
+        bus.remove_watched_root(temp_dir / "planning")
+        assert bus.is_watched(str(temp_dir / "planning"))
+        bus.remove_watched_root(temp_dir / "planning")
+        assert not bus.is_watched(str(temp_dir / "planning"))
+
+
+@requires_inotify
+class TestInotifyWatcher:
+    """Test the inotify backend against real filesystem events."""
+
+    def test_publishes_file_edits_and_files_in_new_directories(self, temp_dir):
+        """Test recursive watching, including directories created later."""
+        planning = temp_dir / "planning"
+        (planning / "tasks-open").mkdir(parents=True)
+        bus = InvalidationBus()
+        recorder = _Recorder()
+        bus.subscribe(recorder)
+        watcher = InotifyWatcher(planning, bus)
+        watcher.start()
+        try:
+            assert bus.is_watched(str(planning / "tasks-open" / "T-a.md"))
+
+            task = planning / "tasks-open" / "T-a.md"
+            _write(task, "First")
+            assert recorder.wait_for(task)
+
+            nested = planning / "projects" / "P-a" / "epics" / "E-b" / "epic.md"
+            nested.parent.mkdir(parents=True)
+            nested.write_text("---\nkind: epic\n---\n")
+            assert recorder.wait_for(planning / "projects")
+            deadline = time.monotonic() + 5
+            while str(nested.parent) not in watcher._dirs.values():
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            nested.write_text("---\nkind: epic\ntitle: Edited\n---\n")
+            assert recorder.wait_for(nested)
+
+            (planning / "notes.txt").write_text("ignored")
+            (planning / ".trellis").mkdir()
+            time.sleep(0.1)
+            assert str(planning / "notes.txt") not in recorder.paths
+        finally:
+            watcher.stop()
+        assert not bus.is_watched(str(planning))
+        assert recorder.paths[-1] == str(planning)
+
+    def test_warm_reads_skip_stat_and_see_external_edits(self, temp_dir, monkeypatch):
+        """Test the zero-stat read path end to end with the global bus."""
+        clear_parse_cache()
+        planning = temp_dir / "planning"
+        task = planning / "tasks-open" / "T-a.md"
+        _write(task, "First")
+
+        recorder = _Recorder()
+        get_invalidation_bus().subscribe(recorder)
+        watcher = create_watcher(planning)
+        watcher.acquire()
+        try:
+            load_markdown(task)  # parse and cache as trusted
+
+            real_stat = os.stat
+            stats: list[str] = []
+
+            def counting_stat(path, *args, **kwargs):
+                if str(path) == str(task):
+                    stats.append(str(path))
+                return real_stat(path, *args, **kwargs)
+
+            monkeypatch.setattr(os, "stat", counting_stat)
+            for _ in range(3):
+                assert load_markdown(task)[0]["title"] == "First"
+            assert stats == []
+
+            # An editor rewrites the file in place
+            _write(task, "Second")
+            assert recorder.wait_for(task)
+            assert load_markdown(task)[0]["title"] == "Second"
+
+            # Trellis' own writes invalidate before returning, without waiting for inotify
+            write_markdown(task, {"kind": "task", "id": "T-a", "title": "Third"}, "Body")
+            assert load_markdown(task)[0]["title"] == "Third"
+        finally:
+            watcher.release()
+            monkeypatch.undo()
+            clear_parse_cache()
+
+
+class TestPollingWatcher:
+    """Test the directory-mtime sweep used when inotify is unavailable."""
+
+    def test_sweep_detects_new_removed_and_in_place_edits(self, temp_dir):
+        """Test what a cheap sweep and a full sweep each detect."""
+        planning = temp_dir / "planning"
+        task = planning / "tasks-open" / "T-a.md"
+        _write(task, "First")
+
+        bus = InvalidationBus()
+        recorder = _Recorder()
+        bus.subscribe(recorder)
+        watcher = PollingWatcher(planning, bus, interval=60)
+        watcher.start()
+        try:
+            # Sweeps lag behind edits, so caches keep validating with stat
+            assert not bus.is_watched(str(planning))
+            added = planning / "tasks-open" / "T-b.md"
+            _write(added, "New")
+            watcher.sweep()
+            assert str(added) in recorder.paths
+            assert str(task) not in recorder.paths
+
+            # In-place edit that keeps the directory mtime: only a full sweep sees it
+            dir_mtime = os.stat(task.parent).st_mtime_ns
+            _write(task, "Edited title")
+            os.utime(task.parent, ns=(dir_mtime, dir_mtime))
+            watcher.sweep()
+            assert str(task) not in recorder.paths
+            watcher.sweep(full=True)
+            assert str(task) in recorder.paths
+
+            added.unlink()
+            recorder.paths.clear()
+            watcher.sweep()
+            assert recorder.paths == [str(added)]
+        finally:
+            watcher.stop()
+
+    def test_base_class_is_abstract(self, temp_dir):
+        """Test that a watcher without a loop cannot be created."""
+        with pytest.raises(TypeError, match="abstract"):
+            PlanningWatcher(temp_dir)  # type: ignore[abstract]
+
+    def test_create_watcher_honours_backend(self, temp_dir):
+        """Test explicit backend selection."""
+        assert isinstance(create_watcher(temp_dir, backend="polling"), PollingWatcher)
+        if inotify_available():
+            assert isinstance(create_watcher(temp_dir), InotifyWatcher)
+
+
+class TestCacheInvalidation:
+    """Test that caches drop entries for published paths."""
+
+    def test_children_cache_drops_parents_of_changed_paths(self, temp_dir):
+        """Test that a new child file invalidates its parent's entry."""
+        bus = get_invalidation_bus()
+        cache = ChildrenCache()
+        feature = temp_dir / "planning" / "projects" / "P-a" / "epics" / "E-b" / "epic.md"
+        other = temp_dir / "planning" / "projects" / "P-c" / "project.md"
+        cache.set_children(feature, [])
+        cache.set_children(other, [])
+
+        bus.publish(feature.parent / "features" / "F-new" / "feature.md")
+        assert cache.get_children(feature) is None
+        assert cache.get_children(other) == []
+
+
+def _task_yaml(task_id: str, prerequisites: list[str], title: str = "Task") -> dict:
+    return {
+        "kind": "task",
+        "id": task_id,
+        "parent": None,
+        "status": "open",
+        "title": title,
+        "priority": "normal",
+        "prerequisites": prerequisites,
+        "worktree": None,
+        "created": "2025-01-01T12:00:00Z",
+        "updated": "2025-01-01T12:00:00Z",
+        "schema_version": "1.1",
+    }
+
+
+class TestDependencyGraphInvalidation:
+    """Test that published paths only replace the graph entries they affect."""
+
+    @pytest.fixture
+    def watched(self, temp_dir):
+        """Watched planning tree with two standalone tasks and a cached graph."""
+        planning = temp_dir / "planning"
+        for task_id, prerequisites in [("a", []), ("b", ["T-a"])]:
+            write_markdown(
+                planning / f"tasks-open/T-{task_id}.md", _task_yaml(task_id, prerequisites), ""
+            )
+        bus = get_invalidation_bus()
+        bus.add_watched_root(planning)
+        cache = DependencyGraphCache()
+        generation = cache.generation
+        objects, fingerprints = cast(
+            tuple[dict, dict[str, FileFingerprint]], get_all_objects(planning, include_mtimes=True)
+        )
+        cache.cache_graph(
+            planning,
+            build_prerequisites_graph(objects),
+            fingerprints,
+            trusted_generation=generation,
+        )
+        try:
+            yield planning, cache
+        finally:
+            bus.remove_watched_root(planning)
+
+    def test_edits_replace_single_entries(self, watched):
+        """Test unchanged prerequisites, a changed entry and a new file."""
+        planning, cache = watched
+        graph = cache.get_valid_graph(planning)
+        assert graph == {"a": [], "b": ["a"]}
+
+        write_markdown(planning / "tasks-open/T-a.md", _task_yaml("a", [], "Renamed"), "")
+        assert cache.get_valid_graph(planning) is graph
+
+        write_markdown(planning / "tasks-open/T-a.md", _task_yaml("a", ["T-c"]), "")
+        write_markdown(planning / "tasks-open/T-c.md", _task_yaml("c", ["T-b"]), "")
+        assert cache.get_valid_graph(planning) == {"a": ["c"], "b": ["a"], "c": ["b"]}
+        assert cache.get_valid_graph(planning) is not graph
+
+    def test_moved_file_keeps_graph_and_removed_file_rebuilds(self, watched):
+        """Test a completion-style move and a plain deletion."""
+        planning, cache = watched
+        done = planning / "tasks-done/20250102_120000-T-a.md"
+        write_markdown(done, _task_yaml("a", []), "")
+        (planning / "tasks-open/T-a.md").unlink()
+        get_invalidation_bus().publish(planning / "tasks-open/T-a.md")
+        assert cache.get_valid_graph(planning) == {"a": [], "b": ["a"]}
+
+        done.unlink()
+        get_invalidation_bus().publish(done)
+        assert cache.get_valid_graph(planning) is None
+
+    def test_concurrent_publishes_and_lookups(self, watched):
+        """Test that lookups racing with publishes never fail."""
+        planning, cache = watched
+        task = str(planning / "tasks-open/T-a.md")
+        errors = []
+
+        def publish():
+            for _ in range(500):
+                cache.invalidate_path(task)
+
+        def look_up():
+            try:
+                for _ in range(500):
+                    cache.get_valid_graph(planning)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=publish), threading.Thread(target=look_up)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert cache.get_valid_graph(planning) == {"a": [], "b": ["a"]}
+
+
+@requires_inotify
+@pytest.mark.asyncio
+async def test_server_watches_planning_root_while_sessions_are_open(temp_dir):
+    """Test the server lifespan wiring for the watch setting."""
+    from fastmcp import Client
+
+    from trellis_mcp.server import create_server
+    from trellis_mcp.settings import Settings
+
+    planning = temp_dir / "planning"
+    server = create_server(
+        Settings(
+            planning_root=planning,
+            log_dir=temp_dir / "logs",
+            watch_planning_root=True,
+            watch_backend="inotify",
+        )
+    )
+    bus = get_invalidation_bus()
+
+    assert not bus.is_watched(str(planning))
+    async with Client(server) as client:
+        assert bus.is_watched(str(planning))
+        await client.call_tool(
+            "createObject", {"kind": "task", "title": "Watched", "projectRoot": str(temp_dir)}
+        )
+        listing = (await client.call_tool("listBacklog", {"projectRoot": str(temp_dir)})).data
+        assert [task["title"] for task in listing["tasks"]] == ["Watched"]
+    assert not bus.is_watched(str(planning))
@@ -0,0 +1,257 @@
+"""Unit tests for the generation stamp and cross-process cache coherence.
+
+Tests that recording a change moves the stamp, that a tracker replays
+changes written by another process onto the caches, and that warm reads
+between changes skip stat validation.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastmcp import Client
+
+from trellis_mcp.backlog_index import get_backlog_index
+from trellis_mcp.change_feed import (
+    ChangeFeed,
+    clear_change_feeds,
+    generation_stamp_path,
+)
+from trellis_mcp.coherence import StampCoherence, StampCoherenceMiddleware
+from trellis_mcp.invalidation import InvalidationBus, get_invalidation_bus
+from trellis_mcp.markdown_loader import load_markdown
+from trellis_mcp.parse_cache import clear_parse_cache
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+from trellis_mcp.utils.io_utils import write_markdown
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    """Drop feeds and parsed files cached by earlier tests."""
+    clear_change_feeds()
+    clear_parse_cache()
+    yield
+    clear_change_feeds()
+    clear_parse_cache()
+
+
+def _write(path: Path, title: str) -> None:
+    """Write a task file directly, as another process would."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\nkind: task\nid: T-a\ntitle: {title}\nstatus: open\n---\nBody\n")
+
+
+class _Recorder(list):
+    """Listener that records published paths."""
+
+    def __call__(self, path: str) -> None:
+        self.append(path)
+
+
+class TestGenerationStamp:
+    """Test the stamp written by the change feed."""
+
+    def test_each_record_moves_the_stamp_without_extra_files(self, temp_dir):
+        """Test that the journal's identity changes per change, and nothing else is written."""
+        planning = temp_dir / "planning"
+        stamp = generation_stamp_path(planning)
+        assert not stamp.exists()
+
+        def identity() -> tuple[int, int]:
+            stat_result = os.stat(stamp)
+            return (stat_result.st_ino, stat_result.st_size)
+
+        feed = ChangeFeed(planning)
+        feed.record("created", "task", "T-a", "tasks-open/T-a.md")
+        first = identity()
+        ChangeFeed(planning).record("updated", "task", "T-a", "tasks-open/T-a.md")
+        assert identity() != first
+        assert sorted(os.listdir(planning / ".trellis")) == ["changes.jsonl", "changes.lock"]
+
+        # Trimming replaces the journal, which also moves the stamp
+        trimmed = ChangeFeed(planning, journal_max_entries=2)
+        before = identity()
+        trimmed.record("updated", "task", "T-a", "tasks-open/T-a.md")
+        assert identity() != before
+
+
+class TestStampCoherence:
+    """Test replaying changes from other processes."""
+
+    def test_sync_publishes_paths_changed_since_last_sync(self, temp_dir):
+        """Test publishing and the single-stat no-op."""
+        planning = temp_dir / "planning"
+        bus = InvalidationBus()
+        published = _Recorder()
+        bus.subscribe(published)
+        coherence = StampCoherence(planning, bus)
+        coherence.acquire()
+        try:
+            assert bus.is_watched(str(planning / "tasks-open" / "T-a.md"))
+            assert coherence.sync() == 0
+
+            other = ChangeFeed(planning)
+            other.record("created", "task", "T-a", "tasks-open/T-a.md")
+            other.record("created", "task", "T-b", "tasks-open/T-b.md")
+            assert coherence.sync() == 2
+            assert published == [
+                str(planning / "tasks-open" / "T-a.md"),
+                str(planning / "tasks-open" / "T-b.md"),
+            ]
+            assert coherence.sync() == 0
+            assert coherence.syncs == 1
+        finally:
+            coherence.release()
+        assert not bus.is_watched(str(planning))
+        assert published[-1] == str(planning)
+
+    def test_warm_reads_skip_stat_until_another_process_writes(self, temp_dir, monkeypatch):
+        """Test the zero-stat read path against a write from another feed instance."""
+        planning = temp_dir / "planning"
+        task = planning / "tasks-open" / "T-a.md"
+        _write(task, "First")
+
+        coherence = StampCoherence(planning)
+        coherence.acquire()
+        try:
+            load_markdown(task)  # parse and cache as trusted
+
+            real_stat = os.stat
+            stats: list[str] = []
+
+            def counting_stat(path, *args, **kwargs):
+                if str(path) == str(task):
+                    stats.append(str(path))
+                return real_stat(path, *args, **kwargs)
+
+            monkeypatch.setattr(os, "stat", counting_stat)
+            for _ in range(3):
+                coherence.sync()
+                assert load_markdown(task)[0]["title"] == "First"
+            assert stats == []
+
+            # Another process rewrites the file and records the change
+            _write(task, "Second")
+            ChangeFeed(planning).record("updated", "task", "T-a", "tasks-open/T-a.md")
+            assert load_markdown(task)[0]["title"] == "First"  # not synced yet
+            assert coherence.sync() == 1
+            assert load_markdown(task)[0]["title"] == "Second"
+        finally:
+            coherence.release()
+            monkeypatch.undo()
+
+    def test_task_completed_by_another_process_leaves_its_open_path(self, temp_dir):
+        """Test that a move publishes its source path, so the task is not listed twice."""
+        planning = temp_dir / "planning"
+        write_markdown(
+            planning / "tasks-open" / "T-moved.md",
+            {
+                "kind": "task",
+                "id": "T-moved",
+                "parent": None,
+                "status": "in-progress",
+                "title": "Moved",
+                "priority": "normal",
+                "prerequisites": [],
+                "created": "2025-01-01T00:00:00Z",
+                "updated": "2025-01-01T00:00:00Z",
+                "schema_version": "1.1",
+            },
+            "Body",
+        )
+
+        coherence = StampCoherence(planning)
+        coherence.acquire()
+        try:
+            columns = get_backlog_index().columns(planning)
+            assert columns.columns["status"] == ("in-progress",)
+
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "import sys; from trellis_mcp.complete_task import complete_task; "
+                    "complete_task(sys.argv[1], 'T-moved')",
+                    str(planning),
+                ],
+                capture_output=True,
+                text=True,
+                timeout=120,
+            )
+            assert result.returncode == 0, result.stderr
+
+            assert coherence.sync() == 2
+            columns = get_backlog_index().columns(planning)
+            assert list(zip(columns.columns["id"], columns.columns["status"])) == [
+                ("T-moved", "done")
+            ]
+        finally:
+            coherence.release()
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_stops_trust_until_the_stamp_reads_again(temp_dir, monkeypatch):
+    """Test the middleware's failure path and the restart on the next request."""
+    planning = temp_dir / "planning"
+    bus = InvalidationBus()
+    coherence = StampCoherence(planning, bus)
+    middleware = StampCoherenceMiddleware(coherence)
+    task_path = str(planning / "tasks-open" / "T-a.md")
+
+    async def call_next(context):
+        return bus.is_watched(task_path)
+
+    coherence.acquire()
+    try:
+        ChangeFeed(planning).record("created", "task", "T-a", "tasks-open/T-a.md")
+
+        def unreadable(self, since_generation, limit=None, collapse=True):
+            raise OSError("journal unreadable")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(ChangeFeed, "changes_since", unreadable)
+            assert await middleware.on_request(None, call_next) is False  # type: ignore[arg-type]
+            assert not coherence.running
+
+        # The journal reads again: tracking resumes from the current generation
+        assert await middleware.on_request(None, call_next) is True  # type: ignore[arg-type]
+        assert coherence.running
+        ChangeFeed(planning).record("updated", "task", "T-a", "tasks-open/T-a.md")
+        assert coherence.sync() == 1
+    finally:
+        coherence.release()
+    assert not bus.is_watched(task_path)
+
+
+@pytest.mark.asyncio
+async def test_server_syncs_before_each_request(temp_dir):
+    """Test the lifespan and middleware wiring for the setting."""
+    planning = temp_dir / "planning"
+    server = create_server(
+        Settings(planning_root=planning, log_dir=temp_dir / "logs", trust_generation_stamp=True)
+    )
+    bus = get_invalidation_bus()
+
+    assert not bus.is_watched(str(planning))
+    async with Client(server) as client:
+        assert bus.is_watched(str(planning))
+        await client.call_tool(
+            "createObject", {"kind": "task", "title": "Mine", "projectRoot": str(temp_dir)}
+        )
+        listing = (await client.call_tool("listBacklog", {"projectRoot": str(temp_dir)})).data
+        assert [task["title"] for task in listing["tasks"]] == ["Mine"]
+
+        # A standalone task written by another process shows up on the next request
+        other = planning / "tasks-open" / "T-theirs.md"
+        other.write_text(
+            "---\nkind: task\nid: T-theirs\ntitle: Theirs\nstatus: open\npriority: normal\n"
+            "prerequisites: []\ncreated: '2025-01-01T00:00:00'\nupdated: '2025-01-01T00:00:00'\n"
+            "schema_version: '1.1'\n---\n"
+        )
+        ChangeFeed(planning).record("created", "task", "T-theirs", "tasks-open/T-theirs.md")
+        listing = (await client.call_tool("listBacklog", {"projectRoot": str(temp_dir)})).data
+        assert sorted(task["title"] for task in listing["tasks"]) == ["Mine", "Theirs"]
+    assert not bus.is_watched(str(planning))
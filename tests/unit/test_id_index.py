@@ -0,0 +1,227 @@
+"""Unit tests for the ID index and the resolveId tool.
+
+Tests trie completion and edit-distance search, reading IDs from every
+layout of the planning tree, re-listing only changed directories, and the
+suggestions in resolveId, getObject and claimNextTask.
+"""
+
+import os
+
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+from trellis_mcp.id_index import IdIndex, IdTrie, did_you_mean
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+
+OLD_MTIME_NS = 1_600_000_000 * 10**9
+
+FILES = [
+    "projects/P-web-app/project.md",
+    "projects/P-web-app/epics/E-auth/epic.md",
+    "projects/P-web-app/epics/E-auth/features/F-login/feature.md",
+    "projects/P-web-app/epics/E-auth/features/F-login/tasks-open/T-implement-auth.md",
+    "projects/P-web-app/epics/E-auth/features/F-login/tasks-done/20250101_120000-T-add-form.md",
+    "tasks-open/T-implement-authz.md",
+    "tasks-done/2025-01/20250102_120000-T-write-docs.md",
+]
+
+
+@pytest.fixture
+def planning(temp_dir):
+    """Planning tree with one object of each kind, standalone and sharded tasks."""
+    root = temp_dir / "planning"
+    for name in FILES:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("---\n---\n")
+    _age(root)
+    return root
+
+
+def _age(root):
+    """Move every directory's mtime out of the recently-modified window."""
+    for directory, _, _ in os.walk(root):
+        os.utime(directory, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+
+
+class TestIdTrie:
+    """Test the trie on its own."""
+
+    def test_complete_shortened_parts(self):
+        """Test that every part of a query may be shortened."""
+        trie = IdTrie()
+        for word in ["implement-auth", "implement-authz", "impl-auth-flow", "import-data"]:
+            trie.add(word)
+
+        assert sorted(trie.complete("impl-auth")) == [
+            "impl-auth-flow",
+            "implement-auth",
+            "implement-authz",
+        ]
+        assert sorted(trie.complete("im")) == sorted(
+            ["implement-auth", "implement-authz", "impl-auth-flow", "import-data"]
+        )
+        assert trie.complete("i-d") == ["import-data"]
+        assert trie.complete("auth") == []
+
+    def test_similar(self):
+        """Test edit-distance search."""
+        trie = IdTrie()
+        for word in ["implement-auth", "implement-authz", "login"]:
+            trie.add(word)
+
+        assert sorted(trie.similar("implemnt-auth", 2)) == [
+            ("implement-auth", 1),
+            ("implement-authz", 2),
+        ]
+        assert trie.similar("lgoin", 2) == [("login", 2)]
+        assert trie.similar("lgoin", 1) == []
+
+    def test_reference_counting(self):
+        """Test that a word added twice stays until discarded twice."""
+        trie = IdTrie()
+        trie.add("auth")
+        trie.add("auth")
+        trie.add("authz")
+
+        trie.discard("auth")
+        assert "auth" in trie
+        trie.discard("auth")
+        assert "auth" not in trie
+        assert "authz" in trie
+        assert len(trie) == 1
+        trie.discard("missing")
+        assert len(trie) == 1
+
+
+class TestIdIndex:
+    """Test the index over a planning tree."""
+
+    def test_reads_every_layout(self, planning):
+        """Test IDs of every kind, standalone and sharded done tasks."""
+        tries = IdIndex().tries(planning)
+
+        assert "web-app" in tries["project"]
+        assert "auth" in tries["epic"]
+        assert "login" in tries["feature"]
+        assert sorted(tries["task"].complete("")) == [
+            "add-form",
+            "implement-auth",
+            "implement-authz",
+            "write-docs",
+        ]
+
+    def test_resolve_order(self, planning):
+        """Test exact matches first, then completions, then similar IDs."""
+        index = IdIndex()
+
+        assert [
+            (m["id"], m["match"], m["distance"]) for m in index.resolve(planning, "T-impl-auth")
+        ] == [
+            ("T-implement-auth", "prefix", 5),
+            ("T-implement-authz", "prefix", 6),
+        ]
+        assert [m["id"] for m in index.resolve(planning, "T-implement-auth")] == [
+            "T-implement-auth",
+            "T-implement-authz",
+        ]
+        assert index.resolve(planning, "T-implement-auth")[0]["match"] == "exact"
+        assert [m["id"] for m in index.resolve(planning, "T-wirte-docs")] == ["T-write-docs"]
+        # Unprefixed IDs are looked up in every kind
+        assert [m["id"] for m in index.resolve(planning, "auth")] == ["E-auth"]
+        assert index.resolve(planning, "T-") == []
+
+    def test_relists_only_changed_directories(self, planning):
+        """Test that a new file costs one listing and a removed one is dropped."""
+        index = IdIndex()
+        index.tries(planning)
+        listings = index.listings
+
+        assert index.resolve(planning, "T-refactor") == []
+        assert index.listings == listings
+
+        tasks_open = planning / "tasks-open"
+        (tasks_open / "T-refactor-db.md").write_text("---\n---\n")
+        os.utime(tasks_open, ns=(OLD_MTIME_NS + 1, OLD_MTIME_NS + 1))
+        assert [m["id"] for m in index.resolve(planning, "T-refactor")] == ["T-refactor-db"]
+        assert index.listings == listings + 1
+
+        (tasks_open / "T-refactor-db.md").unlink()
+        os.utime(tasks_open, ns=(OLD_MTIME_NS + 2, OLD_MTIME_NS + 2))
+        assert index.resolve(planning, "T-refactor") == []
+
+    def test_published_paths_are_relisted(self, planning):
+        """Test that a published file re-lists its directory even with an unchanged mtime."""
+        index = IdIndex()
+        index.tries(planning)
+
+        feature = planning / "projects/P-web-app/epics/E-auth/features/F-login/tasks-open"
+        (feature / "T-logout.md").write_text("---\n---\n")
+        os.utime(feature, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+        assert index.resolve(planning, "T-logout") == []
+
+        index.invalidate_path(str(feature / "T-logout.md"))
+        assert index.resolve(planning, "T-logout")[0]["match"] == "exact"
+
+    def test_removed_directory(self, planning):
+        """Test that a removed feature drops its IDs."""
+        index = IdIndex()
+        index.tries(planning)
+
+        features = planning / "projects/P-web-app/epics/E-auth/features"
+        for path in sorted(features.rglob("*"), reverse=True):
+            path.unlink() if path.is_file() else path.rmdir()
+        os.utime(features, ns=(OLD_MTIME_NS + 1, OLD_MTIME_NS + 1))
+
+        tries = index.tries(planning)
+        assert "login" not in tries["feature"]
+        assert "implement-auth" not in tries["task"]
+        assert "implement-authz" in tries["task"]
+
+
+def test_did_you_mean(planning):
+    """Test the error message hint."""
+    assert did_you_mean(planning, "T-impl-auth") == (
+        " (did you mean T-implement-auth, T-implement-authz?)"
+    )
+    assert did_you_mean(planning, "T-nothing-like-it") == ""
+
+
+@pytest.mark.asyncio
+async def test_tools(planning, temp_dir):
+    """Test resolveId and the hints in getObject and claimNextTask errors."""
+    server = create_server(Settings(planning_root=planning, log_dir=temp_dir / "logs"))
+
+    async with Client(server) as client:
+        result = await client.call_tool(
+            "resolveId", {"projectRoot": str(temp_dir), "id": "T-impl-auth", "limit": 1}
+        )
+        assert result.data == {
+            "id": "T-impl-auth",
+            "exists": False,
+            "matches": [
+                {"id": "T-implement-auth", "kind": "task", "match": "prefix", "distance": 5}
+            ],
+        }
+
+        result = await client.call_tool(
+            "resolveId", {"projectRoot": str(temp_dir), "id": "login", "kind": "feature"}
+        )
+        assert result.data["exists"] is True
+
+        with pytest.raises(ToolError, match="Invalid kind 'story'"):
+            await client.call_tool(
+                "resolveId", {"projectRoot": str(temp_dir), "id": "login", "kind": "story"}
+            )
+
+        with pytest.raises(
+            ToolError, match=r"\(did you mean T-implement-auth, T-implement-authz\?\)"
+        ):
+            await client.call_tool("getObject", {"projectRoot": str(temp_dir), "id": "T-impl-auth"})
+
+        with pytest.raises(ToolError, match=r"\(did you mean T-write-docs\?\)"):
+            await client.call_tool(
+                "claimNextTask", {"projectRoot": str(temp_dir), "taskId": "T-write-doc"}
+            )
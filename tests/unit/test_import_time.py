@@ -0,0 +1,117 @@
+"""Import-time budget tests for the CLI.
+
+Hooks run `trellis-mcp backlog` and `complete` many times a day, so the CLI
+must not pull in fastmcp or the full validation stack on startup. Each check
+runs in a fresh interpreter so module caches from the test session do not
+hide regressions.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+
+from trellis_mcp.bench import TreeShape, generate_tree
+
+# Modules that only `serve`, `delete`, `profile` and the benchmarks need
+SERVER_ONLY_MODULES = ("fastmcp", "mcp", "trellis_mcp.server", "trellis_mcp.tools")
+
+# Modules that only `profile`, `bench` and `load-test` need
+BENCH_ONLY_MODULES = (
+    "trellis_mcp.bench.load_test",
+    "trellis_mcp.bench.suite",
+    "trellis_mcp.bench.tree_generator",
+    "trellis_mcp.profiling",
+    "multiprocessing",
+)
+
+# Cumulative import time allowed for trellis_mcp.cli (eager imports took ~1.6s)
+IMPORT_BUDGET_SECONDS = float(os.environ.get("TRELLIS_IMPORT_BUDGET_SECONDS", "1.0"))
+
+_RUN_CLI = """
+import json, sys
+from trellis_mcp.cli import cli
+try:
+    cli(sys.argv[1:], standalone_mode=False)
+finally:
+    heavy = [m for m in {modules!r} if m in sys.modules]
+    print("LOADED=" + json.dumps(heavy))
+"""
+
+
+def _run_cli(args: list[str], cwd, env: dict[str, str] | None = None) -> list[str]:
+    """Run the CLI in a fresh interpreter and return the server-only modules it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-c", _RUN_CLI.format(modules=SERVER_ONLY_MODULES), *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        env={**os.environ, **(env or {})},
+        timeout=120,
+    )
+    match = re.search(r"^LOADED=(.*)$", result.stdout, re.MULTILINE)
+    assert match, result.stdout + result.stderr
+    return json.loads(match.group(1))
+
+
+def test_help_does_not_load_server_modules(temp_dir):
+    """Test that `--help` stays clear of fastmcp and the server."""
+    assert _run_cli(["--help"], cwd=temp_dir) == []
+
+
+def test_backlog_does_not_load_server_modules(temp_dir):
+    """Test that `backlog` over a real tree stays clear of fastmcp and the server."""
+    planning_root = temp_dir / "planning"
+    generate_tree(planning_root, TreeShape(projects=1, standalone_tasks=5))
+
+    loaded = _run_cli(["backlog"], cwd=temp_dir, env={"MCP_PLANNING_ROOT": str(planning_root)})
+    assert loaded == []
+
+
+def test_cli_import_does_not_load_bench_modules(temp_dir):
+    """Test that importing the CLI leaves the profiling and benchmark modules unloaded.
+
+    A wall-clock budget is too coarse to catch one eager import of these.
+    """
+    check = (
+        "import json, sys, trellis_mcp.cli; "
+        f"print(json.dumps([m for m in {BENCH_ONLY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", check], capture_output=True, text=True, cwd=temp_dir, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout) == []
+
+
+def test_cli_import_time_within_budget(temp_dir):
+    """Test that the cumulative import time of trellis_mcp.cli stays within budget."""
+    timings = []
+    for _ in range(3):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import trellis_mcp.cli"],
+            capture_output=True,
+            text=True,
+            cwd=temp_dir,
+            timeout=120,
+        )
+        match = re.search(
+            r"^import time:\s*\d+ \|\s*(\d+) \| trellis_mcp\.cli$", result.stderr, re.M
+        )
+        assert match, result.stderr[-2000:]
+        timings.append(int(match.group(1)) / 1_000_000)
+
+    assert min(timings) <= IMPORT_BUDGET_SECONDS, (
+        f"import trellis_mcp.cli took {min(timings):.3f}s "
+        f"(budget {IMPORT_BUDGET_SECONDS}s); check for new eager imports"
+    )
+
+
+def test_lazy_exports_resolve():
+    """Test that every public name has a lazy import entry that resolves."""
+    import trellis_mcp
+
+    assert set(trellis_mcp._LAZY_IMPORTS) == set(trellis_mcp.__all__)
+    for name in trellis_mcp.__all__:
+        assert getattr(trellis_mcp, name) is not None
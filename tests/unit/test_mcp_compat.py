@@ -0,0 +1,62 @@
+"""Unit tests for the FastMCP compatibility shim.
+
+Runs the resource subscription hooks against the installed FastMCP, so an
+upgrade that moves the low-level server or its handlers fails here rather
+than leaving subscribers without notifications.
+"""
+
+from contextlib import asynccontextmanager
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from trellis_mcp.mcp_compat import enable_resource_subscriptions
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_reach_the_handlers_with_session_and_lifespan_context():
+    """Test capability advertisement and handler arguments over an in-memory client."""
+    handle = object()
+
+    @asynccontextmanager
+    async def lifespan(_server):
+        yield handle
+
+    server = FastMCP("compat", lifespan=lifespan)
+
+    @server.resource("test://value")
+    def value() -> str:
+        return "value"
+
+    calls: list[tuple[str, str, object]] = []
+
+    async def on_subscribe(uri, session, context):
+        calls.append(("subscribe", uri, context))
+        assert session is not None
+
+    async def on_unsubscribe(uri, session, context):
+        calls.append(("unsubscribe", uri, context))
+
+    enable_resource_subscriptions(server, on_subscribe, on_unsubscribe)
+
+    async with Client(server) as client:
+        capabilities = client.initialize_result.capabilities
+        assert capabilities.resources is not None
+        assert capabilities.resources.subscribe is True
+        await client.session.subscribe_resource("test://value")  # type: ignore[arg-type]
+        await client.session.unsubscribe_resource("test://value")  # type: ignore[arg-type]
+
+    assert calls == [
+        ("subscribe", "test://value", handle),
+        ("unsubscribe", "test://value", handle),
+    ]
+
+
+def test_missing_low_level_server_is_reported():
+    """Test that a server without the private hooks is rejected up front."""
+
+    async def handler(uri, session, context):
+        pass
+
+    with pytest.raises(RuntimeError, match="update trellis_mcp.mcp_compat"):
+        enable_resource_subscriptions(object(), handler, handler)  # type: ignore[arg-type]
@@ -0,0 +1,193 @@
+"""Unit tests for the object map and the getObjects and getTree tools.
+
+Tests resolving IDs and children from the file layout, tree depth limits,
+field projection, and batch retrieval with missing IDs.
+"""
+
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+from trellis_mcp.object_tree import ObjectMap, build_tree
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+from trellis_mcp.utils.io_utils import write_markdown
+
+FEATURE_DIR = "projects/P-web/epics/E-auth/features/F-login"
+
+
+def _object(kind: str, object_id: str, parent: str | None, status: str) -> dict:
+    yaml_dict = {
+        "kind": kind,
+        "id": object_id,
+        "parent": parent,
+        "status": status,
+        "title": f"Title of {object_id}",
+        "priority": "normal",
+        "prerequisites": [],
+        "created": "2025-01-01T12:00:00Z",
+        "updated": "2025-01-01T12:00:00Z",
+        "schema_version": "1.1",
+    }
+    if parent is None:
+        del yaml_dict["parent"]
+    return yaml_dict
+
+
+@pytest.fixture
+def planning(temp_dir):
+    """A project down to tasks, plus a standalone task."""
+    root = temp_dir / "planning"
+    write_markdown(
+        root / "projects/P-web/project.md", _object("project", "web", None, "in-progress"), ""
+    )
+    write_markdown(
+        root / "projects/P-web/epics/E-auth/epic.md",
+        _object("epic", "auth", "P-web", "in-progress"),
+        "",
+    )
+    write_markdown(
+        root / FEATURE_DIR / "feature.md",
+        _object("feature", "login", "E-auth", "in-progress"),
+        "Feature body\n",
+    )
+    write_markdown(
+        root / FEATURE_DIR / "tasks-open/T-form.md",
+        _object("task", "form", "F-login", "open"),
+        "Form body\n",
+    )
+    write_markdown(
+        root / FEATURE_DIR / "tasks-done/20250102_120000-T-api.md",
+        _object("task", "api", "F-login", "done"),
+        "",
+    )
+    write_markdown(
+        root / "tasks-open/T-docs.md", _object("task", "docs", None, "open"), "Docs body\n"
+    )
+    return root
+
+
+def test_object_map_layout():
+    """Test IDs, parents, child order and open tasks winning over done ones."""
+    root = "/planning"
+    object_map = ObjectMap(
+        root,
+        [
+            f"{root}/{FEATURE_DIR}/tasks-open/T-b.md",
+            f"{root}/{FEATURE_DIR}/tasks-done/2025-01/20250102_120000-T-b.md",
+            f"{root}/{FEATURE_DIR}/tasks-done/20250101_120000-T-a.md",
+            f"{root}/{FEATURE_DIR}/feature.md",
+            f"{root}/projects/P-web/epics/E-auth/epic.md",
+            f"{root}/projects/P-web/project.md",
+            f"{root}/tasks-open/T-solo.md",
+        ],
+    )
+
+    assert object_map.children[None] == [("project", "web"), ("task", "solo")]
+    assert object_map.children[("project", "web")] == [("epic", "auth")]
+    assert object_map.children[("epic", "auth")] == [("feature", "login")]
+    assert object_map.children[("feature", "login")] == [("task", "a"), ("task", "b")]
+    assert object_map.paths[("task", "b")] == f"{root}/{FEATURE_DIR}/tasks-open/T-b.md"
+    assert object_map.find("F-login") == ("feature", "login")
+    assert object_map.find("solo") == ("task", "solo")
+    assert object_map.find("E-login") is None
+
+
+def test_build_tree_depth(planning):
+    """Test depth limits and field projection."""
+    paths = [str(path) for path in planning.rglob("*.md")]
+    object_map = ObjectMap(str(planning), paths)
+
+    tree = build_tree(object_map, ("epic", "auth"), 1, ["title"], False)
+    assert tree["id"] == "E-auth"
+    assert tree["yaml"] == {"title": "Title of auth"}
+    [feature] = tree["children"]
+    assert feature["id"] == "F-login"
+    assert feature["has_children"] is True
+    assert "children" not in feature
+
+    tree = build_tree(object_map, ("epic", "auth"), None, ["status"], True)
+    tasks = tree["children"][0]["children"]
+    assert [(task["id"], task["yaml"]["status"]) for task in tasks] == [
+        ("T-api", "done"),
+        ("T-form", "open"),
+    ]
+    assert tasks[1]["body"] == "Form body\n"
+    assert tasks[1]["children"] == []
+
+
+@pytest.mark.asyncio
+async def test_get_objects_tool(planning, temp_dir):
+    """Test batch retrieval, projection and missing IDs."""
+    server = create_server(Settings(planning_root=planning, log_dir=temp_dir / "logs"))
+
+    async with Client(server) as client:
+        result = await client.call_tool(
+            "getObjects",
+            {
+                "projectRoot": str(temp_dir),
+                "ids": ["F-login", "docs", "T-frm", "F-login"],
+                "fields": ["title", "status"],
+                "includeBody": True,
+            },
+        )
+        assert result.data["objects"] == [
+            {
+                "id": "F-login",
+                "kind": "feature",
+                "yaml": {"title": "Title of login", "status": "in-progress"},
+                "body": "Feature body\n",
+            },
+            {
+                "id": "T-docs",
+                "kind": "task",
+                "yaml": {"title": "Title of docs", "status": "open"},
+                "body": "Docs body\n",
+            },
+        ]
+        assert result.data["missing"] == [
+            {"id": "T-frm", "error": "Object not found: T-frm (did you mean T-form?)"}
+        ]
+
+        result = await client.call_tool(
+            "getObjects", {"projectRoot": str(temp_dir), "ids": ["P-web"]}
+        )
+        [project] = result.data["objects"]
+        assert project["yaml"]["kind"] == "project"
+        assert "body" not in project
+
+        with pytest.raises(ToolError, match="At least one object ID is required"):
+            await client.call_tool("getObjects", {"projectRoot": str(temp_dir), "ids": []})
+
+
+@pytest.mark.asyncio
+async def test_get_tree_tool(planning, temp_dir):
+    """Test exporting one object's subtree and the whole planning tree."""
+    server = create_server(Settings(planning_root=planning, log_dir=temp_dir / "logs"))
+
+    async with Client(server) as client:
+        result = await client.call_tool(
+            "getTree", {"projectRoot": str(temp_dir), "fields": ["title"], "depth": 0}
+        )
+        assert result.data == {
+            "roots": [
+                {
+                    "id": "P-web",
+                    "kind": "project",
+                    "yaml": {"title": "Title of web"},
+                    "has_children": True,
+                },
+                {"id": "T-docs", "kind": "task", "yaml": {"title": "Title of docs"}},
+            ]
+        }
+
+        result = await client.call_tool(
+            "getTree", {"projectRoot": str(temp_dir), "rootId": "F-login", "fields": ["status"]}
+        )
+        [feature] = result.data["roots"]
+        assert [task["id"] for task in feature["children"]] == ["T-api", "T-form"]
+
+        with pytest.raises(ToolError, match=r"Object not found: F-logn \(did you mean F-login\?\)"):
+            await client.call_tool("getTree", {"projectRoot": str(temp_dir), "rootId": "F-logn"})
+        with pytest.raises(ToolError, match="Depth cannot be negative"):
+            await client.call_tool("getTree", {"projectRoot": str(temp_dir), "depth": -1})
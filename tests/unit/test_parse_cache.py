@@ -0,0 +1,212 @@
+"""Unit tests for the markdown parse cache.
+
+Tests signature validation, LRU eviction, copy-on-read semantics, the
+integration with load_markdown, and front-matter hash revalidation in the
+parse, children and dependency graph caches.
+"""
+
+import os
+from typing import cast
+
+import pytest
+
+from trellis_mcp.markdown_loader import load_markdown
+from trellis_mcp.parse_cache import (
+    FileFingerprint,
+    ParseCache,
+    clear_parse_cache,
+    file_signature,
+    get_cache_stats,
+    get_parse_cache,
+)
+from trellis_mcp.utils.io_utils import write_markdown
+
+
+@pytest.fixture(autouse=True)
+def _clean_parse_cache():
+    """Start each test with an empty global parse cache."""
+    clear_parse_cache()
+    yield
+    clear_parse_cache()
+
+
+class TestParseCache:
+    """Test ParseCache behaviour in isolation."""
+
+    def test_init_invalid_max_entries(self):
+        """Test cache initialization with invalid max_entries."""
+        with pytest.raises(ValueError, match="Cache max_entries must be positive"):
+            ParseCache(max_entries=0)
+
+    def test_hit_requires_matching_signature(self):
+        """Test that entries are only returned for the recorded signature."""
+        cache = ParseCache()
+        cache.put("/a.md", (1, 100, 10), {"title": "A"}, "body")
+
+        assert cache.get("/a.md", (1, 100, 10)) == ({"title": "A"}, "body")
+        assert cache.get("/a.md", (2, 100, 10)) is None
+        # The stale entry is dropped on mismatch
+        assert cache.get("/a.md", (1, 100, 10)) is None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["size"] == 0
+
+    def test_returned_frontmatter_is_a_copy(self):
+        """Test that callers cannot mutate the cached front-matter."""
+        cache = ParseCache()
+        cache.put("/a.md", (1, 1, 1), {"prerequisites": ["T-x"]}, "")
+
+        frontmatter, _ = cache.get("/a.md", (1, 1, 1)) or ({}, "")
+        frontmatter["prerequisites"].append("T-y")
+
+        assert cache.get("/a.md", (1, 1, 1)) == ({"prerequisites": ["T-x"]}, "")
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ParseCache(max_entries=2)
+        cache.put("/a.md", (1, 1, 1), {}, "a")
+        cache.put("/b.md", (1, 1, 1), {}, "b")
+        cache.get("/a.md", (1, 1, 1))
+        cache.put("/c.md", (1, 1, 1), {}, "c")
+
+        assert cache.get("/b.md", (1, 1, 1)) is None
+        assert cache.get("/a.md", (1, 1, 1)) is not None
+        assert cache.get_stats()["evictions"] == 1
+
+
+class TestLoadMarkdownCaching:
+    """Test that load_markdown reuses and invalidates cached parses."""
+
+    def test_second_load_is_a_cache_hit(self, temp_dir):
+        """Test that unchanged files are not parsed twice."""
+        path = temp_dir / "task.md"
+        write_markdown(path, {"title": "Task", "status": "open"}, "Body\n")
+
+        first = load_markdown(path)
+        second = load_markdown(path)
+
+        assert first == second == ({"title": "Task", "status": "open"}, "Body\n")
+        stats = get_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_atomic_rewrite_invalidates_entry(self, temp_dir):
+        """Test that a same-size rewrite is picked up through the new inode."""
+        path = temp_dir / "task.md"
+        write_markdown(path, {"status": "open"}, "")
+        assert load_markdown(path)[0] == {"status": "open"}
+
+        write_markdown(path, {"status": "done"}, "")
+        assert load_markdown(path)[0] == {"status": "done"}
+
+    def test_in_place_edit_invalidates_entry(self, temp_dir):
+        """Test that editor-style in-place writes are detected through mtime and size."""
+        path = temp_dir / "task.md"
+        path.write_text("---\ntitle: Old\n---\n")
+        assert load_markdown(path)[0] == {"title": "Old"}
+
+        path.write_text("---\ntitle: Newer\n---\n")
+        assert load_markdown(path)[0] == {"title": "Newer"}
+
+    def test_missing_file_raises(self, temp_dir):
+        """Test that missing files still raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError, match="Markdown file not found"):
+            load_markdown(temp_dir / "missing.md")
+
+    def test_relative_and_absolute_paths_share_entry(self, temp_dir, monkeypatch):
+        """Test that cache keys are normalized to absolute paths."""
+        path = temp_dir / "task.md"
+        write_markdown(path, {"title": "Task"}, "")
+        monkeypatch.chdir(temp_dir)
+
+        load_markdown("task.md")
+        load_markdown(path)
+
+        assert get_cache_stats()["hits"] == 1
+        assert get_parse_cache().get(str(path), file_signature(os.stat(path))) is not None
+
+
+def _shift_mtime(path, seconds: int = 60) -> None:
+    """Move a file's mtime without touching its content, as git checkout does."""
+    stat_result = os.stat(path)
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + seconds * 10**9))
+
+
+class TestFrontmatterHashRevalidation:
+    """Test reuse of parses and derived caches when only mtimes change."""
+
+    def test_touched_file_is_revalidated_without_yaml_parse(self, temp_dir, monkeypatch):
+        """Test that a new mtime with the same front-matter skips the YAML parse."""
+        import yaml
+
+        path = temp_dir / "task.md"
+        path.write_text("---\ntitle: Task\n---\nBody\n")
+        load_markdown(path)
+
+        parses: list[str] = []
+        real_safe_load = yaml.safe_load
+        monkeypatch.setattr(
+            yaml, "safe_load", lambda text: parses.append(text) or real_safe_load(text)
+        )
+
+        _shift_mtime(path)
+        assert load_markdown(path) == ({"title": "Task"}, "Body\n")
+        path.write_text("---\ntitle: Task\n---\nLonger body\n")
+        assert load_markdown(path) == ({"title": "Task"}, "Longer body\n")
+        assert parses == []
+        assert get_cache_stats()["revalidations"] == 2
+
+        path.write_text("---\ntitle: Renamed\n---\nLonger body\n")
+        assert load_markdown(path)[0] == {"title": "Renamed"}
+        assert len(parses) == 1
+
+    def test_graph_and_children_caches_survive_mtime_only_changes(self, temp_dir):
+        """Test fingerprint validation in the dependency graph and children caches."""
+        from trellis_mcp.children.cache import ChildrenCache
+        from trellis_mcp.validation.cache import DependencyGraphCache
+        from trellis_mcp.validation.object_loader import get_all_objects
+
+        def front_matter(kind: str, obj_id: str, parent: str, title: str) -> dict:
+            return {
+                "kind": kind,
+                "id": obj_id,
+                "parent": parent,
+                "status": "open" if kind == "task" else "in-progress",
+                "title": title,
+                "priority": "normal",
+                "prerequisites": [],
+                "created": "2025-01-01T00:00:00",
+                "updated": "2025-01-01T00:00:00",
+                "schema_version": "1.1",
+            }
+
+        planning = temp_dir / "planning"
+        feature = planning / "projects" / "P-a" / "epics" / "E-a" / "features" / "F-a"
+        write_markdown(feature / "feature.md", front_matter("feature", "F-a", "E-a", "F"), "")
+        tasks = []
+        for name in ("T-a", "T-b"):
+            task = feature / "tasks-open" / f"{name}.md"
+            write_markdown(task, front_matter("task", name, "F-a", name), "")
+            tasks.append(task)
+
+        _, fingerprints = cast(
+            tuple[dict, dict[str, FileFingerprint]], get_all_objects(planning, include_mtimes=True)
+        )
+        graph_cache = DependencyGraphCache()
+        graph_cache.cache_graph(planning, {}, fingerprints)
+        children_cache = ChildrenCache()
+        children = [{"id": t.stem, "file_path": str(t)} for t in tasks]
+        children_cache.set_children(feature / "feature.md", children)
+
+        for path in [feature / "feature.md", *tasks]:
+            _shift_mtime(path)
+        assert graph_cache.is_cache_valid(planning, fingerprints)
+        assert children_cache.get_children(feature / "feature.md") == children
+        # Refreshed fingerprints make the next check a plain stat comparison
+        assert fingerprints[str(tasks[0])][0] == os.stat(tasks[0]).st_mtime_ns
+
+        write_markdown(tasks[0], front_matter("task", "T-a", "F-a", "Renamed"), "")
+        assert not graph_cache.is_cache_valid(planning, fingerprints)
+        assert children_cache.get_children(feature / "feature.md") is None
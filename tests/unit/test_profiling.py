@@ -0,0 +1,135 @@
+"""Tests for on-demand tool profiling (profiling.py, profileTool and the profile CLI)."""
+
+import json
+import pstats
+
+import pytest
+from click.testing import CliRunner
+from fastmcp import Client
+
+from trellis_mcp.cli import cli
+from trellis_mcp.profiling import format_profile_report, profile_tool_call
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+
+
+@pytest.fixture
+def planning_root(temp_dir):
+    """Provide an empty planning root."""
+    root = temp_dir / "planning"
+    root.mkdir()
+    return root
+
+
+class TestProfileToolCall:
+    """Test the profile_tool_call core."""
+
+    @pytest.mark.asyncio
+    async def test_profiles_real_tool_call(self, planning_root, temp_dir):
+        """Test that a real createObject call is profiled and its stats saved."""
+        output = temp_dir / "create.prof"
+        report = await profile_tool_call(
+            Settings(planning_root=planning_root),
+            "createObject",
+            {"kind": "project", "title": "Profiled", "projectRoot": str(planning_root)},
+            limit=5,
+            output_path=output,
+        )
+
+        assert report["success"] is True
+        assert report["result"]["id"].startswith("P-")
+        assert 0 < len(report["stats"]) <= 5
+        assert report["stats"][0]["cumtime_ms"] >= report["stats"][-1]["cumtime_ms"]
+        assert "Ordered by: cumulative time" in report["stats_text"]
+        assert report["memory"] is None
+        assert pstats.Stats(str(output)).total_calls > 0  # type: ignore[attr-defined]
+
+        text = format_profile_report(report)
+        assert text.startswith("Tool: createObject")
+
+    @pytest.mark.asyncio
+    async def test_tool_errors_are_reported_with_memory(self, planning_root):
+        """Test that a failing call still yields stats and tracemalloc data."""
+        report = await profile_tool_call(
+            Settings(planning_root=planning_root),
+            "getObject",
+            {"id": "T-missing", "projectRoot": str(planning_root)},
+            trace_memory=True,
+        )
+
+        assert report["success"] is False
+        assert report["error"]
+        assert report["memory"] is not None
+        assert report["memory"]["peak_bytes"] > 0
+        assert "Peak traced memory" in format_profile_report(report)
+
+    @pytest.mark.asyncio
+    async def test_unknown_tool_and_sort_rejected(self, planning_root):
+        """Test validation of tool name and sort key."""
+        settings = Settings(planning_root=planning_root)
+        with pytest.raises(ValueError, match="Unknown tool"):
+            await profile_tool_call(settings, "noSuchTool", {})
+        with pytest.raises(ValueError, match="Invalid sort key"):
+            await profile_tool_call(settings, "health_check", {}, sort="name")  # type: ignore
+
+
+class TestProfileToolRegistration:
+    """Test the debug-only profileTool MCP tool."""
+
+    @pytest.mark.asyncio
+    async def test_profile_tool_only_in_debug_mode(self, planning_root):
+        """Test that profileTool is registered only when debug mode is on."""
+        async with Client(create_server(Settings(planning_root=planning_root))) as client:
+            names = [tool.name for tool in await client.list_tools()]
+        assert "profileTool" not in names
+
+        settings = Settings(planning_root=planning_root, debug_mode=True)
+        async with Client(create_server(settings)) as client:
+            result = await client.call_tool(
+                "profileTool",
+                {
+                    "toolName": "listBacklog",
+                    "arguments": {"projectRoot": str(planning_root)},
+                    "limit": 3,
+                },
+            )
+
+        assert result.data["tool"] == "listBacklog"
+        assert result.data["success"] is True
+        assert len(result.data["stats"]) <= 3
+
+
+class TestProfileCommand:
+    """Test the profile CLI command."""
+
+    def test_profile_command_text_and_json(self, planning_root):
+        """Test text and JSON output of the profile command."""
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["profile", "listBacklog", "--project-root", str(planning_root), "--limit", "3"]
+        )
+        assert result.exit_code == 0, result.output
+        assert "Tool: listBacklog" in result.output
+        assert "Status: success" in result.output
+
+        result = runner.invoke(
+            cli,
+            [
+                "profile",
+                "listBacklog",
+                "--args",
+                json.dumps({"projectRoot": str(planning_root), "status": "open"}),
+                "--json",
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        report = json.loads(result.output)
+        assert report["arguments"]["status"] == "open"
+        assert report["success"] is True
+
+    def test_profile_command_rejects_bad_args(self):
+        """Test that malformed --args is reported as a usage error."""
+        runner = CliRunner()
+        result = runner.invoke(cli, ["profile", "listBacklog", "--args", "not json"])
+        assert result.exit_code != 0
+        assert "--args must be valid JSON" in result.output
@@ -0,0 +1,153 @@
+"""Unit tests for the review queue and the listReviewQueue tool.
+
+Tests queue ordering and paging, cursors, that the backlog index keeps the
+queue in step with status changes, and the tool's pages.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+from trellis_mcp.backlog_index import BacklogIndex, get_backlog_index
+from trellis_mcp.query import get_oldest_review
+from trellis_mcp.review_queue import ReviewQueue, decode_cursor, encode_cursor
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+from trellis_mcp.utils.io_utils import write_markdown
+
+MORNING = datetime(2025, 1, 1, 9, tzinfo=timezone.utc)
+NOON = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _task(task_id: str, status: str, updated: str, priority: str = "normal") -> dict:
+    return {
+        "kind": "task",
+        "id": task_id,
+        "parent": None,
+        "status": status,
+        "title": f"Task {task_id}",
+        "priority": priority,
+        "prerequisites": [],
+        "worktree": None,
+        "created": "2025-01-01T08:00:00Z",
+        "updated": updated,
+        "schema_version": "1.1",
+    }
+
+
+@pytest.fixture
+def planning(temp_dir):
+    """Standalone tasks: three in review, one open."""
+    root = temp_dir / "planning"
+    for task_id, status, updated, priority in [
+        ("late", "review", "2025-01-02T12:00:00Z", "high"),
+        ("early-low", "review", "2025-01-01T12:00:00Z", "low"),
+        ("early-high", "review", "2025-01-01T12:00:00Z", "high"),
+        ("open", "open", "2024-12-01T12:00:00Z", "high"),
+    ]:
+        write_markdown(
+            root / f"tasks-open/T-{task_id}.md", _task(task_id, status, updated, priority), ""
+        )
+    return root
+
+
+class TestReviewQueue:
+    """Test the queue on its own."""
+
+    def test_order_update_and_removal(self):
+        """Test that keys stay ordered as they are moved and removed."""
+        queue = ReviewQueue()
+        queue.put("/a", (NOON, 2, "a"))
+        queue.put("/b", (MORNING, 3, "b"))
+        queue.put("/c", (NOON, 1, "c"))
+        assert queue.page() == [(MORNING, 3, "b"), (NOON, 1, "c"), (NOON, 2, "a")]
+
+        queue.put("/b", (NOON, 3, "b"))
+        queue.put("/c", None)
+        queue.put("/missing", None)
+        assert queue.page() == [(NOON, 2, "a"), (NOON, 3, "b")]
+        assert len(queue) == 2
+
+    def test_page_after_key(self):
+        """Test paging, including after a key that left the queue."""
+        queue = ReviewQueue()
+        for number in range(5):
+            queue.put(f"/{number}", (NOON, 2, str(number)))
+
+        assert [key[2] for key in queue.page(limit=2)] == ["0", "1"]
+        assert [key[2] for key in queue.page((NOON, 2, "1"), 2)] == ["2", "3"]
+        queue.put("/2", None)
+        assert [key[2] for key in queue.page((NOON, 2, "2"))] == ["3", "4"]
+
+    def test_cursor_round_trip(self):
+        """Test cursor encoding, with a path containing the separator."""
+        key = (NOON, 1, "tasks-open/T-a|b.md")
+        assert decode_cursor(encode_cursor(key)) == key
+        for cursor in ["bogus", "2025-01-01T12:00:00|x|a.md", "2025-01-01T12:00:00|1|a.md"]:
+            with pytest.raises(ValueError, match="Invalid review queue cursor"):
+                decode_cursor(cursor)
+
+
+def test_index_follows_status_changes(planning):
+    """Test that the queue follows edits without re-reading unchanged files."""
+    index = BacklogIndex()
+    rows, keys, total = index.review_queue(planning)
+    assert [row[0] for row in rows] == ["T-early-high", "T-early-low", "T-late"]
+    assert total == 3
+    parses = index.parses
+
+    path = planning / "tasks-open/T-early-high.md"
+    write_markdown(path, _task("early-high", "done", "2025-01-03T12:00:00Z", "high"), "")
+    write_markdown(
+        planning / "tasks-open/T-open.md",
+        _task("open", "review", "2025-01-01T11:00:00+01:00"),
+        "",
+    )
+    rows, _, total = index.review_queue(planning, limit=2)
+    assert [row[0] for row in rows] == ["T-open", "T-early-low"]
+    assert total == 3
+    assert index.parses == parses + 2
+
+    path.unlink()
+    (planning / "tasks-open/T-late.md").unlink()
+    assert index.review_queue(planning)[2] == 2
+
+
+def test_get_oldest_review_reads_one_file(planning):
+    """Test that repeated calls re-parse nothing."""
+    result = get_oldest_review(planning)
+    assert result is not None
+    assert result.id == "early-high"
+    parses = get_backlog_index().parses
+    result = get_oldest_review(planning)
+    assert result is not None
+    assert result.id == "early-high"
+    assert get_backlog_index().parses == parses
+
+
+@pytest.mark.asyncio
+async def test_list_review_queue_tool(planning, temp_dir):
+    """Test paging through the queue."""
+    server = create_server(Settings(planning_root=planning, log_dir=temp_dir / "logs"))
+
+    async with Client(server) as client:
+        first = await client.call_tool(
+            "listReviewQueue", {"projectRoot": str(temp_dir), "limit": 2}
+        )
+        assert [task["id"] for task in first.data["tasks"]] == ["T-early-high", "T-early-low"]
+        assert first.data["tasks"][0]["status"] == "review"
+        assert first.data["total"] == 3
+
+        second = await client.call_tool(
+            "listReviewQueue",
+            {"projectRoot": str(temp_dir), "limit": 2, "cursor": first.data["next_cursor"]},
+        )
+        assert [task["id"] for task in second.data["tasks"]] == ["T-late"]
+        assert second.data["next_cursor"] is None
+
+        with pytest.raises(ToolError, match="Invalid review queue cursor"):
+            await client.call_tool(
+                "listReviewQueue", {"projectRoot": str(temp_dir), "cursor": "bogus"}
+            )
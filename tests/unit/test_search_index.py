@@ -0,0 +1,147 @@
+"""Unit tests for the persistent task search index and the searchTasks tool.
+
+Tests ranking, prefix and phrase queries and filters, that edits and
+deletions are picked up re-reading only the changed files, that a reopened
+index starts from the saved one, and the tool's parameters.
+"""
+
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+from trellis_mcp.search_index import SearchIndex, build_match
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+from trellis_mcp.utils.io_utils import write_markdown
+
+FEATURE_DIR = "projects/P-app/epics/E-auth/features/F-login"
+
+
+def _task(task_id: str, title: str, parent: str | None = None, status: str = "open") -> dict:
+    return {
+        "kind": "task",
+        "id": task_id,
+        "parent": parent,
+        "status": status,
+        "title": title,
+        "priority": "normal",
+        "prerequisites": [],
+        "worktree": None,
+        "created": "2025-01-01T12:00:00Z",
+        "updated": "2025-01-01T12:00:00Z",
+        "schema_version": "1.1",
+    }
+
+
+@pytest.fixture
+def planning(temp_dir):
+    """Planning tree with two feature tasks and one standalone task."""
+    root = temp_dir / "planning"
+    write_markdown(
+        root / FEATURE_DIR / "tasks-open/T-jwt.md",
+        _task("T-jwt", "Add JWT refresh tokens", "F-login"),
+        "Rotate tokens before they expire.\n",
+    )
+    write_markdown(
+        root / FEATURE_DIR / "tasks-done/20250102_120000-T-session.md",
+        _task("T-session", "Store sessions", "F-login", status="done"),
+        "Sessions outlive a JWT.\n\n### Log\n\n**2025-01-02** - Refactored the refresher.\n",
+    )
+    write_markdown(
+        root / "tasks-open/T-docs.md",
+        _task("T-docs", "Document the API"),
+        "Explain refresh token rotation.\n",
+    )
+    return root
+
+
+def _ids(hits) -> list[str]:
+    return [hit["id"] for hit in hits]
+
+
+class TestSearch:
+    """Test queries and filters."""
+
+    def test_ranking_prefix_and_phrase(self, planning):
+        """Test title matches first, prefix terms and phrases."""
+        index = SearchIndex(planning)
+
+        assert _ids(index.search("jwt")) == ["T-jwt", "T-session"]
+        assert _ids(index.search("refresh*")) == ["T-jwt", "T-docs", "T-session"]
+        assert _ids(index.search('"token rotation"')) == ["T-docs"]
+        assert _ids(index.search("refresher")) == ["T-session"]
+        assert index.search("refresh tokens")[0]["snippet"].startswith("Add JWT [refresh]")
+
+    def test_scope_and_status(self, planning):
+        """Test the scope and status filters."""
+        index = SearchIndex(planning)
+
+        assert _ids(index.search("refresh*", scope="F-login")) == ["T-jwt", "T-session"]
+        assert _ids(index.search("refresh*", scope="P-app")) == ["T-jwt", "T-docs", "T-session"]
+        assert _ids(index.search("refresh*", statuses=["done"])) == ["T-session"]
+        assert _ids(index.search("refresh*", limit=1)) == ["T-jwt"]
+
+
+class TestIncrementalUpdates:
+    """Test keeping the saved index in step with the files."""
+
+    def test_edits_and_deletions(self, planning):
+        """Test that only changed files are re-read."""
+        index = SearchIndex(planning)
+        index.refresh()
+        parses = index.parses
+
+        path = planning / "tasks-open/T-docs.md"
+        write_markdown(path, _task("T-docs", "Document the OAuth flow"), "")
+        assert _ids(index.search("oauth")) == ["T-docs"]
+        assert index.search("api") == []
+        assert index.parses == parses + 1
+
+        path.unlink()
+        assert index.search("oauth") == []
+
+    def test_reopened_index_reuses_saved_documents(self, planning):
+        """Test that a new index over the same tree parses nothing."""
+        SearchIndex(planning).refresh()
+
+        reopened = SearchIndex(planning)
+        assert reopened.refresh() == 0
+        assert reopened.parses == 0
+        assert _ids(reopened.search("jwt")) == ["T-jwt", "T-session"]
+
+
+def test_build_match():
+    """Test the query translation."""
+    assert build_match('jwt-refresh auth* "token rotation"') == (
+        '"jwt-refresh" "auth"* "token rotation"'
+    )
+    with pytest.raises(ValueError, match="no terms"):
+        build_match('** "" -')
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_tool(planning, temp_dir):
+    """Test the tool's results and parameter validation."""
+    server = create_server(Settings(planning_root=planning, log_dir=temp_dir / "logs"))
+
+    async with Client(server) as client:
+        result = await client.call_tool(
+            "searchTasks", {"projectRoot": str(temp_dir), "query": "sessions", "status": "done"}
+        )
+        [hit] = result.data["results"]
+        assert hit["id"] == "T-session"
+        assert hit["parent"] == "F-login"
+        assert hit["file_path"] == str(
+            planning / FEATURE_DIR / "tasks-done/20250102_120000-T-session.md"
+        )
+        assert hit["score"] > 0
+
+        result = await client.call_tool(
+            "searchTasks", {"projectRoot": str(temp_dir), "query": "jwt", "status": "bogus"}
+        )
+        assert result.data == {"results": []}
+
+        with pytest.raises(ToolError, match="Search query cannot be empty"):
+            await client.call_tool("searchTasks", {"projectRoot": str(temp_dir), "query": " "})
+        with pytest.raises(ToolError, match="no terms"):
+            await client.call_tool("searchTasks", {"projectRoot": str(temp_dir), "query": "**"})
@@ -4,12 +4,19 @@ Tests server creation, configuration, and basic server instantiation
 to ensure proper FastMCP integration and server behavior.
 """
 
+import os
+import threading
 from pathlib import Path
 
-from fastmcp import FastMCP
+import pytest
+from fastmcp import Client, FastMCP
 
+from trellis_mcp.done_tasks import get_done_layout
+from trellis_mcp.durability import get_durability_mode
+from trellis_mcp.logging.log_sink import get_log_sink, stop_log_sinks
 from trellis_mcp.server import create_server
 from trellis_mcp.settings import Settings
+from trellis_mcp.wal import delete_action, journal_operation, wal_dir
 
 
 def test_create_server_with_default_settings():
@@ -68,3 +75,41 @@ def test_server_with_different_settings():
         server = create_server(settings)
         assert server is not None
         assert isinstance(server, FastMCP)
+
+
+@pytest.mark.asyncio
+async def test_create_server_has_no_side_effects_until_a_session_opens(temp_dir):
+    """Test that recovery, modes, the log sink and warm-up wait for the first session."""
+    planning = temp_dir / "planning"
+    leftover = planning / "tasks-open" / "T-gone.md"
+    leftover.parent.mkdir(parents=True)
+    leftover.write_text("partial")
+    with pytest.raises(OSError):
+        with journal_operation(planning, "test", [delete_action(planning, leftover)]):
+            leftover.write_text("rewritten")  # changed on disk, then interrupted
+            raise OSError("killed")
+
+    settings = Settings(
+        planning_root=planning,
+        log_dir=temp_dir / "logs",
+        durability="relaxed",
+        done_layout="monthly",
+        warm_cache_on_start=True,
+    )
+    threads_before = {thread.name for thread in threading.enumerate()}
+    try:
+        server = create_server(settings)
+        assert get_durability_mode() == "strict"
+        assert get_done_layout() == "flat"
+        assert get_log_sink(settings.log_dir) is None
+        assert len(os.listdir(wal_dir(planning))) == 1
+        assert {thread.name for thread in threading.enumerate()} == threads_before
+
+        async with Client(server):
+            assert (get_durability_mode(), get_done_layout()) == ("relaxed", "monthly")
+            assert get_log_sink(settings.log_dir) is not None
+            assert os.listdir(wal_dir(planning)) == []
+            assert not leftover.exists()
+        assert (get_durability_mode(), get_done_layout()) == ("strict", "flat")
+    finally:
+        stop_log_sinks()
@@ -0,0 +1,194 @@
+"""Unit tests for the storage backends.
+
+Runs the same contract checks against the markdown and SQLite backends, then
+tests SQLite transactions and a markdown -> SQLite -> markdown round trip
+through the export and import commands.
+"""
+
+import pytest
+from click.testing import CliRunner
+
+from trellis_mcp.cli import cli
+from trellis_mcp.storage import (
+    MarkdownBackend,
+    SQLiteBackend,
+    StorageBackend,
+    StoredObject,
+    open_backend,
+)
+from trellis_mcp.utils.io_utils import read_markdown
+
+
+def _obj(kind: str, obj_id: str, parent: str | None = None, **fields) -> StoredObject:
+    yaml = {
+        "kind": kind,
+        "id": obj_id,
+        "parent": parent,
+        "status": "open",
+        "title": f"Title of {obj_id}",
+        "priority": "normal",
+        "created": "2025-01-01T12:00:00+00:00",
+        "updated": "2025-01-01T12:00:00+00:00",
+        "schema_version": "1.1",
+    }
+    if kind == "task":
+        yaml["prerequisites"] = []
+        yaml["worktree"] = None
+    yaml.update(fields)
+    return {"yaml": yaml, "body": f"Body of {obj_id}\n"}
+
+
+TREE = [
+    _obj("project", "P-app"),
+    _obj("epic", "E-auth", "P-app"),
+    _obj("feature", "F-login", "E-auth"),
+    _obj("feature", "F-logout", "E-auth"),
+    _obj("task", "T-form", "F-login", priority="high"),
+    _obj("task", "T-submit", "F-login", prerequisites=["T-form"]),
+    _obj("task", "T-shipped", "F-login", status="done", updated="2025-03-04T05:06:07+00:00"),
+    _obj("task", "T-chore", None),
+]
+
+
+@pytest.fixture(params=["markdown", "sqlite"])
+def backend(request, temp_dir):
+    """Each backend, filled with the same tree."""
+    if request.param == "markdown":
+        store: StorageBackend = MarkdownBackend(temp_dir / "planning")
+    else:
+        store = SQLiteBackend(temp_dir / "trellis.db")
+    with store.transaction():
+        for obj in TREE:
+            store.put(obj)
+    yield store
+    store.close()
+
+
+def _ids(objects: list[StoredObject]) -> list[str]:
+    return sorted(obj["yaml"]["id"] for obj in objects)
+
+
+class TestBackendContract:
+    """Test the behavior every backend must share."""
+
+    def test_is_a_storage_backend(self, backend):
+        """Test the protocol."""
+        assert isinstance(backend, StorageBackend)
+
+    def test_get_and_replace(self, backend):
+        """Test reading an object back and replacing it."""
+        task = backend.get("task", "form")
+        assert task["yaml"]["priority"] == "high"
+        assert task["body"] == "Body of T-form\n"
+        assert backend.get("task", "T-missing") is None
+
+        task["yaml"]["status"] = "in-progress"
+        backend.put(task)
+        assert backend.get("task", "T-form")["yaml"]["status"] == "in-progress"
+
+    def test_completed_task_moves(self, backend):
+        """Test that a status change to done is stored and the task stays reachable."""
+        task = backend.get("task", "T-submit")
+        task["yaml"]["status"] = "done"
+        backend.put(task)
+        assert backend.get("task", "T-submit")["yaml"]["status"] == "done"
+        assert _ids(backend.query(kind="task", status="done")) == ["T-shipped", "T-submit"]
+
+    def test_queries(self, backend):
+        """Test each query field."""
+        assert _ids(backend.query(priority="high")) == ["T-form"]
+        assert _ids(backend.query(kind="task", parent="F-login")) == [
+            "T-form",
+            "T-shipped",
+            "T-submit",
+        ]
+        assert _ids(backend.query(parent="auth")) == ["F-login", "F-logout"]
+        assert _ids(backend.query(prerequisite="form")) == ["T-submit"]
+        assert _ids(backend.query(kind="task", status="open", parent="F-login")) == [
+            "T-form",
+            "T-submit",
+        ]
+
+    def test_list_scope(self, backend):
+        """Test listing descendants and the whole store."""
+        assert len(backend.list_scope()) == len(TREE)
+        assert _ids(backend.list_scope("E-auth")) == [
+            "F-login",
+            "F-logout",
+            "T-form",
+            "T-shipped",
+            "T-submit",
+        ]
+
+    def test_move(self, backend):
+        """Test moving a task to another feature and out of the hierarchy."""
+        backend.move("T-form", "F-logout")
+        assert _ids(backend.query(parent="F-logout")) == ["T-form"]
+        backend.move("form", None)
+        assert backend.get("task", "T-form")["yaml"]["parent"] is None
+        with pytest.raises(FileNotFoundError):
+            backend.move("T-missing", None)
+
+    def test_delete_cascades(self, backend):
+        """Test that deleting a feature removes its tasks."""
+        assert sorted(backend.delete("feature", "F-login")) == [
+            "F-login",
+            "T-form",
+            "T-shipped",
+            "T-submit",
+        ]
+        assert backend.get("task", "T-form") is None
+        assert backend.delete("feature", "F-login") == []
+
+
+def test_sqlite_transaction_rolls_back(temp_dir):
+    """Test that a failed multi-object write leaves nothing behind."""
+    backend = SQLiteBackend(temp_dir / "trellis.db")
+    with pytest.raises(RuntimeError):
+        with backend.transaction():
+            backend.put(TREE[0])
+            backend.put(TREE[1])
+            raise RuntimeError("abort")
+    assert backend.list_scope() == []
+    backend.close()
+
+
+def test_open_backend_specs(temp_dir):
+    """Test the backend spec strings."""
+    assert isinstance(open_backend(f"sqlite:{temp_dir / 'a.db'}"), SQLiteBackend)
+    assert isinstance(open_backend(str(temp_dir / "planning")), MarkdownBackend)
+    with pytest.raises(ValueError, match="no path"):
+        open_backend("sqlite:")
+
+
+def test_round_trip_through_sqlite(temp_dir):
+    """Test export to SQLite and import into an empty planning tree."""
+    source = MarkdownBackend(temp_dir / "source" / "planning")
+    for obj in TREE:
+        source.put(obj)
+    runner = CliRunner()
+    database = temp_dir / "trellis.db"
+
+    result = runner.invoke(
+        cli,
+        ["export", f"sqlite:{database}"],
+        env={"MCP_PLANNING_ROOT": str(source.planning_root)},
+    )
+    assert result.exit_code == 0, result.output
+    assert f"Exported {len(TREE)} object(s)" in result.output
+
+    target_dir = temp_dir / "target" / "planning"
+    result = runner.invoke(
+        cli, ["import", f"sqlite:{database}"], env={"MCP_PLANNING_ROOT": str(target_dir)}
+    )
+    assert result.exit_code == 0, result.output
+
+    target = MarkdownBackend(target_dir)
+    assert _ids(target.list_scope()) == _ids(TREE)
+    shipped = target_dir.glob("projects/*/epics/*/features/F-login/tasks-done/*-T-shipped.md")
+    assert [path.name for path in shipped] == ["20250304_050607-T-shipped.md"]
+    for obj in source.list_scope():
+        copied = target.get(obj["yaml"]["kind"], obj["yaml"]["id"])
+        assert copied == obj
+    front_matter, _ = read_markdown(target_dir / "tasks-open" / "T-chore.md")
+    assert front_matter["title"] == "Title of T-chore"
@@ -0,0 +1,236 @@
+"""Unit tests for subscribable task resources.
+
+Tests URI handling, the ready/in-progress snapshot, scope matching for
+notifications, polling off the event loop, dropping a session's
+subscriptions when it ends, and subscribe/notify end to end over an
+in-memory client.
+"""
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import mcp.types
+import pytest
+from fastmcp import Client
+from fastmcp.client.messages import MessageHandler
+
+from trellis_mcp import subscriptions
+from trellis_mcp.bench import TreeShape, generate_tree
+from trellis_mcp.change_feed import ChangeFeed, clear_change_feeds
+from trellis_mcp.server import create_server
+from trellis_mcp.settings import Settings
+from trellis_mcp.subscriptions import (
+    SubscriptionManager,
+    build_task_snapshot,
+    parse_task_resource_uri,
+    task_resource_uri,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_feeds():
+    """Drop feeds cached by earlier tests."""
+    clear_change_feeds()
+    yield
+    clear_change_feeds()
+
+
+class _RecordingSession:
+    """Stand-in for a server session that records notifications."""
+
+    def __init__(self):
+        self.updated: list[str] = []
+
+    async def send_resource_updated(self, uri):
+        self.updated.append(str(uri))
+
+
+class _UpdatedHandler(MessageHandler):
+    """Client message handler collecting resource-updated notifications."""
+
+    def __init__(self):
+        self.uris: list[str] = []
+        self.event = asyncio.Event()
+
+    async def on_resource_updated(self, message: mcp.types.ResourceUpdatedNotification) -> None:
+        self.uris.append(str(message.params.uri))
+        self.event.set()
+
+
+class TestTaskResources:
+    """Test URI handling and snapshots."""
+
+    def test_uri_round_trip(self, temp_dir):
+        """Test that built URIs parse back to their planning root and scope."""
+        default = Path("/srv/planning")
+        assert parse_task_resource_uri(task_resource_uri(), default) == (default, None)
+        assert parse_task_resource_uri(task_resource_uri(None, "F-x"), default) == (default, "F-x")
+
+        uri = task_resource_uri(temp_dir / "my project", "E-y")
+        assert "%2F" in uri
+        assert parse_task_resource_uri(uri, default) == (temp_dir / "my project/planning", "E-y")
+        assert parse_task_resource_uri("info://server", default) is None
+
+    def test_snapshot_lists_ready_and_in_progress_tasks_by_scope(self, temp_dir):
+        """Test readiness and scope filtering against the generated tree."""
+        planning = temp_dir / "planning"
+        generate_tree(
+            planning,
+            TreeShape(
+                projects=1,
+                epics_per_project=1,
+                features_per_epic=2,
+                tasks_per_feature=3,
+                standalone_tasks=2,
+                prereq_density=0.0,
+                done_ratio=0.0,
+                in_progress_ratio=0.0,
+            ),
+        )
+
+        snapshot = build_task_snapshot(planning)
+        ready_ids = {task["id"] for task in snapshot["ready"]}
+        assert snapshot["in_progress"] == []
+        assert len(ready_ids) == 8
+        assert all(task_id.startswith("T-") for task_id in ready_ids)
+
+        feature = build_task_snapshot(planning, "F-f000001")
+        assert len(feature["ready"]) == 3
+        assert all(task["parent"] == "F-f000001" for task in feature["ready"])
+        assert len(build_task_snapshot(planning, "P-p0001")["ready"]) == 6
+        assert build_task_snapshot(temp_dir / "missing")["ready"] == []
+
+
+class TestSubscriptionManager:
+    """Test notification routing without a server."""
+
+    @pytest.mark.asyncio
+    async def test_claims_notify_matching_scopes_and_completions_notify_all(self, temp_dir):
+        """Test which subscribers are told about which changes."""
+        planning = temp_dir / "planning"
+        manager = SubscriptionManager(planning)
+        root_session, feature_session, other_session = (
+            _RecordingSession(),
+            _RecordingSession(),
+            _RecordingSession(),
+        )
+        manager.subscribe(task_resource_uri(), root_session)
+        manager.subscribe(task_resource_uri(None, "F-a"), feature_session)
+        manager.subscribe(task_resource_uri(None, "F-b"), other_session)
+        feed = ChangeFeed(planning)
+
+        assert await manager.poll_once() == []
+
+        feed.record(
+            "updated",
+            "task",
+            "T-1",
+            "projects/P-p/epics/E-e/features/F-a/tasks-open/T-1.md",
+            status="in-progress",
+            parent="F-a",
+        )
+        await manager.poll_once()
+        assert root_session.updated == ["trellis://tasks"]
+        assert feature_session.updated == ["trellis://tasks/F-a"]
+        assert other_session.updated == []
+
+        feed.record(
+            "updated",
+            "task",
+            "T-1",
+            "projects/P-p/epics/E-e/features/F-a/tasks-done/20250101_000000-T-1.md",
+            status="done",
+            parent="F-a",
+        )
+        notified = await manager.poll_once()
+        assert sorted(notified) == [
+            "trellis://tasks",
+            "trellis://tasks/F-a",
+            "trellis://tasks/F-b",
+        ]
+
+        manager.unsubscribe(task_resource_uri(None, "F-b"), other_session)
+        assert manager.subscribed_uris() == ["trellis://tasks", "trellis://tasks/F-a"]
+
+    @pytest.mark.asyncio
+    async def test_feeds_are_read_off_the_event_loop(self, temp_dir, monkeypatch):
+        """Test that polling reads change feeds in a worker thread."""
+        planning = temp_dir / "planning"
+        manager = SubscriptionManager(planning)
+        session = _RecordingSession()
+        await manager.subscribe_async(task_resource_uri(), session)
+        ChangeFeed(planning).record("created", "task", "T-1", "tasks-open/T-1.md")
+
+        threads: list[threading.Thread] = []
+        real_get_change_feed = subscriptions.get_change_feed
+
+        def recording_get_change_feed(root):
+            threads.append(threading.current_thread())
+            return real_get_change_feed(root)
+
+        monkeypatch.setattr(subscriptions, "get_change_feed", recording_get_change_feed)
+        assert await manager.poll_once() == ["trellis://tasks"]
+        assert threads and threading.main_thread() not in threads
+
+    @pytest.mark.asyncio
+    async def test_ended_session_loses_its_subscriptions(self, temp_dir):
+        """Test that a session ending while others stay connected is forgotten."""
+        manager = SubscriptionManager(temp_dir / "planning")
+        ending, staying = _RecordingSession(), _RecordingSession()
+        ending_handle = manager.session_started()
+        staying_handle = manager.session_started()
+        try:
+            manager.subscribe(task_resource_uri(), ending, ending_handle)
+            manager.subscribe(task_resource_uri(None, "F-a"), ending, ending_handle)
+            manager.subscribe(task_resource_uri(), staying, staying_handle)
+
+            manager.session_ended(ending_handle)
+            assert manager.subscribed_uris() == ["trellis://tasks"]
+            assert await manager.poll_once() == []
+        finally:
+            manager.session_ended(staying_handle)
+        assert manager.subscribed_uris() == []
+
+    def test_rejects_other_resources(self, temp_dir):
+        """Test that only task resources are subscribable."""
+        manager = SubscriptionManager(temp_dir / "planning")
+        with pytest.raises(ValueError):
+            manager.subscribe("info://server", _RecordingSession())
+
+
+@pytest.mark.asyncio
+async def test_subscribed_client_is_notified_when_another_client_claims(temp_dir):
+    """Test subscribe, push and re-read end to end over two clients."""
+    planning = temp_dir / "planning"
+    generate_tree(
+        planning,
+        TreeShape(projects=1, epics_per_project=1, features_per_epic=1, standalone_tasks=1),
+    )
+    server = create_server(
+        Settings(
+            planning_root=planning,
+            log_dir=temp_dir / "logs",
+            subscription_poll_interval_ms=20,
+        )
+    )
+    handler = _UpdatedHandler()
+    uri = task_resource_uri(temp_dir)
+
+    async with Client(server, message_handler=handler) as watcher:
+        assert watcher.initialize_result.capabilities.resources is not None
+        assert watcher.initialize_result.capabilities.resources.subscribe is True
+        await watcher.session.subscribe_resource(uri)  # type: ignore[arg-type]
+
+        before = json.loads((await watcher.read_resource(uri))[0].text)  # type: ignore[union-attr]
+        assert before["in_progress"] == []
+
+        async with Client(server) as worker:
+            claimed = (await worker.call_tool("claimNextTask", {"projectRoot": str(temp_dir)})).data
+        await asyncio.wait_for(handler.event.wait(), timeout=5)
+        assert handler.uris == [uri]
+
+        after = json.loads((await watcher.read_resource(uri))[0].text)  # type: ignore[union-attr]
+        assert [task["id"] for task in after["in_progress"]] == [claimed["task"]["id"]]
+        assert after["generation"] > before["generation"]
@@ -0,0 +1,100 @@
+"""Unit tests for the vectorized task table.
+
+Builds backlog index columns from generated rows and checks that every
+query, the listing order and the group-by counts come out the same with
+and without the NumPy arrays.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from trellis_mcp import backlog_index
+from trellis_mcp.backlog_index import BacklogQuery, TaskColumns
+from trellis_mcp.models.common import Priority
+
+pytest.importorskip("numpy")
+
+STATUSES = ["open", "in-progress", "review", "done"]
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _rows(count: int) -> tuple[list[tuple], dict[str, str]]:
+    """Generate task rows in TASK_COLUMNS order, with their statuses."""
+    rng = random.Random(7)
+    rows: list[tuple] = []
+    statuses: dict[str, str] = {}
+    for number in range(count):
+        status = rng.choice(STATUSES)
+        standalone = number % 5 == 0
+        project, epic, feature = (
+            (None, None, None)
+            if standalone
+            else (f"P-{number % 2}", f"E-{number % 4}", f"F-{number % 8}")
+        )
+        created = START + timedelta(hours=rng.randrange(1000))
+        prerequisites = tuple(f"t{rng.randrange(count + 20)}" for _ in range(rng.randrange(3)))
+        rows.append(
+            (
+                f"T-t{number}",
+                f"Task {number} {'login' if number % 3 == 0 else 'misc'}",
+                status,
+                Priority(rng.randint(1, 3)),
+                feature,
+                project,
+                epic,
+                feature,
+                rng.choice([None, "wt-a", "wt-b"]),
+                created.replace(tzinfo=None) if number % 2 else created,
+                created + timedelta(hours=rng.randrange(100)),
+                prerequisites,
+                f"tasks-open/T-t{number}.md",
+            )
+        )
+        statuses[f"t{number}"] = status
+    return rows, statuses
+
+
+QUERIES = [
+    BacklogQuery(),
+    BacklogQuery(statuses=frozenset({"open", "review"})),
+    BacklogQuery(priorities=frozenset({"high"}), scope="E-1"),
+    BacklogQuery(scope="P-0", worktree="wt-a"),
+    BacklogQuery(scope="F-missing"),
+    BacklogQuery(title_contains="LOGIN", has_unfinished_prerequisites=False),
+    BacklogQuery(has_unfinished_prerequisites=True, statuses=frozenset({"open"})),
+    BacklogQuery(created_after=START + timedelta(hours=200), created_before=datetime(2025, 1, 20)),
+    BacklogQuery(updated_before=START + timedelta(hours=300)),
+]
+
+
+@pytest.fixture
+def column_pair(monkeypatch, temp_dir):
+    """The same columns answered in pure Python and through the arrays."""
+    rows, statuses = _rows(400)
+    monkeypatch.setattr(backlog_index, "VECTORIZE_MIN_ROWS", 10**9)
+    plain = TaskColumns(rows, statuses, str(temp_dir))
+    assert plain._vectorized() is None
+    monkeypatch.setattr(backlog_index, "VECTORIZE_MIN_ROWS", 1)
+    vectorized = TaskColumns(rows, statuses, str(temp_dir))
+    assert vectorized._vectorized() is not None
+    return plain, vectorized
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_select_and_order_match(column_pair, query):
+    """Test that both paths select and order the same rows."""
+    plain, vectorized = column_pair
+    rows = plain.select(query)
+    assert vectorized.select(query) == rows
+    assert vectorized.order(rows) == plain.order(rows)
+
+
+def test_count_by_matches(column_pair):
+    """Test that both paths count the same groups in the same order."""
+    plain, vectorized = column_pair
+    rows = plain.select(BacklogQuery(statuses=frozenset({"open", "in-progress"})))
+    for fields in (["status"], ["epic", "priority"], ["project", "worktree"], ["parent"]):
+        assert vectorized.count_by(rows, fields) == plain.count_by(rows, fields)
+    assert vectorized.count_by([], ["status"]) == []
@@ -0,0 +1,252 @@
+"""Unit tests for the write-ahead journal and crash recovery.
+
+Tests that a task completion killed or failing between its write and its
+rename is finished by recovery, that operations which failed before their
+first write or with a domain error leave no entry, that cascade deletions
+are replayed, that running operations and fresh temp files are left alone,
+and that in group mode an entry outlives the operation until its writes are
+committed.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from trellis_mcp.complete_task import complete_task
+from trellis_mcp.durability import commit_group, set_durability_mode
+from trellis_mcp.utils.io_utils import read_markdown, write_markdown
+from trellis_mcp.wal import (
+    delete_action,
+    journal_operation,
+    recover_planning_root,
+    remove_stale_tmp_files,
+    wal_dir,
+    write_action,
+)
+
+TASK_YAML = {
+    "kind": "task",
+    "id": "T-crash",
+    "parent": None,
+    "status": "in-progress",
+    "title": "Crash me",
+    "priority": "normal",
+    "worktree": None,
+    "created": "2025-01-01T12:00:00Z",
+    "updated": "2025-01-01T12:00:00Z",
+    "schema_version": "1.1",
+    "prerequisites": [],
+}
+
+# Completes a task in a child process that dies right before the rename into tasks-done
+CRASHING_COMPLETE = textwrap.dedent(
+    """
+    import os
+    import sys
+
+    from trellis_mcp.complete_task import complete_task
+
+    real_replace = os.replace
+
+    def crash_before_move(source, target):
+        if "tasks-done" in str(target):
+            os._exit(17)
+        real_replace(source, target)
+
+    os.replace = crash_before_move
+    complete_task(sys.argv[1], "T-crash", "Done before the crash")
+    """
+)
+
+
+class TestRecovery:
+    """Test replaying entries left by a dead process."""
+
+    def test_completion_killed_before_rename_is_finished(self, temp_dir):
+        """Test that recovery moves the rewritten task into tasks-done."""
+        planning = temp_dir / "planning"
+        task_file = planning / "tasks-open" / "T-crash.md"
+        write_markdown(task_file, TASK_YAML, "Body")
+
+        result = subprocess.run(
+            [sys.executable, "-c", CRASHING_COMPLETE, str(planning)],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 17, result.stderr
+        assert task_file.exists()
+        assert len(os.listdir(wal_dir(planning))) == 1
+
+        report = recover_planning_root(planning)
+        assert report == {"replayed": 1, "discarded": 0, "tmp_removed": 0}
+        assert not task_file.exists()
+        done_files = list((planning / "tasks-done").glob("*-T-crash.md"))
+        assert len(done_files) == 1
+        front_matter, body = read_markdown(done_files[0])
+        assert front_matter["status"] == "done"
+        assert "Done before the crash" in body
+        assert os.listdir(wal_dir(planning)) == []
+
+        # Replaying is idempotent: a second recovery finds nothing to do
+        assert recover_planning_root(planning)["replayed"] == 0
+
+    def test_failed_completion_keeps_entry_for_recovery(self, temp_dir, monkeypatch):
+        """Test that an error after the in-place write leaves the entry to finish the move."""
+        planning = temp_dir / "planning"
+        task_file = planning / "tasks-open" / "T-crash.md"
+        write_markdown(task_file, TASK_YAML, "Body")
+
+        real_replace = os.replace
+
+        def fail_move(source, target):
+            if "tasks-done" in str(target):
+                raise OSError("disk unplugged")
+            real_replace(source, target)
+
+        monkeypatch.setattr(os, "replace", fail_move)
+        with pytest.raises(OSError, match="disk unplugged"):
+            complete_task(planning, "T-crash", "Done before the failure")
+        monkeypatch.undo()
+
+        # The front-matter was rewritten in place, but the move never happened
+        assert read_markdown(task_file)[0]["status"] == "done"
+        assert len(os.listdir(wal_dir(planning))) == 1
+
+        assert recover_planning_root(planning)["replayed"] == 1
+        assert not task_file.exists()
+        assert len(list((planning / "tasks-done").glob("*-T-crash.md"))) == 1
+        assert os.listdir(wal_dir(planning)) == []
+
+    def test_completion_failing_before_its_first_write_leaves_no_entry(self, temp_dir, monkeypatch):
+        """Test that a task whose completion never touched a file is not completed later."""
+        planning = temp_dir / "planning"
+        task_file = planning / "tasks-open" / "T-crash.md"
+        write_markdown(task_file, TASK_YAML, "Body")
+
+        real_replace = os.replace
+
+        def no_space(source, target):
+            if ".trellis" not in str(target):
+                raise OSError("no space left on device")
+            real_replace(source, target)
+
+        monkeypatch.setattr(os, "replace", no_space)
+        with pytest.raises(OSError, match="no space"):
+            complete_task(planning, "T-crash", "Never written")
+        monkeypatch.undo()
+
+        assert read_markdown(task_file)[0]["status"] == "in-progress"
+        assert os.listdir(wal_dir(planning)) == []
+        assert recover_planning_root(planning)["replayed"] == 0
+        assert read_markdown(task_file)[0]["status"] == "in-progress"
+
+    def test_domain_error_after_a_write_leaves_no_entry(self, temp_dir):
+        """Test that an operation reported as failed is not finished by recovery."""
+        planning = temp_dir / "planning"
+        target = planning / "tasks-open" / "T-a.md"
+        with pytest.raises(ValueError, match="refused"):
+            with journal_operation(planning, "test", [write_action(planning, target, "x")]):
+                target.parent.mkdir(parents=True)
+                target.write_text("partial")
+                raise ValueError("refused")
+
+        assert os.listdir(wal_dir(planning)) == []
+        assert target.read_text() == "partial"
+
+    def test_cascade_delete_entry_is_replayed(self, temp_dir):
+        """Test finishing a deletion that stopped after the first path."""
+        planning = temp_dir / "planning"
+        project = planning / "projects" / "P-a"
+        write_markdown(project / "project.md", {"kind": "project", "id": "P-a"}, "")
+        write_markdown(project / "epics" / "E-b" / "epic.md", {"kind": "epic", "id": "E-b"}, "")
+        entry = {
+            "id": "interrupted",
+            "operation": "cascade_delete",
+            "actions": [
+                delete_action(planning, project / "project.md"),
+                delete_action(planning, project / "epics" / "E-b"),
+            ],
+        }
+        (project / "project.md").unlink()
+        wal_dir(planning).mkdir(parents=True)
+        (wal_dir(planning) / "interrupted.json").write_text(json.dumps(entry))
+
+        assert recover_planning_root(planning)["replayed"] == 1
+        assert not (project / "epics" / "E-b").exists()
+
+    def test_running_operations_and_torn_entries(self, temp_dir):
+        """Test that locked entries are skipped and unreadable ones discarded."""
+        planning = temp_dir / "planning"
+        target = planning / "tasks-open" / "T-a.md"
+        with journal_operation(planning, "test", [write_action(planning, target, "x")]):
+            assert recover_planning_root(planning)["replayed"] == 0
+            assert len(os.listdir(wal_dir(planning))) == 1
+        assert os.listdir(wal_dir(planning)) == []
+        assert not target.exists()
+
+        (wal_dir(planning) / "torn.json").write_text('{"id": "torn", "acti')
+        assert recover_planning_root(planning)["discarded"] == 1
+
+    def test_stale_tmp_files_are_removed(self, temp_dir):
+        """Test that only old temp files are removed."""
+        directory = temp_dir / "planning" / "tasks-open"
+        directory.mkdir(parents=True)
+        stale = directory / ".T-a.md.abc.tmp"
+        fresh = directory / ".T-b.md.def.tmp"
+        stale.write_text("partial")
+        fresh.write_text("partial")
+        old = time.time() - 3600
+        os.utime(stale, (old, old))
+
+        assert remove_stale_tmp_files(temp_dir / "planning") == 1
+        assert not stale.exists()
+        assert fresh.exists()
+
+
+def test_group_mode_keeps_entry_until_commit(temp_dir):
+    """Test that the entry is dropped only after the deferred writes are flushed."""
+    planning = temp_dir / "planning"
+    target = planning / "tasks-open" / "T-a.md"
+    set_durability_mode("group")
+    try:
+        with commit_group():
+            with journal_operation(planning, "test", [write_action(planning, target, "x")]):
+                target.parent.mkdir(parents=True)
+                target.write_text("x")
+            assert len(os.listdir(wal_dir(planning))) == 1
+        assert os.listdir(wal_dir(planning)) == []
+    finally:
+        set_durability_mode("strict")
+
+
+def test_entry_costs_one_fsync_in_strict_mode_and_none_in_a_group(temp_dir, monkeypatch):
+    """Test that the entry's directory is not fsynced and groups defer the entry's flush."""
+    planning = temp_dir / "planning"
+    fsyncs: list[int] = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+
+    with journal_operation(planning, "test", []):
+        assert len(fsyncs) == 1
+
+    fsyncs.clear()
+    set_durability_mode("group")
+    try:
+        with commit_group() as group:
+            with journal_operation(planning, "test", []):
+                assert fsyncs == []
+            assert len(group.files) == 1
+    finally:
+        set_durability_mode("strict")
+
+
+def test_paths_outside_the_planning_root_are_rejected(temp_dir):
+    """Test action path validation."""
+    with pytest.raises(ValueError, match="not inside planning root"):
+        delete_action(temp_dir / "planning", Path("/etc/passwd"))
@@ -25,7 +25,7 @@ from trellis_mcp.models.common import Priority
 from trellis_mcp.schema.kind_enum import KindEnum
 from trellis_mcp.schema.status_enum import StatusEnum
 from trellis_mcp.schema.task import TaskModel
-from trellis_mcp.utils.io_utils import read_markdown, write_markdown
+from trellis_mcp.utils.io_utils import atomic_write_text, read_markdown, write_markdown
 
 
 def create_test_task(
@@ -364,192 +364,129 @@ class TestCompleteTaskPrerequisites:
         mock_is_unblocked.assert_called_once_with(mock_task, Path("/fake/project"))
 
 
+def _write_standalone_task(planning_root: Path, status: str, body: str) -> Path:
+    """Write a standalone task file to tasks-open and return its path."""
+    task_file = planning_root / "tasks-open" / "T-test-task.md"
+    task_yaml = {
+        "kind": "task",
+        "id": "T-test-task",
+        "parent": None,
+        "status": status,
+        "title": "Test task",
+        "priority": "normal",
+        "worktree": None,
+        "created": "2025-01-01T12:00:00Z",
+        "updated": "2025-01-01T12:00:00Z",
+        "schema_version": "1.1",
+        "prerequisites": [],
+    }
+    write_markdown(task_file, task_yaml, body)
+    return task_file
+
+
+def _read_done_task(planning_root: Path) -> tuple[dict, str]:
+    """Read the single completed standalone task file."""
+    done_files = list((planning_root / "tasks-done").glob("*-T-test-task.md"))
+    assert len(done_files) == 1
+    return read_markdown(done_files[0])
+
+
 class TestCompleteTaskLogAppending:
-    """Test log appending functionality of complete_task."""
+    """Test log appending functionality of complete_task.
+
+    The log entry is appended in the same write that marks the task done and
+    moves it to tasks-done, so these tests check the completed file.
+    """
 
     @patch("trellis_mcp.complete_task.datetime")
-    @patch("trellis_mcp.complete_task._move_task_to_done")
-    @patch("trellis_mcp.complete_task.write_markdown")
-    @patch("trellis_mcp.complete_task.read_markdown")
-    @patch("trellis_mcp.complete_task.parse_object")
-    @patch("trellis_mcp.complete_task.id_to_path")
-    @patch("trellis_mcp.complete_task.is_unblocked")
-    def test_complete_task_with_summary_appends_log(
-        self,
-        mock_is_unblocked,
-        mock_id_to_path,
-        mock_parse,
-        mock_read_markdown,
-        mock_write_markdown,
-        mock_move,
-        mock_datetime,
-    ):
+    def test_complete_task_with_summary_appends_log(self, mock_datetime, tmp_path):
         """Test that providing summary appends log entry to task file."""
         # Setup datetime mock to return consistent timestamp
         fixed_datetime = datetime(2025, 7, 15, 10, 30, 45, tzinfo=timezone.utc)
         mock_datetime.now.return_value = fixed_datetime
 
-        # Setup mocks
-        mock_task = create_test_task("test-task", StatusEnum.IN_PROGRESS, "Test task")
-        completed_task = create_test_task("test-task", StatusEnum.DONE, "Test task")
-        mock_parse.return_value = mock_task
-        mock_id_to_path.return_value = Path("/fake/path/task.md")
-        mock_is_unblocked.return_value = True
-        mock_move.return_value = completed_task
-
-        # Mock file content for log appending
-        initial_yaml = {"kind": "task", "id": "test-task", "status": "in-progress"}
-        initial_body = "This is a test task.\n\n### Log\n\nTask created."
-        mock_read_markdown.return_value = (initial_yaml, initial_body)
+        planning_root = tmp_path / "planning"
+        task_file = _write_standalone_task(
+            planning_root, "in-progress", "This is a test task.\n\n### Log\n\nTask created."
+        )
 
         # Call complete_task with summary and files
         summary = "Implemented authentication feature"
         files_changed = ["src/auth.py", "tests/test_auth.py"]
 
-        result = complete_task("/fake/project", "test-task", summary, files_changed)
+        result = complete_task(planning_root, "T-test-task", summary, files_changed)
 
-        # Verify completed task is returned
-        assert result == completed_task
+        # Verify completed task is returned and the file moved
+        assert result.status == StatusEnum.DONE
+        assert not task_file.exists()
 
         # Verify log entry was appended
-        mock_write_markdown.assert_called_once()
-        call_args = mock_write_markdown.call_args
-        written_yaml, written_body = call_args[0][1], call_args[0][2]
-
-        assert written_yaml == initial_yaml
+        written_yaml, written_body = _read_done_task(planning_root)
+        assert written_yaml["status"] == "done"
         assert "Task created." in written_body
         assert "Implemented authentication feature" in written_body
         assert 'filesChanged: ["src/auth.py", "tests/test_auth.py"]' in written_body
         # Verify timestamp format (ISO with timezone) - should match our mocked datetime
         assert "**2025-07-15T10:30:45Z**" in written_body
 
-    @patch("trellis_mcp.complete_task._move_task_to_done")
-    @patch("trellis_mcp.complete_task.write_markdown")
-    @patch("trellis_mcp.complete_task.read_markdown")
-    @patch("trellis_mcp.complete_task.parse_object")
-    @patch("trellis_mcp.complete_task.id_to_path")
-    @patch("trellis_mcp.complete_task.is_unblocked")
-    def test_complete_task_with_summary_no_files(
-        self,
-        mock_is_unblocked,
-        mock_id_to_path,
-        mock_parse,
-        mock_read_markdown,
-        mock_write_markdown,
-        mock_move,
-    ):
+    def test_complete_task_with_summary_no_files(self, tmp_path):
         """Test that providing summary without files appends log entry correctly."""
-        # Setup mocks
-        mock_task = create_test_task("test-task", StatusEnum.REVIEW, "Test task")
-        completed_task = create_test_task("test-task", StatusEnum.DONE, "Test task")
-        mock_parse.return_value = mock_task
-        mock_id_to_path.return_value = Path("/fake/path/task.md")
-        mock_is_unblocked.return_value = True
-        mock_move.return_value = completed_task
-
-        # Mock file content for log appending
-        initial_yaml = {"kind": "task", "id": "test-task", "status": "review"}
-        initial_body = "This is a test task.\n\n### Log\n\nTask created."
-        mock_read_markdown.return_value = (initial_yaml, initial_body)
+        planning_root = tmp_path / "planning"
+        _write_standalone_task(
+            planning_root, "review", "This is a test task.\n\n### Log\n\nTask created."
+        )
 
         # Call complete_task with summary only
-        summary = "Fixed bug in validation logic"
-
-        result = complete_task("/fake/project", "test-task", summary)
-
-        # Verify completed task is returned
-        assert result == completed_task
+        complete_task(planning_root, "T-test-task", "Fixed bug in validation logic")
 
         # Verify log entry was appended without filesChanged
-        mock_write_markdown.assert_called_once()
-        call_args = mock_write_markdown.call_args
-        written_yaml, written_body = call_args[0][1], call_args[0][2]
-
-        assert written_yaml == initial_yaml
+        _, written_body = _read_done_task(planning_root)
         assert "Task created." in written_body
         assert "Fixed bug in validation logic" in written_body
         assert "filesChanged:" not in written_body
 
-    @patch("trellis_mcp.complete_task._move_task_to_done")
-    @patch("trellis_mcp.complete_task.write_markdown")
-    @patch("trellis_mcp.complete_task.read_markdown")
-    @patch("trellis_mcp.complete_task.parse_object")
-    @patch("trellis_mcp.complete_task.id_to_path")
-    @patch("trellis_mcp.complete_task.is_unblocked")
-    def test_complete_task_without_summary_no_log_append(
-        self,
-        mock_is_unblocked,
-        mock_id_to_path,
-        mock_parse,
-        mock_read_markdown,
-        mock_write_markdown,
-        mock_move,
-    ):
+    def test_complete_task_without_summary_no_log_append(self, tmp_path):
         """Test that not providing summary does not append log entry."""
-        # Setup mocks
-        mock_task = create_test_task("test-task", StatusEnum.IN_PROGRESS, "Test task")
-        completed_task = create_test_task("test-task", StatusEnum.DONE, "Test task")
-        mock_parse.return_value = mock_task
-        mock_id_to_path.return_value = Path("/fake/path/task.md")
-        mock_is_unblocked.return_value = True
-        mock_move.return_value = completed_task
-
-        # Call complete_task without summary
-        result = complete_task("/fake/project", "test-task")
+        planning_root = tmp_path / "planning"
+        body = "This is a test task."
+        _write_standalone_task(planning_root, "in-progress", body)
 
-        # Verify completed task is returned
-        assert result == completed_task
+        complete_task(planning_root, "T-test-task")
 
-        # Verify no log append functions were called
-        mock_read_markdown.assert_not_called()
-        mock_write_markdown.assert_not_called()
+        # Verify the body is unchanged
+        _, written_body = _read_done_task(planning_root)
+        assert written_body == body
 
-    @patch("trellis_mcp.complete_task._move_task_to_done")
-    @patch("trellis_mcp.complete_task.write_markdown")
-    @patch("trellis_mcp.complete_task.read_markdown")
-    @patch("trellis_mcp.complete_task.parse_object")
-    @patch("trellis_mcp.complete_task.id_to_path")
-    @patch("trellis_mcp.complete_task.is_unblocked")
-    def test_complete_task_creates_log_section_if_missing(
-        self,
-        mock_is_unblocked,
-        mock_id_to_path,
-        mock_parse,
-        mock_read_markdown,
-        mock_write_markdown,
-        mock_move,
-    ):
+    def test_complete_task_creates_log_section_if_missing(self, tmp_path):
         """Test that log section is created if it doesn't exist."""
-        # Setup mocks
-        mock_task = create_test_task("test-task", StatusEnum.IN_PROGRESS, "Test task")
-        completed_task = create_test_task("test-task", StatusEnum.DONE, "Test task")
-        mock_parse.return_value = mock_task
-        mock_id_to_path.return_value = Path("/fake/path/task.md")
-        mock_is_unblocked.return_value = True
-        mock_move.return_value = completed_task
-
-        # Mock file content without log section
-        initial_yaml = {"kind": "task", "id": "test-task", "status": "in-progress"}
-        initial_body = "This is a test task."
-        mock_read_markdown.return_value = (initial_yaml, initial_body)
+        planning_root = tmp_path / "planning"
+        _write_standalone_task(planning_root, "in-progress", "This is a test task.")
 
-        # Call complete_task with summary
-        summary = "Added new functionality"
-
-        result = complete_task("/fake/project", "test-task", summary)
-
-        # Verify completed task is returned
-        assert result == completed_task
+        complete_task(planning_root, "T-test-task", "Added new functionality")
 
         # Verify log section was created and entry appended
-        mock_write_markdown.assert_called_once()
-        call_args = mock_write_markdown.call_args
-        written_yaml, written_body = call_args[0][1], call_args[0][2]
-
-        assert written_yaml == initial_yaml
+        _, written_body = _read_done_task(planning_root)
         assert "### Log" in written_body
         assert "Added new functionality" in written_body
 
+    def test_complete_task_writes_once_and_renames(self, tmp_path):
+        """Test that completion rewrites the file once and renames it into tasks-done."""
+        planning_root = tmp_path / "planning"
+        task_file = _write_standalone_task(planning_root, "in-progress", "This is a test task.")
+        inode = task_file.stat().st_ino
+
+        with patch(
+            "trellis_mcp.utils.io_utils.atomic_write_text", wraps=atomic_write_text
+        ) as mock_write:
+            complete_task(planning_root, "T-test-task", "Done")
+
+        mock_write.assert_called_once()
+        assert mock_write.call_args[0][0] == task_file
+        done_files = list((planning_root / "tasks-done").glob("*-T-test-task.md"))
+        assert len(done_files) == 1
+        assert done_files[0].stat().st_ino != inode  # the in-place write replaced it
+        assert list((planning_root / "tasks-open").iterdir()) == []
+
 
 class TestCompleteTaskParentFeatureUpdate:
     """Test parent feature status update functionality when completing tasks."""